@@ -86,6 +86,11 @@ APP_IMAGES_DIR: Final[Union[Path, WindowsPath, PosixPath]] = (
 )
 """The path to the app images directory as an instance of `Path` or `PosixPath`, depending on the OS."""
 
+CACHE_DIR: Final[Union[Path, WindowsPath, PosixPath]] = (
+    _YT_PLATFORM_DIRS.user_data_path / "cache"
+)
+"""The path to the app derived artifact cache directory as an instance of `Path` or `PosixPath`, depending on the OS."""
+
 NOTEBOOKS_DIR: Final[Union[Path, WindowsPath, PosixPath]] = _YT_USER_DIRS / "notebooks"
 """
 The path to the users notebooks directory as an instance of `Path` or `PosixPath`, depending on the OS.
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Dict, Hashable, List, Optional, Union
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Union
 
 import yaml
 
@@ -11,13 +13,44 @@ from yawning_titan.exceptions import (
     ConfigItemValidationError,
 )
 from yawning_titan.game_modes.components import _LOGGER
+from yawning_titan.utils.config_cache import load_yaml
 
 yaml.Dumper.ignore_aliases = lambda *args: True
 
+_deferred = threading.local()
+
+
+def validation_deferred() -> bool:
+    """
+    Check whether validation is being deferred by :func:`deferred_validation` in this thread.
+
+    :return: True if validation is deferred, otherwise False.
+    """
+    return getattr(_deferred, "depth", 0) > 0
+
+
+@contextmanager
+def deferred_validation() -> Iterator[None]:
+    """
+    Suppress the automatic validation of config items and groups in this thread.
+
+    Item values set and groups created inside the context are not validated
+    until a group is explicitly validated. Use
+    :meth:`ConfigGroup.batch_update` to validate a group on exit.
+    """
+    _deferred.depth = getattr(_deferred, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+
 
 class ConfigBase(ABC):
     """Used to provide helper methods to represent a ConfigGroup object."""
 
+    _config_version: int = 0
+    """A counter incremented whenever any config item value or group element is set, used to invalidate cached digests."""
+
     def get_config_elements(
         self,
         types: Optional[
@@ -389,18 +422,26 @@ class ConfigItem:
     def __post_init__(self):
         if self.value is None and self.properties.default:
             self.value = self.properties.default
-        self.validate()
+        if not validation_deferred():
+            self.validate()
 
     def __setattr__(self, __name: str, __value: Any) -> None:
         """
         Set an attribute of the :class: `ConfigItem` if the value is to be set, call the validation method.
 
+        Validation is skipped while it is deferred, see :func:`deferred_validation`.
+
         :param __name: the name of the attribute to be set
         :param __value: the value to set the attribute to
         """
         self.__dict__[__name] = __value
-        if __name == "value":
-            self.validate()
+        if __name == "properties":
+            self.__dict__["_validation_stale"] = True
+        elif __name == "value":
+            self.__dict__["_validation_stale"] = True
+            ConfigBase._config_version += 1
+            if not validation_deferred():
+                self.validate()
 
     def to_dict(
         self,
@@ -435,11 +476,19 @@ class ConfigItem:
         If no properties exist,
         simply return a default passed :class:`ConfigItemValidation`.
 
+        The result is reused until the value is set again. Unhashable values,
+        which can be changed in place, are validated every time.
+
         :return: An instance of :class:`ConfigItemValidation`.
         """
+        if self.validation is not None and not self.__dict__.get(
+            "_validation_stale", True
+        ):
+            return self.validation
         self.validation = ConfigItemValidation()
         if self.properties:
             self.validation = self.properties.validate(self.value)
+        self.__dict__["_validation_stale"] = not isinstance(self.value, Hashable)
         return self.validation
 
     def set_value(self, value: Any) -> None:
@@ -449,6 +498,8 @@ class ConfigItem:
         :param value: The value to be set.
         """
         self.__dict__["value"] = value
+        self.__dict__["_validation_stale"] = True
+        ConfigBase._config_version += 1
 
     def stringify(self) -> Any:
         """This is here to allow stringify methods to be call on both :class: `ConfigItem` and :class: `ConfigGroup` classes."""
@@ -464,17 +515,48 @@ class ConfigGroup(ConfigBase, ABC):
         :param doc: The groups doc.
         """
         self.doc: Optional[str] = doc
-        self.validation = self.validate()
+        self.validation = None if validation_deferred() else self.validate()
 
     def __setattr__(self, __name: str, __value: Any) -> None:
-        if (
-            hasattr(self, __name)
-            and isinstance(getattr(self, __name), ConfigItem)
-            and not isinstance(__value, ConfigItem)
+        if isinstance(self.__dict__.get(__name), ConfigItem) and not isinstance(
+            __value, ConfigItem
         ):
             self.__dict__[__name].value = __value
         else:
             self.__dict__[__name] = __value
+            if __name != "validation":
+                ConfigBase._config_version += 1
+
+    @property
+    def validation(self) -> ConfigGroupValidation:
+        """
+        The result of the last validation of the group.
+
+        A group created while validation was deferred is validated on first access.
+        """
+        validation = self.__dict__.get("validation")
+        if validation is None:
+            validation = self.validate()
+        return validation
+
+    @contextmanager
+    def batch_update(self) -> Iterator[ConfigGroup]:
+        """
+        Set many values in the group with a single validation of the group on exit.
+
+        Item values set inside the context are not validated individually.
+        Nested batches validate once, when the outermost batch exits.
+
+        .. code:: python
+
+            >>> with game_mode.batch_update():
+            ...     game_mode.game_rules.max_steps.value = 100
+            ...     game_mode.miscellaneous.random_seed.value = 1
+        """
+        with deferred_validation():
+            yield self
+        if not validation_deferred():
+            self.validate()
 
     def validate(
         self, raise_overall_exception: Optional[bool] = False
@@ -574,7 +656,8 @@ class ConfigGroup(ConfigBase, ABC):
 
         kwargs can contain 2 parameters:
             - root: Whether the element is a base level element or not.
-                if the element is a root then it should validate all of its descendants.
+                if the element is a root then it should validate all of its descendants,
+                unless it is inside a :meth:`batch_update`.
             - legacy_lookup: The current flattened dictionary representation of the class by its legacy keys.
         """
         _root = kwargs.get("root", True)
@@ -586,28 +669,30 @@ class ConfigGroup(ConfigBase, ABC):
                 if all(k in config_dict for k in ["RED", "BLUE", "OBSERVATION_SPACE"])
                 else False
             )
-        if legacy:
-            if _legacy_lookup is None:
-                _legacy_lookup = self.to_legacy_dict()
-
-            for element_name, v in config_dict.items():
-                element: ConfigItem = _legacy_lookup.get(element_name)
-                if isinstance(v, dict):
-                    self.set_from_dict(
-                        v, legacy=True, root=False, _legacy_lookup=_legacy_lookup
-                    )
-                if element is not None:
-                    element.set_value(v)
-        else:
-            for element_name, v in config_dict.items():
-                element = getattr(self, element_name, None)
-                if isinstance(v, dict) and isinstance(element, ConfigGroup):
-                    element.set_from_dict(v, False)
-                elif not isinstance(v, dict) and isinstance(element, ConfigItem):
-                    element.set_value(v)
-                else:
-                    setattr(self, element_name, v)
-        if _root:
+        # the root validates every descendant once all the values are set
+        with deferred_validation():
+            if legacy:
+                if _legacy_lookup is None:
+                    _legacy_lookup = self.to_legacy_dict()
+
+                for element_name, v in config_dict.items():
+                    element: ConfigItem = _legacy_lookup.get(element_name)
+                    if isinstance(v, dict):
+                        self.set_from_dict(
+                            v, legacy=True, root=False, legacy_lookup=_legacy_lookup
+                        )
+                    if element is not None:
+                        element.set_value(v)
+            else:
+                for element_name, v in config_dict.items():
+                    element = getattr(self, element_name, None)
+                    if isinstance(v, dict) and isinstance(element, ConfigGroup):
+                        element.set_from_dict(v, root=False)
+                    elif not isinstance(v, dict) and isinstance(element, ConfigItem):
+                        element.set_value(v)
+                    else:
+                        setattr(self, element_name, v)
+        if _root and not validation_deferred():
             self.validate()
 
     def set_from_yaml(
@@ -621,8 +706,7 @@ class ConfigGroup(ConfigBase, ABC):
         :param infer_legacy: Attempt to recognise if a config is of a legacy type.
         """
         try:
-            with open(file_path) as f:
-                config_dict = yaml.safe_load(f)
+            config_dict = load_yaml(file_path)
         except FileNotFoundError as e:
             msg = f"Configuration file does not exist: {file_path}"
             _LOGGER.critical(msg, exc_info=True)
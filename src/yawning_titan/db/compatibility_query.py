@@ -1,10 +1,13 @@
-from typing import Optional, Union
+from typing import Mapping, Optional, Union
 
 from tinydb import Query
 from tinydb.queries import QueryInstance
 
+from yawning_titan.db.doc_summary import DocSummary
 from yawning_titan.networks.network import Network
 
+_COMPATIBILITY_FIELDS = ("entry_node_count", "high_value_node_count", "node_count")
+
 
 def check_element(el_dict: dict, n: int, include_unbounded: bool):
     """Check that a restrict-able element is suitable for a given value.
@@ -45,6 +48,52 @@ def check_element(el_dict: dict, n: int, include_unbounded: bool):
     return check_min and check_max
 
 
+def network_counts(n: Union[Network, DocSummary]) -> dict:
+    """Get the node counts of a network that game mode network compatibility is checked against.
+
+    Networks without entry or high value nodes are counted by the number they choose at random.
+
+    :param n: An instance of :class: `~yawning_titan.networks.network.Network`, or the
+        :class:`~yawning_titan.db.doc_summary.DocSummary` of one.
+
+    :return: A dict of ``node_count``, ``entry_node_count`` and ``high_value_node_count``.
+    """
+    if isinstance(n, DocSummary):
+        return n.compatibility_counts()
+    entry_nodes = n.entry_nodes
+    high_value_nodes = n.high_value_nodes
+    return {
+        "entry_node_count": len(entry_nodes)
+        if entry_nodes
+        else n.num_of_random_entry_nodes,
+        "high_value_node_count": len(high_value_nodes)
+        if high_value_nodes
+        else n.num_of_random_high_value_nodes,
+        "node_count": n.number_of_nodes(),
+    }
+
+
+def check_compatibility(
+    network_compatibility: dict, counts: Mapping, include_unbounded: bool
+) -> bool:
+    """Check that every network compatibility range of a game mode is suitable for the node counts of a network.
+
+    :param network_compatibility: The dictionary representation of a game mode network compatibility ConfigGroup.
+    :param counts: The node counts of a network as returned by :func:`network_counts`.
+    :param include_unbounded: Whether to include fields where part of the range is unbounded.
+
+    :return: A boolean representing if the game mode is suited to the network.
+    """
+    if not isinstance(network_compatibility, dict) or not all(
+        k in network_compatibility for k in _COMPATIBILITY_FIELDS
+    ):
+        return False
+    return all(
+        check_element(e, counts.get(k), include_unbounded)
+        for k, e in network_compatibility.items()
+    )
+
+
 class EntryNodeCompatibilityQuery(Query):
     """
     The :class:`~yawning_titan.db.query.YawningTitanQuery` class extends :class:`tinydb.queries.Query`.
@@ -181,33 +230,21 @@ class NetworkCompatibilityQuery(Query):
         >>> db = GameModeDB()
         >>> db.search(NetworkCompatibilityQuery.compatible_with(network)))
 
-        :param n: The target value of a field as an instance of :class: `~yawning_titan.networks.network.Network`.
+        :param n: The target value of a field as an instance of :class: `~yawning_titan.networks.network.Network`,
+            or the :class:`~yawning_titan.db.doc_summary.DocSummary` of one.
         :param include_unbounded: Whether to include fields where part of the range is unbounded.
         :return: ``True`` if it does exist, otherwise ``False``.
         """
-
-        def test_compatible_with(val: dict, n: Network, include_unbounded):
-            if (
-                not isinstance(val, dict)
-                or not isinstance(n, Network)
-                or not all(
-                    k in val
-                    for k in ["entry_node_count", "high_value_node_count", "node_count"]
-                )
-            ):
+        # the network is counted once rather than for every doc
+        counts = (
+            tuple(network_counts(n).items())
+            if isinstance(n, (Network, DocSummary))
+            else None
+        )
+
+        def test_compatible_with(val: dict, counts, include_unbounded):
+            if counts is None:
                 return False
-            mapper = {
-                "entry_node_count": len(n.entry_nodes)
-                if n.entry_nodes
-                else n.num_of_random_entry_nodes,
-                "high_value_node_count": len(n.high_value_nodes)
-                if n.high_value_nodes
-                else n.num_of_random_high_value_nodes,
-                "node_count": len(n.nodes),
-            }
-            results = [
-                check_element(e, mapper[k], include_unbounded) for k, e in val.items()
-            ]
-            return all(results)
-
-        return self.test(test_compatible_with, n, include_unbounded)
+            return check_compatibility(val, dict(counts), include_unbounded)
+
+        return self.test(test_compatible_with, counts, include_unbounded)
@@ -80,7 +80,7 @@ class DocMetadata:
     @property
     def updated_at(self) -> Union[str, None]:
         """The datetime the document was last updated at as an ISO 8601 str."""
-        return self._created_at
+        return self._updated_at
 
     @property
     def name(self) -> Union[str, None]:
@@ -0,0 +1,125 @@
+"""
+Lightweight summaries of db docs.
+
+Each network and game mode doc stores a ``_summary`` field, computed when
+the doc is written, that holds the values needed to list and filter docs
+without building a :class:`~yawning_titan.networks.network.Network` or
+:class:`~yawning_titan.game_modes.game_mode.GameMode`.
+
+.. versionadded:: 2.0.2
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Final, Mapping, Optional
+
+__all__ = ["SUMMARY_FIELD", "SUMMARY_VERSION", "DocSummary", "count_nodes"]
+
+SUMMARY_FIELD: Final[str] = "_summary"
+"""The doc field the summary is stored in."""
+
+SUMMARY_VERSION: Final[int] = 2
+"""The version of the summary fields. Docs with an older summary are summarised again when listed."""
+
+
+def count_nodes(nodes: Mapping) -> dict:
+    """
+    Count the nodes, entry nodes and high value nodes of a network doc.
+
+    :param nodes: The ``nodes`` field of a network doc.
+    :return: A summary with ``node_count``, ``entry_node_count`` and
+        ``high_value_node_count``.
+    """
+    entry_node_count = high_value_node_count = 0
+    for node in nodes.values():
+        if isinstance(node, Mapping):
+            entry_node_count += bool(node.get("entry_node"))
+            high_value_node_count += bool(node.get("high_value_node"))
+    return {
+        "node_count": len(nodes),
+        "entry_node_count": entry_node_count,
+        "high_value_node_count": high_value_node_count,
+    }
+
+
+@dataclass(frozen=True)
+class DocSummary:
+    """
+    The metadata and summary of a db doc.
+
+    Has the same attributes as :class:`~yawning_titan.db.doc_metadata.DocMetadata`
+    so it can be used in its place when listing docs.
+    """
+
+    uuid: str
+    name: Optional[str] = None
+    description: Optional[str] = None
+    author: Optional[str] = None
+    locked: bool = False
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    node_count: Optional[int] = None
+    """The number of nodes in a network."""
+    entry_node_count: Optional[int] = None
+    """The number of entry nodes in a network."""
+    high_value_node_count: Optional[int] = None
+    """The number of high value nodes in a network."""
+    num_of_random_entry_nodes: Optional[int] = None
+    """The number of entry nodes a network chooses at random."""
+    num_of_random_high_value_nodes: Optional[int] = None
+    """The number of high value nodes a network chooses at random."""
+    valid: Optional[bool] = None
+    """Whether a game mode passes validation."""
+    network_compatibility: Optional[dict] = None
+    """The node count ranges of the networks a game mode can be used with."""
+
+    @classmethod
+    def from_doc(cls, doc: Mapping) -> DocSummary:
+        """
+        Create a summary from the ``_doc_metadata`` and ``_summary`` fields of a doc.
+
+        :param doc: A doc, which only needs its ``_doc_metadata`` and
+            ``_summary`` fields.
+        :return: The instance of DocSummary.
+        """
+        metadata = doc.get("_doc_metadata") or {}
+        summary = doc.get(SUMMARY_FIELD) or {}
+        return cls(
+            uuid=metadata.get("uuid"),
+            name=metadata.get("name"),
+            description=metadata.get("description"),
+            author=metadata.get("author"),
+            locked=bool(metadata.get("locked")),
+            created_at=metadata.get("created_at"),
+            updated_at=metadata.get("updated_at"),
+            node_count=summary.get("node_count"),
+            entry_node_count=summary.get("entry_node_count"),
+            high_value_node_count=summary.get("high_value_node_count"),
+            num_of_random_entry_nodes=summary.get("num_of_random_entry_nodes"),
+            num_of_random_high_value_nodes=summary.get(
+                "num_of_random_high_value_nodes"
+            ),
+            valid=summary.get("valid"),
+            network_compatibility=summary.get("network_compatibility"),
+        )
+
+    def compatibility_counts(self) -> dict:
+        """
+        The node counts of a network that game mode network compatibility is checked against.
+
+        Networks without entry or high value nodes are counted by the number
+        they choose at random.
+
+        :return: A dict of ``node_count``, ``entry_node_count`` and ``high_value_node_count``.
+        """
+        return {
+            "node_count": self.node_count,
+            "entry_node_count": self.entry_node_count
+            or self.num_of_random_entry_nodes,
+            "high_value_node_count": self.high_value_node_count
+            or self.num_of_random_high_value_nodes,
+        }
+
+    def to_dict(self) -> dict:
+        """The DocSummary as a dict."""
+        return asdict(self)
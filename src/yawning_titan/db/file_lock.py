@@ -0,0 +1,174 @@
+"""
+Advisory file locks that let several processes share a db file.
+
+A :class:`FileLock` wraps a ``.lock`` file next to a db file. Writers hold an
+exclusive lock and readers a shared lock using :func:`fcntl.flock`. Every
+exclusive lock also increments a version number stored in the ``.lock`` file,
+so that readers can tell that the db file has changed even when its
+modification time and size have not.
+
+On platforms without :mod:`fcntl` the locks are no-ops, but the version is
+still kept. When the ``.lock`` file cannot be created or opened for writing,
+such as when the db directory is read-only, the locks are no-ops and the
+version is not kept.
+
+.. versionadded:: 2.0.2
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, Final, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+__all__ = ["FileLock", "file_lock"]
+
+_LOGGER = getLogger(__name__)
+
+_VERSION: Final[struct.Struct] = struct.Struct("<Q")
+
+
+class FileLock:
+    """
+    A reentrant advisory lock on a file, shared by the threads of a process.
+
+    Use :func:`file_lock` to get the lock of a path so that every user of the
+    path in a process shares one lock, as :func:`fcntl.flock` locks held by
+    separate file descriptors of the same process block each other.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        The FileLock constructor.
+
+        :param path: The path of the lock file. It is created when first locked.
+        """
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._pid = os.getpid()
+        self._depth = 0
+        self._exclusive = False
+        self._unavailable = False
+
+    def _open(self):
+        """Open the lock file, or mark the lock unavailable if it cannot be opened for writing."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            self._unavailable = True
+            _LOGGER.warning(
+                f"Cannot open the lock file {self.path}, so it is not locked: {e}"
+            )
+
+    def _acquire(self, exclusive: bool):
+        if self._pid != os.getpid():
+            # a forked child shares the parent's open lock file, and so its
+            # flock locks, so it must open its own
+            if self._fd is not None:
+                os.close(self._fd)
+            self._thread_lock = threading.RLock()
+            self._fd = None
+            self._pid = os.getpid()
+            self._depth = 0
+            self._exclusive = False
+            self._unavailable = False
+        self._thread_lock.acquire()
+        try:
+            if self._fd is None and not self._unavailable:
+                self._open()
+            if self._fd is not None:
+                if fcntl is not None and (
+                    self._depth == 0 or (exclusive and not self._exclusive)
+                ):
+                    fcntl.flock(
+                        self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+                    )
+                if exclusive and not self._exclusive:
+                    self._write_version(self._read_version() + 1)
+            if exclusive:
+                self._exclusive = True
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+
+    def _release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._exclusive = False
+        self._thread_lock.release()
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the lock exclusively, for writing, and increment the version."""
+        self._acquire(True)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def shared(self):
+        """Hold the lock shared with other readers. A no-op if the lock is already held."""
+        self._acquire(False)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _read_version(self) -> int:
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, _VERSION.size)
+        return _VERSION.unpack(data)[0] if len(data) == _VERSION.size else 0
+
+    def _write_version(self, version: int):
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, _VERSION.pack(version))
+
+    @property
+    def version(self) -> int:
+        """The number of times the lock has been held exclusively, 0 if the lock file does not exist."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read(_VERSION.size)
+        except OSError:
+            return 0
+        return _VERSION.unpack(data)[0] if len(data) == _VERSION.size else 0
+
+    def close(self):
+        """Close the lock file. The lock must not be held."""
+        with self._thread_lock:
+            if self._fd is not None and self._depth == 0:
+                os.close(self._fd)
+                self._fd = None
+
+
+_LOCKS: Dict[str, FileLock] = {}
+_LOCKS_LOCK = threading.Lock()
+
+
+def file_lock(path: Union[str, Path]) -> FileLock:
+    """
+    Get the process-level :class:`FileLock` of a lock file.
+
+    :param path: The path of the lock file.
+    :return: The shared instance of :class:`FileLock` for the path.
+    """
+    key = os.path.abspath(path)
+    with _LOCKS_LOCK:
+        lock = _LOCKS.get(key)
+        if lock is None:
+            lock = _LOCKS[key] = FileLock(key)
+        return lock
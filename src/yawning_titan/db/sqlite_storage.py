@@ -0,0 +1,468 @@
+"""
+A SQLite storage backend for :class:`~yawning_titan.db.yawning_titan_db.YawningTitanDB`.
+
+:class:`SQLiteTable` implements the parts of the :class:`tinydb.table.Table`
+API used by Yawning-Titan using only the stdlib :mod:`sqlite3` module.
+
+Each doc is stored as a JSON body alongside indexed metadata columns (uuid,
+name, author, locked and node counts) and a JSON copy of its metadata and
+summary that can be listed without decoding the body. Writes only touch the
+changed rows and are transactional, rather than rewriting the whole file as
+TinyDB does.
+
+Queries are :class:`~yawning_titan.db.query.YawningTitanQuery` instances and
+are evaluated against the decoded docs exactly as they are by TinyDB.
+Equality conditions on indexed metadata fields are first used to narrow the
+docs that are decoded.
+
+.. versionadded:: 2.0.2
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, List, Mapping, Optional, Tuple, Union
+
+from tinydb import TinyDB
+from tinydb.queries import QueryInstance
+from tinydb.table import Document
+
+from yawning_titan.db.doc_summary import SUMMARY_FIELD, count_nodes
+from yawning_titan.exceptions import YawningTitanDBError
+
+__all__ = ["SQLiteTable", "migrate_json_db"]
+
+_LOGGER = getLogger(__name__)
+
+_SCHEMA: Final[
+    str
+] = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid TEXT,
+    name TEXT,
+    author TEXT,
+    locked INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    node_count INTEGER,
+    entry_node_count INTEGER,
+    high_value_node_count INTEGER,
+    body TEXT NOT NULL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_uuid ON docs (uuid);
+CREATE INDEX IF NOT EXISTS docs_name ON docs (name);
+CREATE INDEX IF NOT EXISTS docs_author ON docs (author);
+CREATE INDEX IF NOT EXISTS docs_locked ON docs (locked);
+CREATE INDEX IF NOT EXISTS docs_node_count ON docs (node_count);
+"""
+
+_METADATA_COLUMNS: Final[Dict[Tuple[str, ...], str]] = {
+    ("_doc_metadata", "uuid"): "uuid",
+    ("_doc_metadata", "name"): "name",
+    ("_doc_metadata", "author"): "author",
+    ("_doc_metadata", "locked"): "locked",
+}
+"""The doc paths of the indexed metadata columns that equality queries are narrowed by."""
+
+_COLUMNS: Final[List[str]] = [
+    "uuid",
+    "name",
+    "author",
+    "locked",
+    "created_at",
+    "updated_at",
+    "node_count",
+    "entry_node_count",
+    "high_value_node_count",
+    "body",
+    "summary",
+]
+
+
+def _columns(doc: Mapping) -> Tuple[Any, ...]:
+    """
+    Get the column values of a doc.
+
+    :param doc: A doc.
+    :return: The values of ``_COLUMNS``.
+    """
+    metadata = doc.get("_doc_metadata")
+    if not isinstance(metadata, Mapping):
+        metadata = {}
+    summary = doc.get(SUMMARY_FIELD)
+    if not isinstance(summary, Mapping):
+        nodes = doc.get("nodes")
+        summary = count_nodes(nodes) if isinstance(nodes, Mapping) else {}
+    locked = metadata.get("locked")
+    listing = {"_doc_metadata": dict(metadata)}
+    if SUMMARY_FIELD in doc:
+        listing[SUMMARY_FIELD] = doc[SUMMARY_FIELD]
+    return (
+        metadata.get("uuid"),
+        metadata.get("name"),
+        metadata.get("author"),
+        None if locked is None else int(bool(locked)),
+        metadata.get("created_at"),
+        metadata.get("updated_at"),
+        summary.get("node_count"),
+        summary.get("entry_node_count"),
+        summary.get("high_value_node_count"),
+        json.dumps(doc),
+        json.dumps(listing),
+    )
+
+
+def _narrow(query_hash: tuple) -> Tuple[List[str], List[Any], bool]:
+    """
+    Translate the indexed equality conditions of a query into SQL.
+
+    :param query_hash: The ``_hash`` of a :class:`tinydb.queries.QueryInstance`.
+    :return: A tuple of the SQL conditions, their parameters and whether the
+        conditions are equivalent to the whole query.
+    """
+    if not isinstance(query_hash, tuple) or not query_hash:
+        return [], [], False
+    if query_hash[0] == "==" and len(query_hash) == 3:
+        _, path, value = query_hash
+        column = _METADATA_COLUMNS.get(path)
+        if column == "locked" and isinstance(value, bool):
+            return [f"{column} = ?"], [int(value)], True
+        if column and column != "locked" and isinstance(value, str):
+            return [f"{column} = ?"], [value], True
+        return [], [], False
+    if query_hash[0] == "and" and len(query_hash) == 2:
+        conditions, params, exact = [], [], True
+        for part in query_hash[1]:
+            part_conditions, part_params, part_exact = _narrow(part)
+            conditions += part_conditions
+            params += part_params
+            exact = exact and part_exact
+        return conditions, params, exact
+    return [], [], False
+
+
+class SQLiteTable:
+    """
+    A SQLite file that can be used in place of a :class:`tinydb.TinyDB`.
+
+    Only the methods used by Yawning-Titan are implemented. They follow the
+    :class:`tinydb.table.Table` method of the same name.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        The SQLiteTable constructor.
+
+        :param path: The path of the SQLite file. It is created if it does not exist.
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self._path), isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(docs)")]
+        if "summary" not in columns:
+            # files created before the summary column was added
+            with self.transaction() as conn:
+                conn.execute("ALTER TABLE docs ADD COLUMN summary TEXT")
+            self.update({})
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the block in a single write transaction, rolling it back on error.
+
+        Writes made inside an enclosing transaction join it, so several
+        writes can be committed together.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _select(
+        self,
+        cond: Optional[QueryInstance] = None,
+        doc_ids: Optional[List[int]] = None,
+    ) -> List[Document]:
+        """
+        Get the docs that match a query or doc ids.
+
+        :param cond: An optional query.
+        :param doc_ids: An optional list of doc ids.
+        :return: The matching docs in insertion order.
+        """
+        conditions, params, exact = [], [], True
+        if cond is not None:
+            conditions, params, exact = _narrow(getattr(cond, "_hash", None))
+        if doc_ids is not None:
+            doc_ids = list(doc_ids)
+            conditions.append(f"doc_id IN ({', '.join('?' * len(doc_ids))})")
+            params += doc_ids
+        sql = "SELECT doc_id, body FROM docs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY doc_id"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        docs = [Document(json.loads(body), doc_id) for doc_id, body in rows]
+        if cond is not None and not exact:
+            docs = [doc for doc in docs if cond(doc)]
+        return docs
+
+    def all(self) -> List[Document]:
+        """Get all docs."""
+        return self._select()
+
+    def search(self, cond: QueryInstance) -> List[Document]:
+        """
+        Get all docs that match a query.
+
+        :param cond: The query.
+        :return: The matching docs.
+        """
+        return self._select(cond)
+
+    def get(
+        self,
+        cond: Optional[QueryInstance] = None,
+        doc_id: Optional[int] = None,
+        doc_ids: Optional[List[int]] = None,
+    ) -> Union[Document, List[Document], None]:
+        """
+        Get the first doc that matches a query or doc id, or all docs with the given doc ids.
+
+        :param cond: An optional query.
+        :param doc_id: An optional doc id.
+        :param doc_ids: An optional list of doc ids.
+        :return: The doc, or ``None`` if there is no match. If ``doc_ids`` is
+            given, the list of docs that exist.
+        """
+        if doc_ids is not None:
+            return self._select(cond, doc_ids)
+        docs = self._select(cond, None if doc_id is None else [doc_id])
+        return docs[0] if docs else None
+
+    def summaries(self) -> List[Document]:
+        """
+        Get the ``_doc_metadata`` and ``_summary`` fields of every doc without decoding the doc bodies.
+
+        :return: The docs with only those fields, in insertion order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id, summary FROM docs ORDER BY doc_id"
+            ).fetchall()
+        return [Document(json.loads(listing), doc_id) for doc_id, listing in rows]
+
+    def doc_ids_by_uuid(self, uuid: str) -> List[int]:
+        """
+        Get the doc ids of the docs with a uuid using the uuid index.
+
+        :param uuid: A uuid.
+        :return: The doc ids in insertion order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id FROM docs WHERE uuid = ? ORDER BY doc_id", (uuid,)
+            ).fetchall()
+        return [doc_id for doc_id, in rows]
+
+    def contains(self, cond: QueryInstance) -> bool:
+        """
+        Check whether any doc matches a query.
+
+        :param cond: The query.
+        :return: ``True`` if a doc matches, otherwise ``False``.
+        """
+        return bool(self._select(cond))
+
+    def count(self, cond: Optional[QueryInstance] = None) -> int:
+        """
+        Count the docs that match a query.
+
+        :param cond: An optional query. If ``None`` all docs are counted.
+        :return: The number of matching docs.
+        """
+        conditions, params, exact = [], [], True
+        if cond is not None:
+            conditions, params, exact = _narrow(getattr(cond, "_hash", None))
+        if not exact:
+            return len(self._select(cond))
+        sql = "SELECT COUNT(*) FROM docs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def insert(self, doc: Mapping) -> int:
+        """
+        Insert a doc.
+
+        :param doc: The doc.
+        :return: The doc id of the inserted doc.
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                f"INSERT INTO docs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                _columns(doc),
+            )
+        return cursor.lastrowid
+
+    def insert_multiple(self, docs: List[Mapping]) -> List[int]:
+        """
+        Insert docs in a single transaction.
+
+        :param docs: The docs.
+        :return: The doc ids of the inserted docs.
+        """
+        doc_ids = []
+        with self.transaction() as conn:
+            for doc in docs:
+                cursor = conn.execute(
+                    f"INSERT INTO docs ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    _columns(doc),
+                )
+                doc_ids.append(cursor.lastrowid)
+        return doc_ids
+
+    def update(
+        self,
+        fields: Union[Mapping, Callable[[Dict], None]],
+        cond: Optional[QueryInstance] = None,
+        doc_ids: Optional[List[int]] = None,
+    ) -> List[int]:
+        """
+        Update the docs that match a query or doc ids.
+
+        :param fields: The fields to set, or a callable that modifies a doc in
+            place, such as :func:`tinydb.operations.delete`.
+        :param cond: An optional query.
+        :param doc_ids: An optional list of doc ids. If neither ``cond`` nor
+            ``doc_ids`` are given every doc is updated.
+        :return: The doc ids of the updated docs.
+        """
+        assignments = ", ".join(f"{column} = ?" for column in _COLUMNS)
+        with self.transaction() as conn:
+            docs = self._select(cond, doc_ids)
+            for doc in docs:
+                if callable(fields):
+                    fields(doc)
+                else:
+                    doc.update(fields)
+                conn.execute(
+                    f"UPDATE docs SET {assignments} WHERE doc_id = ?",
+                    _columns(doc) + (doc.doc_id,),
+                )
+        return [doc.doc_id for doc in docs]
+
+    def upsert(self, doc: Mapping, cond: QueryInstance) -> List[int]:
+        """
+        Update the docs that match a query, or insert the doc if none match.
+
+        :param doc: The doc.
+        :param cond: The query.
+        :return: The doc ids of the updated or inserted docs.
+        """
+        with self._lock:
+            updated = self.update(doc, cond)
+            if updated:
+                return updated
+            return [self.insert(doc)]
+
+    def remove(
+        self,
+        cond: Optional[QueryInstance] = None,
+        doc_ids: Optional[List[int]] = None,
+    ) -> List[int]:
+        """
+        Remove the docs that match a query or doc ids.
+
+        :param cond: An optional query.
+        :param doc_ids: An optional list of doc ids.
+        :return: The doc ids of the removed docs.
+        """
+        with self.transaction() as conn:
+            removed = [doc.doc_id for doc in self._select(cond, doc_ids)]
+            conn.executemany(
+                "DELETE FROM docs WHERE doc_id = ?", [(i,) for i in removed]
+            )
+        return removed
+
+    def truncate(self):
+        """Remove all docs."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM docs")
+
+    def clear_cache(self):
+        """Kept for compatibility with :class:`tinydb.TinyDB`, SQLite queries are not cached."""
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        return self.count()
+
+
+def migrate_json_db(
+    json_path: Union[str, Path], sqlite_path: Optional[Union[str, Path]] = None
+) -> Path:
+    """
+    Copy every doc in a TinyDB ``.json`` db file into a new SQLite db file.
+
+    The ``.json`` file is left unchanged.
+
+    :param json_path: The path of the TinyDB ``.json`` file.
+    :param sqlite_path: The path of the SQLite file. Defaults to the
+        ``.json`` path with a ``.sqlite`` suffix.
+    :return: The path of the SQLite file.
+    :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+        SQLite file already exists.
+    """
+    json_path = Path(json_path)
+    sqlite_path = (
+        Path(sqlite_path) if sqlite_path else json_path.with_suffix(".sqlite")
+    )
+    if sqlite_path.exists():
+        msg = f"Cannot migrate {json_path} to {sqlite_path} as it already exists."
+        try:
+            raise YawningTitanDBError(msg)
+        except YawningTitanDBError as e:
+            _LOGGER.error(msg)
+            raise e
+    json_db = TinyDB(json_path)
+    docs = json_db.all()
+    json_db.close()
+
+    table = SQLiteTable(sqlite_path)
+    try:
+        with table.transaction() as conn:
+            conn.executemany(
+                f"INSERT INTO docs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [_columns(doc) for doc in docs],
+            )
+    finally:
+        table.close()
+    _LOGGER.info(f"Migrated {len(docs)} docs from {json_path} to {sqlite_path}.")
+    return sqlite_path
@@ -4,28 +4,46 @@ Provides an extended implementation of a TinyDB class as an ABC.
 Makes use of uuid and locked values to ensure duplicates are not possible, and
 locked files (system defaults) cannot be updated or removed.
 
+Docs are stored with TinyDB in a ``.json`` file, or with the
+:class:`~yawning_titan.db.sqlite_storage.SQLiteTable` backend in a ``.sqlite``
+file.
+
+Several processes can share a ``.json`` db file. Writes hold an exclusive
+:class:`~yawning_titan.db.file_lock.FileLock` on a ``.json.lock`` file next to
+it, and reads are served from a snapshot of the docs that is only re-read,
+under a shared lock, once the db file changes.
+
 .. versionadded:: 1.1.0
 """
 from __future__ import annotations
 
-import os.path
+import json
+import os
 from abc import ABC
+from contextlib import contextmanager
 from datetime import datetime
 from logging import getLogger
 from pathlib import Path
-from typing import Final, List, Mapping, Optional, Union
+from typing import Callable, Dict, Final, List, Mapping, Optional, Tuple, Union
 
 from tabulate import tabulate
-from tinydb import TinyDB
+from tinydb import JSONStorage, TinyDB
+from tinydb.middlewares import CachingMiddleware
 from tinydb.queries import QueryInstance
 from tinydb.table import Document
 
 from yawning_titan import DB_DIR
-from yawning_titan.db.doc_metadata import DocMetadata, DocMetadataSchema
+from yawning_titan.db.doc_metadata import DocMetadata
+from yawning_titan.db.doc_summary import SUMMARY_FIELD, SUMMARY_VERSION
+from yawning_titan.db.file_lock import FileLock, file_lock
+from yawning_titan.db.sqlite_storage import SQLiteTable, migrate_json_db
 from yawning_titan.exceptions import YawningTitanDBCriticalError, YawningTitanDBError
 
 _LOGGER = getLogger(__name__)
 
+DB_BACKENDS: Final[Tuple[str, ...]] = ("tinydb", "sqlite")
+"""The available storage backends. ``tinydb`` stores docs in a ``.json`` file and ``sqlite`` in a ``.sqlite`` file."""
+
 
 class YawningTitanDBSchema(ABC):
     """YawningTitanDBSchema ABC that is implemented by all schema classes."""
@@ -36,19 +54,57 @@ class YawningTitanDBSchema(ABC):
 class YawningTitanDB:
     """An :py:class:`~abc.ABC` that implements and extends the :class:`~tinydb.database.TinyDB` query functions."""
 
-    def __init__(self, name: str, root: Optional[Path] = None):
+    _uuid_index: Optional[Dict[str, List[int]]] = None
+    _index_token: Optional[Tuple[int, int, int]] = None
+    _snapshot_docs: Optional[Dict[int, str]] = None
+    _snapshot_token: Optional[Tuple[int, int, int]] = None
+    _buffered: bool = False
+
+    def __init__(
+        self, name: str, root: Optional[Path] = None, backend: Optional[str] = None
+    ):
+        """
+        The YawningTitanDB constructor.
+
+        :param name: The db name, used as the db file name.
+        :param root: The directory of the db file. Defaults to ``yawning_titan.DB_DIR``.
+        :param backend: One of ``DB_BACKENDS``. If ``None``, ``sqlite`` is used
+            if a ``.sqlite`` db file exists, otherwise ``tinydb``. When
+            ``sqlite`` is used and only a ``.json`` db file exists, its docs are
+            migrated into a new ``.sqlite`` file.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            backend is unknown.
+        """
         self._name: Final[str] = name
-        if root is not None:
-            self._path = root / f"{self._name}.json"
+        root = root if root is not None else DB_DIR
+        json_path = root / f"{self._name}.json"
+        sqlite_path = root / f"{self._name}.sqlite"
+        if backend is None:
+            backend = "sqlite" if sqlite_path.is_file() else "tinydb"
+        if backend not in DB_BACKENDS:
+            msg = f"Unknown db backend '{backend}', expected one of {DB_BACKENDS}."
+            try:
+                raise YawningTitanDBError(msg)
+            except YawningTitanDBError as e:
+                _LOGGER.error(msg)
+                raise e
+        self._backend: Final[str] = backend
+
+        if backend == "sqlite":
+            self._path = sqlite_path
+            if not self._db_file_exist() and json_path.is_file():
+                migrate_json_db(json_path, sqlite_path)
+            elif not self._db_file_exist():
+                _LOGGER.info(f"New SQLite .sqlite file created: {self._path}")
+            self._db = SQLiteTable(self._path)
         else:
-            self._path = DB_DIR / f"{self._name}.json"
-
-        if not self._db_file_exist():
-            _LOGGER.info(f"New TinyDB .json file created: {self._path}")
-        self._db = TinyDB(self._path)
+            self._path = json_path
+            if not self._db_file_exist():
+                _LOGGER.info(f"New TinyDB .json file created: {self._path}")
+            self._db = TinyDB(self._path)
 
-    def __enter__(self, name: str):
-        return YawningTitanDB(name)
+    def __enter__(self) -> YawningTitanDB:
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
@@ -57,9 +113,149 @@ class YawningTitanDB:
         """Close the db."""
         self.db.close()
 
+    @property
+    def _file_lock(self) -> FileLock:
+        """The :class:`~yawning_titan.db.file_lock.FileLock` of the db file."""
+        return file_lock(f"{self._path}.lock")
+
+    def _file_token(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Get the modification time, size and lock version of the db file.
+
+        :return: A tuple of the modification time in ns, the size and the
+            :class:`~yawning_titan.db.file_lock.FileLock` version, or ``None``
+            if the file does not exist.
+        """
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, self._file_lock.version
+
+    def _index(self, docs: List[Document], token: Optional[Tuple[int, int, int]]):
+        """
+        Build the uuid to doc id index.
+
+        :param docs: Every doc in the db.
+        :param token: The :func:`_file_token` of the db file the docs were read from.
+        """
+        index = {}
+        for doc in docs:
+            metadata = doc.get("_doc_metadata")
+            if isinstance(metadata, Mapping):
+                index.setdefault(metadata.get("uuid"), []).append(doc.doc_id)
+        self._uuid_index = index
+        self._index_token = token
+
+    def _snapshot(self) -> Dict[int, str]:
+        """
+        Get the JSON text of every doc in the ``.json`` db file.
+
+        TinyDB parses the whole db file on every read. The snapshot is only
+        re-read, under a shared lock, once the db file has changed, and
+        readers then only parse the docs they need.
+
+        :return: A dict of doc id to the doc as JSON text.
+        """
+        token = self._file_token()
+        if self._snapshot_docs is None or self._snapshot_token != token:
+            with self._file_lock.shared():
+                token = self._file_token()
+                docs = self.db.all()
+            self._snapshot_docs = {doc.doc_id: json.dumps(doc) for doc in docs}
+            self._snapshot_token = token
+            self._index(docs, token)
+        return self._snapshot_docs
+
+    def _read_docs(self, doc_ids: Optional[List[int]] = None) -> List[Document]:
+        """
+        Read docs from the db.
+
+        :param doc_ids: An optional list of doc ids. If ``None``, every doc is read.
+        :return: The docs that exist, in insertion order.
+        """
+        if isinstance(self.db, SQLiteTable):
+            return self.db.all() if doc_ids is None else self.db.get(doc_ids=doc_ids)
+        if self._buffered:
+            docs = self.db.all()
+            if doc_ids is not None:
+                wanted = set(doc_ids)
+                docs = [doc for doc in docs if doc.doc_id in wanted]
+            return docs
+        snapshot = self._snapshot()
+        if doc_ids is None:
+            doc_ids = snapshot
+        else:
+            doc_ids = sorted(doc_id for doc_id in set(doc_ids) if doc_id in snapshot)
+        return [Document(json.loads(snapshot[doc_id]), doc_id) for doc_id in doc_ids]
+
+    def _doc_ids(self, uuid: str) -> List[int]:
+        """
+        Get the doc ids of the docs with a uuid.
+
+        The ``sqlite`` backend uses its uuid index. For the ``tinydb`` backend
+        a uuid to doc id index is built with the db snapshot, kept up to date by
+        the writes made through this instance and rebuilt if the db file is
+        changed by anything else.
+
+        :param uuid: A uuid.
+        :return: The doc ids. There should be at most one.
+        """
+        if isinstance(self.db, SQLiteTable):
+            return self.db.doc_ids_by_uuid(uuid)
+        token = self._file_token()
+        if self._uuid_index is None or self._index_token != token:
+            if self._buffered:
+                self._index(self.db.all(), token)
+            else:
+                self._snapshot()
+        return list(self._uuid_index.get(uuid, []))
+
+    def _reindex(self, doc_id: int, old_uuid: Optional[str], new_uuid: Optional[str]):
+        """
+        Update the uuid to doc id index after a write made through this instance.
+
+        :param doc_id: The doc id of the written doc.
+        :param old_uuid: The uuid of the doc before the write, or ``None`` if it was inserted.
+        :param new_uuid: The uuid of the doc after the write, or ``None`` if it was removed.
+        """
+        if isinstance(self.db, SQLiteTable) or self._uuid_index is None:
+            return
+        if old_uuid is not None:
+            doc_ids = self._uuid_index.get(old_uuid, [])
+            if doc_id in doc_ids:
+                doc_ids.remove(doc_id)
+            if not doc_ids:
+                self._uuid_index.pop(old_uuid, None)
+        if new_uuid is not None:
+            self._uuid_index.setdefault(new_uuid, []).append(doc_id)
+        self._index_token = self._file_token()
+
+    def _get_doc_id(self, uuid: str) -> Optional[int]:
+        """
+        Get the doc id of the doc with a uuid.
+
+        :param uuid: A uuid.
+        :return: The doc id if the uuid exists, otherwise ``None``.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
+            when multiple docs have the uuid.
+        """
+        doc_ids = self._doc_ids(uuid)
+        if len(doc_ids) > 1:
+            msg = (
+                f"Get from the {self._name} db with uuid='{uuid}' aborted as multiple docs with the uuid "
+                f"exist. The '{self._path}' db file is corrupted."
+            )
+            try:
+                raise YawningTitanDBCriticalError(msg)
+            except YawningTitanDBCriticalError as e:
+                _LOGGER.critical(msg, exc_info=True)
+                raise e
+        return doc_ids[0] if doc_ids else None
+
     def _db_file_exist(self) -> bool:
         """
-        Check whether the :class:`~tinydb.database.TinyDB` .json file exists.
+        Check whether the db file exists.
 
         :return: ``True`` if it does exist, otherwise ``False``.
         """
@@ -120,8 +316,13 @@ class YawningTitanDB:
         return self._name
 
     @property
-    def db(self) -> TinyDB:
-        """The instance of :class:`~tinydb.database.TinyDB`."""
+    def backend(self) -> str:
+        """The storage backend, one of ``DB_BACKENDS``."""
+        return getattr(self, "_backend", "tinydb")
+
+    @property
+    def db(self) -> Union[TinyDB, SQLiteTable]:
+        """The instance of :class:`~tinydb.database.TinyDB`, or :class:`~yawning_titan.db.sqlite_storage.SQLiteTable` when the ``sqlite`` backend is used."""
         return self._db
 
     def count(self, cond: Optional[QueryInstance] = None) -> int:
@@ -135,13 +336,70 @@ class YawningTitanDB:
             Has a default value of ``None``.
         :return: The number of docs counted.
         """
+        if isinstance(self.db, SQLiteTable) or self._buffered:
+            if cond:
+                return self.db.count(cond)
+            return len(self.db)
         if cond:
-            return self.db.count(cond)
-        return len(self.db.all())
+            return len(self.search(cond))
+        return len(self._snapshot())
 
     def all(self) -> List[Document]:
         """A wrapper for :func:`tinydb.table.Table.all`."""
-        return self.db.all()
+        return self._read_docs()
+
+    def summaries(
+        self, summarise: Optional[Callable[[Document], dict]] = None
+    ) -> List[Document]:
+        """
+        Get the ``_doc_metadata`` and ``_summary`` fields of every doc.
+
+        The ``sqlite`` backend reads them without decoding the doc bodies.
+
+        :param summarise: An optional callable that summarises a full doc.
+            Docs that were stored without a summary, or with a summary older
+            than ``SUMMARY_VERSION``, are summarised with it, and their
+            summaries are written to the db in a single write.
+        :return: The docs with only those fields, in insertion order.
+        """
+        if isinstance(self.db, SQLiteTable):
+            docs = self.db.summaries()
+        else:
+            docs = self._read_docs()
+        missing = [
+            doc.doc_id
+            for doc in docs
+            if (doc.get(SUMMARY_FIELD) or {}).get("version") != SUMMARY_VERSION
+        ]
+        if summarise is not None and missing:
+            full_docs = (
+                self._get_docs(missing)
+                if isinstance(self.db, SQLiteTable)
+                else {doc.doc_id: doc for doc in docs}
+            )
+            new_summaries = {
+                full_docs[doc_id]["_doc_metadata"]["uuid"]: summarise(
+                    full_docs[doc_id]
+                )
+                for doc_id in missing
+            }
+
+            def _set_summary(stored: dict):
+                stored[SUMMARY_FIELD] = new_summaries[stored["_doc_metadata"]["uuid"]]
+
+            with self._write_batch():
+                self.db.update(_set_summary, doc_ids=missing)
+                self._index_token = self._file_token()
+            for doc in docs:
+                if doc.doc_id in missing:
+                    doc[SUMMARY_FIELD] = new_summaries[doc["_doc_metadata"]["uuid"]]
+        return [
+            Document(
+                {k: doc[k] for k in ("_doc_metadata", SUMMARY_FIELD) if k in doc},
+                doc.doc_id,
+            )
+            for doc in docs
+        ]
 
     def show(self, verbose=False):
         """
@@ -175,27 +433,102 @@ class YawningTitanDB:
         :raise: :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
             when the search returns multiple docs with the same uuid.
         """
-        results = self.db.search(DocMetadataSchema.UUID == uuid)
-        self.db.clear_cache()
-        if results:
-            if len(results) == 1:
-                return results[0]
+        doc_id = self._get_doc_id(uuid)
+        if doc_id is not None:
+            return self._get_docs([doc_id]).get(doc_id)
+
+    def get_many(self, uuids: List[str]) -> List[Union[Document, None]]:
+        """
+        Get docs from their uuids with a single read of the db.
+
+        :param uuids: A list of uuids.
+        :return: The matching doc of each uuid, or ``None`` where the uuid does
+            not exist.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
+            when multiple docs have one of the uuids.
+        """
+        doc_ids = [self._get_doc_id(uuid) for uuid in uuids]
+        docs = self._get_docs([doc_id for doc_id in doc_ids if doc_id is not None])
+        return [docs.get(doc_id) for doc_id in doc_ids]
+
+    def _get_docs(self, doc_ids: List[int]) -> Dict[int, Document]:
+        """
+        Get docs from their doc ids with a single read of the db.
+
+        :param doc_ids: A list of doc ids.
+        :return: A dict of doc id to doc for the doc ids that exist.
+        """
+        if not doc_ids:
+            return {}
+        return {doc.doc_id: doc for doc in self._read_docs(doc_ids)}
+
+    @contextmanager
+    def _write_batch(self):
+        """
+        Lock the db for the writes made in the block.
+
+        The ``sqlite`` backend commits the writes together in one transaction.
+        The ``tinydb`` backend holds an exclusive lock on the db file.
+        """
+        if isinstance(self.db, SQLiteTable):
+            with self.db.transaction():
+                yield
+            return
+        with self._file_lock.exclusive():
+            # another process may have inserted docs since the next doc id was cached
+            self.db.table(self.db.default_table_name)._next_id = None
+            yield
+
+    @contextmanager
+    def write_behind(self):
+        """
+        Buffer the writes made in the block and write them to the db together when it exits.
+
+        The ``tinydb`` backend holds an exclusive lock on the db file for the
+        whole block and writes the ``.json`` file once, rather than on every
+        write. The ``sqlite`` backend commits the writes in one transaction.
+        Reads made in the block see the buffered writes. If the block raises,
+        none of its writes are made.
+
+        :Example:
+
+        >>> db = YawningTitanDB("demo")
+        >>> with db.write_behind():
+        ...     for doc in docs:
+        ...         db.upsert(doc, doc["_doc_metadata"]["uuid"])
+        """
+        if isinstance(self.db, SQLiteTable) or self._buffered:
+            with self._write_batch():
+                yield
+            return
+        with self._write_batch():
+            unbuffered_db = self._db
+            buffered_db = TinyDB(self._path, storage=CachingMiddleware(JSONStorage))
+            self._db = buffered_db
+            self._buffered = True
+            try:
+                yield
+            except BaseException:
+                # close the file without flushing the cached writes, so they
+                # are discarded as the sqlite backend rolls them back
+                buffered_db.storage.storage.close()
+                self._uuid_index = None
+                raise
             else:
-                msg = (
-                    f"Get from the {self._name} db with uuid='{uuid}' aborted as multiple docs with the uuid "
-                    f"exist. The '{self._path}' db file is corrupted."
-                )
-                try:
-                    raise YawningTitanDBCriticalError(msg)
-                except YawningTitanDBCriticalError as e:
-                    _LOGGER.critical(msg, exc_info=True)
-                    raise e
+                buffered_db.close()
+                if self._uuid_index is not None:
+                    self._index_token = self._file_token()
+            finally:
+                self._buffered = False
+                self._db = unbuffered_db
 
     def search(self, cond: QueryInstance) -> List[Document]:
         """A wrapper for :func:`tinydb.table.Table.search`."""
-        results = self.db.search(cond)
-        self.db.clear_cache()
-        return results
+        if isinstance(self.db, SQLiteTable) or self._buffered:
+            results = self.db.search(cond)
+            self.db.clear_cache()
+            return results
+        return [doc for doc in self._read_docs() if cond(doc)]
 
     def insert(
         self,
@@ -222,29 +555,155 @@ class YawningTitanDB:
         :raise: :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
             when a doc already exists with the same uuid.
         """
-        if "_doc_metadata" not in doc:
-            doc["_doc_metadata"] = DocMetadata()
-        else:
-            # Check for existing uuid entry
-            uuid = doc["_doc_metadata"]["uuid"]
-            if self.get(uuid):
-                msg = (
-                    f"Failed to insert doc into the {self._name} db with uuid='{uuid}' as one already exists. "
-                    f"The '{self._path}' db file is corrupted."
+        with self._write_batch():
+            if "_doc_metadata" not in doc:
+                doc["_doc_metadata"] = DocMetadata()
+            else:
+                # Check for existing uuid entry
+                uuid = doc["_doc_metadata"]["uuid"]
+                if self._doc_ids(uuid):
+                    msg = (
+                        f"Failed to insert doc into the {self._name} db with uuid='{uuid}' as one already exists. "
+                        f"The '{self._path}' db file is corrupted."
+                    )
+                    try:
+                        raise YawningTitanDBCriticalError(msg)
+                    except YawningTitanDBCriticalError as e:
+                        _LOGGER.critical(msg, exc_info=True)
+                        raise e
+            self._update_doc_metadata(doc, name, description, author)
+            if doc["_doc_metadata"]["locked"]:
+                uuid = doc["_doc_metadata"]["uuid"]
+                _LOGGER.info(
+                    f"Doc inserted into the {self._name} db with uuid='{uuid}' was inserted as locked."
                 )
+            doc_id = self.db.insert(doc)
+            self._reindex(doc_id, None, doc["_doc_metadata"]["uuid"])
+            return self.db.get(doc_id=doc_id)
+
+    def _check_batch_uuids(self, docs: List[Mapping]) -> List[str]:
+        """
+        Give each doc without metadata default metadata and check that no two docs share a uuid.
+
+        :param docs: A list of docs.
+        :return: The uuid of each doc.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
+            when two docs have the same uuid.
+        """
+        uuids = []
+        seen = set()
+        for doc in docs:
+            if "_doc_metadata" not in doc:
+                doc["_doc_metadata"] = DocMetadata().to_dict(include_none=True)
+            uuid = doc["_doc_metadata"]["uuid"]
+            if uuid in seen:
+                msg = f"Failed to write docs to the {self._name} db as more than one has uuid='{uuid}'."
                 try:
                     raise YawningTitanDBCriticalError(msg)
                 except YawningTitanDBCriticalError as e:
                     _LOGGER.critical(msg, exc_info=True)
                     raise e
-        self._update_doc_metadata(doc, name, description, author)
-        if doc["_doc_metadata"]["locked"]:
-            uuid = doc["_doc_metadata"]["uuid"]
-            _LOGGER.info(
-                f"Doc inserted into the {self._name} db with uuid='{uuid}' was inserted as locked."
-            )
-        self.db.insert(doc)
-        return self.get(doc["_doc_metadata"]["uuid"])
+            seen.add(uuid)
+            uuids.append(uuid)
+        return uuids
+
+    def insert_many(self, docs: List[Mapping]) -> List[Document]:
+        """
+        Insert docs with a single write to the db.
+
+        Docs without ``_doc_metadata`` are given the default DocMetadata. The
+        uuids are checked against each other and the db before anything is
+        written.
+
+        :param docs: A list of docs.
+        :return: The inserted docs.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
+            when a doc already exists with the same uuid, or two of the docs
+            have the same uuid.
+        """
+        with self._write_batch():
+            uuids = self._check_batch_uuids(docs)
+            for uuid in uuids:
+                if self._doc_ids(uuid):
+                    msg = f"Failed to insert docs into the {self._name} db as a doc with uuid='{uuid}' already exists."
+                    try:
+                        raise YawningTitanDBCriticalError(msg)
+                    except YawningTitanDBCriticalError as e:
+                        _LOGGER.critical(msg, exc_info=True)
+                        raise e
+            if not docs:
+                return []
+            doc_ids = self.db.insert_multiple(docs)
+            for doc_id, uuid in zip(doc_ids, uuids):
+                self._reindex(doc_id, None, uuid)
+            inserted = self._get_docs(doc_ids)
+            return [inserted[doc_id] for doc_id in doc_ids]
+
+    def upsert_many(self, docs: List[Mapping], reset: bool = False) -> List[Document]:
+        """
+        Insert or replace docs with a single write to the db.
+
+        Unlike :func:`~yawning_titan.db.yawning_titan_db.YawningTitanDB.upsert`,
+        each existing doc is replaced by the new doc rather than updated with
+        its fields. Locked docs are checked before anything is written.
+
+        :param docs: A list of docs.
+        :param reset: If ``True`` the docs are written exactly as given, and
+            locked docs are replaced. Used to reset the default docs.
+        :return: The upserted docs.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if one
+            of the docs to replace is locked.
+            :class:`~yawning_titan.exceptions.YawningTitanDBCriticalError`
+            when two of the docs have the same uuid.
+        """
+        with self._write_batch():
+            uuids = self._check_batch_uuids(docs)
+            inserts = []
+            replacements = {}
+            for uuid, doc in zip(uuids, docs):
+                doc_id = self._get_doc_id(uuid)
+                if doc_id is None:
+                    inserts.append(doc)
+                else:
+                    replacements[doc_id] = doc
+            if not reset:
+                existing_docs = self._get_docs(list(replacements))
+                for doc_id, existing_doc in existing_docs.items():
+                    if self.is_locked(existing_doc):
+                        uuid = replacements[doc_id]["_doc_metadata"]["uuid"]
+                        msg = f"Cannot update doc with uuid='{uuid}' in the {self._name} db as it is locked for editing."
+                        _LOGGER.error(msg)
+                        try:
+                            raise YawningTitanDBError(msg)
+                        except YawningTitanDBError as e:
+                            raise e
+                for doc in replacements.values():
+                    self._update_doc_updated_at_datetime(doc)
+
+            by_uuid = {
+                doc["_doc_metadata"]["uuid"]: doc for doc in replacements.values()
+            }
+
+            def _replace(stored: dict):
+                new_doc = by_uuid[stored["_doc_metadata"]["uuid"]]
+                stored.clear()
+                stored.update(new_doc)
+
+            inserted_ids = []
+            if replacements:
+                self.db.update(_replace, doc_ids=list(replacements))
+            if inserts:
+                inserted_ids = self.db.insert_multiple(inserts)
+            for doc_id, doc in zip(inserted_ids, inserts):
+                self._reindex(doc_id, None, doc["_doc_metadata"]["uuid"])
+            if replacements:
+                self._index_token = self._file_token()
+
+            written = self._get_docs(list(replacements) + inserted_ids)
+            doc_ids = {
+                doc["_doc_metadata"]["uuid"]: doc_id for doc_id, doc in written.items()
+            }
+            return [written[doc_ids[uuid]] for uuid in uuids]
 
     def update(
         self,
@@ -253,6 +712,7 @@ class YawningTitanDB:
         name: Optional[str] = None,
         description: Optional[str] = None,
         author: Optional[str] = None,
+        remove_fields: Optional[List[str]] = None,
     ) -> Document:
         """
         An extension of :func:`tinydb.table.Table.update`.
@@ -266,22 +726,42 @@ class YawningTitanDB:
         :param name: The doc name.
         :param description: The doc description.
         :param author: The docs author.
+        :param remove_fields: Fields to remove from the stored doc in the same
+            write, if they are not in ``doc``.
         :return: The updated doc.
         :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if
             the doc is locked.
         """
-        existing_doc = self.get(uuid)
-        if existing_doc and self.is_locked(existing_doc):
-            msg = f"Cannot update doc with uuid='{uuid}' in the {self._name} db as it is locked for editing."
-            _LOGGER.error(msg)
-            try:
-                raise YawningTitanDBError(msg)
-            except YawningTitanDBError as e:
-                raise e
-        self._update_doc_metadata(doc, name, description, author)
-        self._update_doc_updated_at_datetime(doc)
-        self.db.update(doc, cond=DocMetadataSchema.UUID == uuid)
-        return self.get(uuid)
+        with self._write_batch():
+            doc_id = self._get_doc_id(uuid)
+            existing_doc = self.db.get(doc_id=doc_id) if doc_id is not None else None
+            if existing_doc and self.is_locked(existing_doc):
+                msg = f"Cannot update doc with uuid='{uuid}' in the {self._name} db as it is locked for editing."
+                _LOGGER.error(msg)
+                try:
+                    raise YawningTitanDBError(msg)
+                except YawningTitanDBError as e:
+                    raise e
+            self._update_doc_metadata(doc, name, description, author)
+            self._update_doc_updated_at_datetime(doc)
+            if doc_id is None:
+                return None
+            if remove_fields:
+
+                def _update(stored: dict):
+                    for field in remove_fields:
+                        stored.pop(field, None)
+                    stored.update(doc)
+
+                self.db.update(_update, doc_ids=[doc_id])
+            else:
+                self.db.update(doc, doc_ids=[doc_id])
+            updated_doc = self.db.get(doc_id=doc_id)
+            new_uuid = updated_doc.get("_doc_metadata", {}).get("uuid")
+            self._reindex(doc_id, uuid, new_uuid)
+            if new_uuid == uuid:
+                return updated_doc
+            return self.get(uuid)
 
     def upsert(
         self,
@@ -308,13 +788,13 @@ class YawningTitanDB:
         :param author: The docs author.
         :return: The updated doc.
         """
-        existing_doc = self.get(uuid)
-        if existing_doc:
-            # Attempt to update
-            return self.update(doc, uuid, name, description, author)
-        else:
-            # Insert
-            return self.insert(doc, name, description, author)
+        with self._write_batch():
+            if self._doc_ids(uuid):
+                # Attempt to update
+                return self.update(doc, uuid, name, description, author)
+            else:
+                # Insert
+                return self.insert(doc, name, description, author)
 
     def remove_by_cond(self, cond: QueryInstance) -> List[str]:
         """
@@ -323,14 +803,15 @@ class YawningTitanDB:
         :param cond: A:class:`~yawning_titan.db.query.YawningTitanQuery`.
         :return: The list of uuids from documents removed.
         """
-        results = self.search(cond)
-        removed_uuids = []
-        for doc in results:
-            uuid = doc["_doc_metadata"]["uuid"]
-            removed_uuid = self.remove(uuid)
-            if removed_uuid:
-                removed_uuids.append(removed_uuid)
-        return removed_uuids
+        with self._write_batch():
+            results = self.search(cond)
+            removed_uuids = []
+            for doc in results:
+                uuid = doc["_doc_metadata"]["uuid"]
+                removed_uuid = self.remove(uuid)
+                if removed_uuid:
+                    removed_uuids.append(removed_uuid)
+            return removed_uuids
 
     def remove(self, uuid: str) -> Union[str, None]:
         """
@@ -343,31 +824,33 @@ class YawningTitanDB:
             :class:`~yawning_titan.exceptions.YawningTitanDBError` when
             an attempt to remove a locked doc is made.
         """
-        doc = self.db.search(DocMetadataSchema.UUID == uuid)
-        if doc:
-            if len(doc) > 1:
-                msg = (
-                    f"Removal of a doc from the {self._name} db with uuid='{uuid}' aborted as multiple docs with "
-                    f"the uuid exist. The '{self._path}' db file is corrupted."
-                )
-                try:
-                    raise YawningTitanDBCriticalError(msg)
-                except YawningTitanDBError as e:
-                    _LOGGER.critical(msg, exc_info=True)
-                    raise e
-            else:
-                doc = doc[0]
-                if "_doc_metadata" in doc:
-                    if doc["_doc_metadata"]["locked"]:
-                        msg = (
-                            f"Aborted removal of doc with uuid='{uuid}' from the {self._name} db as it is locked "
-                            f"for removal."
-                        )
-                        _LOGGER.error(msg)
-                        try:
-                            raise YawningTitanDBError(msg)
-                        except YawningTitanDBError as e:
-                            raise e
-                self.db.remove(cond=DocMetadataSchema.UUID == uuid)
-                return uuid
-        return None
+        with self._write_batch():
+            doc_ids = self._doc_ids(uuid)
+            if doc_ids:
+                if len(doc_ids) > 1:
+                    msg = (
+                        f"Removal of a doc from the {self._name} db with uuid='{uuid}' aborted as multiple docs with "
+                        f"the uuid exist. The '{self._path}' db file is corrupted."
+                    )
+                    try:
+                        raise YawningTitanDBCriticalError(msg)
+                    except YawningTitanDBError as e:
+                        _LOGGER.critical(msg, exc_info=True)
+                        raise e
+                else:
+                    doc = self.db.get(doc_id=doc_ids[0])
+                    if "_doc_metadata" in doc:
+                        if doc["_doc_metadata"]["locked"]:
+                            msg = (
+                                f"Aborted removal of doc with uuid='{uuid}' from the {self._name} db as it is locked "
+                                f"for removal."
+                            )
+                            _LOGGER.error(msg)
+                            try:
+                                raise YawningTitanDBError(msg)
+                            except YawningTitanDBError as e:
+                                raise e
+                    self.db.remove(doc_ids=doc_ids)
+                    self._reindex(doc_ids[0], uuid, None)
+                    return uuid
+            return None
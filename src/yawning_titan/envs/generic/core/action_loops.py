@@ -7,10 +7,10 @@ Serves a similar function to library helpers such as Stable Baselines 3 ``evalua
 import os
 import re
 import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from threading import Thread
-from typing import Any
+from typing import Any, List
 from uuid import uuid4
 
 import imageio
@@ -20,6 +20,10 @@ import pandas as pd
 
 from yawning_titan import APP_IMAGES_DIR, IMAGES_DIR, VIDEOS_DIR
 from yawning_titan.envs.generic.generic_env import GenericNetworkEnv
+from yawning_titan.envs.generic.helpers.episode_recorder import (
+    EpisodeRecorder,
+    RecordedEpisode,
+)
 
 
 class ActionLoop:
@@ -130,16 +134,7 @@ class ActionLoop:
                     f"{self.filename}_{string_time}_{self.episode_count}.gif",
                 )
 
-                # gif generator thread
-                gif_thread = Thread(
-                    target=self.generate_gif,
-                    args=(
-                        gif_path,
-                        frame_names,
-                    ),
-                )
-
-                generate_render_thread.append(gif_thread)
+                generate_render_thread.append((self.generate_gif, gif_path))
 
             if save_webm:
                 if webm_output_directory is None:
@@ -149,25 +144,22 @@ class ActionLoop:
                     f"{self.filename}_{string_time}_{self.episode_count}.webm",
                 )
 
-                # video generator thread
-                video_thread = Thread(
-                    target=self.generate_webm,
-                    args=(
-                        webm_path,
-                        frame_names,
-                    ),
-                )
-
-                generate_render_thread.append(video_thread)
+                generate_render_thread.append((self.generate_webm, webm_path))
 
-            # if any threads were added to generate threads list, run them
+            # if any outputs were added to the generate threads list, render them
+            # in threads and raise any error they hit
             if len(generate_render_thread):
-                for thread in generate_render_thread:
-                    thread.start()
-                    thread.join()
-
-                # clean up once done
-                self.render_cleanup(frame_names)
+                try:
+                    with ThreadPoolExecutor() as executor:
+                        futures = [
+                            executor.submit(generate, path, frame_names)
+                            for generate, path in generate_render_thread
+                        ]
+                    for future in futures:
+                        future.result()
+                finally:
+                    # clean up once done
+                    self.render_cleanup(frame_names)
 
             complete_results.append(results)
 
@@ -193,6 +185,28 @@ class ActionLoop:
             complete_results.append(results)
         return complete_results
 
+    def record_action_loop(self, deterministic=False) -> List[RecordedEpisode]:
+        """
+        Run the agent in evaluation and record the episodes for offline rendering.
+
+        Recording only stores the node states of each time step so the loop runs
+        at the speed of the environment. The recorded episodes can be rendered
+        with :func:`~yawning_titan.envs.generic.helpers.episode_recorder.render_episodes`.
+
+        Args:
+            deterministic: Bool to toggle if the agents actions should be deterministic
+
+        Returns:
+            The recorded episodes.
+        """
+        recorder = EpisodeRecorder()
+        self.env.episode_recorder = recorder
+        try:
+            self.standard_action_loop(deterministic=deterministic)
+        finally:
+            self.env.episode_recorder = None
+        return recorder.episodes
+
     def random_action_loop(self, deterministic=False):
         """Indefinitely act within the environment taking random actions."""
         for i in range(self.episode_count):
@@ -238,7 +252,7 @@ class ActionLoop:
         """Create webm from image files."""
         # TODO: Full docstring.
         clip = mp.ImageSequenceClip(frame_names[1:], fps=5)
-        clip.write_gif(webm_path, program="ffmpeg")
+        clip.write_videofile(webm_path, codec="libvpx", audio=False, logger=None)
 
     def render_cleanup(self, frame_names):
         """Delete the frames image files."""
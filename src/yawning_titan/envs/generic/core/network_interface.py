@@ -13,7 +13,7 @@ from typing import Dict, List, Tuple, Union
 import networkx as nx
 import numpy as np
 
-from yawning_titan.game_modes.game_mode import GameMode
+from yawning_titan.game_modes.game_mode import FrozenGameMode, GameMode
 from yawning_titan.networks.network import Network
 from yawning_titan.networks.node import Node
 
@@ -23,14 +23,17 @@ _LOGGER = getLogger(__name__)
 class NetworkInterface:
     """The primary interface between both red and blue agents and the underlying environment."""
 
-    def __init__(self, game_mode: GameMode, network: Network):
+    def __init__(self, game_mode: Union[GameMode, FrozenGameMode], network: Network):
         """
         Initialise the Network Interface and initialises all the necessary components.
 
-        :param game_mode: the :class:`~yawning_titan.game_modes.game_mode.GameMode` that defines the abilities of the agents.
+        :param game_mode: the :class:`~yawning_titan.game_modes.game_mode.GameMode` that defines the abilities of the agents,
+            or a :class:`~yawning_titan.game_modes.game_mode.FrozenGameMode` snapshot of one, which is thawed.
         :param network: the :class:`~yawning_titan.networks.network.Network` that defines the network within which the agents act.
         """
         # opens the fle the user has specified to be the location of the game_mode
+        if isinstance(game_mode, FrozenGameMode):
+            game_mode = game_mode.thaw()
 
         self.game_mode: GameMode = game_mode
         self.current_graph: Network = network
@@ -302,11 +305,10 @@ class NetworkInterface:
 
         if self.game_mode.observation_space.special_nodes.value:
             # gets the entry nodes
-            entry_nodes = {n: 0 for n in self.current_graph.get_nodes()}
-            for n in self.current_graph.entry_nodes:
-                entry_nodes[n] = 1
-            entry_nodes = list(entry_nodes.values())
-            entry_nodes = np.pad(entry_nodes, (0, open_spaces), "constant")
+            entry_nodes = np.zeros(
+                self.current_graph.number_of_nodes() + open_spaces, dtype=int
+            )
+            entry_nodes[self.current_graph.entry_node_indices] = 1
 
             if self.game_mode.game_rules.blue_loss_condition.target_node_lost.value:
                 # gets the target node
@@ -317,14 +319,12 @@ class NetworkInterface:
 
             if self.game_mode.game_rules.blue_loss_condition.high_value_node_lost.value:
                 # gets the high value node nodes
-                nodes = {n: 0 for n in self.current_graph.get_nodes()}
+                nodes = np.zeros(
+                    self.current_graph.number_of_nodes() + open_spaces, dtype=int
+                )
 
                 # set high value nodes to 1
-                for node in self.current_graph.high_value_nodes:
-                    nodes[node] = 1
-
-                nodes = list(nodes.values())
-                nodes = np.pad(nodes, (0, open_spaces), "constant")
+                nodes[self.current_graph.high_value_node_indices] = 1
 
         # gets the skill of the red agent
         skill = []
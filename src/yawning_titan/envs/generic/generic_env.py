@@ -9,7 +9,7 @@ and topology of the network being defended and what data should be collected dur
 import copy
 import json
 from collections import Counter
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import gym
 import numpy as np
@@ -20,9 +20,31 @@ import yawning_titan.envs.generic.core.reward_functions as reward_functions
 from yawning_titan.envs.generic.core.blue_interface import BlueInterface
 from yawning_titan.envs.generic.core.network_interface import NetworkInterface
 from yawning_titan.envs.generic.core.red_interface import RedInterface
+from yawning_titan.envs.generic.helpers.episode_recorder import EpisodeRecorder
 from yawning_titan.envs.generic.helpers.eval_printout import EvalPrintout
 from yawning_titan.envs.generic.helpers.graph2plot import CustomEnvGraph
 
+_ENV_STATE_EXCLUDED = (
+    "RED",
+    "BLUE",
+    "network_interface",
+    "graph_plotter",
+    "episode_recorder",
+    "action_space",
+    "observation_space",
+)
+"""The attributes of the environment that are not part of its state, as they are fixed or are other objects."""
+
+_NETWORK_INTERFACE_STATE_EXCLUDED = ("game_mode",)
+"""The attributes of the network interface that are not part of its state."""
+
+_RED_STATE_EXCLUDED = ("network_interface", "action_dict")
+"""The attributes of the red agent that are not part of its state, the action dict being its bound methods."""
+
+
+def _state_vars(obj, excluded) -> dict:
+    return {key: value for key, value in vars(obj).items() if key not in excluded}
+
 
 class GenericNetworkEnv(gym.Env):
     """Class to create a generic YAWNING TITAN gym environment."""
@@ -75,6 +97,8 @@ class GenericNetworkEnv(gym.Env):
         self.random_seed = self.network_interface.random_seed
 
         self.graph_plotter = None
+        self.episode_recorder: Optional[EpisodeRecorder] = None
+        """An optional recorder that records each episode for offline rendering."""
         self.eval_printout = EvalPrintout(self.avg_every)
 
         self.action_space = spaces.Discrete(self.blue_actions)
@@ -111,6 +135,9 @@ class GenericNetworkEnv(gym.Env):
         self.env_observation = self.network_interface.get_current_observation()
         self.current_game_blue = {}
 
+        if self.episode_recorder is not None:
+            self.episode_recorder.start_episode(self)
+
         return self.env_observation
 
     def step(self, action: int) -> Tuple[np.array, float, bool, Dict[str, dict]]:
@@ -165,8 +192,8 @@ class GenericNetworkEnv(gym.Env):
                 }
             }
         # Gets the number of nodes that are safe
-        number_uncompromised = len(
-            self.network_interface.current_graph.get_nodes(filter_true_safe=True)
+        number_uncompromised = self.network_interface.current_graph.count_nodes(
+            filter_true_safe=True
         )
 
         # Collects data on the natural spreading
@@ -214,10 +241,8 @@ class GenericNetworkEnv(gym.Env):
         ):
             # calculate the number of safe nodes
             percent_comp = (
-                len(
-                    self.network_interface.current_graph.get_nodes(
-                        filter_true_compromised=True
-                    )
+                self.network_interface.current_graph.count_nodes(
+                    filter_true_compromised=True
                 )
                 / self.network_interface.current_graph.number_of_nodes()
             )
@@ -316,10 +341,8 @@ class GenericNetworkEnv(gym.Env):
                     reward = (
                         self.network_interface.game_mode.rewards.for_reaching_max_steps.value
                         * (
-                            len(
-                                self.network_interface.current_graph.get_nodes(
-                                    filter_true_safe=True
-                                )
+                            self.network_interface.current_graph.count_nodes(
+                                filter_true_safe=True
                             )
                             / self.network_interface.current_graph.number_of_nodes()
                         )
@@ -391,14 +414,17 @@ class GenericNetworkEnv(gym.Env):
         self.current_reward = reward
 
         if self.collect_data:
-            notes["safe_nodes"] = len(
-                self.network_interface.current_graph.get_nodes(filter_true_safe=True)
+            notes["safe_nodes"] = self.network_interface.current_graph.count_nodes(
+                filter_true_safe=True
             )
             notes["blue_action"] = blue_action
             notes["blue_node"] = blue_node
             notes["attacks"] = self.network_interface.true_attacks
             notes["end_isolation"] = self.network_interface.get_all_isolation()
 
+        if self.episode_recorder is not None:
+            self.episode_recorder.record_step(self)
+
         if self.print_notes:
             json_data = json.dumps(notes)
             print(json_data)
@@ -448,6 +474,39 @@ class GenericNetworkEnv(gym.Env):
             show_node_names=show_node_names,
         )
 
+    def get_state(self) -> Dict[str, dict]:
+        """
+        Get a copy of the state of the environment, its network interface and its red agent.
+
+        The state includes the node states and graph of the network interface, the red agent's zero day counters
+        and the phase of a ``SineWaveRedAgent``, and the episode progress and metrics of the environment. It is
+        copied in one go so the nodes shared between them stay shared.
+
+        Returns:
+            The state as a picklable dict that can be passed to ``set_state``.
+        """
+        return copy.deepcopy(
+            {
+                "env": _state_vars(self, _ENV_STATE_EXCLUDED),
+                "network_interface": _state_vars(
+                    self.network_interface, _NETWORK_INTERFACE_STATE_EXCLUDED
+                ),
+                "red": _state_vars(self.RED, _RED_STATE_EXCLUDED),
+            }
+        )
+
+    def set_state(self, state: Dict[str, dict]):
+        """
+        Restore the state of the environment, its network interface and its red agent.
+
+        Args:
+            state: A state returned by ``get_state``. It is copied, so can be restored again.
+        """
+        state = copy.deepcopy(state)
+        vars(self).update(state["env"])
+        vars(self.network_interface).update(state["network_interface"])
+        vars(self.RED).update(state["red"])
+
     def calculate_observation_space_size(self, with_feather: bool) -> int:
         """
         Calculate the observation space size.
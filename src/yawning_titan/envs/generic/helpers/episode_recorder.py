@@ -0,0 +1,405 @@
+"""
+Cheap recording of episodes for offline rendering.
+
+Rendering a network with Matplotlib while stepping an environment slows the
+environment down to the speed of the renderer. The ``EpisodeRecorder`` instead
+records the node state arrays of each time step, together with any changes to
+the topology of the network, so that episodes can be rendered later.
+
+``render_episodes`` renders recorded episodes across a pool of processes using
+the Agg backend. Each frame is drawn by ``CustomEnvGraph.render`` and so is
+identical to a frame rendered during stepping.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Tuple, Union
+
+import numpy as np
+
+from yawning_titan.networks.node import Node
+
+if TYPE_CHECKING:
+    from yawning_titan.envs.generic.generic_env import GenericNetworkEnv
+
+_LOGGER = getLogger(__name__)
+
+_NO_NODE = -1
+
+
+@dataclass
+class RecordedStep:
+    """The state of the network at the end of a single time step."""
+
+    current_step: int
+    """The current step in the environment."""
+    reward: float
+    """The reward for the time step, rounded as it is when rendered."""
+    true_compromised_status: np.ndarray
+    """The true compromised status of each node in the current node order."""
+    blue_knows_intrusion: np.ndarray
+    """Whether blue knows about the intrusion on each node in the current node order."""
+    vulnerability_score: np.ndarray
+    """The vulnerability score of each node in the current node order."""
+    high_value_node: np.ndarray
+    """Whether each node in the current node order is a high value node."""
+    entry_node: np.ndarray
+    """Whether each node in the current node order is an entry node."""
+    true_attacks: np.ndarray
+    """The (attacking node, target node) index pairs of all attacks, -1 where there is no attacking node."""
+    detected_attacks: np.ndarray
+    """The (attacking node, target node) index pairs of the attacks detected by blue."""
+    made_safe_nodes: np.ndarray
+    """The indexes of the nodes that blue made safe this time step."""
+    target_node: int = _NO_NODE
+    """The index of the red agent's target node, -1 if there is no target."""
+    node_order: Optional[np.ndarray] = None
+    """The new node order if the set of nodes changed this time step, otherwise ``None``."""
+    edges_added: Optional[np.ndarray] = None
+    """The edges added this time step as node index pairs, otherwise ``None``."""
+    edges_removed: Optional[np.ndarray] = None
+    """The edges removed this time step as node index pairs, otherwise ``None``."""
+
+
+@dataclass
+class RecordedEpisode:
+    """
+    A recorded episode.
+
+    Nodes are referenced by their index into ``nodes``, the table of every node
+    that appeared in the episode. The topology is stored as the initial node
+    order and edges followed by the deltas recorded on each step.
+    """
+
+    nodes: List[Dict] = field(default_factory=list)
+    """The ``Node.to_dict`` of every node seen in the episode."""
+    node_order: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))
+    """The initial order of the nodes in the network."""
+    edges: np.ndarray = field(default_factory=lambda: np.zeros((0, 2), np.int32))
+    """The initial edges of the network as node index pairs."""
+    steps: List[RecordedStep] = field(default_factory=list)
+    """The recorded time steps."""
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+class EpisodeRecorder:
+    """
+    Records the episodes of a ``GenericNetworkEnv``.
+
+    The recorder is attached to an environment by setting
+    ``GenericNetworkEnv.episode_recorder``. The environment then calls
+    ``start_episode`` on reset and ``record_step`` at the end of each step.
+    """
+
+    def __init__(self):
+        """The EpisodeRecorder constructor."""
+        self.episodes: List[RecordedEpisode] = []
+        self._node_ids: Dict[Node, int] = {}
+        self._order: List[int] = []
+        self._edges: Dict[FrozenSet[int], Tuple[int, int]] = {}
+
+    @property
+    def current_episode(self) -> Optional[RecordedEpisode]:
+        """The episode currently being recorded."""
+        if self.episodes:
+            return self.episodes[-1]
+        return None
+
+    def _node_id(self, node: Node) -> int:
+        """Get the index of a node in the current episodes node table, adding it if it is new."""
+        node_id = self._node_ids.get(node)
+        if node_id is None:
+            node_id = len(self.current_episode.nodes)
+            self._node_ids[node] = node_id
+            self.current_episode.nodes.append(node.to_dict())
+        return node_id
+
+    def _index_pairs(self, pairs) -> np.ndarray:
+        """Convert pairs of nodes to pairs of node indexes."""
+        return np.array(
+            [
+                [
+                    _NO_NODE if pair[0] is None else self._node_id(pair[0]),
+                    self._node_id(pair[1]),
+                ]
+                for pair in pairs
+            ],
+            dtype=np.int32,
+        ).reshape(-1, 2)
+
+    def _edge_map(self, env: GenericNetworkEnv) -> Dict[FrozenSet[int], Tuple[int, int]]:
+        """Get the edges of the current network as node index pairs, in the order the network iterates them."""
+        return {
+            frozenset(edge): edge
+            for edge in (
+                (self._node_id(u), self._node_id(v))
+                for u, v in env.network_interface.current_graph.edges
+            )
+        }
+
+    def start_episode(self, env: GenericNetworkEnv):
+        """
+        Start recording a new episode from the current state of the environment.
+
+        Args:
+            env: The environment being recorded.
+        """
+        self.episodes.append(RecordedEpisode())
+        self._node_ids = {}
+        self._order = [
+            self._node_id(n) for n in env.network_interface.current_graph.nodes
+        ]
+        self._edges = self._edge_map(env)
+        episode = self.current_episode
+        episode.node_order = np.array(self._order, dtype=np.int32)
+        episode.edges = np.array(list(self._edges.values()), np.int32).reshape(-1, 2)
+
+    def record_step(self, env: GenericNetworkEnv):
+        """
+        Record the state of the environment at the end of a step.
+
+        Args:
+            env: The environment being recorded.
+        """
+        if self.current_episode is None:
+            self.start_episode(env)
+        network_interface = env.network_interface
+        nodes = list(network_interface.current_graph.nodes)
+
+        order = [self._node_id(n) for n in nodes]
+        node_order = None
+        if order != self._order:
+            node_order = np.array(order, dtype=np.int32)
+            self._order = order
+
+        edges = self._edge_map(env)
+        edges_added = edges_removed = None
+        if edges.keys() != self._edges.keys():
+            edges_added = np.array(
+                [e for k, e in edges.items() if k not in self._edges], np.int32
+            ).reshape(-1, 2)
+            edges_removed = np.array(
+                [e for k, e in self._edges.items() if k not in edges], np.int32
+            ).reshape(-1, 2)
+            self._edges = edges
+
+        target_node = network_interface.get_target_node()
+        self.current_episode.steps.append(
+            RecordedStep(
+                current_step=env.current_duration,
+                reward=round(env.current_reward, 2),
+                true_compromised_status=np.array(
+                    [n.true_compromised_status for n in nodes], dtype=np.int8
+                ),
+                blue_knows_intrusion=np.array(
+                    [n.blue_knows_intrusion for n in nodes], dtype=bool
+                ),
+                vulnerability_score=np.array(
+                    [n.vulnerability_score for n in nodes], dtype=float
+                ),
+                high_value_node=np.array([n.high_value_node for n in nodes], dtype=bool),
+                entry_node=np.array([n.entry_node for n in nodes], dtype=bool),
+                true_attacks=self._index_pairs(network_interface.true_attacks),
+                detected_attacks=self._index_pairs(network_interface.detected_attacks),
+                made_safe_nodes=np.array(
+                    [self._node_id(n) for n in env.made_safe_nodes], dtype=np.int32
+                ),
+                target_node=_NO_NODE
+                if target_node is None
+                else self._node_id(target_node),
+                node_order=node_order,
+                edges_added=edges_added,
+                edges_removed=edges_removed,
+            )
+        )
+
+
+def _init_render_worker():
+    """Use the non-interactive Agg backend in render worker processes."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def render_episode(
+    episode: RecordedEpisode,
+    filename: str,
+    save_gif: bool = True,
+    save_webm: bool = False,
+    save_png: bool = False,
+    gif_output_directory: Optional[Path] = None,
+    webm_output_directory: Optional[Path] = None,
+    png_output_directory: Optional[Path] = None,
+    show_only_blue_view: bool = False,
+    show_node_names: bool = False,
+) -> Dict[str, Union[Path, List[Path]]]:
+    """
+    Render a recorded episode.
+
+    Each recorded step is rendered with ``CustomEnvGraph.render`` and saved as a
+    PNG frame in the same way as ``ActionLoop.gif_action_loop``.
+
+    Args:
+        episode: The recorded episode.
+        filename: The name given to the output files, without an extension.
+        save_gif: Whether to save the episode as a GIF.
+        save_webm: Whether to save the episode as a WEBM.
+        save_png: Whether to keep the PNG frames.
+        gif_output_directory: Directory where the GIF will be output.
+            Defaults to ``IMAGES_DIR``.
+        webm_output_directory: Directory where the WEBM will be output.
+            Defaults to ``VIDEOS_DIR``.
+        png_output_directory: Directory where the PNG frames will be
+            output. Defaults to a ``filename`` directory in ``IMAGES_DIR``.
+        show_only_blue_view: If true only shows what the blue agent can see.
+        show_node_names: Show the names of nodes.
+
+    Returns:
+        A dict of the output paths keyed by ``gif``, ``webm`` and ``png``.
+    """
+    import imageio
+    import matplotlib.pyplot as plt
+    import moviepy.editor as mp
+
+    from yawning_titan import IMAGES_DIR, VIDEOS_DIR
+    from yawning_titan.envs.generic.helpers.graph2plot import CustomEnvGraph
+    from yawning_titan.networks.network import Network
+
+    if png_output_directory is None:
+        png_output_directory = (
+            IMAGES_DIR / filename if save_png else Path(tempfile.mkdtemp())
+        )
+    os.makedirs(png_output_directory, exist_ok=True)
+
+    nodes = [Node.create_from_db(**node_dict) for node_dict in episode.nodes]
+    order = list(episode.node_order)
+    network = Network()
+    network.add_nodes_from([nodes[n] for n in order])
+    network.add_edges_from([(nodes[u], nodes[v]) for u, v in episode.edges])
+
+    graph = CustomEnvGraph()
+    frame_names = []
+    for i, step in enumerate(episode.steps):
+        # replay the topology deltas in the order they happened so that the network iterates its nodes and edges in
+        # the same order as it did when the episode was recorded
+        if step.node_order is not None:
+            new_order = list(step.node_order)
+            network.remove_nodes_from(
+                [nodes[n] for n in set(order).difference(new_order)]
+            )
+            network.add_nodes_from(
+                [nodes[n] for n in new_order if n not in set(order)]
+            )
+            order = new_order
+        if step.edges_added is not None:
+            network.remove_edges_from([(nodes[u], nodes[v]) for u, v in step.edges_removed])
+            network.add_edges_from([(nodes[u], nodes[v]) for u, v in step.edges_added])
+
+        for j, n in enumerate(order):
+            node = nodes[n]
+            node.true_compromised_status = int(step.true_compromised_status[j])
+            node.blue_knows_intrusion = bool(step.blue_knows_intrusion[j])
+            node.vulnerability_score = float(step.vulnerability_score[j])
+            node.high_value_node = bool(step.high_value_node[j])
+            node.entry_node = bool(step.entry_node[j])
+
+        attacks = step.detected_attacks if show_only_blue_view else step.true_attacks
+        graph.render(
+            current_step=step.current_step,
+            g=network,
+            attacked_nodes=[
+                [None if u == _NO_NODE else nodes[u], nodes[v]] for u, v in attacks
+            ],
+            current_time_step_reward=step.reward,
+            made_safe_nodes=[nodes[n] for n in step.made_safe_nodes],
+            target_node=None
+            if step.target_node == _NO_NODE
+            else nodes[step.target_node],
+            show_only_blue_view=show_only_blue_view,
+            show_node_names=show_node_names,
+        )
+        frame_name = Path(png_output_directory) / f"{filename}_{i}.png"
+        plt.savefig(frame_name, bbox_inches="tight", dpi=100)
+        frame_names.append(frame_name)
+    graph.close()
+
+    output = {}
+    if save_gif and frame_names:
+        if gif_output_directory is None:
+            gif_output_directory = IMAGES_DIR
+        gif_path = Path(gif_output_directory) / f"{filename}.gif"
+        with imageio.get_writer(gif_path, mode="I") as writer:
+            for frame_name in frame_names:
+                writer.append_data(imageio.imread(frame_name))
+            # add more of the last frame so the result can be seen longer
+            for _ in range(10):
+                writer.append_data(imageio.imread(frame_names[-1]))
+        output["gif"] = gif_path
+
+    if save_webm and frame_names:
+        if webm_output_directory is None:
+            webm_output_directory = VIDEOS_DIR
+        webm_path = Path(webm_output_directory) / f"{filename}.webm"
+        clip = mp.ImageSequenceClip([f.as_posix() for f in frame_names], fps=5)
+        clip.write_videofile(
+            webm_path.as_posix(), codec="libvpx", audio=False, logger=None
+        )
+        output["webm"] = webm_path
+
+    if save_png:
+        output["png"] = frame_names
+    else:
+        for frame_name in frame_names:
+            os.remove(frame_name)
+        if not os.listdir(png_output_directory):
+            os.rmdir(png_output_directory)
+
+    return output
+
+
+def render_episodes(
+    episodes: List[RecordedEpisode],
+    filename: str = "YT",
+    processes: Optional[int] = None,
+    **kwargs,
+) -> List[Dict[str, Union[Path, List[Path]]]]:
+    """
+    Render recorded episodes across a pool of processes using the Agg backend.
+
+    Args:
+        episodes: The recorded episodes.
+        filename: The prefix of the output file names. The time and the
+            episode number are appended to it.
+        processes: The maximum number of render processes. Defaults to the
+            number of CPUs.
+        kwargs: Keyword arguments passed to ``render_episode``.
+
+    Returns:
+        The output paths of each episode, in the order of ``episodes``.
+    """
+    string_time = datetime.now().strftime("%d-%m-%Y_%H-%M")
+    _LOGGER.debug(f"Rendering {len(episodes)} recorded episodes.")
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_render_worker,
+    ) as pool:
+        futures = [
+            pool.submit(
+                render_episode,
+                episode,
+                f"{filename}_{string_time}_{i + 1}",
+                **kwargs,
+            )
+            for i, episode in enumerate(episodes)
+        ]
+        return [future.result() for future in futures]
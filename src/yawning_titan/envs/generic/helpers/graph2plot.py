@@ -1,8 +1,12 @@
 import math
 import statistics
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
 from matplotlib.lines import Line2D
 
 from yawning_titan.networks.network import Network
@@ -29,8 +33,67 @@ def repeat_check(node: Dict, legend_list: List[Line2D]):
     return False
 
 
+# All the shades of green for the different levels of vulnerability
+GREEN_SHADES = [
+    "#00FF13",
+    "#00DF11",
+    "#00BF0E",
+    "#009F0C",
+    "#00800A",
+    "#006007",
+]
+
+SPECIAL_NODE_INFO = {
+    "high_value_node": {
+        "description": "high value node",
+        "colour": "#da2fed",
+    }
+}
+
+# The face colour palette used by the node collection. Per-node colours are stored as indexes into this palette so
+# that the colour update for each frame is a single array lookup.
+_NODE_PALETTE = [
+    "grey",  # void
+    "orange",  # compromised
+    SPECIAL_NODE_INFO["high_value_node"]["colour"],  # high value node
+    "#2c195e",  # target node
+    "red",  # attacked node
+    "#4ef2e7",  # made safe
+] + GREEN_SHADES
+_VOID, _COMPROMISED, _HIGH_VALUE, _TARGET, _ATTACKED, _MADE_SAFE, _SAFE = range(7)
+
+# The face colour palette used by the ring drawn around compromised nodes.
+_RING_PALETTE = [(0.0, 0.0, 0.0, 0.0), "red", "blue"]
+_NO_RING, _UNKNOWN_RING, _KNOWN_RING = range(3)
+
+
+def _backend_supports_blit(canvas: FigureCanvasBase) -> bool:
+    """
+    Check whether a canvas can blit to a display.
+
+    Non-interactive canvases such as Agg can copy regions but their ``blit`` is a no-op, so there is nothing to gain
+    from blitting to them.
+
+    Args:
+        canvas: The figure canvas.
+
+    Returns:
+        ``True`` if the canvas supports blitting to a display, otherwise ``False``.
+    """
+    return bool(
+        getattr(canvas, "supports_blit", False)
+        and type(canvas).blit is not FigureCanvasBase.blit
+    )
+
+
 class CustomEnvGraph:
-    """A network graph rendering environment for Open AI Gym use."""
+    """
+    A network graph rendering environment for Open AI Gym use.
+
+    The renderer is retained-mode: the Matplotlib artists for the edges, nodes, node names and legend are created when
+    the topology of the network changes and are then updated in place for every frame. Only the node face colours,
+    the attack paths and the information text change between frames.
+    """
 
     def __init__(self, title: str = None):
         """
@@ -54,6 +117,24 @@ class CustomEnvGraph:
         )
         plt.tight_layout()
 
+        self._node_palette = to_rgba_array(_NODE_PALETTE)
+        self._ring_palette = to_rgba_array(_RING_PALETTE)
+
+        # Retained artists, (re)built by ``_draw_network``
+        self._topology_key: Optional[Tuple] = None
+        self._legend_key: Optional[Tuple] = None
+        self._nodes: List[Node] = []
+        self._node_index: Dict[Node, int] = {}
+        self._positions: np.ndarray = np.zeros((0, 2))
+        self._node_collection = None
+        self._ring_collection = None
+        self._entry_collection = None
+        self._edge_collection = None
+        self._attack_collection = None
+        self._background = None
+
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
         # Show the graph without blocking the rest of the program
         plt.show(block=False)
 
@@ -61,17 +142,9 @@ class CustomEnvGraph:
         self,
         current_step: int,
         g: Network,
-        # pos: dict,
-        # compromised_nodes: dict,
-        # uncompromised_nodes: list,
         attacked_nodes: List[List[Node]],
         current_time_step_reward: float,
-        # red_previous_node,
-        # vulnerability_dict: dict,
         made_safe_nodes: list,
-        # title: str,
-        # special_nodes: dict = None,
-        # entrance_nodes: list = None,
         show_only_blue_view: bool = False,
         target_node: Node = None,
         show_node_names: bool = False,
@@ -79,32 +152,136 @@ class CustomEnvGraph:
         """
         Render the current network into an axis.
 
+        The network is only fully redrawn when its topology changes (e.g. a deceptive node is added or a node is
+        isolated); otherwise the existing artists are updated in place.
+
         Args:
             current_step: the current step in the environment (int)
             g: a networkx object that stores the current connectivity (networkx graph)
-            pos: a dictionary that contains the points and their positions
-            compromised_nodes: a dictionary of all the compromised nodes and a boolean value if blue can see the intrusion or not
-            uncompromised_nodes: a list of all the uncompromised nodes
             attacked_nodes: a list of the nodes where an attack is happening
                 (infected node, target node)
             current_time_step_reward: the current total reward
-            red_previous_node: CURRENTLY NOT USED
-            vulnerability_dict: A dictionary that stores the vulnerability of the nodes
             made_safe_nodes: a list of nodes that the blue agent has made safe this turn
-            title: The title for the render
-            special_nodes: A dictionary containing dictionaries of: nodes, node descriptions and colours for the nodes
-            entrance_nodes: Nodes that serve as a gateway for the red agent to be able to access the network
             show_only_blue_view: If true only shows what the blue agent can see
+            target_node: The node that the red agent is targeting
+            show_node_names: Show the names of nodes
+        """
+        nodes = list(g.nodes)
+        topology_key = (tuple(nodes), tuple(g.edges), show_node_names)
+        if topology_key != self._topology_key:
+            self._draw_network(g, nodes, show_node_names)
+            self._topology_key = topology_key
+
+        entry_nodes = g.entry_nodes
+        legend_key = (show_only_blue_view, target_node is not None, bool(entry_nodes))
+        if legend_key != self._legend_key:
+            self._draw_legend(*legend_key)
+            self._legend_key = legend_key
+
+        self._update_nodes(
+            made_safe_nodes, attacked_nodes, entry_nodes, show_only_blue_view, target_node
+        )
+        self._update_attacks(attacked_nodes)
+
+        # Creates a string containing information about the current state of the network
+        info = (
+            "Current Step: "
+            + str(current_step)
+            + "\nReward for current time step: "
+            + str(current_time_step_reward)
+            + "\nCurrent Avg vulnerability: "
+            + str(round(statistics.mean([n.vulnerability_score for n in nodes]), 2))
+        )
+        self.vis_ax.set_xlabel(info)
+
+        self._blit()
+
+    def _draw_network(self, g: Network, nodes: List[Node], show_node_names: bool):
+        """
+        Rebuild all of the retained artists for the network.
+
+        Args:
+            g: The network being rendered.
+            nodes: The nodes of the network in the order used by the node collections.
             show_node_names: Show the names of nodes
         """
-        self.vis_ax.clear()
+        ax = self.vis_ax
+        ax.clear()
+        self._legend_key = None
+        self._background = None
+
+        self._nodes = nodes
+        self._node_index = {node: i for i, node in enumerate(nodes)}
+        self._positions = np.array(
+            [[n.x_pos, n.y_pos] for n in nodes], dtype=float
+        ).reshape(-1, 2)
+        x = self._positions[:, 0]
+        y = self._positions[:, 1]
+
+        # plots all of the edges in the graph
+        self._edge_collection = LineCollection(
+            [
+                [[edge[0].x_pos, edge[0].y_pos], [edge[1].x_pos, edge[1].y_pos]]
+                for edge in g.edges
+            ],
+            colors="grey",
+            zorder=1,
+        )
+        ax.add_collection(self._edge_collection)
+
+        # the current turns attacks, updated every frame
+        self._attack_collection = LineCollection([], colors="red", zorder=2)
+        ax.add_collection(self._attack_collection)
+
+        # the circles around compromised nodes
+        self._ring_collection = ax.scatter(x, y, s=484, zorder=7)
+        # all of the nodes, coloured by their current state
+        self._node_collection = ax.scatter(x, y, s=324, zorder=8)
+        # the entrance nodes
+        self._entry_collection = ax.scatter(
+            [], [], color="black", zorder=11, s=121, marker="$E$"
+        )
+
+        if show_node_names:
+            for node in nodes:
+                ax.text(
+                    node.x_pos + 0.1,
+                    node.y_pos + 0.1,
+                    node,
+                    color="red",
+                    fontsize=12,
+                    zorder=11,
+                )
+
+        if len(nodes):
+            max_x = max(0, x.max())
+            max_y = max(0, y.max())
+            min_x = min(100000, x.min())
+            min_y = min(100000, y.min())
+        else:
+            max_x, max_y, min_x, min_y = 0, 0, 100000, 100000
+        ax.axes.xaxis.set_ticks([])
+        ax.axes.yaxis.set_ticks([])
+        ax.axes.set_xlim(min_x - 0.1 * max_x, max_x * 1.1)
+        ax.axes.set_ylim(min_y - 0.1 * max_y, max_y * 1.1)
+        for pos in ["left", "right", "top", "bottom"]:
+            ax.spines[pos].set_visible(False)
+
+        # invert y axis - computer coords to cartesian conversion
+        ax.invert_yaxis()
+
+    def _draw_legend(
+        self, show_only_blue_view: bool, show_target_node: bool, show_entry_nodes: bool
+    ):
+        """
+        Rebuild the legend.
 
-        special_node_info = {
-            "high_value_node": {
-                "description": "high value node",
-                "colour": "#da2fed",
-            }
-        }
+        Args:
+            show_only_blue_view: If true only shows what the blue agent can see
+            show_target_node: Whether a target node is being rendered
+            show_entry_nodes: Whether entry nodes are being rendered
+        """
+        self._background = None
 
         # Creates a list that contains the details for the legend
         legend_objects = [
@@ -161,7 +338,7 @@ class CustomEnvGraph:
             ),
         ]
         # If a target node is specified add to the legend
-        if target_node is not None:
+        if show_target_node:
             legend_objects.append(
                 Line2D(
                     [0],
@@ -173,14 +350,6 @@ class CustomEnvGraph:
                     markersize=15,
                 )
             )
-            # plots the target node
-            plt.scatter(
-                [target_node.x_pos],
-                [target_node.y_pos],
-                color="#2c195e",
-                s=324,
-                zorder=8,
-            )
 
         legend_objects.extend(
             [
@@ -232,27 +401,26 @@ class CustomEnvGraph:
                 )
             )
         # Some environments may have special custom nodes that they want to add
-        if len(special_node_info) > 0:
-            for node_info in special_node_info.values():
-                # only insert if the legend is not in the list yet
-                if not repeat_check(node_info, legend_objects):
-                    # Inserts the object into the legends at position 3. This is because it looks better if there are any
-                    # special nodes added that they are added at the some point as the other nodes in the legend
-                    legend_objects.insert(
-                        3,
-                        Line2D(
-                            [0],
-                            [0],
-                            color="white",
-                            marker="o",
-                            markerfacecolor=node_info["colour"],
-                            label=node_info["description"],
-                            markersize=15,
-                        ),
-                    )
+        for node_info in SPECIAL_NODE_INFO.values():
+            # only insert if the legend is not in the list yet
+            if not repeat_check(node_info, legend_objects):
+                # Inserts the object into the legends at position 3. This is because it looks better if there are any
+                # special nodes added that they are added at the some point as the other nodes in the legend
+                legend_objects.insert(
+                    3,
+                    Line2D(
+                        [0],
+                        [0],
+                        color="white",
+                        marker="o",
+                        markerfacecolor=node_info["colour"],
+                        label=node_info["description"],
+                        markersize=15,
+                    ),
+                )
 
         # If entrance nodes are used then they are added to the legend
-        if g.entry_nodes:
+        if show_entry_nodes:
             legend_objects.append(
                 Line2D(
                     [0],
@@ -264,155 +432,8 @@ class CustomEnvGraph:
                     markersize=12,
                 )
             )
-        # plots all of the edges in the graph
-        for edge in g.edges:
-            plt.plot(
-                [edge[0].x_pos, edge[1].x_pos],
-                [edge[0].y_pos, edge[1].y_pos],
-                color="grey",
-                zorder=1,
-            )
-
-        # plots all of the current turns attacks
-        red_nodes_x = []
-        red_nodes_y = []
-        for node_set in attacked_nodes:
-            red_nodes_x.append(node_set[1].x_pos)
-            red_nodes_y.append(node_set[1].y_pos)
-            if node_set[0] is not None:
-                plt.plot(
-                    [node_set[0].x_pos, node_set[1].x_pos],
-                    [node_set[0].y_pos, node_set[1].y_pos],
-                    color="red",
-                    zorder=2,
-                )
-
-        # All the shades of green for the different levels of vulnerability
-        green_shades = [
-            "#00FF13",
-            "#00DF11",
-            "#00BF0E",
-            "#009F0C",
-            "#00800A",
-            "#006007",
-        ]
-        max_x = 0
-        max_y = 0
-        min_x = 100000
-        min_y = 100000
-        comp_x = []
-        comp_y = []
-        known_comp_x = []
-        known_comp_y = []
-        unknown_comp_x = []
-        unknown_comp_y = []
-        safe_x = []
-        safe_y = []
-        safe_colours = []
-        void_x = []
-        void_y = []
-        special_x = []
-        special_y = []
-        special_colour = []
-        made_safe_x = []
-        made_safe_y = []
-        for n in g.get_nodes():
-            max_x = max(max_x, n.x_pos)
-            max_y = max(max_y, n.y_pos)
-            min_x = min(min_x, n.x_pos)
-            min_y = min(min_y, n.y_pos)
-            if n in made_safe_nodes:
-                # get the locations of nodes that have been made safe
-                made_safe_x.append(n.x_pos)
-                made_safe_y.append(n.y_pos)
-            elif n.high_value_node:
-                # get the locations of special nodes
-                special_x.append(n.x_pos)
-                special_y.append(n.y_pos)
-                special_colour.append(special_node_info["high_value_node"]["colour"])
-            elif n.true_compromised_status == 1:
-                if n.blue_knows_intrusion:
-                    # get the locations of compromised nodes (unknown)
-                    comp_x.append(n.x_pos)
-                    comp_y.append(n.y_pos)
-                    if not show_only_blue_view:
-                        # get the locations of compromised nodes (known)
-                        known_comp_x.append(n.x_pos)
-                        known_comp_y.append(n.y_pos)
-                else:
-                    if not show_only_blue_view:
-                        comp_x.append(n.x_pos)
-                        comp_y.append(n.y_pos)
-                        unknown_comp_x.append(n.x_pos)
-                        unknown_comp_y.append(n.y_pos)
-                    else:
-                        # get the location of the safe nodes
-                        vuln = n.vulnerability_score
-                        index = 5 - math.floor(vuln * (len(green_shades) - 1))
-                        safe_colours.append(green_shades[index])
-                        safe_x.append(n.x_pos)
-                        safe_y.append(n.y_pos)
-            elif n.true_compromised_status == 0:
-                # get the locations of safe nodes
-                vuln = n.vulnerability_score
-                index = 5 - math.floor(vuln * (len(green_shades) - 1))
-                safe_colours.append(green_shades[index])
-                safe_x.append(n.x_pos)
-                safe_y.append(n.y_pos)
-            else:
-                void_x.append(n.x_pos)
-                void_y.append(n.y_pos)
-
-        # plots any nodes that have no features
-        plt.scatter(void_x, void_y, color="grey", s=300, zorder=1)
-
-        # plots all of the compromised nodes
-        plt.scatter(comp_x, comp_y, color="orange", s=324, zorder=8)
-        # plot the circles around unknown compromised nodes
-        plt.scatter(unknown_comp_x, unknown_comp_y, color="red", s=484, zorder=7)
-        # plot the circles around known compromised nodes
-        plt.scatter(known_comp_x, known_comp_y, color="blue", s=484, zorder=7)
-        # plots all of the safe nodes
-        plt.scatter(safe_x, safe_y, color=safe_colours, s=324, zorder=5)
-        # plots all of the recently taken red nodes
-        plt.scatter(red_nodes_x, red_nodes_y, color="red", s=324, zorder=9)
-        # plots all of the nodes that have just been patched
-        plt.scatter(made_safe_x, made_safe_y, color="#4ef2e7", s=324, zorder=10)
-        # plots any special nodes for the env
-        plt.scatter(special_x, special_y, color=special_colour, s=324, zorder=6)
-        # plot the entrance nodes
-        for node in g.entry_nodes:
-            plt.scatter(
-                [node.x_pos],
-                [node.y_pos],
-                color="black",
-                zorder=11,
-                s=121,
-                marker="$E$",
-            )
-        if show_node_names:
-            for node in g.nodes:
-                plt.text(
-                    node.x_pos + 0.1,
-                    node.y_pos + 0.1,
-                    node,
-                    color="red",
-                    fontsize=12,
-                    zorder=11,
-                )
 
-        # Creates a string containing information about the current state of the network
-
-        info = (
-            "Current Step: "
-            + str(current_step)
-            + "\nReward for current time step: "
-            + str(current_time_step_reward)
-            + "\nCurrent Avg vulnerability: "
-            + str(round(statistics.mean([n.vulnerability_score for n in g.nodes]), 2))
-        )
-        ax = plt.gca()
-        ax.legend(
+        self.vis_ax.legend(
             handles=legend_objects,
             loc="center left",
             bbox_to_anchor=(1, 0.5),
@@ -421,18 +442,140 @@ class CustomEnvGraph:
             fontsize=10,
             edgecolor="black",
         )
-        ax.axes.xaxis.set_ticks([])
-        ax.axes.yaxis.set_ticks([])
-        ax.axes.set_xlim(min_x - 0.1 * max_x, max_x * 1.1)
-        ax.axes.set_ylim(min_y - 0.1 * max_y, max_y * 1.1)
 
-        ax.set_xlabel(info)
-        for pos in ["left", "right", "top", "bottom"]:
-            plt.gca().spines[pos].set_visible(False)
+    def _update_nodes(
+        self,
+        made_safe_nodes: list,
+        attacked_nodes: List[List[Node]],
+        entry_nodes: List[Node],
+        show_only_blue_view: bool,
+        target_node: Optional[Node],
+    ):
+        """
+        Update the node face colours, sizes and markers for the current frame.
 
-        # plt.show()
-        # invert y axis - computer coords to cartesian conversion
-        plt.gca().invert_yaxis()
+        Args:
+            made_safe_nodes: a list of nodes that the blue agent has made safe this turn
+            attacked_nodes: a list of the nodes where an attack is happening
+                (infected node, target node)
+            entry_nodes: The entry nodes of the network.
+            show_only_blue_view: If true only shows what the blue agent can see
+            target_node: The node that the red agent is targeting
+        """
+        n = len(self._nodes)
+        colours = np.full(n, _VOID, dtype=np.intp)
+        rings = np.full(n, _NO_RING, dtype=np.intp)
+        made_safe = set(made_safe_nodes)
+
+        for i, node in enumerate(self._nodes):
+            if node in made_safe:
+                colours[i] = _MADE_SAFE
+            elif node.high_value_node:
+                colours[i] = _HIGH_VALUE
+            elif node.true_compromised_status == 1 and (
+                node.blue_knows_intrusion or not show_only_blue_view
+            ):
+                colours[i] = _COMPROMISED
+                if not show_only_blue_view:
+                    rings[i] = _KNOWN_RING if node.blue_knows_intrusion else _UNKNOWN_RING
+            elif node.true_compromised_status in (0, 1):
+                # the shade of green depends on how vulnerable the safe node is
+                index = 5 - math.floor(
+                    node.vulnerability_score * (len(GREEN_SHADES) - 1)
+                )
+                colours[i] = _SAFE + index % len(GREEN_SHADES)
+
+        # the target node is drawn over safe and high value nodes but under compromised nodes
+        if target_node is not None and target_node in self._node_index:
+            i = self._node_index[target_node]
+            if colours[i] not in (_MADE_SAFE, _COMPROMISED):
+                colours[i] = _TARGET
+        # recently taken red nodes are drawn over everything except nodes that have just been patched
+        for node_set in attacked_nodes:
+            i = self._node_index.get(node_set[1])
+            if i is not None and colours[i] != _MADE_SAFE:
+                colours[i] = _ATTACKED
+
+        sizes = np.where(colours == _VOID, 300, 324)
+        self._node_collection.set_facecolors(self._node_palette[colours])
+        self._node_collection.set_sizes(sizes)
+        self._ring_collection.set_facecolors(self._ring_palette[rings])
+
+        entry_index = [self._node_index[e] for e in entry_nodes if e in self._node_index]
+        self._entry_collection.set_offsets(self._positions[entry_index].reshape(-1, 2))
+
+    def _update_attacks(self, attacked_nodes: List[List[Node]]):
+        """
+        Update the highlighted attack paths for the current frame.
+
+        Args:
+            attacked_nodes: a list of the nodes where an attack is happening
+                (infected node, target node)
+        """
+        self._attack_collection.set_segments(
+            [
+                [
+                    [node_set[0].x_pos, node_set[0].y_pos],
+                    [node_set[1].x_pos, node_set[1].y_pos],
+                ]
+                for node_set in attacked_nodes
+                if node_set[0] is not None
+            ]
+        )
+
+    def _dynamic_artists(self) -> list:
+        """The artists that change between frames."""
+        return [
+            self._attack_collection,
+            self._ring_collection,
+            self._node_collection,
+            self._entry_collection,
+            self.vis_ax.xaxis.label,
+        ]
+
+    def _on_draw(self, event):
+        """
+        Capture the static background after a full draw so that later frames can be blitted over it.
+
+        Args:
+            event: The Matplotlib draw event.
+        """
+        if not _backend_supports_blit(self.fig.canvas):
+            return
+        dynamic = self._dynamic_artists()
+        if any(artist is None for artist in dynamic):
+            return
+        # draw the background without the dynamic artists
+        for artist in dynamic:
+            artist.set_visible(False)
+        self.fig.draw_artist(self.fig.patch)
+        for artist in self.fig.get_children():
+            if artist is not self.fig.patch:
+                self.fig.draw_artist(artist)
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in dynamic:
+            artist.set_visible(True)
+            self.fig.draw_artist(artist)
+
+    def _blit(self):
+        """
+        Push the current frame to the display.
+
+        Where the backend supports blitting only the dynamic artists are redrawn over the cached background. A full
+        redraw is requested when there is no valid background. Non-interactive backends are drawn when the figure is
+        saved.
+        """
+        canvas = self.fig.canvas
+        if not _backend_supports_blit(canvas):
+            return
+        if self._background is None:
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            for artist in self._dynamic_artists():
+                self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
 
     def close(self):
         """Close all handles to external renderers."""
@@ -39,5 +39,11 @@ class YawningTitanRunError(ValueError):
     pass
 
 
+class YawningTitanSweepError(ValueError):
+    """An error has occurred in the expansion or running of a YawningTitanSweep."""
+
+    pass
+
+
 class NetworkError(ValueError):
     """An error has occurred in the construction to the Network."""
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Optional
+import copy
+import hashlib
+import json
+from typing import Any, Dict, Final, Optional
 
-from yawning_titan.config.core import ConfigGroup
+from yawning_titan.config.core import ConfigBase, ConfigGroup, deferred_validation
 from yawning_titan.db.doc_metadata import DocMetadata, DocMetaDataObject
 from yawning_titan.game_modes.components.blue_agent import Blue
 from yawning_titan.game_modes.components.game_rules import GameRules
@@ -12,6 +15,18 @@ from yawning_titan.game_modes.components.red_agent import Red
 from yawning_titan.game_modes.components.reset import Reset
 from yawning_titan.game_modes.components.rewards import Rewards
 
+GAME_MODE_SCHEMA_VERSION: Final[int] = 1
+"""The version of the game mode config layout stored in a :class:`FrozenGameMode`.
+
+Bump this when config groups or items are added, removed or renamed.
+"""
+
+
+def _values_fingerprint(values: dict) -> str:
+    values = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(values.encode("utf-8")).hexdigest()
+
+
 # --- Tier 0 groups
 
 
@@ -30,20 +45,70 @@ class GameMode(ConfigGroup, DocMetaDataObject):
         miscellaneous: Miscellaneous = None,
         _doc_metadata: Optional[DocMetadata] = None,
     ):
-        self.red: Red = red if red else Red()
-        self.blue: Blue = blue if blue else Blue()
-        self.game_rules: GameRules = game_rules if game_rules else GameRules()
-        self.observation_space: ObservationSpace = (
-            observation_space if observation_space else ObservationSpace()
-        )
-        self.on_reset: Reset = on_reset if on_reset else Reset()
-        self.rewards: Rewards = rewards if rewards else Rewards()
-        self.miscellaneous: Miscellaneous = (
-            miscellaneous if miscellaneous else Miscellaneous()
-        )
+        # the whole tree is validated once by ConfigGroup.__init__
+        with deferred_validation():
+            self.red: Red = red if red else Red()
+            self.blue: Blue = blue if blue else Blue()
+            self.game_rules: GameRules = game_rules if game_rules else GameRules()
+            self.observation_space: ObservationSpace = (
+                observation_space if observation_space else ObservationSpace()
+            )
+            self.on_reset: Reset = on_reset if on_reset else Reset()
+            self.rewards: Rewards = rewards if rewards else Rewards()
+            self.miscellaneous: Miscellaneous = (
+                miscellaneous if miscellaneous else Miscellaneous()
+            )
         self._doc_metadata = _doc_metadata if _doc_metadata else DocMetadata()
+        self._fingerprint = None
         super().__init__(doc)
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        A hex digest of the values of the game mode.
+
+        The doc and doc metadata are not included, so game modes with the same
+        values share a fingerprint. It is cached until a config value is set.
+        Values mutated in place, e.g. by appending to a list value, are not
+        detected; set the value instead.
+        """
+        version = ConfigBase._config_version
+        if self._fingerprint is None or self._fingerprint[0] != version:
+            # bypass ConfigGroup.__setattr__, which would bump the version
+            self.__dict__["_fingerprint"] = (
+                version,
+                _values_fingerprint(self.to_dict(values_only=True)),
+            )
+        return self._fingerprint[1]
+
+    def freeze(self) -> FrozenGameMode:
+        """
+        Take an immutable snapshot of the values of the game mode.
+
+        The snapshot is much cheaper to pickle than the game mode, so it
+        should be used to send game modes to worker processes.
+
+        :return: An instance of :class:`FrozenGameMode`.
+        """
+        doc_metadata = None
+        if self.doc_metadata is not None:
+            doc_metadata = self.doc_metadata.to_dict(include_none=True)
+        return FrozenGameMode(
+            copy.deepcopy(self.to_dict(values_only=True)),
+            GAME_MODE_SCHEMA_VERSION,
+            doc_metadata,
+        )
+
+    @classmethod
+    def thaw(cls, frozen: FrozenGameMode) -> GameMode:
+        """
+        Rebuild a game mode from a snapshot taken with :meth:`freeze`.
+
+        :param frozen: An instance of :class:`FrozenGameMode`.
+        :return: An instance of :class:`GameMode`.
+        """
+        return frozen.thaw()
+
     @classmethod
     def create_from_yaml(
         cls,
@@ -60,7 +125,8 @@ class GameMode(ConfigGroup, DocMetaDataObject):
 
         :return: An instance of :class: `GameMode`.
         """
-        game_mode = GameMode()
+        with deferred_validation():
+            game_mode = GameMode()
         game_mode.set_from_yaml(yaml, legacy=legacy, infer_legacy=infer_legacy)
         return game_mode
 
@@ -81,7 +147,8 @@ class GameMode(ConfigGroup, DocMetaDataObject):
 
         :return: An instance of :class: `GameMode`.
         """
-        game_mode = GameMode()
+        with deferred_validation():
+            game_mode = GameMode()
         game_mode.set_from_dict(dict, legacy=legacy, infer_legacy=infer_legacy)
         if raise_errors and not game_mode.validation.passed:
             raise ValueError(game_mode.validation.log())
@@ -111,3 +178,100 @@ class GameMode(ConfigGroup, DocMetaDataObject):
             config_dict["_doc_metadata"] = self.doc_metadata.to_dict(include_none=True)
 
         return config_dict
+
+
+class FrozenGameMode:
+    """
+    An immutable snapshot of the values of a :class:`GameMode`.
+
+    Only the config values, the schema version and the doc metadata are
+    stored, so a snapshot pickles without the docs, properties and validation
+    of the config tree and unpickles without revalidating it.
+    """
+
+    __slots__ = ("_values", "_schema_version", "_doc_metadata", "_fingerprint")
+
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        schema_version: int = GAME_MODE_SCHEMA_VERSION,
+        doc_metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        The FrozenGameMode constructor.
+
+        Use :meth:`GameMode.freeze` rather than calling this directly.
+
+        :param values: The nested dict of values from ``GameMode.to_dict(values_only=True)``.
+        :param schema_version: The :data:`GAME_MODE_SCHEMA_VERSION` the values were taken with.
+        :param doc_metadata: The doc metadata of the game mode as a dict.
+        """
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_schema_version", schema_version)
+        object.__setattr__(self, "_doc_metadata", doc_metadata)
+        object.__setattr__(self, "_fingerprint", None)
+
+    @property
+    def schema_version(self) -> int:
+        """The :data:`GAME_MODE_SCHEMA_VERSION` the values were taken with."""
+        return self._schema_version
+
+    @property
+    def fingerprint(self) -> str:
+        """The :attr:`GameMode.fingerprint` of the game mode the snapshot was taken from."""
+        if self._fingerprint is None:
+            object.__setattr__(self, "_fingerprint", _values_fingerprint(self._values))
+        return self._fingerprint
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The values of the snapshot.
+
+        :return: A copy of the nested dict of values.
+        """
+        return copy.deepcopy(self._values)
+
+    def thaw(self) -> GameMode:
+        """
+        Rebuild the full :class:`GameMode`.
+
+        :return: A new instance of :class:`GameMode`.
+        :raises ValueError: If the snapshot was taken with a different
+            :data:`GAME_MODE_SCHEMA_VERSION`.
+        """
+        if self._schema_version != GAME_MODE_SCHEMA_VERSION:
+            raise ValueError(
+                f"Cannot thaw a game mode frozen with schema version "
+                f"{self._schema_version}, expected {GAME_MODE_SCHEMA_VERSION}."
+            )
+        game_mode = GameMode.create(self.to_dict(), infer_legacy=False)
+        if self._doc_metadata is not None:
+            game_mode._doc_metadata = DocMetadata(**self._doc_metadata)
+        return game_mode
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __reduce__(self):
+        return self.__class__, (self._values, self._schema_version, self._doc_metadata)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenGameMode):
+            return (
+                self._schema_version == other._schema_version
+                and self.fingerprint == other.fingerprint
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._schema_version, self.fingerprint))
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"schema_version={self._schema_version}, "
+            f"fingerprint='{self.fingerprint}')"
+        )
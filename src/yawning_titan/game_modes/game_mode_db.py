@@ -1,10 +1,11 @@
 """Provides an API for the ``game_mode.json`` TinyDB file, and a Schema class that defines the game_mode DB fields."""
 from __future__ import annotations
 
+import json
 import os
 from logging import getLogger
 from pathlib import Path
-from typing import Final, List, Optional, Union
+from typing import Dict, Final, List, Optional, Union
 
 from tinydb import TinyDB
 from tinydb.queries import QueryInstance
@@ -16,12 +17,17 @@ from yawning_titan.db.compatibility_query import (
     HighValueNodeCompatibilityQuery,
     NetworkCompatibilityQuery,
     NetworkNodeCompatibilityQuery,
+    check_compatibility,
+    network_counts,
 )
-from yawning_titan.db.doc_metadata import DocMetadata, DocMetadataSchema
+from yawning_titan.db.doc_metadata import DocMetadata
+from yawning_titan.db.doc_summary import SUMMARY_FIELD, SUMMARY_VERSION, DocSummary
 from yawning_titan.db.query import YawningTitanQuery
 from yawning_titan.db.schemas import GameModeConfigurationSchema
 from yawning_titan.db.yawning_titan_db import YawningTitanDB
 from yawning_titan.game_modes.game_mode import GameMode
+from yawning_titan.networks.network import Network
+from yawning_titan.utils.config_cache import config_cache
 
 __all__ = ["GameModeDB", "GameModeSchema"]
 
@@ -94,7 +100,7 @@ class GameModeDB:
         self._db = YawningTitanDB("game_modes")
 
     def __enter__(self) -> GameModeDB:
-        return GameModeDB()
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._db.__exit__(exc_type, exc_val, exc_tb)
@@ -109,11 +115,76 @@ class GameModeDB:
         :param doc: A :class:`tinydb.table.Document`.
         :return: The doc as a :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         """
+        doc = {k: v for k, v in doc.items() if k != SUMMARY_FIELD}
         doc["_doc_metadata"] = DocMetadata(**doc["_doc_metadata"])
         game_mode: GameMode = GameMode()
         game_mode.set_from_dict(doc)
         return game_mode
 
+    @classmethod
+    def _to_doc(cls, game_mode: GameMode, values_only: bool = False) -> dict:
+        """
+        Represent a game mode as a db doc.
+
+        :param game_mode: An instance of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        :param values_only: Whether to only include the config values.
+        :return: The doc.
+        """
+        doc = game_mode.to_dict(
+            json_serializable=True, include_none=True, values_only=values_only
+        )
+        doc[SUMMARY_FIELD] = cls._summarise(game_mode)
+        return doc
+
+    @staticmethod
+    def _summarise(game_mode: GameMode) -> dict:
+        """
+        The summary stored with a game mode doc.
+
+        :param game_mode: An instance of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        :return: Whether the game mode passes validation, and the node count
+            ranges of the networks it can be used with.
+        """
+        return {
+            "version": SUMMARY_VERSION,
+            "valid": game_mode.validation.passed,
+            "network_compatibility": game_mode.game_rules.network_compatibility.to_dict(
+                values_only=True
+            ),
+        }
+
+    def _summarise_doc(self, doc: Document) -> dict:
+        """
+        Summarise a game mode doc that was stored without a summary.
+
+        :param doc: The doc.
+        :return: The summary of the game mode.
+        """
+        return self._summarise(self._load_game_mode(doc))
+
+    def _cache_key(self, uuid: str) -> tuple:
+        """
+        The :class:`~yawning_titan.utils.config_cache.ConfigCache` key of a doc.
+
+        :param uuid: The doc uuid.
+        :return: The cache key.
+        """
+        return "game_mode", str(self._db._path), uuid
+
+    def _load_game_mode(self, doc: Document) -> GameMode:
+        """
+        Get the :class:`~yawning_titan.game_modes.game_mode.GameMode` of a doc, only rebuilding it if the doc has changed.
+
+        :param doc: A :class:`tinydb.table.Document`.
+        :return: A new instance of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        """
+        metadata = doc["_doc_metadata"]
+        return config_cache().get_or_load(
+            self._cache_key(metadata["uuid"]),
+            (metadata.get("created_at"), metadata.get("updated_at")),
+            lambda: self._doc_to_game_mode(doc),
+        )
+
     def insert(
         self,
         game_mode: GameMode,
@@ -134,21 +205,166 @@ class GameModeDB:
         :return: The inserted :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         """
         game_mode.doc_metadata.update(name, description, author)
-        self._db.insert(
-            game_mode.to_dict(
-                json_serializable=True, include_none=True, values_only=True
-            )
-        )
+        config_cache().invalidate(self._cache_key(game_mode.doc_metadata.uuid))
+        self._db.insert(self._to_doc(game_mode, values_only=True))
 
         return game_mode
 
+    def insert_many(self, game_modes: List[GameMode]) -> List[GameMode]:
+        """
+        Insert :class:`~yawning_titan.game_modes.game_mode.GameMode` into the DB with a single write.
+
+        :param game_modes: A list of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        :return: The inserted :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        """
+        for game_mode in game_modes:
+            config_cache().invalidate(self._cache_key(game_mode.doc_metadata.uuid))
+        self._db.insert_many(
+            [self._to_doc(game_mode, values_only=True) for game_mode in game_modes]
+        )
+        return game_modes
+
+    def upsert_many(self, game_modes: List[GameMode]) -> List[GameMode]:
+        """
+        Insert or replace :class:`~yawning_titan.game_modes.game_mode.GameMode` in the DB with a single write.
+
+        :param game_modes: A list of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        :return: The upserted :class:`~yawning_titan.game_modes.game_mode.GameMode`.
+        """
+        for game_mode in game_modes:
+            config_cache().invalidate(self._cache_key(game_mode.doc_metadata.uuid))
+        docs = self._db.upsert_many(
+            [self._to_doc(game_mode) for game_mode in game_modes]
+        )
+        for game_mode, doc in zip(game_modes, docs):
+            game_mode.doc_metadata.updated_at = doc["_doc_metadata"].get("updated_at")
+        return game_modes
+
+    def write_behind(self):
+        """
+        Buffer the writes made in the block and write them to the DB together when it exits.
+
+        See :func:`~yawning_titan.db.yawning_titan_db.YawningTitanDB.write_behind`.
+
+        :Example:
+
+        >>> with db.write_behind():
+        ...     for game_mode in game_modes:
+        ...         db.upsert(game_mode)
+        """
+        return self._db.write_behind()
+
     def all(self) -> List[GameMode]:
         """
         Get all :class:`~yawning_titan.game_modes.game_mode.GameMode` from the game mode DB.
 
         :return: A :class:`list` of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         """
-        return [self._doc_to_game_mode(doc) for doc in self._db.all()]
+        return [self._load_game_mode(doc) for doc in self._db.all()]
+
+    def list_summaries(self) -> List[DocSummary]:
+        """
+        Get the metadata and validity of all game modes without building them.
+
+        :return: A :class:`list` of :class:`~yawning_titan.db.doc_summary.DocSummary`.
+        """
+        return [
+            DocSummary.from_doc(doc) for doc in self._db.summaries(self._summarise_doc)
+        ]
+
+    def search_uuids(self, query: YawningTitanQuery) -> List[str]:
+        """
+        Searches the game modes with a :class:`GameModeSchema` query without building them.
+
+        :param query: A :class:`~yawning_titan.db.query.YawningTitanQuery`.
+        :return: A :class:`list` of the uuids of the matching game modes.
+        """
+        return [doc["_doc_metadata"]["uuid"] for doc in self._db.search(query)]
+
+    def compatible_uuids(
+        self,
+        network: Union[Network, DocSummary, None],
+        include_unbounded: bool = True,
+    ) -> List[str]:
+        """
+        Get the uuids of the game modes that can be used with a network without building them.
+
+        The node counts of the network are checked against the network
+        compatibility ranges stored in each game mode summary, in the same way
+        as :func:`~yawning_titan.db.compatibility_query.NetworkCompatibilityQuery.compatible_with`.
+
+        :param network: An instance of :class:`~yawning_titan.networks.network.Network`,
+            or the :class:`~yawning_titan.db.doc_summary.DocSummary` of one.
+        :param include_unbounded: Whether to include game modes where part of a range is unbounded.
+        :return: A :class:`list` of game mode uuids.
+        """
+        if not isinstance(network, (Network, DocSummary)):
+            return []
+        counts = network_counts(network)
+        return [
+            summary.uuid
+            for summary in self.list_summaries()
+            if check_compatibility(
+                summary.network_compatibility, counts, include_unbounded
+            )
+        ]
+
+    def compatibility_matrix(
+        self,
+        networks: Optional[List[Union[Network, DocSummary]]] = None,
+        include_unbounded: bool = True,
+    ) -> Dict[str, List[str]]:
+        """
+        Get the uuids of the game modes that can be used with each of several networks.
+
+        The matrix is cached per process and only recalculated once the
+        network compatibility of a game mode, or the node counts of a network,
+        change.
+
+        :param networks: A list of :class:`~yawning_titan.networks.network.Network`
+            or :class:`~yawning_titan.db.doc_summary.DocSummary`. Defaults to
+            the summaries of every network in the
+            :class:`~yawning_titan.networks.network_db.NetworkDB`.
+        :param include_unbounded: Whether to include game modes where part of a range is unbounded.
+        :return: A dict of network uuid to the :class:`list` of compatible game mode uuids.
+        """
+        if networks is None:
+            from yawning_titan.networks.network_db import NetworkDB
+
+            with NetworkDB() as db:
+                networks = db.list_summaries()
+        network_counts_by_uuid = {}
+        for n in networks:
+            uuid = n.uuid if isinstance(n, DocSummary) else n.doc_metadata.uuid
+            network_counts_by_uuid[uuid] = network_counts(n)
+        game_modes = self.list_summaries()
+        version = (
+            include_unbounded,
+            tuple(
+                (s.uuid, json.dumps(s.network_compatibility, sort_keys=True))
+                for s in game_modes
+            ),
+            tuple(
+                (uuid, tuple(counts.items()))
+                for uuid, counts in network_counts_by_uuid.items()
+            ),
+        )
+
+        def _load():
+            return {
+                uuid: [
+                    s.uuid
+                    for s in game_modes
+                    if check_compatibility(
+                        s.network_compatibility, counts, include_unbounded
+                    )
+                ]
+                for uuid, counts in network_counts_by_uuid.items()
+            }
+
+        return config_cache().get_or_load(
+            ("compatibility_matrix", str(self._db._path)), version, _load
+        )
 
     def show(self, verbose=False):
         """
@@ -171,9 +387,23 @@ class GameModeDB:
         # self._db.db.clear_cache()
         doc = self._db.get(uuid)
         if doc:
-            return self._doc_to_game_mode(doc)
+            return self._load_game_mode(doc)
         return None
 
+    def get_many(self, uuids: List[str]) -> List[Union[GameMode, None]]:
+        """
+        Get game_mode config documents from their uuids with a single read of the db.
+
+        :param uuids: A list of target document uuids.
+        :return: The game_mode config document of each uuid as an instance of
+            :class:~yawning_titan.game_modes.game_mode.GameMode`, or :class:`None`
+            where the uuid does not exist.
+        """
+        return [
+            self._load_game_mode(doc) if doc else None
+            for doc in self._db.get_many(uuids)
+        ]
+
     def search(self, query: YawningTitanQuery) -> List[GameMode]:
         """
         Searches the :class:`~yawning_titan.game_modes.game_mode.GameMode` with a :class:`GameModeSchema` query.
@@ -183,7 +413,7 @@ class GameModeDB:
         """
         game_mode_configs = []
         for doc in self._db.search(query):
-            game_mode_configs.append(self._doc_to_game_mode(doc))
+            game_mode_configs.append(self._load_game_mode(doc))
         return game_mode_configs
 
     def count(self, cond: Optional[QueryInstance] = None) -> int:
@@ -219,9 +449,10 @@ class GameModeDB:
         """
         # Update the configs metadata
         game_mode.doc_metadata.update(name, description, author)
+        config_cache().invalidate(self._cache_key(game_mode.doc_metadata.uuid))
         # Perform the update and retrieve the returned doc
         doc = self._db.update(
-            game_mode.to_dict(json_serializable=True),
+            self._to_doc(game_mode),
             game_mode.doc_metadata.uuid,
             name,
             description,
@@ -250,8 +481,9 @@ class GameModeDB:
         :return: The upserted :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         """
         game_mode.doc_metadata.update(name, description, author)
+        config_cache().invalidate(self._cache_key(game_mode.doc_metadata.uuid))
         doc = self._db.upsert(
-            game_mode.to_dict(json_serializable=True),
+            self._to_doc(game_mode),
             game_mode.doc_metadata.uuid,
             name,
             description,
@@ -271,6 +503,7 @@ class GameModeDB:
         :param game_mode: An instance of :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         :return: The uuid of the removed :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         """
+        config_cache().invalidate(self._cache_key(game_mode.doc_metadata.uuid))
         return self._db.remove(game_mode.doc_metadata.uuid)
 
     def remove_by_cond(self, cond: QueryInstance) -> List[str]:
@@ -280,7 +513,10 @@ class GameModeDB:
         :param cond: A :class:`~yawning_titan.db.query.YawningTitanQuery`.
         :return: The list of uuids of the removed :class:`~yawning_titan.game_modes.game_mode.GameMode`.
         """
-        return self._db.remove_by_cond(cond)
+        uuids = self._db.remove_by_cond(cond)
+        for uuid in uuids:
+            config_cache().invalidate(self._cache_key(uuid))
+        return uuids
 
     def reset_default_game_modes_in_db(self, force=False):
         """
@@ -303,36 +539,36 @@ class GameModeDB:
 
         # Load the default db file into TinyDB
         default_db = TinyDB(default_game_mode_path)
-
-        # Iterate over all default game_modes, and force an update in the
-        # main GameModeDB by uuid.
-        for game_mode in default_db.all():
-            uuid = game_mode["_doc_metadata"]["uuid"]
-            name = game_mode["_doc_metadata"]["name"]
-
-            # Get the matching game_mode from the game_modes db
-            try:
-                db_game_mode = self.get(uuid)
-            except KeyError:
-                db_game_mode = None
-
-            # If the game_mode doesn't match the default, or it doesn't exist,
-            # perform an upsert.
-            if not force and db_game_mode:
-                reset = False
-            else:
-                reset = True
-            if reset:
-                self._db.db.upsert(game_mode, DocMetadataSchema.UUID == uuid)
-                _LOGGER.info(
-                    f"Reset default game_mode '{name}' in the "
-                    f"{self._db.name} db with uuid='{uuid}'."
-                )
+        default_docs = default_db.all()
 
         # Clear the default db cache and close the file.
         default_db.clear_cache()
         default_db.close()
 
+        # Get the matching docs from the game_modes db, without building them
+        uuids = [doc["_doc_metadata"]["uuid"] for doc in default_docs]
+        db_docs = self._db.get_many(uuids)
+
+        # If a game_mode doesn't match the default, or it doesn't exist,
+        # reset it. All resets are written to the main GameModeDB at once.
+        reset_docs = [
+            doc
+            for doc, db_doc in zip(default_docs, db_docs)
+            if force
+            or db_doc is None
+            or {k: v for k, v in db_doc.items() if k != SUMMARY_FIELD} != doc
+        ]
+        for uuid in uuids:
+            config_cache().invalidate(self._cache_key(uuid))
+        for doc in reset_docs:
+            doc[SUMMARY_FIELD] = self._summarise_doc(doc)
+        self._db.upsert_many(reset_docs, reset=True)
+        for doc in reset_docs:
+            _LOGGER.info(
+                f"Reset default game_mode '{doc['_doc_metadata']['name']}' in the "
+                f"{self._db.name} db with uuid='{doc['_doc_metadata']['uuid']}'."
+            )
+
     def rebuild_db(self):
         """
         Rebuild the db.
@@ -350,8 +586,9 @@ class GameModeDB:
                 function.
         """
         _LOGGER.info(f"Rebuilding the {self._db.name} db.")
-        self._db.db.clear_cache()
-        self._db.db.truncate()
+        with self._db._write_batch():
+            self._db.db.clear_cache()
+            self._db.db.truncate()
         self.reset_default_game_modes_in_db()
 
     def add_yaml_game_modes_to_db(self, directory: Path = None):
@@ -361,10 +598,12 @@ class GameModeDB:
         """
         if directory is None:
             directory = _LIB_CONFIG_ROOT_PATH / "_package_data" / "game_modes"
+        game_modes = []
         for game_mode_path in directory.iterdir():
-            game_mode = GameMode()
-            game_mode.set_from_yaml(game_mode_path, infer_legacy=True)
-            self.insert(game_mode, name=game_mode_path.stem)
+            game_mode = GameMode.create_from_yaml(game_mode_path, infer_legacy=True)
+            game_mode.doc_metadata.update(name=game_mode_path.stem)
+            game_modes.append(game_mode)
+        self.insert_many(game_modes)
 
 
 def default_game_mode() -> GameMode:
@@ -1,6 +1,7 @@
 """Provides a CLI using Typer as an entry point."""
 import os
 import sys
+from typing import Optional
 
 import typer
 
@@ -40,6 +41,58 @@ def reset_db(rebuild: bool = False):
     reset_network_and_game_mode_db_defaults.run(rebuild)
 
 
+@app.command()
+def import_db(directory: str, upsert: bool = False):
+    """
+    Bulk import a directory of network and game mode files into the NetworkDB and GameModeDB.
+
+    Game modes are read from .yaml files, networks from .ytnet binary network
+    files, and either from .json files.
+
+    :param directory: The directory containing the files to import.
+    :param upsert: If True, replace networks and game modes that already
+        exist. Default value is False.
+    """
+    from yawning_titan.utils import import_db_files
+
+    import_db_files.run(directory, upsert)
+
+
+@app.command()
+def sweep(
+    spec: str,
+    output_dir: Optional[str] = None,
+    cpus_per_job: int = 1,
+    max_workers: Optional[int] = None,
+    retry_failed: bool = False,
+):
+    """
+    Run a sweep of YawningTitanRun jobs over game modes, networks, PPO hyperparameters and seeds.
+
+    Running the same sweep again resumes it where it left off.
+
+    :param spec: The path of a .yaml or .json sweep spec file.
+    :param output_dir: The sweep output dir. Defaults to a dir in the agents
+        dir named after the sweep.
+    :param cpus_per_job: The number of CPUs each job may use. Default value is 1.
+    :param max_workers: The number of jobs to run at once. Defaults to as
+        many as the CPU budget allows.
+    :param retry_failed: If True, run jobs that failed in a previous run of
+        the sweep again. Default value is False.
+    """
+    from yawning_titan.yawning_titan_sweep import YawningTitanSweep
+
+    yt_sweep = YawningTitanSweep(
+        spec,
+        output_dir=output_dir,
+        cpus_per_job=cpus_per_job,
+        max_workers=max_workers,
+        retry_failed=retry_failed,
+    )
+    yt_sweep.run()
+    print(yt_sweep.results_path)
+
+
 @app.command()
 def reset_notebooks(overwrite: bool = True):
     """
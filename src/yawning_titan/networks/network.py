@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import math
 import random
 import warnings
-from collections import Counter
+from collections import OrderedDict
 from enum import Enum
 from logging import getLogger
+from pathlib import Path
 from random import sample
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import networkx as nx
 import numpy
@@ -20,15 +33,63 @@ from networkx.drawing.layout import (
     spiral_layout,
     spring_layout,
 )
-from numpy.random import choice
 from tabulate import tabulate
 
 from yawning_titan.db.doc_metadata import DocMetadata
 from yawning_titan.exceptions import NetworkError
+from yawning_titan.networks.network_file import (
+    decode_strings,
+    encode_strings,
+    read_network_file,
+    write_network_file,
+)
 from yawning_titan.networks.node import Node
+from yawning_titan.utils.derived_artifact_cache import derived_artifact_cache
 
 _LOGGER = getLogger(__name__)
 
+_SPECIAL_NODE_FLAGS = ("entry_node", "high_value_node", "deceptive_node")
+
+_NODE_STATUS_BITS: Final[Dict[str, int]] = {
+    "true_compromised_status": 1,
+    "blue_view_compromised_status": 2,
+    "isolated": 4,
+    "deceptive_node": 8,
+    "entry_node": 16,
+    "high_value_node": 32,
+}
+"""The bit of each node flag or status in the node status bitmask."""
+
+ARTIFACT_CACHE_MIN_NODES: Final[int] = 1000
+"""Networks with at least this many nodes keep their eigenvector centrality in the derived artifact cache."""
+
+
+class _TopologyCache(OrderedDict):
+    """
+    A bounded cache of values derived from the topology of a network.
+
+    Deep copies of a network share the cache of the network they were copied
+    from until either of them changes topology, so the episode copies made by
+    the NetworkInterface reuse the values computed on earlier resets.
+    """
+
+    max_entries: int = 64
+
+    def put(self, key: Any, value: Any):
+        """
+        Store a value, evicting the least recently stored value when full.
+
+        :param key: The cache key.
+        :param value: The value to store.
+        """
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+    def __deepcopy__(self, memo):
+        return self
+
 
 class NetworkLayout(Enum):
     """
@@ -79,6 +140,162 @@ class RandomEntryNodePreference(Enum):
     """No preference."""
 
 
+class EntryNodeSampler:
+    """
+    Draws random entry nodes weighted by the eigenvector centrality of the nodes.
+
+    The centrality and the normalised weights for each
+    :class:`RandomEntryNodePreference` are computed once per network topology
+    and kept in the topology cache of the network, which deep copies of the
+    network share, so the episode copies made on each reset reuse them. The
+    centrality is serialised with the network so that it is not recomputed
+    after the network is loaded.
+    """
+
+    def __init__(self, centrality: Optional[Dict[str, float]] = None):
+        """
+        The EntryNodeSampler constructor.
+
+        :param centrality: An optional dict of node uuid to eigenvector
+            centrality, as returned by :meth:`to_dict`.
+        """
+        self._centrality: Optional[Dict[str, float]] = centrality
+        self._topology_version: Optional[int] = None
+
+    def bind(self, network: Network):
+        """
+        Mark any stored centrality as belonging to the current topology of a network.
+
+        The stored centrality is discarded if it does not cover exactly the
+        nodes of the network.
+
+        :param network: The network the sampler belongs to.
+        """
+        if self._centrality is None or set(self._centrality) != set(
+            network._uuid_index()
+        ):
+            self._centrality = None
+            self._topology_version = None
+        else:
+            self._topology_version = network.topology_version
+
+    def weights(
+        self, network: Network, preference: RandomEntryNodePreference
+    ) -> numpy.ndarray:
+        """
+        Get the normalised entry node weights of a network for a preference.
+
+        :param network: The network the sampler belongs to.
+        :param preference: The entry node placement preference.
+        :return: A read-only array of probabilities in network node order.
+        """
+        if self._topology_version != network.topology_version:
+            self._centrality = None
+            self._topology_version = network.topology_version
+
+        key = ("entry_node_weights", preference)
+        weights = network._topology_cache.get(key)
+        if weights is None:
+            if preference == RandomEntryNodePreference.NONE:
+                weights = numpy.ones(network.number_of_nodes())
+            else:
+                weights = self._node_centrality(network)
+                if preference == RandomEntryNodePreference.EDGE:
+                    weights = (1 / weights) ** 4
+                else:
+                    weights = weights**4
+            weights = weights / weights.sum()
+            weights.flags.writeable = False
+            network._topology_cache.put(key, weights)
+        return weights
+
+    def _node_centrality(self, network: Network) -> numpy.ndarray:
+        """
+        Get the eigenvector centrality of the nodes of a network, computing it once per topology.
+
+        :param network: The network the sampler belongs to.
+        :return: The centrality of each node in network node order.
+        """
+        if self._centrality is None:
+            centrality = network._topology_cache.get("eigenvector_centrality")
+            if centrality is None:
+                if network.number_of_nodes() >= ARTIFACT_CACHE_MIN_NODES:
+                    centrality = derived_artifact_cache().get_or_compute(
+                        "eigenvector_centrality",
+                        network.topology_fingerprint,
+                        lambda: self._eigenvector_centrality(network),
+                    )
+                else:
+                    centrality = self._eigenvector_centrality(network)
+                network._topology_cache.put("eigenvector_centrality", centrality)
+            self._centrality = {
+                n.uuid: float(c) for n, c in zip(network.nodes, centrality)
+            }
+        return numpy.array(
+            [self._centrality[n.uuid] for n in network.nodes], dtype=float
+        )
+
+    @staticmethod
+    def _eigenvector_centrality(network: Network) -> numpy.ndarray:
+        """
+        Compute the eigenvector centrality of the nodes of a network.
+
+        :param network: The network.
+        :return: The centrality of each node in network node order.
+        """
+        try:
+            centrality = nx.algorithms.centrality.eigenvector_centrality(
+                network, max_iter=500
+            )
+        except nx.PowerIterationFailedConvergence as e:
+            _LOGGER.debug(e)
+            centrality = {node: 0.5 for node in network.nodes}
+        return numpy.array([centrality[n] for n in network.nodes], dtype=float)
+
+    def sample(
+        self,
+        network: Network,
+        n: int,
+        preference: RandomEntryNodePreference,
+        rng: Optional[numpy.random.Generator] = None,
+    ) -> List[Node]:
+        """
+        Draw distinct entry nodes from a network.
+
+        :param network: The network the sampler belongs to.
+        :param n: The number of entry nodes to draw.
+        :param preference: The entry node placement preference.
+        :param rng: An optional ``numpy.random.Generator``. If ``None`` the
+            global NumPy random state is used.
+        :return: A list of the chosen nodes.
+        """
+        p = self.weights(network, preference)
+        indices = (rng if rng is not None else numpy.random).choice(
+            len(p), n, replace=False, p=p
+        )
+        nodes = list(network.nodes)
+        return [nodes[i] for i in indices]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Represent the `EntryNodeSampler` as a dictionary."""
+        return {"centrality": self._centrality}
+
+    @classmethod
+    def create(cls, sampler_dict: Dict[str, Any]) -> EntryNodeSampler:
+        """
+        Create an instance of :class:`EntryNodeSampler` from a dictionary.
+
+        :param sampler_dict: A dictionary as returned by :meth:`to_dict`.
+        :return: An instance of :class:`EntryNodeSampler`.
+        """
+        return cls(centrality=sampler_dict.get("centrality"))
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.to_dict() == other.to_dict()
+        return False
+
+
 class Network(nx.Graph):
     """
     A Network that the NetworkInterface interacts with.
@@ -131,6 +348,17 @@ class Network(nx.Graph):
         :param node_vulnerability_upper_bound: The upper-bound of a nodes
             vulnerability score. Default value of 0.01.
         """
+        self._special_node_sets: Optional[Dict[str, set]] = None
+        self._special_node_cache: Dict[str, Tuple[List[Node], numpy.ndarray]] = {}
+        self._node_positions: Optional[Dict[Node, int]] = None
+        self._node_list: Optional[List[Node]] = None
+        self._status_bits: Optional[numpy.ndarray] = None
+        self._topology_version: int = 0
+        self._topology_cache = _TopologyCache()
+        self._content_version: int = 0
+        self._node_content_digest: Optional[Tuple[int, str]] = None
+        self._entry_node_sampler = EntryNodeSampler()
+
         super().__init__()
         self.set_random_entry_nodes = set_random_entry_nodes
         """If no entry nodes are added, set them at random. Default is ``False``."""
@@ -161,17 +389,32 @@ class Network(nx.Graph):
     @property
     def high_value_nodes(self) -> List[Node]:
         """A list of the high value nodes in the network."""
-        return [n for n in self.nodes if n.high_value_node]
+        return list(self._get_special_nodes("high_value_node")[0])
 
     @property
     def entry_nodes(self) -> List[Node]:
         """A list of the entry nodes in the network."""
-        return [n for n in self.nodes if n.entry_node]
+        return list(self._get_special_nodes("entry_node")[0])
 
     @property
     def deceptive_nodes(self) -> List[Node]:
         """A list of the deceptive nodes in the network."""
-        return [n for n in self.nodes if n.deceptive_node]
+        return list(self._get_special_nodes("deceptive_node")[0])
+
+    @property
+    def high_value_node_indices(self) -> numpy.ndarray:
+        """A read-only array of the positions of the high value nodes in the network node order."""
+        return self._get_special_nodes("high_value_node")[1]
+
+    @property
+    def entry_node_indices(self) -> numpy.ndarray:
+        """A read-only array of the positions of the entry nodes in the network node order."""
+        return self._get_special_nodes("entry_node")[1]
+
+    @property
+    def deceptive_node_indices(self) -> numpy.ndarray:
+        """A read-only array of the positions of the deceptive nodes in the network node order."""
+        return self._get_special_nodes("deceptive_node")[1]
 
     @property
     def node_vulnerability_lower_bound(self) -> float:
@@ -192,6 +435,86 @@ class Network(nx.Graph):
         """The configs document metadata."""
         return self._doc_metadata
 
+    @property
+    def entry_node_sampler(self) -> EntryNodeSampler:
+        """The sampler used to choose random entry nodes."""
+        return self._entry_node_sampler
+
+    @entry_node_sampler.setter
+    def entry_node_sampler(self, sampler: Union[EntryNodeSampler, Dict[str, Any]]):
+        # take a copy so that a sampler is never shared between networks
+        if isinstance(sampler, EntryNodeSampler):
+            sampler = sampler.to_dict()
+        sampler = EntryNodeSampler.create(sampler)
+        sampler.bind(self)
+        self._entry_node_sampler = sampler
+
+    @property
+    def topology_version(self) -> int:
+        """A counter that is incremented whenever a node or edge is added or removed."""
+        return self._topology_version
+
+    @property
+    def topology_fingerprint(self) -> str:
+        """
+        A hex digest of the number of nodes and the edges between them in node order.
+
+        Node uuids are not included, so identically built networks share a
+        fingerprint. It is computed once per topology and can be used to
+        key anything derived from the topology alone, e.g. centrality.
+        """
+        fingerprint = self._topology_cache.get("topology_fingerprint")
+        if fingerprint is None:
+            index = {node: i for i, node in enumerate(self._node)}
+            edges = numpy.array(
+                [(index[u], index[v]) for u, v in self.edges], dtype="<i8"
+            ).reshape(-1, 2)
+            edges.sort(axis=1)
+            edges = edges[numpy.lexsort((edges[:, 1], edges[:, 0]))]
+            digest = hashlib.sha256(f"{len(index)},{len(edges)};".encode("utf-8"))
+            digest.update(edges.tobytes())
+            fingerprint = digest.hexdigest()
+            self._topology_cache.put("topology_fingerprint", fingerprint)
+        return fingerprint
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A hex digest of the topology, the node attributes and the network settings.
+
+        Unlike ``hash(network)``, which only uses the doc metadata uuid, the
+        fingerprint follows the content of the network: it changes whenever
+        the network is edited and networks with the same content share it.
+        The node part is cached until a node is added, removed or edited.
+        """
+        if (
+            self._node_content_digest is None
+            or self._node_content_digest[0] != self._content_version
+        ):
+            node_attrs = [
+                [
+                    n.name,
+                    n.high_value_node,
+                    n.entry_node,
+                    n.vulnerability,
+                    n.x_pos,
+                    n.y_pos,
+                ]
+                for n in self._node
+            ]
+            digest = hashlib.sha256(json.dumps(node_attrs).encode("utf-8"))
+            self._node_content_digest = (self._content_version, digest.hexdigest())
+
+        settings = {
+            k: v
+            for k, v in self.to_dict().items()
+            if k not in ["nodes", "edges", "entry_node_sampler", "_doc_metadata"]
+        }
+        digest = hashlib.sha256(self.topology_fingerprint.encode("utf-8"))
+        digest.update(self._node_content_digest[1].encode("utf-8"))
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
     @node_vulnerability_lower_bound.setter
     def node_vulnerability_lower_bound(self, x: float):
         if x is None or x <= 0:
@@ -216,11 +539,23 @@ class Network(nx.Graph):
 
         if the `node_for_adding` is a special node then check that there are no intersections between hvn and entry_node's.
         """
-        if node_for_adding not in self.nodes:
+        if node_for_adding not in self._node:
             super().add_node(node_for_adding, **kwargs)
+            self._nodes_added([node_for_adding])
             if node_for_adding.entry_node or node_for_adding.high_value_node:
                 self._check_intersect(node_for_adding)
 
+    def add_nodes_from(self, nodes_for_adding: Iterable[Node], **attr):
+        """
+        Add multiple nodes to the network.
+
+        Extend the `add_nodes_from` method of the superclass.
+        """
+        nodes_for_adding = list(nodes_for_adding)
+        new_nodes = self._new_nodes(nodes_for_adding)
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self._nodes_added(new_nodes)
+
     def remove_node(self, n: Node):
         """
         Remove a node from the network.
@@ -228,6 +563,27 @@ class Network(nx.Graph):
         Extend the `remove_node` method of the superclass.
         """
         super().remove_node(n)
+        self._nodes_removed([n])
+
+    def remove_nodes_from(self, nodes: Iterable[Node]):
+        """
+        Remove multiple nodes from the network.
+
+        Extend the `remove_nodes_from` method of the superclass.
+        """
+        nodes = [n for n in dict.fromkeys(nodes) if n in self._node]
+        super().remove_nodes_from(nodes)
+        self._nodes_removed(nodes)
+
+    def clear(self):
+        """
+        Remove all nodes and edges from the network.
+
+        Extend the `clear` method of the superclass.
+        """
+        nodes = list(self._node)
+        super().clear()
+        self._nodes_removed(nodes)
 
     def add_edge(self, u_of_edge: Node, v_of_edge: Node, **kwargs):
         """
@@ -235,7 +591,22 @@ class Network(nx.Graph):
 
         Extend the `add_edge` method of the superclass.
         """
+        new_nodes = self._new_nodes([u_of_edge, v_of_edge])
         super().add_edge(u_of_edge, v_of_edge, **kwargs)
+        self._nodes_added(new_nodes)
+        self._topology_changed()
+
+    def add_edges_from(self, ebunch_to_add: Iterable[Tuple[Node, ...]], **attr):
+        """
+        Add multiple edges to the network.
+
+        Extend the `add_edges_from` method of the superclass.
+        """
+        ebunch_to_add = list(ebunch_to_add)
+        new_nodes = self._new_nodes(n for e in ebunch_to_add for n in e[:2])
+        super().add_edges_from(ebunch_to_add, **attr)
+        self._nodes_added(new_nodes)
+        self._topology_changed()
 
     def remove_edge(self, u: Node, v: Node):
         """
@@ -244,6 +615,16 @@ class Network(nx.Graph):
         Extend the `remove_edge` method of the superclass.
         """
         super().remove_edge(u, v)
+        self._topology_changed()
+
+    def remove_edges_from(self, ebunch: Iterable[Tuple[Node, ...]]):
+        """
+        Remove multiple edges from the network.
+
+        Extend the `remove_edges_from` method of the superclass.
+        """
+        super().remove_edges_from(ebunch)
+        self._topology_changed()
 
     def reset(self):
         """
@@ -314,6 +695,8 @@ class Network(nx.Graph):
         """
         Get all of the nodes from the network and apply a filter(s) to extract a specific subset of the nodes.
 
+        The filters are applied as a single mask over the node status bitmask.
+
         Args:
             filter_true_compromised: Filter so only nodes that are compromised remain
             filter_blue_view_compromised: Filter so only nodes that blue can see are compromised remain
@@ -327,31 +710,21 @@ class Network(nx.Graph):
         Returns:
             A list of nodes
         """
-        nodes = self.nodes
-        if filter_true_compromised:
-            # Return true if compromised status is 1
-            nodes = [n for n in nodes if n.true_compromised_status == 1]
-        if filter_blue_view_compromised:
-            # Return True if blue view compromised status is 1
-            nodes = [n for n in nodes if n.blue_view_compromised_status == 1]
-        if filter_true_safe:
-            # Return True if compromised status is 0
-            nodes = [n for n in nodes if n.true_compromised_status == 0]
-        if filter_blue_view_safe:
-            # Return True if blue view compromised status is 0
-            nodes = [n for n in nodes if n.blue_view_compromised_status == 0]
-        if filter_isolated:
-            # Return True if isolated is True
-            nodes = [n for n in nodes if n.isolated]
-        if filter_non_isolated:
-            # Return True if isolated is False
-            nodes = [n for n in nodes if not n.isolated]
-        if filter_deceptive:
-            # Return True if deceptive node is True
-            nodes = [n for n in nodes if n.deceptive_node]
-        if filter_non_deceptive:
-            # Return True if deceptive node is False
-            nodes = [n for n in nodes if not n.deceptive_node]
+        indices = self.get_node_indices(
+            filter_true_compromised=filter_true_compromised,
+            filter_blue_view_compromised=filter_blue_view_compromised,
+            filter_true_safe=filter_true_safe,
+            filter_blue_view_safe=filter_blue_view_safe,
+            filter_isolated=filter_isolated,
+            filter_non_isolated=filter_non_isolated,
+            filter_deceptive=filter_deceptive,
+            filter_non_deceptive=filter_non_deceptive,
+        )
+        if indices is None:
+            nodes = self.nodes
+        else:
+            node_list = self._node_list
+            nodes = [node_list[i] for i in indices.tolist()]
 
         if key_by_name:
             return {n.name: n for n in nodes}
@@ -361,6 +734,149 @@ class Network(nx.Graph):
 
         return nodes
 
+    def get_node_indices(
+        self,
+        filter_true_compromised: bool = False,
+        filter_blue_view_compromised: bool = False,
+        filter_true_safe: bool = False,
+        filter_blue_view_safe: bool = False,
+        filter_isolated: bool = False,
+        filter_non_isolated: bool = False,
+        filter_deceptive: bool = False,
+        filter_non_deceptive: bool = False,
+    ) -> Optional[numpy.ndarray]:
+        """
+        Get the positions in the network node order of the nodes that pass a filter(s).
+
+        Takes the same filters as :meth:`get_nodes`.
+
+        Returns:
+            An int array of node positions, or None if no filter is applied
+        """
+        required, excluded = self._status_filter(
+            filter_true_compromised,
+            filter_blue_view_compromised,
+            filter_true_safe,
+            filter_blue_view_safe,
+            filter_isolated,
+            filter_non_isolated,
+            filter_deceptive,
+            filter_non_deceptive,
+        )
+        if not (required or excluded):
+            return None
+        bits = self._get_status_bits()
+        if required & excluded:
+            return numpy.zeros(0, dtype=numpy.int64)
+        return numpy.flatnonzero((bits & (required | excluded)) == required)
+
+    def count_nodes(
+        self,
+        filter_true_compromised: bool = False,
+        filter_blue_view_compromised: bool = False,
+        filter_true_safe: bool = False,
+        filter_blue_view_safe: bool = False,
+        filter_isolated: bool = False,
+        filter_non_isolated: bool = False,
+        filter_deceptive: bool = False,
+        filter_non_deceptive: bool = False,
+    ) -> int:
+        """
+        Count the nodes that pass a filter(s) without building a list of them.
+
+        Takes the same filters as :meth:`get_nodes`.
+
+        Returns:
+            The number of nodes
+        """
+        required, excluded = self._status_filter(
+            filter_true_compromised,
+            filter_blue_view_compromised,
+            filter_true_safe,
+            filter_blue_view_safe,
+            filter_isolated,
+            filter_non_isolated,
+            filter_deceptive,
+            filter_non_deceptive,
+        )
+        if not (required or excluded):
+            return self.number_of_nodes()
+        if required & excluded:
+            return 0
+        bits = self._get_status_bits()
+        return int(numpy.count_nonzero((bits & (required | excluded)) == required))
+
+    @staticmethod
+    def _status_filter(
+        filter_true_compromised: bool,
+        filter_blue_view_compromised: bool,
+        filter_true_safe: bool,
+        filter_blue_view_safe: bool,
+        filter_isolated: bool,
+        filter_non_isolated: bool,
+        filter_deceptive: bool,
+        filter_non_deceptive: bool,
+    ) -> Tuple[int, int]:
+        """
+        Convert the :meth:`get_nodes` filters to the status bits that must be set and must be clear.
+
+        :return: A tuple of the required bits and the excluded bits.
+        """
+        required = excluded = 0
+        for flag, set_filter, clear_filter in (
+            ("true_compromised_status", filter_true_compromised, filter_true_safe),
+            (
+                "blue_view_compromised_status",
+                filter_blue_view_compromised,
+                filter_blue_view_safe,
+            ),
+            ("isolated", filter_isolated, filter_non_isolated),
+            ("deceptive_node", filter_deceptive, filter_non_deceptive),
+        ):
+            if set_filter:
+                required |= _NODE_STATUS_BITS[flag]
+            if clear_filter:
+                excluded |= _NODE_STATUS_BITS[flag]
+        return required, excluded
+
+    @staticmethod
+    def _node_status_bits(nodes: Iterable[Node]) -> numpy.ndarray:
+        """
+        Build the status bitmask of some nodes.
+
+        :param nodes: The nodes.
+        :return: A uint8 array of the status bits of each node.
+        """
+        return numpy.fromiter(
+            (
+                (n.true_compromised_status == 1)
+                | (n.blue_view_compromised_status == 1) << 1
+                | bool(n.isolated) << 2
+                | bool(n.deceptive_node) << 3
+                | bool(n.entry_node) << 4
+                | bool(n.high_value_node) << 5
+                for n in nodes
+            ),
+            dtype=numpy.uint8,
+        )
+
+    def _get_status_bits(self) -> numpy.ndarray:
+        """
+        Get the status bitmask of the nodes in the network node order.
+
+        The bitmask is built on first access and then kept up to date by the
+        node setters and the network mutation methods.
+
+        :return: A uint8 array with the bits of ``_NODE_STATUS_BITS`` set for
+            each node.
+        """
+        if self._status_bits is None:
+            if self._node_positions is None:
+                self._node_positions = {n: i for i, n in enumerate(self._node)}
+            self._node_list = list(self._node)
+            self._status_bits = self._node_status_bits(self._node_list)
+        return self._status_bits
+
     def get_node_from_uuid(self, uuid: str) -> Union[Node, None]:
         """Return the first node that has a given uuid."""
         for node in self.nodes:
@@ -385,22 +901,166 @@ class Network(nx.Graph):
             self.node_vulnerability_lower_bound, self.node_vulnerability_upper_bound
         )
 
-    def _check_intersect(self, node: Node):
-        """Check that high value nodes and entry nodes do not overlap."""
-        if self.entry_nodes and self.high_value_nodes:
-            uuids_intersect = [
-                n.uuid for n in set(self.entry_nodes) & set(self.high_value_nodes)
-            ]
-            if uuids_intersect:
-                if node.uuid in uuids_intersect:
-                    node_str = str(node)
-                    warnings.warn(
-                        UserWarning(
-                            f"Entry nodes and high value nodes intersect at node "
-                            f"'{node_str}', and may cause the training to end "
-                            f"prematurely."
-                        )
+    def _new_nodes(self, nodes: Iterable) -> List[Node]:
+        """
+        Get the nodes that are not yet in the network, in order of first appearance.
+
+        :param nodes: Nodes, or ``(node, attr_dict)`` tuples, about to be added.
+        :return: A list of the nodes that will be new to the network.
+        """
+        new_nodes = {}
+        for n in nodes:
+            try:
+                is_new = n not in self._node
+            except TypeError:
+                n = n[0]
+                is_new = n not in self._node
+            if is_new:
+                new_nodes[n] = None
+        return list(new_nodes)
+
+    def _nodes_added(self, nodes: List[Node]):
+        """
+        Register nodes that have been added to the network and index any special nodes.
+
+        :param nodes: The new nodes, in the order they were added.
+        """
+        if not nodes:
+            return
+        self._topology_changed()
+        for node in nodes:
+            node._add_network(self)
+        if self._node_positions is not None:
+            for node in nodes:
+                self._node_positions[node] = len(self._node_positions)
+        if self._status_bits is not None:
+            self._node_list.extend(nodes)
+            self._status_bits = numpy.concatenate(
+                [self._status_bits, self._node_status_bits(nodes)]
+            )
+        if self._special_node_sets is not None:
+            for flag, members in self._special_node_sets.items():
+                special = [node for node in nodes if getattr(node, flag)]
+                if special:
+                    members.update(special)
+                    self._special_node_cache.pop(flag, None)
+
+    def _nodes_removed(self, nodes: List[Node]):
+        """
+        Deregister nodes that have been removed from the network and drop them from the indexes.
+
+        :param nodes: The removed nodes.
+        """
+        for node in nodes:
+            node._remove_network(self)
+        if nodes:
+            self._topology_changed()
+            if self._special_node_sets is not None:
+                for members in self._special_node_sets.values():
+                    members.difference_update(nodes)
+            # the positions of the remaining nodes have shifted
+            self._node_positions = None
+            self._node_list = None
+            self._status_bits = None
+            self._special_node_cache.clear()
+
+    def _topology_changed(self):
+        """Increment the topology version and detach from any cache shared with copies of the network."""
+        self._topology_version += 1
+        self._content_version += 1
+        self._topology_cache = _TopologyCache()
+
+    def _node_attribute_changed(self, node: Node):
+        """
+        Invalidate the cached node part of the :attr:`fingerprint`.
+
+        Called by the :class:`~yawning_titan.networks.node.Node` property
+        setters.
+
+        :param node: The node that has changed.
+        """
+        self._content_version += 1
+
+    def _node_flag_changed(self, node: Node, flag: str, value: bool):
+        """
+        Update the node status bitmask and the special node indexes after a flag or status has been set on a node.
+
+        Called by the :class:`~yawning_titan.networks.node.Node` property
+        setters.
+
+        :param node: The node whose flag has been set.
+        :param flag: The name of the flag or status.
+        :param value: The new value of the flag, or whether the status is set.
+        """
+        if self._status_bits is not None:
+            bit = _NODE_STATUS_BITS[flag]
+            i = self._node_positions[node]
+            if value:
+                self._status_bits[i] |= bit
+            else:
+                self._status_bits[i] &= 0xFF ^ bit
+        if flag not in _SPECIAL_NODE_FLAGS:
+            return
+        if flag != "deceptive_node":
+            self._content_version += 1
+        if self._special_node_sets is None:
+            return
+        members = self._special_node_sets[flag]
+        if value and node not in members:
+            members.add(node)
+        elif not value and node in members:
+            members.discard(node)
+        else:
+            return
+        self._special_node_cache.pop(flag, None)
+
+    def _get_special_nodes(self, flag: str) -> Tuple[List[Node], numpy.ndarray]:
+        """
+        Get the nodes with a special node flag set and their positions in the node order.
+
+        The indexes are built on first access and then kept up to date by the
+        node setters and the network mutation methods.
+
+        :param flag: The name of the flag.
+        :return: A tuple of the nodes in network order and a read-only array
+            of their positions.
+        """
+        cached = self._special_node_cache.get(flag)
+        if cached is None:
+            if self._special_node_sets is None:
+                self._special_node_sets = {
+                    f: {n for n in self._node if getattr(n, f)}
+                    for f in _SPECIAL_NODE_FLAGS
+                }
+            if self._node_positions is None:
+                self._node_positions = {n: i for i, n in enumerate(self._node)}
+            nodes = sorted(
+                self._special_node_sets[flag], key=self._node_positions.__getitem__
+            )
+            indices = numpy.array(
+                [self._node_positions[n] for n in nodes], dtype=numpy.int64
+            )
+            indices.flags.writeable = False
+            cached = self._special_node_cache[flag] = (nodes, indices)
+        return cached
+
+    def _check_intersect(self, node: Optional[Node] = None):
+        """
+        Check that high value nodes and entry nodes do not overlap.
+
+        :param node: The node to check. If ``None``, every entry node in the
+            network is checked.
+        """
+        nodes = self._get_special_nodes("entry_node")[0] if node is None else [node]
+        for n in nodes:
+            if n.entry_node and n.high_value_node:
+                warnings.warn(
+                    UserWarning(
+                        f"Entry nodes and high value nodes intersect at node "
+                        f"'{str(n)}', and may cause the training to end "
+                        f"prematurely."
                     )
+                )
 
     def set_from_dict(
         self,
@@ -484,12 +1144,17 @@ class Network(nx.Graph):
         :param nodes_dict: a dictionary of node uuids to properties
         :param remove_existing: a boolean to indicate whether to remove existing nodes
         """
-        nodes = [*self.nodes]
         if remove_existing:
-            for n in nodes:
-                self.remove_node(n)
-        for uuid, attrs in nodes_dict.items():
-            self.add_node(Node.create_from_db(**attrs))
+            self.remove_nodes_from([*self.nodes])
+        uuid_index = self._uuid_index()
+        nodes = [
+            Node.create_from_db(**attrs)
+            for attrs in nodes_dict.values()
+            if attrs["uuid"] not in uuid_index
+        ]
+        self.add_nodes_from(nodes)
+        for node in nodes:
+            self._check_intersect(node)
 
     def add_edges_from_dict(self, edges_dict: Dict[str, dict], remove_existing=False):
         """Add edges to the graph with properties defined from a dictionary.
@@ -497,49 +1162,36 @@ class Network(nx.Graph):
         :param edges_dict: a dictionary of edge uuids to properties
         :param remove_existing: a boolean to indicate whether to remove existing edges
         """
-        edge_tuples = []
         if remove_existing:
-            for e in self.edges:
-                self.remove_edge(e)
-        for uuid_u, edges in edges_dict.items():
-            for uuid_v in edges.keys():
-                edge_tuple = tuple(sorted([uuid_u, uuid_v]))
-                if edge_tuple not in edge_tuples:
-                    edge_tuples.append(edge_tuple)
-                    node_u = self.get_node_from_uuid(edge_tuple[0])
-                    node_v = self.get_node_from_uuid(edge_tuple[1])
-                    self.add_edge(node_u, node_v)
-
-    def reset_random_entry_nodes(self):
+            self.remove_edges_from([*self.edges])
+        uuid_index = self._uuid_index()
+        self.add_edges_from(
+            (uuid_index[uuid_u], uuid_index[uuid_v])
+            for uuid_u, edges in edges_dict.items()
+            for uuid_v in edges.keys()
+        )
+
+    def _uuid_index(self) -> Dict[str, Node]:
+        """A dict of node uuid to node for every node in the network."""
+        return {node.uuid: node for node in self.nodes}
+
+    def reset_random_entry_nodes(self, rng: Optional[numpy.random.Generator] = None):
         """
         Set the entry nodes.
 
-        If no entry nodes supplied then the first node in the network is chosen as the initial node.
+        The entry nodes are drawn by the :attr:`entry_node_sampler` using the
+        `random_entry_node_preference`.
+
+        :param rng: An optional ``numpy.random.Generator`` to draw the entry
+            nodes with. If ``None`` the global NumPy random state is used.
         """
-        try:
-            node_dict = nx.algorithms.centrality.eigenvector_centrality(
-                self, max_iter=500
+        entry_nodes = set(
+            self._entry_node_sampler.sample(
+                self,
+                self.num_of_random_entry_nodes,
+                self.random_entry_node_preference,
+                rng,
             )
-        except nx.PowerIterationFailedConvergence as e:
-            _LOGGER.debug(e)
-            node_dict = {node: 0.5 for node in self.nodes()}
-        weights = list(node_dict.values())
-        all_nodes = list(node_dict.keys())
-
-        if self.random_entry_node_preference == RandomEntryNodePreference.EDGE:
-            weights = list(map(lambda x: (1 / x) ** 4, weights))
-        elif self.random_entry_node_preference == RandomEntryNodePreference.CENTRAL:
-            weights = list(map(lambda x: x**4, weights))
-        elif self.random_entry_node_preference == RandomEntryNodePreference.NONE:
-            weights = [1] * len(all_nodes)
-
-        weights_normal = [float(i) / sum(weights) for i in weights]
-
-        entry_nodes = choice(
-            all_nodes,
-            self.num_of_random_entry_nodes,
-            replace=False,
-            p=weights_normal,
         )
 
         for node in self.nodes:
@@ -589,35 +1241,20 @@ class Network(nx.Graph):
         possible_high_value_nodes = []
         # chooses a random node to be the high value node
         if self.random_high_value_node_preference == RandomHighValueNodePreference.NONE:
-            possible_high_value_nodes = list(
-                set(self.nodes).difference(set(self.entry_nodes))
-            )
+            possible_high_value_nodes = [n for n in self.nodes if not n.entry_node]
         # Choose the node that is the furthest away from the entry points as the high value node
         elif (
             self.random_high_value_node_preference.FURTHEST_AWAY_FROM_ENTRY
             == RandomHighValueNodePreference.FURTHEST_AWAY_FROM_ENTRY
         ):
-            # gets all the paths between nodes
-            paths = []
-            for n in self.entry_nodes:
-                paths.append(dict(nx.all_pairs_shortest_path_length(self))[n])
-            sums = Counter()
-            counters = Counter()
-            # gets the distances to the entry points
-            for itemset in paths:
-                sums.update(itemset)
-                counters.update(itemset.keys())
-            # averages the distances to find the node that is, on average, the furthest away
-            result = {x: float(sums[x]) / counters[x] for x in sums.keys()}
-            for _ in range(self.num_possible_high_value_nodes):
-                current = max(result, key=result.get)
-                possible_high_value_nodes.append(current)
-                result.pop(current)
-
             # prevent high value nodes from becoming entry nodes
-            possible_high_value_nodes = list(
-                set(possible_high_value_nodes).difference(self.entry_nodes)
-            )
+            possible_high_value_nodes = [
+                n
+                for n in self._furthest_from_entry_nodes(
+                    self.num_possible_high_value_nodes
+                )
+                if not n.entry_node
+            ]
         # randomly pick unique nodes from a list of possible high value nodes
 
         if (
@@ -633,9 +1270,11 @@ class Network(nx.Graph):
             )
             warnings.warn(UserWarning(msg))
 
-        high_value_nodes = sample(
-            set(possible_high_value_nodes),
-            number_of_high_value_nodes,
+        high_value_nodes = set(
+            sample(
+                possible_high_value_nodes,
+                number_of_high_value_nodes,
+            )
         )
         for node in self.nodes:
             if node in high_value_nodes:
@@ -644,6 +1283,55 @@ class Network(nx.Graph):
                 node.high_value_node = False
             self._check_intersect(node)
 
+    def _furthest_from_entry_nodes(self, k: int) -> List[Node]:
+        """
+        Get the ``k`` nodes with the greatest mean shortest path length to the entry nodes.
+
+        A breadth first search is run from each entry node only and the mean
+        is taken over the entry nodes that can reach each node. Ties are
+        broken by the order in which the searches first reach the nodes. The
+        result is cached for the current topology and set of entry nodes.
+
+        :param k: The number of nodes to return.
+        :return: The nodes in descending order of mean distance.
+        """
+        entry_indices = self.entry_node_indices
+        key = ("furthest_from_entry", k, entry_indices.tobytes())
+        ranked = self._topology_cache.get(key)
+        if ranked is None:
+            n_nodes = self.number_of_nodes()
+            position = {n: i for i, n in enumerate(self._node)}
+            sums = numpy.zeros(n_nodes)
+            counts = numpy.zeros(n_nodes, dtype=numpy.int64)
+            first_seen = numpy.full(n_nodes, n_nodes, dtype=numpy.int64)
+            n_seen = 0
+            for entry_node in self.entry_nodes:
+                lengths = nx.single_source_shortest_path_length(self, entry_node)
+                reached = numpy.fromiter(
+                    (position[n] for n in lengths), dtype=numpy.int64, count=len(lengths)
+                )
+                sums[reached] += numpy.fromiter(
+                    lengths.values(), dtype=numpy.float64, count=len(lengths)
+                )
+                counts[reached] += 1
+                new = reached[first_seen[reached] == n_nodes]
+                first_seen[new] = numpy.arange(n_seen, n_seen + len(new))
+                n_seen += len(new)
+
+            candidates = numpy.flatnonzero(counts)
+            neg_mean = -sums[candidates] / counts[candidates]
+            if k < len(candidates):
+                # partial sort: keep everything tied with the k-th largest mean
+                kth = numpy.partition(neg_mean, k - 1)[k - 1]
+                keep = neg_mean <= kth
+                candidates, neg_mean = candidates[keep], neg_mean[keep]
+            order = numpy.lexsort((first_seen[candidates], neg_mean))[:k]
+            ranked = candidates[order]
+            self._topology_cache.put(key, ranked)
+
+        nodes = list(self._node)
+        return [nodes[i] for i in ranked]
+
     def reset_random_vulnerabilities(self):
         """Regenerate random vulnerabilities for every node in the network."""
         if self.set_random_vulnerabilities:
@@ -671,6 +1359,7 @@ class Network(nx.Graph):
             "set_random_vulnerabilities": self.set_random_vulnerabilities,
             "node_vulnerability_lower_bound": self.node_vulnerability_lower_bound,
             "node_vulnerability_upper_bound": self.node_vulnerability_upper_bound,
+            "entry_node_sampler": self.entry_node_sampler,
             "nodes": self.__dict__["_node"],
             "edges": self.__dict__["_adj"],
             "_doc_metadata": self.doc_metadata,
@@ -682,24 +1371,264 @@ class Network(nx.Graph):
                 for k, v in d["edges"].items()
             }
             d["_doc_metadata"] = d["_doc_metadata"].to_dict()
+            d["entry_node_sampler"] = d["entry_node_sampler"].to_dict()
         return d
 
     def to_adj_matrix_and_positions(self) -> Tuple[numpy.array, Dict[str, List[float]]]:
         """Represent the network by its adjacency matrix and a dictionary of node names to positions."""
         return nx.to_numpy_array(self), {n.name: n.node_position for n in self.nodes}
 
+    @classmethod
+    def from_arrays(
+        cls,
+        node_attrs: Dict[str, Sequence],
+        edge_index: Union[numpy.ndarray, Sequence[Sequence[int]]],
+        positions: Optional[Union[numpy.ndarray, Sequence[Sequence[float]]]] = None,
+        **kwargs,
+    ) -> Network:
+        """
+        Bulk construct an instance of :class:`Network` from arrays.
+
+        The inputs are validated once, the nodes and edges are each added in a
+        single pass and the entry node and high value node intersection check
+        is run once at the end.
+
+        :param node_attrs: A dict of equal length node attribute columns keyed
+            by ``uuid``, ``name``, ``high_value_node``, ``entry_node`` or
+            ``vulnerability``. Missing columns take the :class:`Node` defaults.
+        :param edge_index: An array of shape ``(n_edges, 2)`` of node index
+            pairs. Each undirected edge is added once, in order of first
+            appearance.
+        :param positions: An optional array of shape ``(n_nodes, 2)`` of node
+            x,y positions.
+        :param kwargs: Keyword arguments passed to the :class:`Network`
+            constructor.
+        :return: An instance of :class:`Network`.
+        :raises NetworkError: If the node attributes, positions and edge index
+            are inconsistent.
+        """
+        defaults = {
+            "uuid": None,
+            "name": None,
+            "high_value_node": False,
+            "entry_node": False,
+            "vulnerability": 0.01,
+        }
+        unknown = set(node_attrs).difference(defaults)
+        columns = {
+            k: v.tolist() if isinstance(v, numpy.ndarray) else list(v)
+            for k, v in node_attrs.items()
+        }
+        lengths = {len(v) for v in columns.values()}
+        if positions is not None:
+            if isinstance(positions, numpy.ndarray):
+                positions = positions.reshape(-1, 2).tolist()
+            lengths.add(len(positions))
+        n_nodes = lengths.pop() if len(lengths) == 1 else 0
+        edges = numpy.asarray(edge_index, dtype=numpy.int64).reshape(-1, 2)
+
+        msg = None
+        if unknown:
+            msg = f"Unknown node attributes: {sorted(unknown)}."
+        elif lengths:
+            msg = "The node attributes and positions must all have the same length."
+        elif len(edges) and (edges.min() < 0 or edges.max() >= n_nodes):
+            msg = f"The edge index must only reference nodes 0 to {n_nodes - 1}."
+        if msg:
+            try:
+                raise NetworkError(msg)
+            except NetworkError as e:
+                _LOGGER.critical(e)
+                raise e
+
+        nodes = []
+        for i in range(n_nodes):
+            attrs = {k: columns[k][i] if k in columns else v for k, v in defaults.items()}
+            uuid = attrs.pop("uuid")
+            node = Node(**attrs)
+            if uuid is not None:
+                node._uuid = uuid
+            if positions is not None:
+                node.x_pos, node.y_pos = positions[i]
+            nodes.append(node)
+
+        # keep the first occurrence of each undirected edge
+        if len(edges):
+            keys = numpy.sort(edges, axis=1) @ numpy.array([n_nodes, 1])
+            _, first = numpy.unique(keys, return_index=True)
+            edges = edges[numpy.sort(first)]
+
+        network = cls(**kwargs)
+        network.add_nodes_from(nodes)
+        network.add_edges_from((nodes[u], nodes[v]) for u, v in edges.tolist())
+        network._check_intersect()
+        return network
+
     @classmethod
     def create(cls, network_dict: dict) -> Network:
         """
         Create an instance on :class: `Network` from a dictionary.
 
+        The nodes and edges are bulk constructed with :meth:`from_arrays`.
+
         :param network_dict: a dictionary describing a :class:`Network`
         :return: An instance of :class: `Network`.
+        :raises NetworkError: If an edge references a node that is not in the
+            network dictionary.
+        """
+        network_dict = dict(network_dict)
+        nodes = list(network_dict.pop("nodes", {}).values())
+        edges = network_dict.pop("edges", {})
+
+        index = {attrs["uuid"]: i for i, attrs in enumerate(nodes)}
+        try:
+            edge_index = [
+                (index[uuid_u], index[uuid_v])
+                for uuid_u, uuid_vs in edges.items()
+                for uuid_v in uuid_vs.keys()
+            ]
+        except KeyError as e:
+            msg = f"Edge references node uuid {e} which is not in the network."
+            try:
+                raise NetworkError(msg)
+            except NetworkError as e:
+                _LOGGER.critical(e)
+                raise e
+        network = cls.from_arrays(
+            node_attrs={
+                "uuid": [attrs["uuid"] for attrs in nodes],
+                "name": [attrs.get("name") for attrs in nodes],
+                "high_value_node": [attrs["high_value_node"] for attrs in nodes],
+                "entry_node": [attrs["entry_node"] for attrs in nodes],
+                "vulnerability": [attrs["vulnerability"] for attrs in nodes],
+            },
+            edge_index=edge_index,
+            positions=[[attrs["x_pos"], attrs["y_pos"]] for attrs in nodes],
+        )
+        network.set_from_dict(network_dict, clear_special_nodes=False)
+        return network
+
+    def save_binary(self, path: Union[str, Path]):
+        """
+        Save the network to a binary network file.
+
+        Node attributes are stored as typed columns, edges as an int32 edge
+        index and positions as a float array, with the remaining network
+        attributes in a small JSON header. Use :meth:`load_binary` to load it.
+
+        Unlike :meth:`create`, loading the file does not re-randomise the
+        entry nodes, high value nodes or vulnerabilities, so the loaded
+        network has the same :meth:`to_dict` as the saved one.
+
+        :param path: The path of the file to write.
+        """
+        network_dict = self.to_dict(json_serializable=True)
+        network_dict.pop("nodes")
+        network_dict.pop("edges")
+        centrality = network_dict.pop("entry_node_sampler")["centrality"]
+
+        nodes = list(self._node)
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = list(self.edges(data=True))
+        network_dict["edge_attrs"] = [
+            [i, attrs] for i, (_, _, attrs) in enumerate(edges) if attrs
+        ]
+
+        uuids, uuid_offsets, _ = encode_strings([n.uuid for n in nodes])
+        names, name_offsets, name_is_null = encode_strings([n.name for n in nodes])
+        arrays = {
+            "uuid": uuids,
+            "uuid_offsets": uuid_offsets,
+            "name": names,
+            "name_offsets": name_offsets,
+            "name_is_null": name_is_null,
+            "high_value_node": numpy.array(
+                [n.high_value_node for n in nodes], dtype=bool
+            ),
+            "entry_node": numpy.array([n.entry_node for n in nodes], dtype=bool),
+            "vulnerability": numpy.array(
+                [n.vulnerability for n in nodes], dtype="<f8"
+            ),
+            "positions": numpy.array(
+                [[n.x_pos, n.y_pos] for n in nodes], dtype="<f8"
+            ).reshape(-1, 2),
+            "edge_index": numpy.array(
+                [[index[u], index[v]] for u, v, _ in edges], dtype="<i4"
+            ).reshape(-1, 2),
+        }
+        if centrality is not None:
+            arrays["centrality"] = numpy.array(
+                [centrality[n.uuid] for n in nodes], dtype="<f8"
+            )
+        write_network_file(path, network_dict, arrays)
+
+    @classmethod
+    def load_binary(cls, path: Union[str, Path], mmap: bool = True) -> Network:
+        """
+        Load a network from a binary network file written by :meth:`save_binary`.
+
+        :param path: The path of the file to read.
+        :param mmap: If True the file is memory mapped rather than read into
+            memory up front.
+        :return: An instance of :class:`Network`.
+        :raises NetworkError: If the file is not a network file.
         """
-        network = Network()
-        network.set_from_dict(network_dict)
+        network_dict, arrays = read_network_file(path, mmap=mmap)
+        edge_attrs = network_dict.pop("edge_attrs", [])
+        # the attributes are restored as saved, without re-randomising nodes
+        network_dict["doc_metadata"] = DocMetadata(**network_dict.pop("_doc_metadata"))
+        if network_dict.get("random_entry_node_preference"):
+            network_dict["random_entry_node_preference"] = RandomEntryNodePreference[
+                network_dict["random_entry_node_preference"]
+            ]
+        if network_dict.get("random_high_value_node_preference"):
+            network_dict[
+                "random_high_value_node_preference"
+            ] = RandomHighValueNodePreference[
+                network_dict["random_high_value_node_preference"]
+            ]
+
+        uuids = decode_strings(arrays["uuid"], arrays["uuid_offsets"])
+        network = cls.from_arrays(
+            node_attrs={
+                "uuid": uuids,
+                "name": decode_strings(
+                    arrays["name"], arrays["name_offsets"], arrays["name_is_null"]
+                ),
+                "high_value_node": arrays["high_value_node"],
+                "entry_node": arrays["entry_node"],
+                "vulnerability": arrays["vulnerability"],
+            },
+            edge_index=arrays["edge_index"],
+            positions=arrays["positions"],
+            **network_dict,
+        )
+        if edge_attrs:
+            nodes = list(network._node)
+            for i, attrs in edge_attrs:
+                u, v = arrays["edge_index"][i].tolist()
+                network.edges[nodes[u], nodes[v]].update(attrs)
+        if "centrality" in arrays:
+            network.entry_node_sampler = {
+                "centrality": dict(zip(uuids, arrays["centrality"].tolist()))
+            }
         return network
 
+    def __getstate__(self):
+        # The special node indexes are rebuilt on demand after a copy or unpickle.
+        state = self.__dict__.copy()
+        state["_special_node_sets"] = None
+        state["_special_node_cache"] = {}
+        state["_node_positions"] = None
+        state["_node_list"] = None
+        state["_status_bits"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for node in self._node:
+            node._add_network(self)
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
             return self.doc_metadata.uuid == other.doc_metadata.uuid
@@ -10,18 +10,19 @@ Networks that can be created are:
 - A ring network.
 - A P2P network.
 - A randomly generated binominal network.
+- A hierarchical enterprise network.
+- A Barabási–Albert scale-free network.
+- A multi-site WAN of enterprise networks.
 - A custom network using user-input options.
 """
 import math
 import random
-from itertools import combinations, groupby
-from typing import Any, Dict, List, Union
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Union
 
-import networkx as nx
 import numpy as np
 
 from yawning_titan.networks.network import Network
-from yawning_titan.networks.node import Node
 
 
 def check_if_nearby(pos: List[float], full_list: dict, value: int) -> bool:
@@ -40,38 +41,167 @@ def check_if_nearby(pos: List[float], full_list: dict, value: int) -> bool:
     return False
 
 
-def generate_node_positions(matrix: np.array) -> dict:
+def generate_node_position_array(
+    n_nodes: int, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
     """
-    Generate a random position for each node and saves it as a dictionary.
+    Generate a random position for each node using a spatial hash grid.
 
-    :param matrix: The adjacency matrix for the network.
+    Positions are random integer points in a square with sides of
+    ``4 * n_nodes``. As in :func:`check_if_nearby`, a point is rejected if it
+    lies within a separation value of an already placed point and the
+    separation value shrinks after every 10 failed attempts. Placed points are
+    bucketed into grid cells as wide as the largest separation value so that
+    only the neighbouring cells are checked for each candidate point.
 
-    :return: A dictionary of node positions.
+    :param n_nodes: The number of nodes.
+    :param rng: The random number generator. Defaults to one seeded from the
+        ``random`` module.
+
+    :return: An integer array of shape ``(n_nodes, 2)`` of x,y positions.
     """
-    positions = {}
-    for i in range(0, len(matrix)):
-        # generates a random x,y position for a node
-        rand_pos = [
-            random.randint(0, len(matrix) * 4),
-            random.randint(0, len(matrix) * 4),
-        ]
+    if rng is None:
+        rng = _get_rng()
+    max_value = 5
+    cell_size = max_value + 1
+    grid: Dict[tuple, List[tuple]] = defaultdict(list)
+    positions = np.zeros((n_nodes, 2), dtype=np.int64)
+
+    # draw candidate points in batches rather than one at a time
+    candidates = rng.integers(0, n_nodes * 4, size=(max(n_nodes, 1) * 2, 2)).tolist()
+    c = 0
+    for i in range(n_nodes):
         fails = 0
-        value = 5
-        while check_if_nearby(rand_pos, positions, value):
+        value = max_value
+        while True:
+            if c == len(candidates):
+                candidates = rng.integers(0, n_nodes * 4, size=(n_nodes, 2)).tolist()
+                c = 0
+            x, y = candidates[c]
+            c += 1
+            cx, cy = x // cell_size, y // cell_size
+            nearby = False
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for px, py in grid.get((gx, gy), ()):
+                        if abs(px - x) <= value and abs(py - y) <= value:
+                            nearby = True
+                            break
+                    if nearby:
+                        break
+                if nearby:
+                    break
+            if not nearby:
+                break
             # if that position has already been used then generate a new point
-            rand_pos = [
-                random.randint(0, len(matrix) * 4),
-                random.randint(0, len(matrix) * 4),
-            ]
             fails += 1
             if fails % 10 == 0:
-                value -= 1
-                if value == -1:
-                    value = 0
-        positions[str(i)] = rand_pos
+                value = max(value - 1, 0)
+        grid[(cx, cy)].append((x, y))
+        positions[i] = (x, y)
     return positions
 
 
+def generate_node_positions(matrix: np.array) -> dict:
+    """
+    Generate a random position for each node and saves it as a dictionary.
+
+    :param matrix: The adjacency matrix for the network.
+
+    :return: A dictionary of node positions.
+    """
+    positions = generate_node_position_array(len(matrix))
+    return {str(i): pos for i, pos in enumerate(positions.tolist())}
+
+
+def _get_rng(seed: Optional[int] = None) -> np.random.Generator:
+    """
+    Get a NumPy random number generator.
+
+    When no seed is given the generator is seeded from the ``random`` module so
+    that seeding ``random`` still makes network creation repeatable.
+
+    :param seed: An optional seed.
+    :return: An instance of ``numpy.random.Generator``.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    return np.random.default_rng(seed)
+
+
+def _random_upper_edges(
+    n_nodes: int, probability: float, rng: np.random.Generator, offset: int = 0
+) -> np.ndarray:
+    """
+    Draw each of the ``n_nodes * (n_nodes - 1) / 2`` possible edges with a given probability.
+
+    Sparse graphs draw the number of edges from a binomial distribution and
+    then sample that many distinct positions in the upper triangle of the
+    adjacency matrix, so the cost is proportional to the number of edges.
+    Dense graphs draw the upper triangle a row at a time.
+
+    :param n_nodes: The number of nodes.
+    :param probability: The probability of each edge.
+    :param rng: The random number generator.
+    :param offset: An offset added to every node index.
+    :return: An int array of shape ``(n_edges, 2)`` with ``i < j`` on each row.
+    """
+    n_pairs = n_nodes * (n_nodes - 1) // 2
+    if n_pairs == 0 or probability <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    if probability < 0.25:
+        n_edges = rng.binomial(n_pairs, probability)
+        flat = np.sort(rng.choice(n_pairs, size=n_edges, replace=False))
+        # invert the row-major index of the upper triangle, row i starts at i * (2n - i - 1) / 2
+        b = 2 * n_nodes - 1
+        i = np.floor((b - np.sqrt(b * b - 8.0 * flat)) / 2).astype(np.int64)
+        row_start = i * (b - i) // 2
+        # correct any floating point error at the row boundaries
+        i = np.where(flat < row_start, i - 1, i)
+        row_start = i * (b - i) // 2
+        next_row_start = (i + 1) * (b - i - 1) // 2
+        i = np.where(flat >= next_row_start, i + 1, i)
+        row_start = i * (b - i) // 2
+        j = flat - row_start + i + 1
+        return np.stack([i, j], axis=1) + offset
+    rows = []
+    for i in range(n_nodes - 1):
+        j = np.flatnonzero(rng.random(n_nodes - i - 1) < probability) + (i + 1)
+        rows.append(np.stack([np.full(len(j), i), j], axis=1))
+    return np.concatenate(rows) + offset
+
+
+def _unique_edges(edges: np.ndarray) -> np.ndarray:
+    """
+    Remove self-loops and duplicate undirected edges from an edge array.
+
+    :param edges: An int array of shape ``(n_edges, 2)``.
+    :return: The unique edges ordered by ``(i, j)`` with ``i < j``.
+    """
+    edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    return np.unique(edges, axis=0)
+
+
+def get_network_from_edges_and_positions(
+    edges: np.ndarray, positions: np.ndarray
+) -> Network:
+    """
+    Bulk construct a network from an edge array and a position array.
+
+    The nodes are named by their index.
+
+    :param edges: An int array of shape ``(n_edges, 2)`` of node index pairs.
+    :param positions: An array of shape ``(n_nodes, 2)`` of x,y positions.
+    :return: An instance of :class:`~yawning_titan.networks.network.Network`.
+    """
+    return Network.from_arrays(
+        node_attrs={"name": [str(i) for i in range(len(positions))]},
+        edge_index=edges,
+        positions=positions,
+    )
+
+
 def get_network_from_matrix_and_positions(
     matrix: np.ndarray,
     positions: Dict[str, List[int]],
@@ -83,23 +213,11 @@ def get_network_from_matrix_and_positions(
     :param positions: The node positions on a graph.
     :return: An instance of :class:`~yawning_titan.networks.network.Network`.
     """
-    network = Network()
-    edges = []
-    # Create all Nodes
-    nodes: Dict[Any, Node] = {i: Node(name=str(i)) for i in range(len(matrix))}
-    for y_i, y_node in enumerate(matrix):
-        # Retrieve the Node and add to the Network
-        network.add_node(nodes[y_i])  # Retrieve the positions and set on the Node
-        if str(y_i) in positions.keys():
-            x, y = positions[str(y_i)]
-            nodes[y_i].x_pos = x
-            nodes[y_i].y_pos = y  # If the edge hasn't already been added, add it
-        for x_i, x_node in enumerate(y_node):
-            if x_node == 1:
-                edge = tuple(sorted([y_i, x_i]))
-                if edge not in edges:
-                    network.add_edge(nodes[edge[0]], nodes[edge[1]])
-    return network
+    matrix = np.asarray(matrix)
+    node_positions = [positions.get(str(i), [0.0, 0.0]) for i in range(len(matrix))]
+    return get_network_from_edges_and_positions(
+        np.argwhere(matrix == 1), node_positions
+    )
 
 
 def get_18_node_network_mesh() -> Network:
@@ -195,7 +313,9 @@ def dcbo_base_network() -> Network:
     return get_network_from_matrix_and_positions(matrix, positions)
 
 
-def create_mesh(size: int = 100, connectivity: float = 0.7) -> Network:
+def create_mesh(
+    size: int = 100, connectivity: float = 0.7, seed: Optional[int] = None
+) -> Network:
     """
     Create a mesh node environment.
 
@@ -203,23 +323,22 @@ def create_mesh(size: int = 100, connectivity: float = 0.7) -> Network:
     :param connectivity: How connected each of the nodes should be (percentage
         chance for any node to be connected to
         any other).
+    :param seed: An optional seed for the random number generator.
 
     :return: An instance of :class:`~yawning_titan.networks.network.Network`.
     """
-    matrix = np.zeros((size, size))
-    for i in range(0, size):
-        for j in range(i + 1, size):
-            if random.randint(0, 99) < connectivity * 100:
-                matrix[i][j] = 1
-                matrix[j][i] = 1
-
-    positions = generate_node_positions(matrix)
+    rng = _get_rng(seed)
+    edges = _random_upper_edges(size, connectivity, rng)
+    positions = generate_node_position_array(size, rng)
 
-    return get_network_from_matrix_and_positions(matrix, positions)
+    return get_network_from_edges_and_positions(edges, positions)
 
 
 def create_star(
-    first_layer_size: int = 8, group_size: int = 5, group_connectivity: float = 0.5
+    first_layer_size: int = 8,
+    group_size: int = 5,
+    group_connectivity: float = 0.5,
+    seed: Optional[int] = None,
 ) -> Network:
     """
     Create a star node environment.
@@ -232,35 +351,36 @@ def create_star(
         ring".
     :param group_size: How many nodes are in each collection.
     :param group_connectivity: How connected the nodes in the connections are.
+    :param seed: An optional seed for the random number generator.
 
     :return: An instance of :class:`~yawning_titan.networks.network.Network`.
     """
+    rng = _get_rng(seed)
     number_of_nodes = 1 + first_layer_size * group_size
 
-    matrix = np.zeros((number_of_nodes, number_of_nodes))
+    # creates the groups; every group shares the same upper triangle offset by the group start
+    i, j = np.triu_indices(group_size, 1)
+    mask = rng.random((first_layer_size, len(i))) < group_connectivity
+    group, pair = np.nonzero(mask)
+    group_start = 1 + group * group_size
+    group_edges = np.stack([group_start + i[pair], group_start + j[pair]], axis=1)
 
-    # creates the groups and connects them
-    for i in range(first_layer_size):
-        for j in range(0, group_size):
-            for k in range(j + 1, group_size):
-                if random.randint(0, 99) < group_connectivity * 100:
-                    matrix[j + 1 + i * group_size][k + 1 + i * group_size] = 1
-                    matrix[k + 1 + i * group_size][j + 1 + i * group_size] = 1
     # connects the groups to the center node
-    for i in range(0, first_layer_size):
-        connector = random.randint(0, group_size - 1)
-        matrix[0][1 + i * group_size + connector] = 1
-        matrix[1 + i * group_size + connector][0] = 1
+    connectors = 1 + np.arange(first_layer_size) * group_size
+    connectors += rng.integers(0, group_size, size=first_layer_size)
+    centre_edges = np.stack([np.zeros_like(connectors), connectors], axis=1)
 
-    positions = generate_node_positions(matrix)
+    edges = _unique_edges(np.concatenate([group_edges, centre_edges]))
+    positions = generate_node_position_array(number_of_nodes, rng)
 
-    return get_network_from_matrix_and_positions(matrix, positions)
+    return get_network_from_edges_and_positions(edges, positions)
 
 
 def create_p2p(
     group_size: int = 5,
     inter_group_connectivity: float = 0.1,
     group_connectivity: int = 1,
+    seed: Optional[int] = None,
 ) -> Network:
     """
     Create a two group network.
@@ -272,49 +392,44 @@ def create_p2p(
         variance).
     :param inter_group_connectivity: The connectivity between the two groups.
     :param group_connectivity: The connectivity within the group.
+    :param seed: An optional seed for the random number generator.
 
     :return: An instance of :class:`~yawning_titan.networks.network.Network`.
     """
+    rng = _get_rng(seed)
     # creates the sizes of the groups
-    group1_size = (
-        group_size + random.randint(0, int(group_size / 2)) - int(group_size / 4)
-    )
-    group2_size = (
-        group_size + random.randint(0, int(group_size / 2)) - int(group_size / 4)
-    )
+    group1_size, group2_size = (
+        group_size
+        + rng.integers(0, int(group_size / 2), size=2, endpoint=True)
+        - int(group_size / 4)
+    ).tolist()
     total_size = group1_size + group2_size
 
-    matrix = np.zeros((total_size, total_size))
-
-    # connections between group 1
-    for i in range(0, group1_size):
-        for j in range(i + 1, group1_size):
-            if random.randint(0, 99) < group_connectivity * 100:
-                matrix[i][j] = 1
-                matrix[j][i] = 1
-
-    # connections between group 2
-    for i in range(group1_size, total_size):
-        for j in range(i + 1, total_size):
-            if random.randint(0, 99) < group_connectivity * 100:
-                matrix[i][j] = 1
-                matrix[j][i] = 1
+    # connections within group 1 and group 2
+    group1_edges = _random_upper_edges(group1_size, group_connectivity, rng)
+    group2_edges = _random_upper_edges(
+        group2_size, group_connectivity, rng, offset=group1_size
+    )
 
-    connections = math.ceil(inter_group_connectivity * total_size)
     # connections between the two groups
-    for i in range(0, connections):
-        g1 = random.randint(0, group1_size - 1)
-        g2 = random.randint(group1_size, total_size - 1)
-
-        matrix[g1][g2] = 1
-        matrix[g2][g1] = 1
+    connections = math.ceil(inter_group_connectivity * total_size)
+    inter_group_edges = np.stack(
+        [
+            rng.integers(0, group1_size, size=connections),
+            rng.integers(group1_size, total_size, size=connections),
+        ],
+        axis=1,
+    )
 
-    positions = generate_node_positions(matrix)
+    edges = _unique_edges(np.concatenate([group1_edges, group2_edges, inter_group_edges]))
+    positions = generate_node_position_array(total_size, rng)
 
-    return get_network_from_matrix_and_positions(matrix, positions)
+    return get_network_from_edges_and_positions(edges, positions)
 
 
-def create_ring(break_probability: float = 0.3, ring_size: int = 60) -> Network:
+def create_ring(
+    break_probability: float = 0.3, ring_size: int = 60, seed: Optional[int] = None
+) -> Network:
     """
     Create a ring network.
 
@@ -322,22 +437,18 @@ def create_ring(break_probability: float = 0.3, ring_size: int = 60) -> Network:
     connected.
 
     :param ring_size: The number of nodes in the network.
+    :param seed: An optional seed for the random number generator.
     :return: An instance of :class:`~yawning_titan.networks.network.Network`.
     """
-    matrix = np.zeros((ring_size, ring_size))
-
-    # runs through the nodes connecting each one to the next
-    for i in range(0, ring_size - 1):
-        if random.randint(1, 99) > break_probability * 100:
-            matrix[i][i + 1] = 1
-            matrix[i + 1][i] = 1
-    if random.randint(1, 99) > break_probability * 100:
-        matrix[ring_size - 1][0] = 1
-        matrix[0][ring_size - 1] = 1
+    rng = _get_rng(seed)
+    # connects each node to the next, and the last node back to the first
+    i = np.arange(ring_size)
+    edges = np.stack([i, (i + 1) % ring_size], axis=1)
+    keep = rng.integers(1, 100, size=ring_size) > break_probability * 100
+    edges = _unique_edges(edges[keep])
+    positions = generate_node_position_array(ring_size, rng)
 
-    positions = generate_node_positions(matrix)
-
-    return get_network_from_matrix_and_positions(matrix, positions)
+    return get_network_from_edges_and_positions(edges, positions)
 
 
 def custom_network() -> Union[Network, None]:
@@ -374,7 +485,7 @@ def custom_network() -> Union[Network, None]:
 
 
 def gnp_random_connected_graph(
-    n_nodes: int, probability_of_edge: float
+    n_nodes: int, probability_of_edge: float, seed: Optional[int] = None
 ) -> Union[Network, None]:
     """
     Create a randomly connected graph.
@@ -382,30 +493,433 @@ def gnp_random_connected_graph(
     With the guarantee that each node will have at least one connection.
 
     This is taken from the following stack overflow Q&A with a bit of a
-    refactor for clarity.
+    refactor for clarity. Each node ``i`` is connected to one random node
+    ``j > i`` and then to each node ``j > i`` with a probability of
+    ``probability_of_edge``.
 
     :param n_nodes: the number of nodes in the graph.
     :param probability_of_edge: the probability for a node to have an edge.
+    :param seed: An optional seed for the random number generator.
 
     :return: An instance of :class:`~yawning_titan.networks.network.Network`.
     """
-    edges = combinations(range(n_nodes), 2)
-    graph = nx.Graph()
-    graph.add_nodes_from(range(n_nodes))
     if probability_of_edge <= 0:
         return None
+    rng = _get_rng(seed)
     if probability_of_edge >= 1:
-        return nx.complete_graph(n_nodes, create_using=graph)
+        edges = np.stack(np.triu_indices(n_nodes, 1), axis=1)
+    else:
+        i = np.arange(n_nodes - 1)
+        guaranteed_edges = np.stack(
+            [i, i + 1 + (rng.random(n_nodes - 1) * (n_nodes - 1 - i)).astype(np.int64)],
+            axis=1,
+        )
+        random_edges = _random_upper_edges(n_nodes, probability_of_edge, rng)
+        edges = _unique_edges(np.concatenate([guaranteed_edges, random_edges]))
+    positions = generate_node_position_array(n_nodes, rng)
 
-    for _, node_edges in groupby(edges, key=lambda x: x[0]):
-        node_edges = list(node_edges)
-        random_edge = random.choice(node_edges)
-        graph.add_edge(*random_edge)
-        for edge in node_edges:
-            if random.random() < probability_of_edge:
-                graph.add_edge(*edge)
+    return get_network_from_edges_and_positions(edges, positions)
 
-    matrix = nx.to_numpy_array(graph)
-    positions = generate_node_positions(matrix)
 
-    return get_network_from_matrix_and_positions(matrix, positions)
+def _place_special_nodes(
+    n_nodes: int,
+    entry_candidates: np.ndarray,
+    high_value_candidates: np.ndarray,
+    num_of_entry_nodes: int,
+    num_of_high_value_nodes: int,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draw distinct entry nodes and high value nodes from candidate node indices.
+
+    The high value candidates that are drawn as entry nodes are skipped, and
+    the counts are capped at the number of candidates.
+
+    :param n_nodes: The number of nodes in the network.
+    :param entry_candidates: The indices of the nodes that can be entry nodes.
+    :param high_value_candidates: The indices of the nodes that can be high
+        value nodes, in order of preference if ``num_of_high_value_nodes`` is
+        less than the number of candidates. Shuffle them for no preference.
+    :param num_of_entry_nodes: The number of entry nodes.
+    :param num_of_high_value_nodes: The number of high value nodes.
+    :param rng: The random number generator.
+    :return: A tuple of the entry node and high value node bool masks.
+    """
+    entry_node = np.zeros(n_nodes, dtype=bool)
+    high_value_node = np.zeros(n_nodes, dtype=bool)
+    num_of_entry_nodes = min(num_of_entry_nodes, len(entry_candidates))
+    entry_node[rng.choice(entry_candidates, num_of_entry_nodes, replace=False)] = True
+    high_value_candidates = high_value_candidates[~entry_node[high_value_candidates]]
+    high_value_node[high_value_candidates[:num_of_high_value_nodes]] = True
+    return entry_node, high_value_node
+
+
+def _layer_positions(
+    levels: np.ndarray, width: float, height: float, x_offset: float = 0
+) -> np.ndarray:
+    """
+    Position nodes in horizontal layers, spreading each layer evenly across a width.
+
+    Nodes keep their index order within a layer, so the children of a node
+    are placed below it when nodes are numbered layer by layer.
+
+    :param levels: The layer of each node, the top layer being the highest.
+    :param width: The width of the layout.
+    :param height: The height of the layout.
+    :param x_offset: An offset added to every x position.
+    :return: A float array of shape ``(n_nodes, 2)`` of x,y positions.
+    """
+    positions = np.zeros((len(levels), 2))
+    top = max(int(levels.max()), 1) if len(levels) else 1
+    for level in np.unique(levels):
+        members = np.flatnonzero(levels == level)
+        positions[members, 0] = x_offset + (np.arange(len(members)) + 0.5) * (
+            width / len(members)
+        )
+        positions[members, 1] = height * level / top
+    return positions
+
+
+def _enterprise_edges(
+    n_core: int,
+    n_distribution: int,
+    access_per_distribution: int,
+    hosts_per_access: int,
+    redundant_uplinks: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the edges of a core/distribution/access network.
+
+    Nodes are numbered layer by layer: core, distribution, access and then
+    the hosts of each access switch in turn.
+
+    :param n_core: The number of fully meshed core nodes.
+    :param n_distribution: The number of distribution nodes.
+    :param access_per_distribution: The number of access nodes per
+        distribution node.
+    :param hosts_per_access: The number of hosts per access node.
+    :param redundant_uplinks: Whether distribution and access nodes have a
+        second uplink to the next node in the layer above.
+    :return: A tuple of the edge array and the layer of each node, hosts
+        being layer 0 and core nodes layer 3.
+    """
+    n_access = n_distribution * access_per_distribution
+    n_hosts = n_access * hosts_per_access
+    distribution = n_core + np.arange(n_distribution)
+    access = n_core + n_distribution + np.arange(n_access)
+    hosts = n_core + n_distribution + n_access + np.arange(n_hosts)
+
+    edges = [np.stack(np.triu_indices(n_core, 1), axis=1)]
+    d = np.arange(n_distribution)
+    edges.append(np.stack([distribution, d % n_core], axis=1))
+    a = np.arange(n_access) // access_per_distribution
+    edges.append(np.stack([access, distribution[a]], axis=1))
+    if redundant_uplinks:
+        edges.append(np.stack([distribution, (d + 1) % n_core], axis=1))
+        edges.append(
+            np.stack([access, distribution[(a + 1) % n_distribution]], axis=1)
+        )
+    h = np.arange(n_hosts) // hosts_per_access
+    edges.append(np.stack([hosts, access[h]], axis=1))
+
+    levels = np.repeat([3, 2, 1, 0], [n_core, n_distribution, n_access, n_hosts])
+    return _unique_edges(np.concatenate(edges)), levels
+
+
+def _enterprise_names(
+    n_core: int, n_distribution: int, n_access: int, n_servers: int, n_hosts: int
+) -> List[str]:
+    """
+    Name the nodes of a core/distribution/access network by their role.
+
+    :param n_core: The number of core nodes.
+    :param n_distribution: The number of distribution nodes.
+    :param n_access: The number of access nodes.
+    :param n_servers: The number of hosts that are servers, the first hosts.
+    :param n_hosts: The total number of hosts.
+    :return: A list of node names in node order.
+    """
+    return (
+        [f"core-{i}" for i in range(n_core)]
+        + [f"distribution-{i}" for i in range(n_distribution)]
+        + [f"access-{i}" for i in range(n_access)]
+        + [f"server-{i}" for i in range(n_servers)]
+        + [f"host-{i}" for i in range(n_hosts - n_servers)]
+    )
+
+
+def create_enterprise(
+    n_core: int = 2,
+    n_distribution: int = 4,
+    access_per_distribution: int = 4,
+    hosts_per_access: int = 24,
+    server_access: int = 1,
+    redundant_uplinks: bool = True,
+    num_of_entry_nodes: int = 1,
+    num_of_high_value_nodes: int = 1,
+    seed: Optional[int] = None,
+) -> Network:
+    """
+    Create a hierarchical enterprise network.
+
+    A fully meshed core is connected to distribution nodes, which connect
+    access nodes, which each connect a subnet of hosts. The hosts of the
+    first ``server_access`` access nodes are servers. Entry nodes are drawn
+    from the other hosts and high value nodes from the servers.
+
+    The network has ``n_core + n_distribution * (1 + access_per_distribution
+    * (1 + hosts_per_access))`` nodes, so e.g. ``n_distribution=40,
+    access_per_distribution=50, hosts_per_access=49`` gives 100k nodes.
+    Nodes are laid out in layers with each subnet below its access node.
+
+    :param n_core: The number of core nodes, at least 1.
+    :param n_distribution: The number of distribution nodes, at least 1.
+    :param access_per_distribution: The number of access nodes per
+        distribution node.
+    :param hosts_per_access: The number of hosts per access node.
+    :param server_access: The number of access nodes whose hosts are servers.
+    :param redundant_uplinks: Whether distribution and access nodes have a
+        second uplink to the layer above.
+    :param num_of_entry_nodes: The number of entry nodes.
+    :param num_of_high_value_nodes: The number of high value nodes.
+    :param seed: An optional seed for the random number generator.
+
+    :return: An instance of :class:`~yawning_titan.networks.network.Network`.
+    """
+    rng = _get_rng(seed)
+    n_access = n_distribution * access_per_distribution
+    edges, levels = _enterprise_edges(
+        n_core,
+        n_distribution,
+        access_per_distribution,
+        hosts_per_access,
+        redundant_uplinks,
+    )
+    n_nodes = len(levels)
+    host_start = n_core + n_distribution + n_access
+    n_servers = min(server_access, n_access) * hosts_per_access
+
+    entry_candidates = np.arange(host_start + n_servers, n_nodes)
+    if not len(entry_candidates):
+        entry_candidates = np.arange(host_start, n_nodes)
+    entry_node, high_value_node = _place_special_nodes(
+        n_nodes,
+        entry_candidates,
+        rng.permutation(np.arange(host_start, host_start + n_servers)),
+        num_of_entry_nodes,
+        num_of_high_value_nodes,
+        rng,
+    )
+    names = _enterprise_names(
+        n_core, n_distribution, n_access, n_servers, n_nodes - host_start
+    )
+    positions = _layer_positions(levels, width=max(n_nodes - host_start, 1), height=4)
+
+    return Network.from_arrays(
+        node_attrs={
+            "name": names,
+            "entry_node": entry_node,
+            "high_value_node": high_value_node,
+        },
+        edge_index=edges,
+        positions=positions,
+    )
+
+
+def _barabasi_albert_edges(
+    n_nodes: int, m: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Draw the edges of a Barabási–Albert preferential attachment graph.
+
+    The graph grows from a clique of ``m + 1`` nodes and each new node is
+    attached to ``m`` existing nodes drawn with probability proportional to
+    their degree. The draws are made from the list of edge endpoints, each
+    node appearing once per edge, so each draw is a uniform index into that
+    list. Every index points either at a known node or at an earlier draw,
+    so all the draws are made up front and resolved by pointer jumping.
+    Repeated draws for the same new node are merged, so a node can have
+    fewer than ``m`` edges when it is added.
+
+    :param n_nodes: The number of nodes.
+    :param m: The number of edges to attach from each new node.
+    :param rng: The random number generator.
+    :return: The unique edges ordered by ``(i, j)`` with ``i < j``.
+    """
+    n_seed = min(m + 1, n_nodes)
+    seed_edges = np.stack(np.triu_indices(n_seed, 1), axis=1)
+    n_new = n_nodes - n_seed
+    if n_new <= 0 or m <= 0:
+        return seed_edges
+
+    seed_slots = seed_edges.size
+    new_nodes = n_seed + np.arange(n_new)
+    step_starts = seed_slots + 2 * m * np.arange(n_new)
+    # each step appends m copies of the new node followed by its m targets
+    node_slots = (step_starts[:, None] + np.arange(m)).ravel()
+    target_slots = (step_starts[:, None] + m + np.arange(m)).ravel()
+
+    endpoints = np.full(seed_slots + 2 * m * n_new, -1, dtype=np.int64)
+    endpoints[:seed_slots] = seed_edges.ravel()
+    endpoints[node_slots] = np.repeat(new_nodes, m)
+
+    pointer = np.arange(len(endpoints))
+    draws = rng.random((n_new, m)) * step_starts[:, None]
+    pointer[target_slots] = draws.astype(np.int64).ravel()
+    while True:
+        unresolved = endpoints[pointer[target_slots]] < 0
+        if not unresolved.any():
+            break
+        pointer[target_slots] = pointer[pointer[target_slots]]
+    endpoints[target_slots] = endpoints[pointer[target_slots]]
+
+    new_edges = np.stack([np.repeat(new_nodes, m), endpoints[target_slots]], axis=1)
+    return _unique_edges(np.concatenate([seed_edges, new_edges]))
+
+
+def create_barabasi_albert(
+    n_nodes: int = 1000,
+    m: int = 2,
+    num_of_entry_nodes: int = 1,
+    num_of_high_value_nodes: int = 1,
+    seed: Optional[int] = None,
+) -> Network:
+    """
+    Create a Barabási–Albert scale-free network.
+
+    Entry nodes are drawn from the least connected nodes, at the edge of the
+    network. High value nodes are the most connected hubs.
+
+    :param n_nodes: The number of nodes.
+    :param m: The number of edges attached from each new node as the network
+        grows.
+    :param num_of_entry_nodes: The number of entry nodes.
+    :param num_of_high_value_nodes: The number of high value nodes.
+    :param seed: An optional seed for the random number generator.
+
+    :return: An instance of :class:`~yawning_titan.networks.network.Network`.
+    """
+    rng = _get_rng(seed)
+    edges = _barabasi_albert_edges(n_nodes, m, rng)
+    degree = np.bincount(edges.ravel(), minlength=n_nodes)
+
+    entry_candidates = np.flatnonzero(degree == degree.min()) if n_nodes else degree
+    if len(entry_candidates) < num_of_entry_nodes:
+        entry_candidates = np.arange(n_nodes)
+    entry_node, high_value_node = _place_special_nodes(
+        n_nodes,
+        entry_candidates,
+        np.argsort(-degree, kind="stable"),
+        num_of_entry_nodes,
+        num_of_high_value_nodes,
+        rng,
+    )
+    positions = generate_node_position_array(n_nodes, rng)
+
+    return Network.from_arrays(
+        node_attrs={
+            "name": [str(i) for i in range(n_nodes)],
+            "entry_node": entry_node,
+            "high_value_node": high_value_node,
+        },
+        edge_index=edges,
+        positions=positions,
+    )
+
+
+def create_wan(
+    n_sites: int = 4,
+    n_distribution: int = 2,
+    access_per_distribution: int = 4,
+    hosts_per_access: int = 24,
+    backbone_connectivity: float = 0.2,
+    server_access: int = 1,
+    num_of_entry_nodes: int = 1,
+    num_of_high_value_nodes: int = 1,
+    seed: Optional[int] = None,
+) -> Network:
+    """
+    Create a multi-site wide area network.
+
+    Each site is an enterprise network, as created by
+    :func:`create_enterprise`, with a single core node acting as the site
+    gateway. The gateways form a backbone ring with extra links drawn with a
+    probability of ``backbone_connectivity``. The first site is the
+    headquarters: the hosts of its first ``server_access`` access nodes are
+    servers and the high value nodes are drawn from them. Entry nodes are
+    drawn from the hosts of the branch sites.
+
+    Sites are laid out side by side.
+
+    :param n_sites: The number of sites, at least 1.
+    :param n_distribution: The number of distribution nodes per site, at
+        least 1.
+    :param access_per_distribution: The number of access nodes per
+        distribution node.
+    :param hosts_per_access: The number of hosts per access node.
+    :param backbone_connectivity: The probability of a backbone link between
+        two gateways that are not neighbours on the ring.
+    :param server_access: The number of headquarters access nodes whose hosts
+        are servers.
+    :param num_of_entry_nodes: The number of entry nodes.
+    :param num_of_high_value_nodes: The number of high value nodes.
+    :param seed: An optional seed for the random number generator.
+
+    :return: An instance of :class:`~yawning_titan.networks.network.Network`.
+    """
+    rng = _get_rng(seed)
+    n_access = n_distribution * access_per_distribution
+    site_edges, site_levels = _enterprise_edges(
+        1, n_distribution, access_per_distribution, hosts_per_access, True
+    )
+    site_size = len(site_levels)
+    host_start = 1 + n_distribution + n_access
+    n_hosts = site_size - host_start
+    n_servers = min(server_access, n_access) * hosts_per_access
+    n_nodes = n_sites * site_size
+
+    offsets = np.arange(n_sites) * site_size
+    edges = [(site_edges[None, :, :] + offsets[:, None, None]).reshape(-1, 2)]
+    # the backbone ring and the extra links between gateways
+    if n_sites > 1:
+        sites = np.arange(n_sites)
+        edges.append(offsets[np.stack([sites, (sites + 1) % n_sites], axis=1)])
+        edges.append(offsets[_random_upper_edges(n_sites, backbone_connectivity, rng)])
+    edges = _unique_edges(np.concatenate(edges))
+
+    branch_hosts = (offsets[1:, None] + host_start + np.arange(n_hosts)).ravel()
+    if not len(branch_hosts):
+        branch_hosts = np.arange(host_start + n_servers, site_size)
+    entry_node, high_value_node = _place_special_nodes(
+        n_nodes,
+        branch_hosts,
+        rng.permutation(np.arange(host_start, host_start + n_servers)),
+        num_of_entry_nodes,
+        num_of_high_value_nodes,
+        rng,
+    )
+
+    hq_names = _enterprise_names(1, n_distribution, n_access, n_servers, n_hosts)
+    branch_names = _enterprise_names(1, n_distribution, n_access, 0, n_hosts)
+    hq_names[0] = branch_names[0] = "gateway"
+    names = [f"hq-{name}" for name in hq_names]
+    for site in range(1, n_sites):
+        names.extend(f"site-{site}-{name}" for name in branch_names)
+
+    width = max(n_hosts, 1)
+    positions = np.concatenate(
+        [
+            _layer_positions(site_levels, width, height=4, x_offset=site * width * 1.1)
+            for site in range(n_sites)
+        ]
+    )
+
+    return Network.from_arrays(
+        node_attrs={
+            "name": names,
+            "entry_node": entry_node,
+            "high_value_node": high_value_node,
+        },
+        edge_index=edges,
+        positions=positions,
+    )
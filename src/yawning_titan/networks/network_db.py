@@ -2,22 +2,65 @@
 from __future__ import annotations
 
 import os
+from contextlib import contextmanager
 from logging import getLogger
 from pathlib import Path
-from typing import Final, List, Optional, Union
+from typing import Final, List, Mapping, Optional, Tuple, Union
+from uuid import uuid4
 
 from tinydb import TinyDB
 from tinydb.queries import QueryInstance
-
-from yawning_titan.db.doc_metadata import DocMetadataSchema
+from tinydb.table import Document
+
+from yawning_titan.db.doc_metadata import DocMetadata, DocMetadataSchema
+from yawning_titan.db.doc_summary import (
+    SUMMARY_FIELD,
+    SUMMARY_VERSION,
+    DocSummary,
+    count_nodes,
+)
 from yawning_titan.db.query import YawningTitanQuery
 from yawning_titan.db.yawning_titan_db import YawningTitanDB, YawningTitanDBSchema
+from yawning_titan.exceptions import YawningTitanDBError
 from yawning_titan.networks.network import Network
+from yawning_titan.networks.network_delta import (
+    NetworkRevision,
+    apply_delta,
+    is_empty,
+    network_delta,
+)
+from yawning_titan.utils.config_cache import config_cache
 
 __all__ = ["NetworkDB", "NetworkSchema", "default_18_node_network"]
 
 _LOGGER = getLogger(__name__)
 
+BINARY_STORAGE_MIN_NODES: Final[int] = 10000
+"""Networks with at least this many nodes are stored by reference to a binary network file by default."""
+
+MAX_REVISIONS: Final[int] = 100
+"""The number of previous versions of each network kept in the network history."""
+
+_NETWORK_FILE_FIELD: Final[str] = "network_file"
+_PARENT_FIELD: Final[str] = "parent_uuid"
+_DELTA_FIELD: Final[str] = "delta"
+_INLINE_FIELDS: Final[List[str]] = ["nodes", "edges", "entry_node_sampler"]
+_REVISION_EXCLUDED_FIELDS: Final[List[str]] = [
+    "nodes",
+    "edges",
+    SUMMARY_FIELD,
+    _NETWORK_FILE_FIELD,
+    _DELTA_FIELD,
+]
+_STORAGE_FIELDS: Final[List[str]] = [
+    "nodes",
+    "edges",
+    "entry_node_sampler",
+    _NETWORK_FILE_FIELD,
+    _PARENT_FIELD,
+    _DELTA_FIELD,
+]
+
 
 class NetworkQuery(YawningTitanQuery):
     def __int__(self):
@@ -59,7 +102,7 @@ class NetworkQuery(YawningTitanQuery):
 
         def test_len(val, i):
             try:
-                nodes = [n for n in val.values() if val[type]]
+                nodes = [n for n in val.values() if n[type]]
                 return len(nodes) == i
             except TypeError:
                 return False
@@ -78,6 +121,27 @@ class NetworkQuery(YawningTitanQuery):
 
         return self.test(test_len, min, max, type)
 
+    @staticmethod
+    def _summary_count_between(
+        count: str, min: int, max: int, fallback: QueryInstance
+    ) -> QueryInstance:
+        """
+        Helper function that tests a node count stored in the doc summary.
+
+        Docs stored without a summary are tested with ``fallback``, which
+        counts their nodes. Like the node queries, networks stored by
+        reference are not matched.
+        """
+
+        def test_count(val, min, max):
+            return isinstance(val, int) and min <= val <= max
+
+        summary = YawningTitanQuery()[SUMMARY_FIELD]
+        return (
+            YawningTitanQuery().nodes.exists()
+            & summary[count].test(test_count, min, max)
+        ) | (~summary[count].exists() & fallback)
+
     @staticmethod
     def num_of_entry_nodes(n: int) -> YawningTitanQuery:
         """
@@ -92,7 +156,12 @@ class NetworkQuery(YawningTitanQuery):
         :param n: The target number of entry nodes.
         :return: A List of Nodes.
         """
-        return NetworkQuery().nodes._num_nodes_of_type(n, "entry_node")
+        return NetworkQuery._summary_count_between(
+            "entry_node_count",
+            n,
+            n,
+            NetworkQuery().nodes._num_nodes_of_type(n, "entry_node"),
+        )
 
     @staticmethod
     def num_of_entry_nodes_between(min: int, max: int) -> YawningTitanQuery:
@@ -108,7 +177,12 @@ class NetworkQuery(YawningTitanQuery):
         :param n: The target number of entry nodes.
         :return: A List of Nodes.
         """
-        return NetworkQuery().nodes._num_nodes_of_type_between(min, max, "entry_node")
+        return NetworkQuery._summary_count_between(
+            "entry_node_count",
+            min,
+            max,
+            NetworkQuery().nodes._num_nodes_of_type_between(min, max, "entry_node"),
+        )
 
     @staticmethod
     def num_of_high_value_nodes(n: int) -> YawningTitanQuery:
@@ -125,7 +199,12 @@ class NetworkQuery(YawningTitanQuery):
         :param max: The maximum number of high_value nodes.
         :return: A List of Nodes.
         """
-        return NetworkQuery().nodes._num_nodes_of_type(n, "high_value_node")
+        return NetworkQuery._summary_count_between(
+            "high_value_node_count",
+            n,
+            n,
+            NetworkQuery().nodes._num_nodes_of_type(n, "high_value_node"),
+        )
 
     @staticmethod
     def num_of_high_value_nodes_between(min: int, max: int) -> YawningTitanQuery:
@@ -142,8 +221,13 @@ class NetworkQuery(YawningTitanQuery):
         :param max: The minimum number of high_value nodes.
         :return: A List of Nodes.
         """
-        return NetworkQuery().nodes._num_nodes_of_type_between(
-            min, max, "high_value_node"
+        return NetworkQuery._summary_count_between(
+            "high_value_node_count",
+            min,
+            max,
+            NetworkQuery().nodes._num_nodes_of_type_between(
+                min, max, "high_value_node"
+            ),
         )
 
 
@@ -190,6 +274,15 @@ class NetworkSchema(YawningTitanDBSchema):
     NODE_VULNERABILITY_UPPER_BOUND: Final[
         YawningTitanQuery
     ] = YawningTitanQuery().node_vulnerability_upper_bound
+    PARENT_UUID: Final[YawningTitanQuery] = YawningTitanQuery()[_PARENT_FIELD]
+    """The uuid of the network a network is stored as a delta of."""
+
+
+class _HistorySchema:
+    """A schema-like class that defines the network history DB fields."""
+
+    NETWORK_UUID: Final[YawningTitanQuery] = YawningTitanQuery().network_uuid
+    REVISION: Final[YawningTitanQuery] = YawningTitanQuery().revision
 
 
 class NetworkDB:
@@ -211,16 +304,95 @@ class NetworkDB:
 
             >>> db.search(NetworkSchema.SET_RANDOM_ENTRY_NODES == True)
 
+    Large networks are stored by reference. Their nodes and edges are saved to
+    a binary network file (see
+    :meth:`~yawning_titan.networks.network.Network.save_binary`) and the doc
+    only holds the network attributes, so
+    :class:`NetworkQuery` node queries do not match them.
+
+    A network can be stored as a delta of a parent network by passing
+    ``parent_uuid``, so that only the nodes and edges that differ from the
+    parent are stored. Networks stored as deltas are built on top of their
+    cached parent when they are loaded, and follow changes to the nodes and
+    edges of the parent that they have not changed themselves. When the parent
+    is removed, they are stored in full. Like networks stored by reference,
+    :class:`NetworkQuery` node queries do not match them.
+
+    Each update keeps the version of the network it replaces in the network
+    history, as a delta of the new version. See
+    :func:`~yawning_titan.networks.network_db.NetworkDB.history` and
+    :func:`~yawning_titan.networks.network_db.NetworkDB.rollback`. The
+    network history is a second db file alongside the network db, so an
+    update of a network that is not stored as a delta still writes the
+    network in full, and also writes its revision to the network history.
     """
 
+    _history_db: Optional[YawningTitanDB] = None
+    _file_changes: Optional[Tuple[List[Path], List[Path]]] = None
+
     def __init__(self):
         self._db = YawningTitanDB("networks")
+        self._history_db = None
+        self._file_changes = None
 
     def __enter__(self) -> NetworkDB:
-        return NetworkDB()
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._db.__exit__(exc_type, exc_val, exc_tb)
+        if self._history_db is not None:
+            self._history_db.__exit__(exc_type, exc_val, exc_tb)
+
+    @property
+    def _history(self) -> YawningTitanDB:
+        """The network history db, opened on first use alongside the network db with the same backend."""
+        if self._history_db is None:
+            db_path = Path(self._db._path)
+            self._history_db = YawningTitanDB(
+                f"{db_path.stem}_history",
+                root=db_path.parent,
+                backend=self._db.backend,
+            )
+        return self._history_db
+
+    @contextmanager
+    def _write_scope(self, history: bool = True):
+        """
+        Lock the network db and network history for the writes of the block and make them together.
+
+        The writes to the network db are made before those to the network
+        history, so the history never holds a revision of an update that was
+        not made. If the block raises, neither db is written.
+
+        Binary network files are written in full before the docs that refer
+        to them. The files of the replaced docs are removed once the docs
+        have been written, or the new files are removed if the block raises.
+
+        :param history: Whether the block writes to the network history.
+        """
+        outermost = self._file_changes is None
+        if outermost:
+            self._file_changes = ([], [])
+        written, replaced = self._file_changes
+        try:
+            if history:
+                with self._history.write_behind(), self._db.write_behind():
+                    yield
+            else:
+                with self._db.write_behind():
+                    yield
+        except BaseException:
+            if outermost:
+                for path in written:
+                    path.unlink(missing_ok=True)
+            raise
+        else:
+            if outermost:
+                for path in replaced:
+                    path.unlink(missing_ok=True)
+        finally:
+            if outermost:
+                self._file_changes = None
 
     def insert(
         self,
@@ -228,6 +400,8 @@ class NetworkDB:
         name: Optional[str] = None,
         description: Optional[str] = None,
         author: Optional[str] = None,
+        by_reference: Optional[bool] = None,
+        parent_uuid: Optional[str] = None,
     ) -> Network:
         """
         Insert a :class:`~yawning_titan.networks.network.Network` into the DB as ``.json``.
@@ -239,20 +413,116 @@ class NetworkDB:
         :param name: The config name.
         :param description: The config description.
         :param author: The config author.
+        :param by_reference: Whether to store the nodes and edges in a binary
+            network file rather than inline. If ``None``, networks with at
+            least ``BINARY_STORAGE_MIN_NODES`` nodes are stored by reference.
+        :param parent_uuid: The uuid of a network in the db to store the
+            network as a delta of. If given, ``by_reference`` is ignored.
         :return: The inserted :class:`~yawning_titan.networks.network.Network`.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            parent network does not exist.
         """
         network.doc_metadata.update(name, description, author)
-        self._db.insert(network.to_dict(json_serializable=True))
+        self._invalidate(network.doc_metadata.uuid)
+        with self._write_scope(history=False):
+            doc = self._to_doc(network, by_reference, parent_uuid)
+            self._write_network_file(network, doc)
+            self._db.insert(doc)
 
         return network
 
+    def insert_many(
+        self, networks: List[Network], by_reference: Optional[bool] = None
+    ) -> List[Network]:
+        """
+        Insert :class:`~yawning_titan.networks.network.Network` into the DB with a single write.
+
+        :param networks: A list of :class:`~yawning_titan.networks.network.Network`.
+        :param by_reference: Whether to store the nodes and edges in binary
+            network files rather than inline. If ``None``, networks with at
+            least ``BINARY_STORAGE_MIN_NODES`` nodes are stored by reference.
+        :return: The inserted :class:`~yawning_titan.networks.network.Network`.
+        """
+        for network in networks:
+            self._invalidate(network.doc_metadata.uuid)
+        with self._write_scope(history=False):
+            docs = [self._to_doc(network, by_reference) for network in networks]
+            for network, doc in zip(networks, docs):
+                self._write_network_file(network, doc)
+            self._db.insert_many(docs)
+        return networks
+
+    def upsert_many(
+        self, networks: List[Network], by_reference: Optional[bool] = None
+    ) -> List[Network]:
+        """
+        Insert or replace :class:`~yawning_titan.networks.network.Network` in the DB with a single write.
+
+        :param networks: A list of :class:`~yawning_titan.networks.network.Network`.
+        :param by_reference: Whether to store the nodes and edges in binary
+            network files rather than inline. If ``None``, networks with at
+            least ``BINARY_STORAGE_MIN_NODES`` nodes are stored by reference.
+        :return: The upserted :class:`~yawning_titan.networks.network.Network`.
+        """
+        for network in networks:
+            self._invalidate(network.doc_metadata.uuid)
+        with self._write_scope(history=False):
+            docs = [self._to_doc(network, by_reference) for network in networks]
+            replaced = self._db.get_many(
+                [network.doc_metadata.uuid for network in networks]
+            )
+            for network, doc, stored in zip(networks, docs, replaced):
+                self._write_network_file(network, doc, stored)
+            stored_docs = self._db.upsert_many(docs)
+            for network, stored_doc in zip(networks, stored_docs):
+                network.doc_metadata.updated_at = stored_doc["_doc_metadata"].get(
+                    "updated_at"
+                )
+            self._refresh_child_summaries(
+                [network.doc_metadata.uuid for network in networks]
+            )
+        return networks
+
+    def write_behind(self):
+        """
+        Buffer the writes made in the block and write them to the DB together when it exits.
+
+        See :func:`~yawning_titan.db.yawning_titan_db.YawningTitanDB.write_behind`.
+
+        :Example:
+
+        >>> with db.write_behind():
+        ...     for network in networks:
+        ...         db.upsert(network)
+        """
+        return self._write_scope()
+
     def all(self) -> List[Network]:
         """
         Get all :class:`~yawning_titan.networks.network.Network` from the network DB.
 
         :return: A :class:`list` of :class:`~yawning_titan.networks.network.Network`.
         """
-        return [Network.create(doc) for doc in self._db.all()]
+        return [self._from_doc(doc) for doc in self._db.all()]
+
+    def list_summaries(self) -> List[DocSummary]:
+        """
+        Get the metadata and node counts of all networks without building them.
+
+        :return: A :class:`list` of :class:`~yawning_titan.db.doc_summary.DocSummary`.
+        """
+        return [
+            DocSummary.from_doc(doc) for doc in self._db.summaries(self._summarise_doc)
+        ]
+
+    def search_uuids(self, query: YawningTitanQuery) -> List[str]:
+        """
+        Searches the networks with a :class:`NetworkSchema` query without building them.
+
+        :param query: A :class:`~yawning_titan.db.query.YawningTitanQuery`.
+        :return: A :class:`list` of the uuids of the matching networks.
+        """
+        return [doc["_doc_metadata"]["uuid"] for doc in self._db.search(query)]
 
     def show(self, verbose=False):
         """
@@ -275,7 +545,20 @@ class NetworkDB:
         # self._db.db.clear_cache()
         doc = self._db.get(uuid)
         if doc:
-            return Network.create(doc)
+            return self._from_doc(doc)
+
+    def get_many(self, uuids: List[str]) -> List[Union[Network, None]]:
+        """
+        Get network config documents from their uuids with a single read of the db.
+
+        :param uuids: A list of target document uuids.
+        :return: The network config document of each uuid as an instance of
+            :class:`~yawning_titan.networks.network.Network`, or :py:class:`None`
+            where the uuid does not exist.
+        """
+        return [
+            self._from_doc(doc) if doc else None for doc in self._db.get_many(uuids)
+        ]
 
     def search(self, query: YawningTitanQuery) -> List[Network]:
         """
@@ -286,7 +569,7 @@ class NetworkDB:
         """
         network_configs = []
         for doc in self._db.search(query):
-            network_configs.append(Network.create(doc))
+            network_configs.append(self._from_doc(doc))
         return network_configs
 
     def count(self, cond: Optional[QueryInstance] = None) -> int:
@@ -310,31 +593,39 @@ class NetworkDB:
         name: Optional[str] = None,
         description: Optional[str] = None,
         author: Optional[str] = None,
+        by_reference: Optional[bool] = None,
+        parent_uuid: Optional[str] = None,
     ) -> Network:
         """
         Update a :class:`~yawning_titan.networks.network.Network`. in the db.
 
+        The version of the network that is replaced is kept in the network
+        history.
+
         :param network: An instance of :class:`~yawning_titan.networks.network.Network`.
         :param name: The config name.
         :param description: The config description.
         :param author: The config author.
+        :param by_reference: Whether to store the nodes and edges in a binary
+            network file rather than inline. If ``None``, networks with at
+            least ``BINARY_STORAGE_MIN_NODES`` nodes are stored by reference.
+        :param parent_uuid: The uuid of a network in the db to store the
+            network as a delta of. If ``None``, a network stored as a delta
+            stays a delta of the same parent.
         :return: The updated :class:`~yawning_titan.networks.network.Network`.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            parent network does not exist.
         """
         # Update the configs metadata
         network.doc_metadata.update(name, description, author)
-        # Perform the update and retrieve the returned doc
-        doc = self._db.update(
-            network.to_dict(json_serializable=True),
-            network.doc_metadata.uuid,
-            name,
-            description,
-            author,
-        )
-        if doc:
-            # Update the configs metadata created at
-            network.doc_metadata.updated_at = doc["_doc_metadata"]["updated_at"]
-
-        return network
+        self._invalidate(network.doc_metadata.uuid)
+        with self._write_scope():
+            stored = self._db.get(network.doc_metadata.uuid)
+            if parent_uuid is None and stored:
+                parent_uuid = stored.get(_PARENT_FIELD)
+            return self._update(
+                network, stored, name, description, author, by_reference, parent_uuid
+            )
 
     def upsert(
         self,
@@ -342,24 +633,54 @@ class NetworkDB:
         name: Optional[str] = None,
         description: Optional[str] = None,
         author: Optional[str] = None,
+        by_reference: Optional[bool] = None,
+        parent_uuid: Optional[str] = None,
     ) -> Network:
         """
         Upsert a :class:`~yawning_titan.networks.network.Network`. in the db.
 
+        If the network is updated, the version that is replaced is kept in
+        the network history.
+
         :param network: An instance of :class:`~yawning_titan.networks.network.Network`.
         :param name: The config name.
         :param description: The config description.
         :param author: The config author.
+        :param by_reference: Whether to store the nodes and edges in a binary
+            network file rather than inline. If ``None``, networks with at
+            least ``BINARY_STORAGE_MIN_NODES`` nodes are stored by reference.
+        :param parent_uuid: The uuid of a network in the db to store the
+            network as a delta of. If ``None``, a network stored as a delta
+            stays a delta of the same parent.
         :return: The upserted :class:`~yawning_titan.networks.network.Network`.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            parent network does not exist.
         """
         network.doc_metadata.update(name, description, author)
-        doc = self._db.upsert(
-            network.to_dict(json_serializable=True),
-            network.doc_metadata.uuid,
-            name,
-            description,
-            author,
-        )
+        self._invalidate(network.doc_metadata.uuid)
+        with self._write_scope():
+            stored = self._db.get(network.doc_metadata.uuid)
+            if stored:
+                if parent_uuid is None:
+                    parent_uuid = stored.get(_PARENT_FIELD)
+                return self._update(
+                    network,
+                    stored,
+                    name,
+                    description,
+                    author,
+                    by_reference,
+                    parent_uuid,
+                )
+            network_doc = self._to_doc(network, by_reference, parent_uuid)
+            self._write_network_file(network, network_doc)
+            doc = self._db.upsert(
+                network_doc,
+                network.doc_metadata.uuid,
+                name,
+                description,
+                author,
+            )
 
         # Update the configs metadata created at
         if doc and "updated_at" in doc["_doc_metadata"]:
@@ -367,23 +688,536 @@ class NetworkDB:
 
         return network
 
+    def _update(
+        self,
+        network: Network,
+        stored: Optional[Document],
+        name: Optional[str],
+        description: Optional[str],
+        author: Optional[str],
+        by_reference: Optional[bool],
+        parent_uuid: Optional[str],
+    ) -> Network:
+        """
+        Update a network in the db and keep the version it replaces in the network history.
+
+        The network file is written first, then the doc, its network history
+        and the summaries of the networks stored as deltas of it are written
+        in one write scope.
+
+        :param network: An instance of :class:`~yawning_titan.networks.network.Network`.
+        :param stored: The doc of the network that is replaced.
+        :param name: The config name.
+        :param description: The config description.
+        :param author: The config author.
+        :param by_reference: Whether to store the nodes and edges in a binary
+            network file.
+        :param parent_uuid: The uuid of the network to store the network as a
+            delta of, or ``None`` to store it in full.
+        :return: The updated :class:`~yawning_titan.networks.network.Network`.
+        """
+        with self._write_scope():
+            # the replaced version is read before its network file is overwritten
+            previous = self._resolve(stored) if stored else None
+            network_doc = self._to_doc(network, by_reference, parent_uuid)
+            self._write_network_file(network, network_doc, stored)
+            # Perform the update, removing the fields of other storage modes,
+            # and retrieve the returned doc
+            doc = self._db.update(
+                network_doc,
+                network.doc_metadata.uuid,
+                name,
+                description,
+                author,
+                remove_fields=[f for f in _STORAGE_FIELDS if f not in network_doc],
+            )
+            if doc:
+                # Update the configs metadata created at
+                network.doc_metadata.updated_at = doc["_doc_metadata"]["updated_at"]
+                self._record_revision(stored, previous, network_doc, network)
+                self._refresh_child_summaries([network.doc_metadata.uuid])
+
+        return network
+
+    def history(self, uuid: str) -> List[NetworkRevision]:
+        """
+        Get the previous versions of a network kept in the network history.
+
+        Up to ``MAX_REVISIONS`` versions are kept for each network.
+
+        :param uuid: The network uuid.
+        :return: A :class:`list` of :class:`~yawning_titan.networks.network_delta.NetworkRevision`,
+            oldest first.
+        """
+        return [NetworkRevision.from_doc(doc) for doc in self._history_docs(uuid)]
+
+    def get_revision(self, uuid: str, revision: int) -> Union[Network, None]:
+        """
+        Get a previous version of a network from the network history.
+
+        The version is rebuilt by applying the deltas of the later revisions,
+        newest first, to the current version of the network.
+
+        :param uuid: The network uuid.
+        :param revision: The revision number, as listed by
+            :func:`~yawning_titan.networks.network_db.NetworkDB.history`.
+        :return: The network at the revision, or :py:class:`None` if the
+            network or the revision does not exist.
+        """
+        stored = self._db.get(uuid)
+        docs = [doc for doc in self._history_docs(uuid) if doc["revision"] >= revision]
+        if not stored or not docs or docs[0]["revision"] != revision:
+            return None
+        nodes_and_edges = self._resolve(stored)
+        for doc in reversed(docs):
+            nodes_and_edges = apply_delta(nodes_and_edges, doc[_DELTA_FIELD])
+        network_dict = {**docs[0]["network"], **nodes_and_edges}
+        network_dict.pop(_PARENT_FIELD, None)
+        return Network.create(network_dict)
+
+    def rollback(self, uuid: str, revision: int) -> Union[Network, None]:
+        """
+        Restore a network to a previous version from the network history.
+
+        The version that is replaced is kept in the network history, so a
+        rollback can itself be rolled back.
+
+        :param uuid: The network uuid.
+        :param revision: The revision number, as listed by
+            :func:`~yawning_titan.networks.network_db.NetworkDB.history`.
+        :return: The restored network, or :py:class:`None` if the network or
+            the revision does not exist.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            network is locked.
+        """
+        with self._write_scope():
+            network = self.get_revision(uuid, revision)
+            if network is None:
+                return None
+            doc = next(
+                doc for doc in self._history_docs(uuid) if doc["revision"] == revision
+            )
+            parent_uuid = doc["network"].get(_PARENT_FIELD)
+            if parent_uuid and not self._db.get(parent_uuid):
+                # the parent has since been removed, so store the network in full
+                parent_uuid = None
+            self._invalidate(uuid)
+            return self._update(
+                network, self._db.get(uuid), None, None, None, None, parent_uuid
+            )
+
     def remove(self, network: Network) -> Union[str, None]:
         """
         Remove a :class:`~yawning_titan.networks.network.Network`. from the db.
 
+        The network history of the network is removed with it. Networks
+        stored as deltas of the network are stored in full first.
+
         :param network: An instance of :class:`~yawning_titan.networks.network.Network`.
         :return: The uuid of the removed :class:`~yawning_titan.networks.network.Network`.
         """
-        return self._db.remove(network.doc_metadata.uuid)
+        with self._write_scope():
+            self._detach_children([network.doc_metadata.uuid])
+            self._invalidate(network.doc_metadata.uuid)
+            self._replace_network_file(self._db.get(network.doc_metadata.uuid))
+            uuid = self._db.remove(network.doc_metadata.uuid)
+            if uuid:
+                self._history.remove_by_cond(_HistorySchema.NETWORK_UUID == uuid)
+        return uuid
 
     def remove_by_cond(self, cond: QueryInstance) -> List[str]:
         """
         Remove :class:`~yawning_titan.networks.network.Network`. from the db that match the query.
 
+        Networks that do not match the query and are stored as deltas of
+        networks that do are stored in full first.
+
         :param cond: A :class:`~yawning_titan.db.query.YawningTitanQuery`.
         :return: The list of uuids of the removed :class:`~yawning_titan.networks.network.Network`.
         """
-        return self._db.remove_by_cond(cond)
+        with self._write_scope():
+            self._detach_children(self.search_uuids(cond))
+            for doc in self._db.search(cond):
+                self._replace_network_file(doc)
+            uuids = self._db.remove_by_cond(cond)
+            self._history.remove_by_cond(_HistorySchema.NETWORK_UUID.one_of(uuids))
+        for uuid in uuids:
+            self._invalidate(uuid)
+        return uuids
+
+    def _detach_children(self, uuids: List[str]):
+        """
+        Store in full the networks stored as deltas of networks that are being removed.
+
+        Networks that are being removed themselves are left as they are.
+
+        :param uuids: The uuids of the networks being removed.
+        """
+        children = [
+            doc
+            for doc in self._db.search(NetworkSchema.PARENT_UUID.one_of(uuids))
+            if doc["_doc_metadata"]["uuid"] not in uuids
+        ]
+        if not children:
+            return
+        docs = []
+        for doc in children:
+            network = self._from_doc(doc)
+            full_doc = self._to_doc(network)
+            full_doc["_doc_metadata"] = doc["_doc_metadata"]
+            self._write_network_file(network, full_doc, doc)
+            self._invalidate(doc["_doc_metadata"]["uuid"])
+            docs.append(full_doc)
+        # the docs are replaced as they are, so locked networks are detached too
+        self._db.upsert_many(docs, reset=True)
+
+    def _network_file_path(self, doc: Mapping) -> Path:
+        """
+        The path of the binary network file of a network stored by reference.
+
+        :param doc: The doc of the network.
+        :return: The file path, alongside the db file.
+        """
+        db_path = Path(self._db._path)
+        return db_path.parent / f"{db_path.stem}_files" / doc[_NETWORK_FILE_FIELD]
+
+    def _to_doc(
+        self,
+        network: Network,
+        by_reference: Optional[bool] = None,
+        parent_uuid: Optional[str] = None,
+    ) -> dict:
+        """
+        Represent a network as a db doc.
+
+        :param network: An instance of :class:`~yawning_titan.networks.network.Network`.
+        :param by_reference: Whether the nodes and edges are left out of the
+            doc and stored in a binary network file instead. If ``None``, this
+            is decided by ``BINARY_STORAGE_MIN_NODES``.
+        :param parent_uuid: The uuid of a network in the db to store the nodes
+            and edges as a delta of. Takes precedence over ``by_reference``.
+        :return: The doc.
+        """
+        if by_reference is None:
+            by_reference = network.number_of_nodes() >= BINARY_STORAGE_MIN_NODES
+        doc = network.to_dict(json_serializable=True)
+        if parent_uuid:
+            parent = self._delta_parent(network.doc_metadata.uuid, parent_uuid)
+            doc[_DELTA_FIELD] = network_delta(self._resolve(parent), doc)
+            doc.pop("nodes")
+            doc.pop("edges")
+            doc[_PARENT_FIELD] = parent_uuid
+        elif by_reference:
+            for field in _INLINE_FIELDS:
+                doc.pop(field)
+            # each version gets a new file, so the file of the stored version
+            # is intact until the doc that refers to the new file is written
+            doc[_NETWORK_FILE_FIELD] = (
+                f"{network.doc_metadata.uuid}.{uuid4().hex[:12]}.ytnet"
+            )
+        doc[SUMMARY_FIELD] = self._summarise(network)
+        return doc
+
+    @staticmethod
+    def _summarise(network: Network) -> dict:
+        """
+        The summary stored with a network doc.
+
+        :param network: An instance of :class:`~yawning_titan.networks.network.Network`.
+        :return: The node counts of the network, used to list networks and
+            check their compatibility with game modes.
+        """
+        return {
+            "version": SUMMARY_VERSION,
+            "node_count": network.number_of_nodes(),
+            "entry_node_count": len(network.entry_nodes),
+            "high_value_node_count": len(network.high_value_nodes),
+            "num_of_random_entry_nodes": network.num_of_random_entry_nodes,
+            "num_of_random_high_value_nodes": network.num_of_random_high_value_nodes,
+        }
+
+    def _refresh_child_summaries(self, uuids: List[str]):
+        """
+        Summarise again the networks stored as deltas of networks that have changed.
+
+        A network stored as a delta follows the changes to its parent, so its
+        summary changes with the parent's. The networks stored as deltas of
+        those networks are refreshed in turn.
+
+        :param uuids: The uuids of the networks that have changed.
+        """
+        while uuids:
+            children = self._db.search(NetworkSchema.PARENT_UUID.one_of(uuids))
+            uuids = [doc["_doc_metadata"]["uuid"] for doc in children]
+            if not children:
+                return
+            with self._db._write_batch():
+                for doc, uuid in zip(children, uuids):
+                    self._db.db.update(
+                        {SUMMARY_FIELD: self._summarise(self._from_doc(doc))},
+                        DocMetadataSchema.UUID == uuid,
+                    )
+
+    def _summarise_doc(self, doc: Document) -> dict:
+        """
+        Summarise a network doc that was stored without a summary.
+
+        :param doc: The doc.
+        :return: The node counts of the network.
+        """
+        if "nodes" not in doc:
+            return self._summarise(self._from_doc(doc))
+        return {
+            "version": SUMMARY_VERSION,
+            **count_nodes(doc["nodes"]),
+            "num_of_random_entry_nodes": doc.get("num_of_random_entry_nodes"),
+            "num_of_random_high_value_nodes": doc.get(
+                "num_of_random_high_value_nodes"
+            ),
+        }
+
+    def _write_network_file(
+        self, network: Network, doc: dict, stored: Optional[Document] = None
+    ):
+        """
+        Write the binary network file of a network stored by reference, before its doc is written.
+
+        Must be called in a :meth:`_write_scope`.
+
+        :param network: The network to store.
+        :param doc: The doc to store.
+        :param stored: The doc the doc replaces, if any. Its network file is
+            removed once the doc has been written.
+        """
+        if _NETWORK_FILE_FIELD in doc:
+            path = self._network_file_path(doc)
+            network.save_binary(path)
+            self._file_changes[0].append(path)
+        self._replace_network_file(stored)
+
+    def _replace_network_file(self, stored: Optional[Document]):
+        """
+        Remove the binary network file of a doc once the doc has been replaced or removed.
+
+        Must be called in a :meth:`_write_scope`.
+
+        :param stored: The doc, if any.
+        """
+        if stored and _NETWORK_FILE_FIELD in stored:
+            self._file_changes[1].append(self._network_file_path(stored))
+
+    def _cache_key(self, uuid: str) -> tuple:
+        """
+        The :class:`~yawning_titan.utils.config_cache.ConfigCache` key of a doc.
+
+        :param uuid: The doc uuid.
+        :return: The cache key.
+        """
+        return "network", str(self._db._path), uuid
+
+    def _invalidate(self, uuid: str):
+        """
+        Remove a network from the :class:`~yawning_titan.utils.config_cache.ConfigCache`.
+
+        :param uuid: The network uuid.
+        """
+        config_cache().invalidate(self._cache_key(uuid))
+        config_cache().invalidate(("network_nodes",) + self._cache_key(uuid)[1:])
+
+    def _doc_version(self, doc: Document) -> tuple:
+        """
+        The version of a doc, which changes whenever the network it holds changes.
+
+        The version of a network stored as a delta includes the version of
+        its parent.
+
+        :param doc: The doc.
+        :return: The version.
+        """
+        metadata = doc["_doc_metadata"]
+        version = (metadata.get("created_at"), metadata.get("updated_at"))
+        if _PARENT_FIELD in doc:
+            version += (self._doc_version(self._parent_doc(doc)),)
+        return version
+
+    def _parent_doc(self, doc: Document) -> Document:
+        """
+        Get the doc of the network a network is stored as a delta of.
+
+        :param doc: The doc of the network stored as a delta.
+        :return: The parent doc.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            parent does not exist.
+        """
+        parent = self._db.get(doc[_PARENT_FIELD])
+        if parent is None:
+            msg = (
+                f"The network with uuid='{doc['_doc_metadata']['uuid']}' in the {self._db.name} db is stored as a "
+                f"delta of the network with uuid='{doc[_PARENT_FIELD]}', which does not exist."
+            )
+            try:
+                raise YawningTitanDBError(msg)
+            except YawningTitanDBError as e:
+                _LOGGER.error(msg, exc_info=True)
+                raise e
+        return parent
+
+    def _delta_parent(self, uuid: str, parent_uuid: str) -> Document:
+        """
+        Get the doc of a network to store another network as a delta of.
+
+        :param uuid: The uuid of the network to store as a delta.
+        :param parent_uuid: The uuid of the parent network.
+        :return: The parent doc.
+        :raise: :class:`~yawning_titan.exceptions.YawningTitanDBError` if the
+            parent does not exist, or is the network itself or stored as a
+            delta of it.
+        """
+        msg = None
+        parent = ancestor = self._db.get(parent_uuid)
+        if parent is None:
+            msg = f"Cannot store a network as a delta of the network with uuid='{parent_uuid}' as it does not exist."
+        while ancestor is not None and msg is None:
+            if ancestor["_doc_metadata"]["uuid"] == uuid:
+                msg = (
+                    f"Cannot store the network with uuid='{uuid}' as a delta of the network with "
+                    f"uuid='{parent_uuid}' as it is the same network or stored as a delta of it."
+                )
+            elif _PARENT_FIELD in ancestor:
+                ancestor = self._parent_doc(ancestor)
+            else:
+                ancestor = None
+        if msg:
+            try:
+                raise YawningTitanDBError(msg)
+            except YawningTitanDBError as e:
+                _LOGGER.error(msg, exc_info=True)
+                raise e
+        return parent
+
+    def _resolve(self, doc: Document) -> dict:
+        """
+        Get the nodes and edges of a network doc in any storage mode.
+
+        The nodes and edges of networks stored as deltas are built by applying
+        the delta to the nodes and edges of the parent. They, and those of
+        networks stored by reference, are cached.
+
+        :param doc: The doc.
+        :return: A dict of the ``nodes`` and ``edges`` of the network in the
+            format generated by :meth:`~yawning_titan.networks.network.Network.to_dict`
+            with ``json_serializable=True``.
+        """
+        if _PARENT_FIELD not in doc and _NETWORK_FILE_FIELD not in doc:
+            return {"nodes": doc.get("nodes", {}), "edges": doc.get("edges", {})}
+
+        def _load():
+            if _PARENT_FIELD in doc:
+                return apply_delta(
+                    self._resolve(self._parent_doc(doc)), doc[_DELTA_FIELD]
+                )
+            network_dict = self._create_from_doc(doc).to_dict(json_serializable=True)
+            return {"nodes": network_dict["nodes"], "edges": network_dict["edges"]}
+
+        uuid = doc["_doc_metadata"]["uuid"]
+        return config_cache().get_or_load(
+            ("network_nodes",) + self._cache_key(uuid)[1:],
+            self._doc_version(doc),
+            _load,
+        )
+
+    def _history_docs(self, uuid: str) -> List[Document]:
+        """
+        Get the network history docs of a network.
+
+        :param uuid: The network uuid.
+        :return: The docs, oldest first.
+        """
+        docs = self._history.search(_HistorySchema.NETWORK_UUID == uuid)
+        return sorted(docs, key=lambda doc: doc["revision"])
+
+    def _record_revision(
+        self, stored: Document, previous: dict, network_doc: dict, network: Network
+    ):
+        """
+        Keep a replaced version of a network in the network history.
+
+        The version is stored as a delta of the version that replaced it.
+        Nothing is kept if the network has not changed.
+
+        :param stored: The doc that was replaced.
+        :param previous: The nodes and edges of the replaced version.
+        :param network_doc: The doc that replaced it.
+        :param network: The network that replaced it.
+        """
+
+        def _attributes(doc: Mapping) -> dict:
+            return {k: v for k, v in doc.items() if k not in _REVISION_EXCLUDED_FIELDS}
+
+        def _without_updated_at(attributes: dict) -> dict:
+            metadata = dict(attributes["_doc_metadata"])
+            metadata.pop("updated_at", None)
+            return {**attributes, "_doc_metadata": metadata}
+
+        delta = network_delta(network.to_dict(json_serializable=True), previous)
+        attributes = _attributes(stored)
+        if is_empty(delta) and _without_updated_at(attributes) == _without_updated_at(
+            _attributes(network_doc)
+        ):
+            return
+
+        uuid = network.doc_metadata.uuid
+        revisions = [doc["revision"] for doc in self._history_docs(uuid)]
+        revision = max(revisions, default=0) + 1
+        with self._history.write_behind():
+            self._history.insert(
+                {
+                    "_doc_metadata": DocMetadata().to_dict(),
+                    "network_uuid": uuid,
+                    "revision": revision,
+                    "network": attributes,
+                    _DELTA_FIELD: delta,
+                }
+            )
+            if len(revisions) >= MAX_REVISIONS:
+                self._history.remove_by_cond(
+                    (_HistorySchema.NETWORK_UUID == uuid)
+                    & (_HistorySchema.REVISION <= revision - MAX_REVISIONS)
+                )
+
+    def _from_doc(self, doc: Document) -> Network:
+        """
+        Get the network of a db doc, only rebuilding it if the doc has changed.
+
+        :param doc: The doc.
+        :return: A new instance of :class:`~yawning_titan.networks.network.Network`.
+        """
+        return config_cache().get_or_load(
+            self._cache_key(doc["_doc_metadata"]["uuid"]),
+            self._doc_version(doc),
+            lambda: self._create_from_doc(doc),
+        )
+
+    def _create_from_doc(self, doc: Document) -> Network:
+        """
+        Create a network from a db doc.
+
+        :param doc: The doc.
+        :return: An instance of :class:`~yawning_titan.networks.network.Network`.
+        """
+        if _PARENT_FIELD in doc:
+            network_dict = {
+                k: v for k, v in doc.items() if k not in (_PARENT_FIELD, _DELTA_FIELD)
+            }
+            return Network.create({**network_dict, **self._resolve(doc)})
+        if _NETWORK_FILE_FIELD not in doc:
+            return Network.create(doc)
+        doc = dict(doc)
+        network = Network.load_binary(self._network_file_path(doc))
+        del doc[_NETWORK_FILE_FIELD]
+        # apply the doc attributes as Network.create does
+        network.set_from_dict(doc, clear_special_nodes=False)
+        return network
 
     def reset_default_networks_in_db(self, force=False):
         """
@@ -406,36 +1240,42 @@ class NetworkDB:
 
         # Load the default db file into TinyDB
         default_db = TinyDB(default_network_path)
-
-        # Iterate over all default networks, and force an update in the
-        # main NetworkDB by uuid.
-        for package_data_network in default_db.all():
-            uuid = package_data_network["_doc_metadata"]["uuid"]
-            name = package_data_network["_doc_metadata"]["name"]
-
-            # Get the matching network from the networks db
-            try:
-                db_network = self.get(uuid)
-            except KeyError:
-                db_network = None
-
-            # If the network doesn't match the default, or it doesn't exist,
-            # perform an upsert.
-            if not force and db_network:
-                reset = False
-            else:
-                reset = True
-            if reset:
-                self._db.db.upsert(package_data_network, DocMetadataSchema.UUID == uuid)
-                _LOGGER.info(
-                    f"Reset default network '{name}' in the "
-                    f"{self._db.name} db with uuid='{uuid}'."
-                )
+        default_docs = default_db.all()
 
         # Clear the default db cache and close the file.
         default_db.clear_cache()
         default_db.close()
 
+        # Get the matching docs from the networks db, without building them
+        uuids = [doc["_doc_metadata"]["uuid"] for doc in default_docs]
+        db_docs = self._db.get_many(uuids)
+
+        # If a network doesn't match the default, or it doesn't exist, reset
+        # it. All resets are written to the main NetworkDB at once.
+        reset_docs = [
+            doc
+            for doc, db_doc in zip(default_docs, db_docs)
+            if force
+            or db_doc is None
+            or {k: v for k, v in db_doc.items() if k != SUMMARY_FIELD} != doc
+        ]
+        for uuid in uuids:
+            self._invalidate(uuid)
+        for doc in reset_docs:
+            doc[SUMMARY_FIELD] = self._summarise_doc(doc)
+        with self._write_scope(history=False):
+            replaced = self._db.get_many(
+                [doc["_doc_metadata"]["uuid"] for doc in reset_docs]
+            )
+            for stored in replaced:
+                self._replace_network_file(stored)
+            self._db.upsert_many(reset_docs, reset=True)
+        for doc in reset_docs:
+            _LOGGER.info(
+                f"Reset default network '{doc['_doc_metadata']['name']}' in the "
+                f"{self._db.name} db with uuid='{doc['_doc_metadata']['uuid']}'."
+            )
+
     def rebuild_db(self):
         """
         Rebuild the db.
@@ -453,8 +1293,11 @@ class NetworkDB:
                 function.
         """
         _LOGGER.info(f"Rebuilding the {self._db.name} db.")
-        self._db.db.clear_cache()
-        self._db.db.truncate()
+        with self._db._write_batch():
+            self._db.db.clear_cache()
+            self._db.db.truncate()
+        with self._history._write_batch():
+            self._history.db.truncate()
         self.reset_default_networks_in_db()
 
 
@@ -0,0 +1,155 @@
+"""
+Node and edge deltas between networks.
+
+A delta records the difference between the nodes and edges of two networks
+in the format generated by
+:meth:`~yawning_titan.networks.network.Network.to_dict` with
+``json_serializable=True``. The nodes that are added or changed are stored
+whole, and removed nodes as ``None``. Edges are stored as the node uuid pairs
+that are added and removed.
+
+The :class:`~yawning_titan.networks.network_db.NetworkDB` uses deltas to
+store networks against a parent network, and to keep the revision history of
+each network.
+
+.. versionadded:: 2.0.2
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+__all__ = ["NetworkRevision", "network_delta", "apply_delta", "is_empty"]
+
+
+def _edge_set(edges: Mapping) -> Set[Tuple[str, str]]:
+    """
+    Get the undirected edges of a network as a set of sorted node uuid pairs.
+
+    :param edges: The ``edges`` of a network dict.
+    :return: The set of edges.
+    """
+    return {
+        (u, v) if u <= v else (v, u)
+        for u, neighbours in edges.items()
+        for v in neighbours
+    }
+
+
+def _edges_from_set(edges: Iterable[Tuple[str, str]]) -> Dict[str, Dict[str, dict]]:
+    """
+    Get the ``edges`` of a network dict from a set of node uuid pairs.
+
+    :param edges: The edges as node uuid pairs.
+    :return: The edges as an adjacency dict with each edge stored once.
+    """
+    adjacency = {}
+    for u, v in sorted(edges):
+        adjacency.setdefault(u, {})[v] = {}
+    return adjacency
+
+
+def network_delta(base: Mapping, target: Mapping) -> dict:
+    """
+    Get the delta that turns the nodes and edges of one network into another's.
+
+    :param base: The network dict the delta is applied to.
+    :param target: The network dict the delta results in.
+    :return: A delta with ``nodes``, a dict of node uuid to node dict for
+        added and changed nodes and ``None`` for removed nodes, and
+        ``edges_added`` and ``edges_removed``, lists of node uuid pairs.
+    """
+    base_nodes = base.get("nodes", {})
+    target_nodes = target.get("nodes", {})
+    nodes = {
+        uuid: dict(node)
+        for uuid, node in target_nodes.items()
+        if base_nodes.get(uuid) != node
+    }
+    nodes.update({uuid: None for uuid in base_nodes if uuid not in target_nodes})
+
+    base_edges = _edge_set(base.get("edges", {}))
+    target_edges = _edge_set(target.get("edges", {}))
+    return {
+        "nodes": nodes,
+        "edges_added": [list(edge) for edge in sorted(target_edges - base_edges)],
+        "edges_removed": [list(edge) for edge in sorted(base_edges - target_edges)],
+    }
+
+
+def apply_delta(base: Mapping, delta: Mapping) -> dict:
+    """
+    Apply a delta to the nodes and edges of a network.
+
+    :param base: A network dict. It is not modified.
+    :param delta: A delta as returned by :func:`network_delta`.
+    :return: A dict of the resulting ``nodes`` and ``edges``.
+    """
+    nodes = dict(base.get("nodes", {}))
+    for uuid, node in delta.get("nodes", {}).items():
+        if node is None:
+            nodes.pop(uuid, None)
+        else:
+            nodes[uuid] = node
+
+    edges = _edge_set(base.get("edges", {}))
+    edges.difference_update(tuple(edge) for edge in delta.get("edges_removed", []))
+    edges.update(tuple(sorted(edge)) for edge in delta.get("edges_added", []))
+    # edges to nodes that were removed go with them
+    edges = {(u, v) for u, v in edges if u in nodes and v in nodes}
+    return {"nodes": nodes, "edges": _edges_from_set(edges)}
+
+
+def is_empty(delta: Mapping) -> bool:
+    """
+    Check whether a delta changes nothing.
+
+    :param delta: A delta as returned by :func:`network_delta`.
+    :return: ``True`` if the delta has no node or edge changes.
+    """
+    return not (
+        delta.get("nodes") or delta.get("edges_added") or delta.get("edges_removed")
+    )
+
+
+@dataclass(frozen=True)
+class NetworkRevision:
+    """A previous version of a network kept in the history of the network DB."""
+
+    network_uuid: str
+    """The uuid of the network."""
+    revision: int
+    """The revision number, counting up from 1 for the first version replaced."""
+    name: Optional[str] = None
+    """The network name at the revision."""
+    updated_at: Optional[str] = None
+    """When the revision was written, as an ISO 8601 str."""
+    parent_uuid: Optional[str] = None
+    """The uuid of the network the revision was stored as a delta of, if any."""
+    nodes_changed: int = 0
+    """The number of nodes that differ from the version that replaced it."""
+    edges_changed: int = 0
+    """The number of edges that differ from the version that replaced it."""
+
+    @classmethod
+    def from_doc(cls, doc: Mapping) -> NetworkRevision:
+        """
+        Create a revision from a network history doc.
+
+        :param doc: The history doc.
+        :return: The instance of NetworkRevision.
+        """
+        network = doc.get("network") or {}
+        metadata = network.get("_doc_metadata") or {}
+        delta = doc.get("delta") or {}
+        return cls(
+            network_uuid=doc["network_uuid"],
+            revision=doc["revision"],
+            name=metadata.get("name"),
+            updated_at=metadata.get("updated_at") or metadata.get("created_at"),
+            parent_uuid=network.get("parent_uuid"),
+            nodes_changed=len(delta.get("nodes", {})),
+            edges_changed=len(delta.get("edges_added", []))
+            + len(delta.get("edges_removed", [])),
+        )
+
@@ -0,0 +1,172 @@
+"""
+Read and write the binary network file format used by :meth:`Network.save_binary`.
+
+A network file is made up of:
+
+- An 8 byte magic string.
+- The length of the header as a little-endian unsigned 64-bit int.
+- A UTF-8 JSON header holding the network metadata and the dtype, shape and
+  offset of each array.
+- The raw array data, each array aligned to a 64 byte boundary so that it can
+  be memory mapped.
+"""
+from __future__ import annotations
+
+import json
+import os
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
+
+import numpy as np
+
+from yawning_titan.exceptions import NetworkError
+
+__all__ = [
+    "read_network_file",
+    "write_network_file",
+    "encode_strings",
+    "decode_strings",
+]
+
+_LOGGER = getLogger(__name__)
+
+MAGIC: Final[bytes] = b"YTNETWK1"
+"""The magic string at the start of every network file."""
+
+_ALIGNMENT: Final[int] = 64
+_PREFIX_SIZE: Final[int] = len(MAGIC) + 8
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_network_file(
+    path: Union[str, Path], metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]
+):
+    """
+    Write a network file.
+
+    The file is written to a temporary file alongside ``path`` and then moved
+    into place so that readers never see a partially written file.
+
+    :param path: The path of the file to write.
+    :param metadata: A JSON serializable dict of network metadata.
+    :param arrays: A dict of named arrays to store.
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, a in arrays.items():
+        layout[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset = _aligned(offset + a.nbytes)
+    header = json.dumps({"metadata": metadata, "arrays": layout}).encode("utf-8")
+    data_start = _aligned(_PREFIX_SIZE + len(header))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, a in arrays.items():
+            f.write(b"\0" * (data_start + layout[name]["offset"] - f.tell()))
+            f.write(a.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_network_file(
+    path: Union[str, Path], mmap: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Read a network file.
+
+    :param path: The path of the file to read.
+    :param mmap: If True the arrays are read-only memory maps of the file,
+        otherwise the file is read into memory.
+    :return: A tuple of the metadata dict and the dict of named arrays.
+    :raises NetworkError: If the file is not a network file.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX_SIZE)
+        if len(prefix) < _PREFIX_SIZE or prefix[: len(MAGIC)] != MAGIC:
+            msg = f"{path} is not a yawning_titan network file."
+            try:
+                raise NetworkError(msg)
+            except NetworkError as e:
+                _LOGGER.critical(e)
+                raise e
+        header_len = int.from_bytes(prefix[len(MAGIC) :], "little")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        data_start = _aligned(_PREFIX_SIZE + header_len)
+        data = None
+        if not mmap:
+            f.seek(data_start)
+            data = f.read()
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape))
+        if count == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        elif mmap:
+            arrays[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=data_start + spec["offset"],
+                shape=shape,
+            )
+        else:
+            arrays[name] = np.frombuffer(
+                data, dtype=dtype, count=count, offset=spec["offset"]
+            ).reshape(shape)
+    return header["metadata"], arrays
+
+
+def encode_strings(
+    values: List[Optional[str]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode a list of optional strings as arrays.
+
+    :param values: The strings to encode. ``None`` values are allowed.
+    :return: A tuple of the UTF-8 bytes of every string concatenated, the
+        int64 start offset of each string (plus the end offset) and a bool
+        mask of the ``None`` values.
+    """
+    encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    is_null = np.array([v is None for v in values], dtype=bool)
+    return blob, offsets, is_null
+
+
+def decode_strings(
+    blob: np.ndarray, offsets: np.ndarray, is_null: Optional[np.ndarray] = None
+) -> List[Optional[str]]:
+    """
+    Decode a list of optional strings encoded with :func:`encode_strings`.
+
+    :param blob: The concatenated UTF-8 bytes.
+    :param offsets: The string offsets.
+    :param is_null: An optional mask of the ``None`` values.
+    :return: The list of strings.
+    """
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    values = [
+        data[bounds[i] : bounds[i + 1]].decode("utf-8")
+        for i in range(len(bounds) - 1)
+    ]
+    if is_null is not None:
+        for i in np.flatnonzero(is_null).tolist():
+            values[i] = None
+    return values
@@ -1,12 +1,50 @@
 from __future__ import annotations
 
-from typing import List, Optional
-from uuid import uuid4
+import weakref
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+if TYPE_CHECKING:
+    from yawning_titan.networks.network import Network
+
+
+def _uuid_sort_key(uuid: str) -> Optional[int]:
+    """
+    Get an integer that sorts in the same order as a canonical uuid string.
+
+    :param uuid: A uuid string.
+    :return: The uuid as an int, or None if the string is not a canonical
+        lowercase uuid.
+    """
+    try:
+        parsed = UUID(uuid)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return parsed.int if str(parsed) == uuid else None
 
 
 class Node:
     """A Node for building networks with yawning_titan.networks.network.Network."""
 
+    __slots__ = (
+        "_uuid_str",
+        "_hash",
+        "_sort_key",
+        "_networks",
+        "_name",
+        "_high_value_node",
+        "_entry_node",
+        "_vulnerability",
+        "_x_pos",
+        "_y_pos",
+        "vulnerability_score",
+        "_true_compromised_status",
+        "_blue_view_compromised_status",
+        "_deceptive_node",
+        "blue_knows_intrusion",
+        "_isolated",
+    )
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -25,8 +63,12 @@ class Node:
         :param vulnerability: The vulnerability score of the Node. Has a
             default value of 0.1.
         """
-        self._uuid: str = str(uuid4())
-        self.name: str = name
+        uuid = uuid4()
+        self._uuid_str: str = str(uuid)
+        self._hash: int = hash(self._uuid_str)
+        self._sort_key: Optional[int] = uuid.int
+        self._networks: Tuple[weakref.ref, ...] = ()
+        self._name: str = name
         self._high_value_node: bool = high_value_node
         self._entry_node: bool = entry_node
         self._vulnerability = vulnerability
@@ -35,11 +77,11 @@ class Node:
         self._x_pos: float = 0.0
         self._y_pos: float = 0.0
         self.vulnerability_score = vulnerability
-        self.true_compromised_status = 0
-        self.blue_view_compromised_status = 0
-        self.deceptive_node = False
+        self._true_compromised_status: int = 0
+        self._blue_view_compromised_status: int = 0
+        self._deceptive_node: bool = False
         self.blue_knows_intrusion = False
-        self.isolated = False
+        self._isolated: bool = False
 
     @classmethod
     def create_from_db(
@@ -91,6 +133,16 @@ class Node:
         self.x_pos = pos[0]
         self.y_pos = pos[1]
 
+    @property
+    def name(self) -> Optional[str]:
+        """The name of the Node."""
+        return self._name
+
+    @name.setter
+    def name(self, name: Optional[str]):
+        self._name = name
+        self._notify_networks_of_change()
+
     @property
     def vulnerability(self) -> float:
         """The nodes initial vulnerability."""
@@ -100,11 +152,23 @@ class Node:
     def vulnerability(self, x):
         self._vulnerability = x
         self.vulnerability_score = x
+        self._notify_networks_of_change()
 
     @property
     def uuid(self) -> str:
         """The node UUID."""
-        return self._uuid
+        return self._uuid_str
+
+    @property
+    def _uuid(self) -> str:
+        """The node UUID, settable so that nodes can be recreated from the NetworkDB."""
+        return self._uuid_str
+
+    @_uuid.setter
+    def _uuid(self, uuid: str):
+        self._uuid_str = uuid
+        self._hash = hash(uuid)
+        self._sort_key = _uuid_sort_key(uuid)
 
     @property
     def high_value_node(self) -> bool:
@@ -114,6 +178,7 @@ class Node:
     @high_value_node.setter
     def high_value_node(self, high_value_node: bool):
         self._high_value_node = high_value_node
+        self._notify_networks("high_value_node", high_value_node)
 
     @property
     def entry_node(self) -> bool:
@@ -123,6 +188,47 @@ class Node:
     @entry_node.setter
     def entry_node(self, entry_node: bool):
         self._entry_node = entry_node
+        self._notify_networks("entry_node", entry_node)
+
+    @property
+    def deceptive_node(self) -> bool:
+        """True if the Node is a deceptive node, otherwise False."""
+        return self._deceptive_node
+
+    @deceptive_node.setter
+    def deceptive_node(self, deceptive_node: bool):
+        self._deceptive_node = deceptive_node
+        self._notify_networks("deceptive_node", deceptive_node)
+
+    @property
+    def true_compromised_status(self) -> int:
+        """1 if the Node is compromised, otherwise 0."""
+        return self._true_compromised_status
+
+    @true_compromised_status.setter
+    def true_compromised_status(self, status: int):
+        self._true_compromised_status = status
+        self._notify_networks("true_compromised_status", status == 1)
+
+    @property
+    def blue_view_compromised_status(self) -> int:
+        """1 if the blue agent sees the Node as compromised, otherwise 0."""
+        return self._blue_view_compromised_status
+
+    @blue_view_compromised_status.setter
+    def blue_view_compromised_status(self, status: int):
+        self._blue_view_compromised_status = status
+        self._notify_networks("blue_view_compromised_status", status == 1)
+
+    @property
+    def isolated(self) -> bool:
+        """True if the Node has been isolated, otherwise False."""
+        return self._isolated
+
+    @isolated.setter
+    def isolated(self, isolated: bool):
+        self._isolated = isolated
+        self._notify_networks("isolated", bool(isolated))
 
     @property
     def x_pos(self) -> float:
@@ -132,6 +238,7 @@ class Node:
     @x_pos.setter
     def x_pos(self, x_pos: float):
         self._x_pos = x_pos
+        self._notify_networks_of_change()
 
     @property
     def y_pos(self) -> float:
@@ -141,6 +248,51 @@ class Node:
     @y_pos.setter
     def y_pos(self, y_pos: float):
         self._y_pos = y_pos
+        self._notify_networks_of_change()
+
+    def _add_network(self, network: Network):
+        """
+        Register a network that contains the Node.
+
+        Registered networks are notified when a special node flag changes so
+        that they can keep their special node indexes up to date.
+
+        :param network: The network the Node has been added to.
+        """
+        if not any(ref() is network for ref in self._networks):
+            self._networks += (weakref.ref(network),)
+
+    def _remove_network(self, network: Network):
+        """
+        Deregister a network that no longer contains the Node.
+
+        :param network: The network the Node has been removed from.
+        """
+        self._networks = tuple(
+            ref for ref in self._networks if ref() is not None and ref() is not network
+        )
+
+    def _notify_networks(self, flag: str, value: bool):
+        """
+        Notify the registered networks that a special node flag or status has changed.
+
+        :param flag: The name of the flag, one of ``entry_node``,
+            ``high_value_node``, ``deceptive_node``,
+            ``true_compromised_status``, ``blue_view_compromised_status`` or
+            ``isolated``.
+        :param value: The new value of the flag, or whether the status is set.
+        """
+        for ref in self._networks:
+            network = ref()
+            if network is not None:
+                network._node_flag_changed(self, flag, value)
+
+    def _notify_networks_of_change(self):
+        """Notify the registered networks that an attribute stored with the Node has changed."""
+        for ref in self._networks:
+            network = ref()
+            if network is not None:
+                network._node_attribute_changed(self)
 
     def to_dict(self):
         """The Node as a dict."""
@@ -173,15 +325,39 @@ class Node:
         )
         return node_str
 
+    def __getstate__(self):
+        # Networks re-register themselves when they are copied or unpickled.
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["_networks"] = ()
+        return state
+
+    def __setstate__(self, state):
+        self._networks = ()
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __deepcopy__(self, memo):
+        # every attribute other than the network registrations is immutable
+        node = object.__new__(self.__class__)
+        for slot in self.__slots__:
+            setattr(node, slot, getattr(self, slot))
+        node._networks = ()
+        memo[id(self)] = node
+        return node
+
     def __hash__(self):
-        return hash((self._uuid))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, self.__class__):
-            return hash(self) == hash(other)
+            return self._hash == other._hash
         return False
 
     def __lt__(self, other: Node):
         if isinstance(other, Node):
-            return self.uuid < other.uuid
+            if self._sort_key is not None and other._sort_key is not None:
+                return self._sort_key < other._sort_key
+            return self._uuid_str < other._uuid_str
         return self.uuid < other
@@ -0,0 +1,169 @@
+"""
+A process-level cache of parsed configs, game modes and networks.
+
+Entries are keyed by their source, such as a file path or a db doc uuid, and
+a version of the source, such as the file modification time or the doc
+``updated_at`` datetime, so that an entry is reloaded as soon as its source
+changes.
+
+Objects are stored pickled and every read unpickles a new copy, so callers
+are free to modify what they are given without corrupting the cache.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Final, Hashable, Optional, Tuple, Union
+
+import yaml
+
+__all__ = ["ConfigCache", "config_cache", "load_yaml"]
+
+_LOGGER = getLogger(__name__)
+
+YAML_LOADER: Final = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+"""The libyaml safe loader if PyYAML was built with libyaml, otherwise the pure-Python safe loader."""
+
+
+class ConfigCache:
+    """A least recently used cache of pickled objects keyed by source and version."""
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        """
+        The ConfigCache constructor.
+
+        :param maxsize: The maximum number of entries to hold.
+        :param max_bytes: The maximum total size of the pickled entries. As
+            entries include whole networks, this bounds the memory held by the
+            cache. Objects larger than this are not cached.
+        """
+        self.maxsize: int = maxsize
+        self.max_bytes: int = max_bytes
+        self._entries: OrderedDict[Hashable, Tuple[Hashable, bytes]] = OrderedDict()
+        self._nbytes: int = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[Any]:
+        """
+        Get a copy of a cached object.
+
+        :param key: The source of the object.
+        :param version: The version of the source.
+        :return: A new copy of the object, or ``None`` if the source and
+            version are not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(entry[1])
+
+    def put(self, key: Hashable, version: Hashable, obj: Any):
+        """
+        Cache a copy of an object.
+
+        Objects that cannot be pickled, or are larger than ``max_bytes`` once
+        pickled, are not cached.
+
+        :param key: The source of the object.
+        :param version: The version of the source.
+        :param obj: The object.
+        """
+        try:
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            _LOGGER.debug(f"Unable to cache {key}: {e}")
+            return
+        with self._lock:
+            self._pop(key)
+            if len(data) > self.max_bytes:
+                _LOGGER.debug(f"Unable to cache {key}: larger than max_bytes")
+                return
+            self._entries[key] = (version, data)
+            self._nbytes += len(data)
+            while len(self._entries) > self.maxsize or self._nbytes > self.max_bytes:
+                self._nbytes -= len(self._entries.popitem(last=False)[1][1])
+
+    def _pop(self, key: Hashable):
+        """Remove an entry, if it is cached. Must be called holding the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= len(entry[1])
+
+    def get_or_load(
+        self, key: Hashable, version: Hashable, load: Callable[[], Any]
+    ) -> Any:
+        """
+        Get a copy of a cached object, loading and caching it on a miss.
+
+        :param key: The source of the object.
+        :param version: The version of the source.
+        :param load: A callable that loads the object from its source.
+        :return: The object. On a miss this is the loaded object itself.
+        """
+        obj = self.get(key, version)
+        if obj is None:
+            obj = load()
+            self.put(key, version, obj)
+        return obj
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Remove an entry, or every entry.
+
+        :param key: The source to remove. If ``None`` the cache is cleared.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._nbytes = 0
+            else:
+                self._pop(key)
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the pickled entries."""
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_DEFAULT_CACHE: Optional[ConfigCache] = None
+
+
+def config_cache() -> ConfigCache:
+    """
+    The process-level :class:`ConfigCache`.
+
+    :return: The shared instance of :class:`ConfigCache`.
+    """
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ConfigCache()
+    return _DEFAULT_CACHE
+
+
+def load_yaml(file_path: Union[str, Path]) -> Any:
+    """
+    Load a .yaml file, parsing it only if it has changed since it was last loaded.
+
+    :param file_path: The path to the .yaml file.
+    :return: A new copy of the parsed file.
+    :raises FileNotFoundError: If the file does not exist.
+    """
+    path = Path(file_path).resolve()
+    stat = os.stat(path)
+
+    def _load():
+        with open(path) as f:
+            return yaml.load(f, Loader=YAML_LOADER)
+
+    return config_cache().get_or_load(
+        ("yaml", str(path)), (stat.st_mtime_ns, stat.st_size), _load
+    )
@@ -0,0 +1,118 @@
+"""
+An on-disk cache of arrays derived from networks and game modes.
+
+Artifacts are keyed by an artifact name and a content fingerprint, such as
+:attr:`~yawning_titan.networks.network.Network.topology_fingerprint`, so
+that repeated runs on the same network can skip expensive precomputation.
+"""
+from __future__ import annotations
+
+import os
+from logging import getLogger
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from yawning_titan import CACHE_DIR
+
+__all__ = ["DerivedArtifactCache", "derived_artifact_cache"]
+
+_LOGGER = getLogger(__name__)
+
+
+class DerivedArtifactCache:
+    """
+    Stores derived arrays as ``.npy`` files under ``<root>/<name>/<fingerprint>.npy``.
+
+    The cache is best effort. Unreadable files are treated as cache misses and
+    failed writes are logged and ignored.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """
+        The DerivedArtifactCache constructor.
+
+        :param root: The cache directory. Defaults to ``yawning_titan.CACHE_DIR``.
+        """
+        self.root: Path = Path(root) if root is not None else CACHE_DIR
+
+    def path(self, name: str, fingerprint: str) -> Path:
+        """
+        The path of a cached artifact.
+
+        :param name: The artifact name.
+        :param fingerprint: The fingerprint of the content it was derived from.
+        :return: The path of the ``.npy`` file.
+        """
+        return self.root / name / f"{fingerprint}.npy"
+
+    def load(self, name: str, fingerprint: str) -> Optional[np.ndarray]:
+        """
+        Load a cached artifact.
+
+        :param name: The artifact name.
+        :param fingerprint: The fingerprint of the content it was derived from.
+        :return: The array, or ``None`` if it is not cached.
+        """
+        path = self.path(name, fingerprint)
+        if not path.is_file():
+            return None
+        try:
+            return np.load(path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            _LOGGER.debug(f"Ignoring unreadable cached artifact {path}: {e}")
+            return None
+
+    def save(self, name: str, fingerprint: str, artifact: np.ndarray):
+        """
+        Cache an artifact.
+
+        The artifact is written to a temporary file and moved into place so
+        that concurrent runs never read a partially written file.
+
+        :param name: The artifact name.
+        :param fingerprint: The fingerprint of the content it was derived from.
+        :param artifact: The array to cache.
+        """
+        path = self.path(name, fingerprint)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npy")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(tmp_path, np.asarray(artifact), allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _LOGGER.debug(f"Unable to cache artifact {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def get_or_compute(
+        self, name: str, fingerprint: str, compute: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Load a cached artifact, computing and caching it on a miss.
+
+        :param name: The artifact name.
+        :param fingerprint: The fingerprint of the content it is derived from.
+        :param compute: A callable that computes the artifact.
+        :return: The array.
+        """
+        artifact = self.load(name, fingerprint)
+        if artifact is None:
+            artifact = np.asarray(compute())
+            self.save(name, fingerprint, artifact)
+        return artifact
+
+
+_DEFAULT_CACHE: Optional[DerivedArtifactCache] = None
+
+
+def derived_artifact_cache() -> DerivedArtifactCache:
+    """
+    The default :class:`DerivedArtifactCache`, stored in ``yawning_titan.CACHE_DIR``.
+
+    :return: The shared instance of :class:`DerivedArtifactCache`.
+    """
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = DerivedArtifactCache()
+    return _DEFAULT_CACHE
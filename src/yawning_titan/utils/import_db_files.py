@@ -0,0 +1,79 @@
+"""Bulk import a directory of network and game mode files into the NetworkDB and GameModeDB."""
+import json
+from logging import getLogger
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from yawning_titan.db.doc_metadata import DocMetadata
+from yawning_titan.game_modes.game_mode import GameMode
+from yawning_titan.networks.network import Network
+
+_LOGGER = getLogger(__name__)
+
+
+def load_files(directory: Union[str, Path]) -> Tuple[List[Network], List[GameMode]]:
+    """
+    Load the network and game mode files in a directory.
+
+    - ``.yaml`` and ``.yml`` files are game modes, named after the file.
+    - ``.json`` files are networks or game modes in the format generated by
+      their ``to_dict(json_serializable=True)`` methods. Networks are
+      recognised by their ``nodes`` and ``edges``.
+    - ``.ytnet`` files are binary network files.
+
+    Other files are skipped.
+
+    :param directory: The directory to load files from.
+    :return: A tuple of the list of networks and the list of game modes.
+    """
+    networks = []
+    game_modes = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix in (".yaml", ".yml"):
+            game_mode = GameMode.create_from_yaml(path, infer_legacy=True)
+            game_mode.doc_metadata.update(name=path.stem)
+            game_modes.append(game_mode)
+        elif path.suffix == ".json":
+            with open(path) as f:
+                doc = json.load(f)
+            if "nodes" in doc and "edges" in doc:
+                networks.append(Network.create(doc))
+            else:
+                if "_doc_metadata" in doc:
+                    doc["_doc_metadata"] = DocMetadata(**doc["_doc_metadata"])
+                game_modes.append(GameMode.create(doc))
+        elif path.suffix == ".ytnet":
+            networks.append(Network.load_binary(path, mmap=False))
+        else:
+            _LOGGER.info(f"Skipped importing {path} as it is not a known file type.")
+    return networks, game_modes
+
+
+def run(directory: Union[str, Path], upsert: bool = False) -> Tuple[int, int]:
+    """
+    Bulk import a directory of network and game mode files.
+
+    All networks are written to the NetworkDB, and all game modes to the
+    GameModeDB, with a single write each.
+
+    :param directory: The directory to import files from.
+    :param upsert: If True, networks and game modes that already exist are
+        replaced, otherwise importing them fails.
+    :return: The number of networks and game modes imported.
+    """
+    from yawning_titan.game_modes.game_mode_db import GameModeDB
+    from yawning_titan.networks.network_db import NetworkDB
+
+    networks, game_modes = load_files(directory)
+    network_db = NetworkDB()
+    game_mode_db = GameModeDB()
+    if upsert:
+        network_db.upsert_many(networks)
+        game_mode_db.upsert_many(game_modes)
+    else:
+        network_db.insert_many(networks)
+        game_mode_db.insert_many(game_modes)
+    _LOGGER.info(
+        f"Imported {len(networks)} networks and {len(game_modes)} game modes from {directory}."
+    )
+    return len(networks), len(game_modes)
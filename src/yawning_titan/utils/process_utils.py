@@ -0,0 +1,59 @@
+"""
+Helpers shared by the process pools and file checkpoints of runs and sweeps.
+
+Used by :class:`~yawning_titan.yawning_titan_run.YawningTitanRun` to train
+seeds concurrently and by
+:class:`~yawning_titan.yawning_titan_sweep.YawningTitanSweep` to run jobs.
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+from typing import IO, Callable, Final, List
+
+__all__ = ["THREAD_ENV_VARS", "init_worker", "write_atomic"]
+
+THREAD_ENV_VARS: Final[List[str]] = [
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+]
+"""The env vars that limit the threads of the numerical libraries."""
+
+
+def init_worker(cpus: int):
+    """
+    Limit the threads a worker process uses to its CPU budget.
+
+    Used as the ``initializer`` of a process pool.
+
+    :param cpus: The number of CPUs the worker may use.
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(cpus)
+    import torch
+
+    torch.set_num_threads(cpus)
+
+
+def write_atomic(path: pathlib.Path, write: Callable[[IO], None], binary: bool = False):
+    """
+    Write a file by writing a temporary file and replacing the file with it.
+
+    :param path: The file path.
+    :param write: A callable that writes to an open file.
+    :param binary: If True, the file is opened in binary mode rather than text mode.
+    """
+    path = pathlib.Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") if binary else open(
+            tmp_path, "w", newline=""
+        ) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -5,6 +5,7 @@ from yawning_titan import (
     AGENTS_DIR,
     AGENTS_LOGS_DIR,
     APP_IMAGES_DIR,
+    CACHE_DIR,
     DB_DIR,
     GAME_MODES_DIR,
     IMAGES_DIR,
@@ -36,6 +37,7 @@ def run():
         DB_DIR,
         LOG_DIR,
         APP_IMAGES_DIR,
+        CACHE_DIR,
     ]
 
     for app_dir in app_dirs:
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import copy
+import io
 import json
+import multiprocessing
 import os.path
 import pathlib
+import pickle
+import random
 import shutil
+import statistics
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from logging import Logger, getLogger
-from typing import Dict, Final, List, Optional, Union
+from typing import Dict, Final, List, Optional, Tuple, Union
 from uuid import uuid4
 
+import numpy as np
+import torch
 import yaml
 from stable_baselines3 import PPO
-from stable_baselines3.common.callbacks import EvalCallback
+from stable_baselines3.common.callbacks import BaseCallback, EvalCallback
 from stable_baselines3.common.env_checker import check_env
 from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
@@ -31,9 +40,139 @@ from yawning_titan.game_modes.game_mode import GameMode
 from yawning_titan.game_modes.game_mode_db import default_game_mode
 from yawning_titan.networks.network import Network
 from yawning_titan.networks.network_db import default_18_node_network
+from yawning_titan.utils.config_cache import load_yaml
+from yawning_titan.utils.process_utils import init_worker, write_atomic
 
 _LOGGER = getLogger(__name__)
 
+_ARGS_ADDED_SINCE_SAVED: Final[Dict] = {
+    "ppo_kwargs": {},
+    "concurrent_training_runs": False,
+    "checkpoint_freq": None,
+}
+"""Args that runs saved by earlier versions do not have in their args.json, and their defaults."""
+
+SEEDS_FILE: Final[str] = "seeds.json"
+"""The file the results of each seed of a concurrent multi-seed run are saved to."""
+
+CHECKPOINT_FILE: Final[str] = "checkpoint.pkl"
+"""The file a run is checkpointed to while training."""
+
+_AGENT_STATE: Final[Tuple[str, ...]] = ("_last_obs", "_last_original_obs")
+"""The attributes of the agent checkpointed with a run that loading a saved agent discards, forcing an env reset."""
+
+_EVAL_CALLBACK_STATE: Final[Tuple[str, ...]] = (
+    "n_calls",
+    "best_mean_reward",
+    "last_mean_reward",
+    "evaluations_results",
+    "evaluations_timesteps",
+    "evaluations_length",
+    "evaluations_successes",
+    "_is_success_buffer",
+)
+"""The attributes of the eval callback checkpointed with a run, which hold its eval history."""
+
+_MONITOR_STATE: Final[Tuple[str, ...]] = (
+    "rewards",
+    "needs_reset",
+    "episode_returns",
+    "episode_lengths",
+    "episode_times",
+    "total_steps",
+    "current_reset_info",
+)
+"""The attributes of the Monitor wrapping the training env checkpointed with a run."""
+
+
+def _get_rng_state() -> Dict:
+    """Get the states of the random, numpy and torch random number generators."""
+    state = {
+        "random": random.getstate(),
+        "numpy": np.random.get_state(),
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["torch_cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def _set_rng_state(state: Dict):
+    """Set the states of the random number generators from a state returned by ``_get_rng_state``."""
+    random.setstate(state["random"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "torch_cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["torch_cuda"])
+
+
+def _copy_attrs(obj, attrs: Tuple[str, ...]) -> Dict:
+    """Copy the attributes an object has out of ``attrs``."""
+    return copy.deepcopy(
+        {attr: getattr(obj, attr) for attr in attrs if hasattr(obj, attr)}
+    )
+
+
+class _CheckpointCallback(BaseCallback):
+    """
+    Checkpoints a ``YawningTitanRun`` every ``checkpoint_freq`` env steps.
+
+    Checkpoints are taken at the start of a rollout, once the previous rollout has been trained on, so that no
+    partially collected rollout is lost. A checkpoint can therefore be taken up to ``n_steps`` after it is due.
+    """
+
+    def __init__(self, yt_run: YawningTitanRun, checkpoint_freq: int):
+        super().__init__()
+        self.yt_run = yt_run
+        self.checkpoint_freq = checkpoint_freq
+        self._last_checkpoint = 0
+
+    def _on_training_start(self):
+        self._last_checkpoint = self.model.num_timesteps
+
+    def _on_rollout_start(self):
+        if self.model.num_timesteps - self._last_checkpoint >= self.checkpoint_freq:
+            self._last_checkpoint = self.model.num_timesteps
+            self.yt_run.checkpoint()
+
+    def _on_step(self) -> bool:
+        return True
+
+
+def _train_seed(run_kwargs: Dict, seed: int, output_dir: str) -> Dict:
+    """
+    Train, evaluate and save one seed of a concurrent multi-seed run.
+
+    Runs in a worker process.
+
+    :param run_kwargs: The ``YawningTitanRun`` args shared by every seed.
+    :param seed: The random seed of the game mode.
+    :param output_dir: The output dir of the seed.
+    :return: A dict of the ``seed``, run ``uuid``, ``output_dir``, and the
+        ``mean_reward`` and ``std_reward`` of its evaluation.
+    """
+    game_mode = run_kwargs["game_mode"]
+    game_mode.miscellaneous.random_seed.value = seed
+
+    yt_run = YawningTitanRun(
+        **run_kwargs,
+        training_runs=1,
+        concurrent_training_runs=False,
+        output_dir=output_dir,
+        auto=False,
+    )
+    yt_run.setup()
+    yt_run.train()
+    mean_reward, std_reward = yt_run.evaluate()
+    yt_run.save()
+    return {
+        "seed": seed,
+        "uuid": yt_run.uuid,
+        "output_dir": os.path.basename(output_dir),
+        "mean_reward": float(mean_reward),
+        "std_reward": float(std_reward),
+    }
+
 
 class YawningTitanRun:
     """
@@ -54,6 +193,23 @@ class YawningTitanRun:
         yt_run.train()
         yt_run.evaluate()
 
+    With ``concurrent_training_runs=True``, ``training_runs`` agents are trained with independent seeds in
+    separate processes. Each seed is saved to its own ``seed_<seed>`` subdirectory of the output dir, and the
+    mean and variance of their eval rewards are reported when all have finished.
+
+    .. code:: python
+
+        yt_run = YawningTitanRun(training_runs=4, concurrent_training_runs=True)
+        yt_run.seed_summary()
+
+    With ``checkpoint_freq`` set, the run is checkpointed while training, and an interrupted run can be resumed
+    where its last checkpoint left off by calling ``.resume()``.
+
+    .. code:: python
+
+        yt_run = YawningTitanRun.resume(output_dir)
+        yt_run.train()
+
     Trained agents can be saved by calling ``.save()``. If no path is provided, a path is generated using the
     AGENTS_DIR, today's date, and the uuid of the instance of ``YawningTitanRun``.
 
@@ -65,8 +221,6 @@ class YawningTitanRun:
     .. todo::
 
         - Build a reporting functionality that captures all logs and eval and generates a PDF report.
-        - Add multiple training runs functionality for the same agent.
-        - Add the ability to load a saved agent and continue training it.
     """
 
     def __init__(
@@ -89,6 +243,9 @@ class YawningTitanRun:
         logger: Optional[Logger] = None,
         output_dir: Optional[str] = None,
         auto: bool = True,
+        ppo_kwargs: Optional[Dict] = None,
+        concurrent_training_runs: bool = False,
+        checkpoint_freq: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -119,6 +276,14 @@ class YawningTitanRun:
             a path is generated using the ``yawning_titan.AGENTS_DIR``, today's date, and the uuid of the instance
             of ``YawningTitanRun``.
         :param auto: If True, ``setup()``, ``train()``, and ``evaluate()`` are called automatically.
+        :param ppo_kwargs: Optional keyword arguments, such as ``learning_rate`` or ``n_steps``, passed to the
+            ``stable_baselines3.ppo.ppo.PPO`` constructor when a new agent is created.
+        :param concurrent_training_runs: If True, ``training_runs`` agents are trained concurrently in separate
+            processes, each with its own seed, instead of training one agent ``training_runs`` times. The seeds count
+            up from the game mode random seed, or from 0 if it has none. Default value = False.
+        :param checkpoint_freq: Checkpoint the run to ``checkpoint.pkl`` in the output dir every ``checkpoint_freq``
+            env steps while training, so it can be resumed with ``.resume()``. If None, the run is not checkpointed.
+            Default value = None.
         """
         # Give the run an uuid
         self.uuid: Final[str] = str(uuid4())
@@ -160,6 +325,14 @@ class YawningTitanRun:
         self.render = render
         self.verbose = verbose
         self.auto = auto
+        self.ppo_kwargs: Dict = dict(ppo_kwargs) if ppo_kwargs else {}
+        self.concurrent_training_runs = concurrent_training_runs
+        self.seed_results: List[Dict] = []
+        self.checkpoint_freq = checkpoint_freq
+        self._training_run = 0
+        self._resuming = False
+        self._checkpoint_executor: Optional[ThreadPoolExecutor] = None
+        self._checkpoint_future: Optional[Future] = None
 
         self.logger = _LOGGER if logger is None else logger
         self.logger.debug(f"YT run  {self.uuid}: Run initialised")
@@ -168,7 +341,9 @@ class YawningTitanRun:
 
         # Automatically setup, train, and evaluate the agent if auto is True.
         if self.auto:
-            self.setup()
+            # a concurrent run sets itself up with the best seed once trained
+            if not self.concurrent_training_runs:
+                self.setup()
             self.train()
             self.evaluate()
             self.save()
@@ -192,6 +367,9 @@ class YawningTitanRun:
             "render": self.render,
             "verbose": self.verbose,
             "auto": self.auto,
+            "ppo_kwargs": self.ppo_kwargs,
+            "concurrent_training_runs": self.concurrent_training_runs,
+            "checkpoint_freq": self.checkpoint_freq,
         }
 
     def _get_new_ppo(self) -> PPO:
@@ -202,9 +380,12 @@ class YawningTitanRun:
             verbose=self.verbose,
             tensorboard_log=str(PPO_TENSORBOARD_LOGS_DIR),
             seed=self.env.network_interface.random_seed,
+            **self.ppo_kwargs,
         )
 
-    def _load_existing_ppo(self, ppo_zip_path: str) -> PPO:
+    def _load_existing_ppo(
+        self, ppo_zip_path: Union[str, io.BufferedIOBase]
+    ) -> PPO:
         """Load an existing ppo.zip file into ``stable_baselines.ppo.ppo.PPO``."""
         return PPO.load(
             ppo_zip_path,
@@ -214,14 +395,32 @@ class YawningTitanRun:
             seed=self.env.network_interface.random_seed,
         )
 
-    def setup(self, new: bool = True, ppo_zip_path: Optional[str] = None):
+    def _make_output_dir(self):
+        """Create the output dir, generating its path if one wasn't provided."""
+        if self.output_dir:
+            if isinstance(self.output_dir, str):
+                self.output_dir = pathlib.Path(self.output_dir)
+        else:
+            self.output_dir = pathlib.Path(
+                os.path.join(
+                    AGENTS_DIR, "trained", str(datetime.now().date()), f"{self.uuid}"
+                )
+            )
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def setup(
+        self,
+        new: bool = True,
+        ppo_zip_path: Optional[Union[str, io.BufferedIOBase]] = None,
+    ):
         """
         Performs a setup of the ``NetworkInterface``, ``GenericNetworkEnv``, ``PPO`` algorithm.
 
         The setup needs to be performed before training can occur.
 
         :param new: If True, a new instance of PPO is generated. If False, a ppo_zip_path must be passed tooo.
-        :param ppo_zip_path: Optional path to a saved ppo.zip file. Required if new = False.
+        :param ppo_zip_path: Optional path to a saved ppo.zip file, or a file-like object of one. Required if
+            new = False.
 
         :raise AttributeError: When new=False and ppo_zip_path hasn't been provided.
         """
@@ -233,16 +432,7 @@ class YawningTitanRun:
                 _LOGGER.critical(e)
                 raise e
 
-        if self.output_dir:
-            if isinstance(self.output_dir, str):
-                self.output_dir = pathlib.Path(self.output_dir)
-        else:
-            self.output_dir = pathlib.Path(
-                os.path.join(
-                    AGENTS_DIR, "trained", str(datetime.now().date()), f"{self.uuid}"
-                )
-            )
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._make_output_dir()
 
         self.network_interface = NetworkInterface(
             game_mode=self.game_mode, network=self.network
@@ -288,25 +478,164 @@ class YawningTitanRun:
         )
         self.logger.debug(f"YT run  {self.uuid}: Eval callback set")
 
+    @property
+    def seeds(self) -> List[int]:
+        """The seeds of the agents trained by a concurrent multi-seed run."""
+        base_seed = self.game_mode.miscellaneous.random_seed.value or 0
+        return [base_seed + i for i in range(self.training_runs)]
+
+    def _seed_run_kwargs(self) -> Dict:
+        """The args of the run passed to each seed of a concurrent multi-seed run."""
+        return {
+            "network": self.network,
+            "game_mode": self.game_mode,
+            "red_agent_class": self._red_agent_class,
+            "blue_agent_class": self._blue_agent_class,
+            "print_metrics": self.print_metrics,
+            "show_metrics_every": self.show_metrics_every,
+            "collect_additional_per_ts_data": self.collect_additional_per_ts_data,
+            "eval_freq": self.eval_freq,
+            "total_timesteps": self.total_timesteps,
+            "n_eval_episodes": self.n_eval_episodes,
+            "deterministic": self.deterministic,
+            "warn": self.warn,
+            "render": self.render,
+            "verbose": self.verbose,
+            "ppo_kwargs": self.ppo_kwargs,
+            "checkpoint_freq": self.checkpoint_freq,
+        }
+
+    def _train_concurrently(self) -> PPO:
+        """
+        Train an agent for each seed in a separate process.
+
+        The processes are spawned rather than forked, as forking a process that
+        has used torch can deadlock. The CPUs are shared evenly between them.
+        The run doesn't need to be setup first, as it is setup with the agent
+        of the best seed once all the seeds are trained.
+
+        :return: The agent of the seed with the highest mean eval reward.
+
+        :raise YawningTitanRunError: When the training of a seed fails.
+        """
+        self._make_output_dir()
+        seeds = self.seeds
+        cpus = os.cpu_count() or 1
+        max_workers = min(len(seeds), cpus)
+        self.logger.debug(
+            f"YT run  {self.uuid}: Training seeds {seeds} on {max_workers} processes"
+        )
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(max(1, cpus // max_workers),),
+        ) as executor:
+            futures = {
+                seed: executor.submit(
+                    _train_seed,
+                    self._seed_run_kwargs(),
+                    seed,
+                    str(self.output_dir / f"seed_{seed}"),
+                )
+                for seed in seeds
+            }
+            seed_results = []
+            for seed, future in futures.items():
+                try:
+                    seed_results.append(future.result())
+                except Exception as error:
+                    # don't start the seeds still waiting on a free process
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    msg = f"YT run  {self.uuid}: Training seed {seed} failed: {error!r}"
+                    try:
+                        raise YawningTitanRunError(msg) from error
+                    except YawningTitanRunError as e:
+                        _LOGGER.critical(e)
+                        raise e
+        self.seed_results = seed_results
+
+        summary = self.seed_summary()
+        self.logger.info(
+            f"YT run  {self.uuid}: Trained {len(seeds)} seeds, mean reward "
+            f"{summary['mean_reward']}, reward variance {summary['reward_variance']}"
+        )
+
+        best = max(seed_results, key=lambda result: result["mean_reward"])
+        self.setup(
+            new=False,
+            ppo_zip_path=os.path.join(self.output_dir, best["output_dir"], "ppo.zip"),
+        )
+        return self.agent
+
+    def seed_summary(self) -> Dict:
+        """
+        Summarise the eval rewards of the seeds of a concurrent multi-seed run.
+
+        :return: A dict of the ``mean_reward`` and sample ``reward_variance`` of the mean eval rewards of the seeds,
+            and the results of each seed as ``seeds``. The mean and variance are None when not enough seeds have
+            been trained.
+        """
+        rewards = [result["mean_reward"] for result in self.seed_results]
+        return {
+            "mean_reward": statistics.fmean(rewards) if rewards else None,
+            "reward_variance": statistics.variance(rewards)
+            if len(rewards) > 1
+            else None,
+            "seeds": self.seed_results,
+        }
+
     def train(self) -> Union[PPO, None]:
         """
         Trains the agent.
 
+        When ``concurrent_training_runs`` is True, an agent is trained for each seed and the agent of the seed with
+        the highest mean eval reward becomes the agent of the run. The run doesn't need to be setup first.
+
+        A run returned by ``.resume()`` continues from the training run and timestep it was checkpointed at.
+
         :return: The trained instance of ``stable_baselines3.ppo.ppo.PPO``.
         """
-        if self.env and self.agent and self.eval_callback:
-            self.logger.debug(f"YT run  {self.uuid}: Performing agent training")
-            for i in range(self.training_runs):
-                self.agent.learn(
-                    total_timesteps=self.total_timesteps,
-                    n_eval_episodes=self.n_eval_episodes,
-                    callback=self.eval_callback,
-                )
-                self.logger.debug(f"YT run  {self.uuid}: Training run {i + 1} complete")
+        if self.concurrent_training_runs:
+            self.agent = self._train_concurrently()
+            self.logger.debug(f"YT run  {self.uuid}: Agent training complete")
+            return self.agent
 
-                self.env.reset()
-                self.logger.debug(f"YT run  {self.uuid}: GenericNetworkEnv reset")
+        if self.env and self.agent and self.eval_callback:
+            callback = [self.eval_callback]
+            if self.checkpoint_freq:
+                callback.append(_CheckpointCallback(self, self.checkpoint_freq))
 
+            self.logger.debug(f"YT run  {self.uuid}: Performing agent training")
+            try:
+                for i in range(self._training_run, self.training_runs):
+                    self._training_run = i
+                    # a resumed training run carries on counting its timesteps
+                    resuming, self._resuming = self._resuming, False
+                    total_timesteps = self.total_timesteps
+                    if resuming:
+                        total_timesteps -= self.agent.num_timesteps
+                    self.agent.learn(
+                        total_timesteps=total_timesteps,
+                        n_eval_episodes=self.n_eval_episodes,
+                        callback=callback,
+                        reset_num_timesteps=not resuming,
+                    )
+                    self.logger.debug(
+                        f"YT run  {self.uuid}: Training run {i + 1} complete"
+                    )
+
+                    self.env.reset()
+                    self.logger.debug(f"YT run  {self.uuid}: GenericNetworkEnv reset")
+            finally:
+                # wait for the last checkpoint to be written before returning
+                if self._checkpoint_executor is not None:
+                    self._checkpoint_executor.shutdown(wait=True)
+                    self._checkpoint_executor = None
+
+            self._training_run = 0
+            if self._checkpoint_future is not None:
+                self._checkpoint_future.result()
             self.logger.debug(f"YT run  {self.uuid}: Agent training complete")
             return self.agent
         else:
@@ -315,6 +644,77 @@ class YawningTitanRun:
                 f"Call .setup() on the instance of {self.__class__.__name__} to setup the run."
             )
 
+    @property
+    def checkpoint_path(self) -> pathlib.Path:
+        """The path the run is checkpointed to."""
+        return pathlib.Path(self.output_dir) / CHECKPOINT_FILE
+
+    def checkpoint(self) -> Future:
+        """
+        Checkpoint the run so that its training can be resumed with ``.resume()``.
+
+        The checkpoint holds the agent's policy, optimizer and ``num_timesteps``, the state of the env and its red
+        agent, the states of the random number generators, and the eval history. The state is copied straight away,
+        then written to ``checkpoint.pkl`` in the output dir by a background thread. The previous checkpoint is only
+        replaced once the new one has been written in full.
+
+        :return: A future of the checkpoint path, done when the checkpoint has been written.
+        """
+        ppo = io.BytesIO()
+        self.agent.save(ppo)
+        checkpoint = {
+            "args": self._args_dict(),
+            "training_run": self._training_run,
+            "ppo": ppo.getvalue(),
+            "agent": _copy_attrs(self.agent, _AGENT_STATE),
+            "env": self.env.get_state(),
+            "monitor": _copy_attrs(self.agent.get_env().envs[0], _MONITOR_STATE),
+            "eval_callback": _copy_attrs(self.eval_callback, _EVAL_CALLBACK_STATE),
+            "rng": _get_rng_state(),
+        }
+        self.logger.debug(
+            f"YT run  {self.uuid}: Checkpointing at timestep {self.agent.num_timesteps}"
+        )
+
+        if self._checkpoint_executor is None:
+            self._checkpoint_executor = ThreadPoolExecutor(max_workers=1)
+        self._checkpoint_future = self._checkpoint_executor.submit(
+            self._write_checkpoint, checkpoint
+        )
+        return self._checkpoint_future
+
+    def _write_checkpoint(self, checkpoint: Dict) -> str:
+        """Write a checkpoint atomically. Runs in the checkpoint thread."""
+        try:
+            write_atomic(
+                self.checkpoint_path,
+                lambda file: pickle.dump(checkpoint, file, pickle.HIGHEST_PROTOCOL),
+                binary=True,
+            )
+        except Exception as e:
+            self.logger.error(
+                f"YT run  {self.uuid}: Failed to write checkpoint: {e!r}"
+            )
+            raise e
+        self.logger.debug(
+            f"YT run  {self.uuid}: Checkpoint written to {self.checkpoint_path}"
+        )
+        return str(self.checkpoint_path)
+
+    def _restore_checkpoint(self, checkpoint: Dict):
+        """Restore the state of a run that has been setup from its checkpoint."""
+        self._training_run = checkpoint["training_run"]
+        self._resuming = True
+        for attr, value in checkpoint["agent"].items():
+            setattr(self.agent, attr, value)
+        self.env.set_state(checkpoint["env"])
+        for attr, value in checkpoint["monitor"].items():
+            setattr(self.agent.get_env().envs[0], attr, value)
+        for attr, value in checkpoint["eval_callback"].items():
+            setattr(self.eval_callback, attr, value)
+        # loading the agent reseeds the random number generators, so they are restored last
+        _set_rng_state(checkpoint["rng"])
+
     def evaluate(self) -> Union[tuple[float, float], tuple[List[float], List[int]]]:
         """
         Evaluates the trained agent.
@@ -341,6 +741,8 @@ class YawningTitanRun:
 
         The YawningTitanRun.uuid is saved to UUID.
 
+        The results of each seed of a concurrent multi-seed run are saved to seeds.json, alongside the
+        ``seed_<seed>`` subdirectories the seeds were saved to as they finished.
 
         :return: The path the agent has been saved to.
         """
@@ -359,6 +761,11 @@ class YawningTitanRun:
             with open(uuid_path, "w") as file:
                 file.write(self.uuid)
 
+            if self.seed_results:
+                seeds_path = os.path.join(self.output_dir, SEEDS_FILE)
+                with open(seeds_path, "w") as file:
+                    json.dump(self.seed_summary(), file, indent=4)
+
             self.logger.debug(
                 f"YT run  {self.uuid}: Saved trained agent (Stable Baselines3 PPO) to: {agent_path}"
             )
@@ -398,7 +805,8 @@ class YawningTitanRun:
         """
         Export the YawningTitanRun as a zip.
 
-        The contents of output_dir is archived to the agents_dir exported dir.
+        The contents of output_dir, including the subdirectories of each seed of a concurrent multi-seed run, is
+        archived to the agents_dir exported dir.
 
         Included is an INVENTORY file that contains all files and their sizes. This is used for file verification when
         an exported YawningTitanRun is imported.
@@ -435,6 +843,37 @@ class YawningTitanRun:
         }
         return mapping[agent_class_str]
 
+    @classmethod
+    def _parse_args(cls, args: Dict, msg: str) -> Dict:
+        """
+        Parse the args of a saved YawningTitanRun into the args of its constructor.
+
+        :param args: The args as saved by ``_args_dict``. They are modified.
+        :param msg: The start of the error message raised when the args are corrupted.
+        :return: The args, with the network, game mode, and agent classes created.
+
+        :raise ValueError: When the args keys aren't correct.
+        """
+        # args added since the run was saved take their default values
+        for key, default in _ARGS_ADDED_SINCE_SAVED.items():
+            args.setdefault(key, default)
+
+        if args.keys() == YawningTitanRun(auto=False)._args_dict().keys():
+            args["network"] = Network.create(args["network"])
+            args["game_mode"] = GameMode.create(args["game_mode"])
+            args["red_agent_class"] = cls._get_agent_class_from_str(
+                args["red_agent_class"]
+            )
+            args["blue_agent_class"] = cls._get_agent_class_from_str(
+                args["blue_agent_class"]
+            )
+            return args
+        else:
+            # Args keys don't match
+            msg = f"{msg} is corrupted."
+            _LOGGER.error(msg)
+            raise ValueError(msg)
+
     @classmethod
     def _load_args_file(cls, path: str) -> Dict:
         """
@@ -449,24 +888,7 @@ class YawningTitanRun:
         args_path = os.path.join(path, "args.json")
         msg = f"Cannot load trained agent as the args file ({args_path}) "
         if os.path.isfile(args_path):
-            with open(args_path, "r") as file:
-                args = yaml.safe_load(file)
-
-            if args.keys() == YawningTitanRun(auto=False)._args_dict().keys():
-                args["network"] = Network.create(args["network"])
-                args["game_mode"] = GameMode.create(args["game_mode"])
-                args["red_agent_class"] = cls._get_agent_class_from_str(
-                    args["red_agent_class"]
-                )
-                args["blue_agent_class"] = cls._get_agent_class_from_str(
-                    args["blue_agent_class"]
-                )
-                return args
-            else:
-                # Args file keys don't match
-                msg = f"{msg} is corrupted."
-                _LOGGER.error(msg)
-                raise ValueError(msg)
+            return cls._parse_args(load_yaml(args_path), msg)
         else:
             # Args file doesn't exist
             msg = f"{msg} does not exist."
@@ -492,6 +914,54 @@ class YawningTitanRun:
         yt_run.uuid = uuid  # noqa - We'll allow it here :)
         yt_run.setup(new=False, ppo_zip_path=os.path.join(path, "ppo.zip"))
 
+        seeds_path = os.path.join(path, SEEDS_FILE)
+        if os.path.isfile(seeds_path):
+            with open(seeds_path) as file:
+                yt_run.seed_results = json.load(file)["seeds"]
+
+        return yt_run
+
+    @classmethod
+    def resume(cls, path: str) -> YawningTitanRun:
+        """
+        Load a checkpointed YawningTitanRun so that its training continues exactly where the checkpoint left off.
+
+        Call ``.train()`` on the returned run to train it for the rest of its ``total_timesteps`` and
+        ``training_runs``.
+
+        :param path: The output dir of a checkpointed YawningTitanRun, or the path of its checkpoint file.
+        :return: An instance of YawningTitanRun.
+
+        :raise YawningTitanRunError: When the checkpoint doesn't exist.
+        """
+        checkpoint_path = pathlib.Path(path)
+        if checkpoint_path.is_dir():
+            checkpoint_path = checkpoint_path / CHECKPOINT_FILE
+        if not checkpoint_path.is_file():
+            msg = f"Cannot resume YawningTitanRun as the checkpoint ({checkpoint_path}) does not exist."
+            try:
+                raise YawningTitanRunError(msg)
+            except YawningTitanRunError as e:
+                _LOGGER.critical(e)
+                raise e
+
+        with open(checkpoint_path, "rb") as file:
+            checkpoint = pickle.load(file)
+        args = cls._parse_args(
+            checkpoint["args"],
+            f"Cannot resume YawningTitanRun as the args in the checkpoint ({checkpoint_path})",
+        )
+
+        uuid = args.pop("uuid")
+        args.pop("auto")
+
+        yt_run = YawningTitanRun(
+            **args, output_dir=str(checkpoint_path.parent), auto=False
+        )
+        yt_run.uuid = uuid  # noqa - We'll allow it here :)
+        yt_run.setup(new=False, ppo_zip_path=io.BytesIO(checkpoint["ppo"]))
+        yt_run._restore_checkpoint(checkpoint)
+
         return yt_run
 
     @classmethod
@@ -601,6 +1071,9 @@ class YawningTitanRun:
             f"deterministic={self.deterministic}, "
             f"warn={self.warn}, "
             f"render={self.render}, "
-            f"verbose={self.verbose}"
+            f"verbose={self.verbose}, "
+            f"ppo_kwargs={self.ppo_kwargs}, "
+            f"concurrent_training_runs={self.concurrent_training_runs}, "
+            f"checkpoint_freq={self.checkpoint_freq}"
             ")"
         )
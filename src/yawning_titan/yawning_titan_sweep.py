@@ -0,0 +1,458 @@
+"""
+Run a sweep of :class:`~yawning_titan.yawning_titan_run.YawningTitanRun` jobs on a local process pool.
+
+A sweep spec is a dict, or a ``.yaml`` or ``.json`` file, that is expanded
+into one job for every combination of its game modes, networks, seeds and
+PPO hyperparameter values:
+
+.. code:: yaml
+
+    name: learning_rate_sweep
+    game_modes: [900a704f-6271-4994-ade7-40b74d3199b1]  # uuids or names in the GameModeDB
+    networks: [Default 18-node network]  # uuids or names in the NetworkDB
+    seeds: [1, 2, 3]
+    ppo:  # each list is a grid axis, passed to stable_baselines3 PPO
+      learning_rate: [0.0003, 0.001]
+      n_steps: 2048
+    run:  # fixed YawningTitanRun args
+      total_timesteps: 100000
+      eval_freq: 10000
+      n_eval_episodes: 10
+
+The status of every job is checkpointed to ``sweep_status.json`` in the sweep
+output dir, so running the same sweep again resumes it where it left off.
+The results of the completed jobs are collected into ``results.csv``, with a
+column for each job parameter and result.
+
+.. versionadded:: 2.0.2
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import pathlib
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from logging import getLogger
+from typing import Any, Dict, Final, List, Mapping, Optional, Union
+
+from yawning_titan import AGENTS_DIR
+from yawning_titan.exceptions import YawningTitanSweepError
+from yawning_titan.utils.config_cache import load_yaml
+from yawning_titan.utils.process_utils import init_worker, write_atomic
+
+__all__ = ["YawningTitanSweep", "expand_spec"]
+
+_LOGGER = getLogger(__name__)
+
+STATUS_FILE: Final[str] = "sweep_status.json"
+"""The file the status of each job is checkpointed to."""
+
+RESULTS_FILE: Final[str] = "results.csv"
+"""The file the results of the completed jobs are collected into."""
+
+RESULT_COLUMNS: Final[List[str]] = [
+    "eval_reward_mean",
+    "eval_reward_std",
+    "win_rate",
+    "wall_time",
+    "steps_per_sec",
+    "num_timesteps",
+]
+"""The result columns of the results file."""
+
+_STARTED_FILE: Final[str] = ".started"
+"""The file a worker creates in a job dir while it runs the job."""
+
+_DEFAULT_GAME_MODE: Final[str] = "900a704f-6271-4994-ade7-40b74d3199b1"
+_DEFAULT_NETWORK: Final[str] = "b3cd9dfd-b178-415d-93f0-c9e279b3c511"
+
+
+def _as_list(value: Any) -> list:
+    """A spec value as a list of values, wrapping a single value."""
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _resolve_uuids(names: List[str], db) -> List[str]:
+    """
+    Resolve a list of uuids or names to the uuids of the docs in a db.
+
+    :param names: A list of uuids or names.
+    :param db: A :class:`~yawning_titan.networks.network_db.NetworkDB` or
+        :class:`~yawning_titan.game_modes.game_mode_db.GameModeDB`.
+    :return: The uuids.
+    :raise: :class:`~yawning_titan.exceptions.YawningTitanSweepError` if a
+        uuid or name does not match exactly one doc.
+    """
+    summaries = db.list_summaries()
+    uuids = []
+    for name in names:
+        matches = [s.uuid for s in summaries if name in (s.uuid, s.name)]
+        if len(matches) != 1:
+            msg = f"Sweep spec entry '{name}' matches {len(matches)} docs in the {db._db.name} db, not 1."
+            try:
+                raise YawningTitanSweepError(msg)
+            except YawningTitanSweepError as e:
+                _LOGGER.critical(e)
+                raise e
+        uuids.append(matches[0])
+    return uuids
+
+
+def _job_id(job: Mapping) -> str:
+    """A short id of a job that only depends on its parameters."""
+    params = json.dumps(job, sort_keys=True, default=str)
+    return hashlib.sha1(params.encode()).hexdigest()[:12]
+
+
+def expand_spec(spec: Mapping) -> List[Dict]:
+    """
+    Expand a sweep spec into its jobs.
+
+    :param spec: A sweep spec as described in :mod:`yawning_titan.yawning_titan_sweep`.
+        Game modes and networks are given as uuids, or names to resolve
+        from the GameModeDB and NetworkDB.
+    :return: A list of jobs, each a dict of ``job_id``, ``game_mode``,
+        ``network``, ``seed``, ``ppo_kwargs`` and ``run_kwargs``.
+    :raise: :class:`~yawning_titan.exceptions.YawningTitanSweepError` if a
+        game mode or network does not exist.
+    """
+    from yawning_titan.game_modes.game_mode_db import GameModeDB
+    from yawning_titan.networks.network_db import NetworkDB
+
+    game_modes = _resolve_uuids(
+        _as_list(spec.get("game_modes", _DEFAULT_GAME_MODE)), GameModeDB()
+    )
+    networks = _resolve_uuids(
+        _as_list(spec.get("networks", _DEFAULT_NETWORK)), NetworkDB()
+    )
+    seeds = _as_list(spec.get("seeds", None))
+    ppo = spec.get("ppo") or {}
+    ppo_grid = [
+        dict(zip(ppo.keys(), values))
+        for values in itertools.product(*(_as_list(v) for v in ppo.values()))
+    ]
+    run_kwargs = dict(spec.get("run") or {})
+
+    jobs = []
+    for game_mode, network, seed, ppo_kwargs in itertools.product(
+        game_modes, networks, seeds, ppo_grid
+    ):
+        job = {
+            "game_mode": game_mode,
+            "network": network,
+            "seed": seed,
+            "ppo_kwargs": ppo_kwargs,
+            "run_kwargs": run_kwargs,
+        }
+        jobs.append({"job_id": _job_id(job), **job})
+    return jobs
+
+
+def _run_job(job: Mapping, output_dir: str) -> Dict:
+    """
+    Train and evaluate the :class:`~yawning_titan.yawning_titan_run.YawningTitanRun` of a job.
+
+    Runs in a worker process.
+
+    :param job: A job as returned by :func:`expand_spec`.
+    :param output_dir: The output dir of the job.
+    :return: A dict of the results in ``RESULT_COLUMNS``.
+    """
+    from stable_baselines3.common.evaluation import evaluate_policy
+
+    from yawning_titan.game_modes.game_mode_db import GameModeDB
+    from yawning_titan.networks.network_db import NetworkDB
+    from yawning_titan.yawning_titan_run import YawningTitanRun
+
+    game_mode = GameModeDB().get(job["game_mode"])
+    network = NetworkDB().get(job["network"])
+    if job["seed"] is not None:
+        game_mode.miscellaneous.random_seed.value = job["seed"]
+
+    yt_run = YawningTitanRun(
+        network=network,
+        game_mode=game_mode,
+        ppo_kwargs=job["ppo_kwargs"],
+        output_dir=output_dir,
+        **{**job["run_kwargs"], "auto": False},
+    )
+    # a concurrent run sets itself up once its seeds are trained
+    if not yt_run.concurrent_training_runs:
+        yt_run.setup()
+    start = time.perf_counter()
+    yt_run.train()
+    wall_time = time.perf_counter() - start
+
+    rewards, lengths = evaluate_policy(
+        yt_run.agent,
+        yt_run.env,
+        n_eval_episodes=yt_run.n_eval_episodes,
+        deterministic=yt_run.deterministic,
+        return_episode_rewards=True,
+    )
+    yt_run.save()
+
+    # blue wins an episode by lasting until the max steps
+    max_steps = game_mode.game_rules.max_steps.value
+    # every training run, or seed, of the job trains for the same number of
+    # timesteps, and the agent only counts those of the last one
+    num_timesteps = yt_run.agent.num_timesteps * yt_run.training_runs
+    return {
+        "eval_reward_mean": statistics.fmean(rewards),
+        "eval_reward_std": statistics.pstdev(rewards),
+        "win_rate": float(
+            sum(length >= max_steps for length in lengths) / len(lengths)
+        ),
+        "wall_time": wall_time,
+        "steps_per_sec": num_timesteps / wall_time if wall_time else None,
+        "num_timesteps": num_timesteps,
+    }
+
+
+def _run_started_job(run_job, job: Mapping, output_dir: str) -> Dict:
+    """
+    Run a job, marking its output dir as started until the job returns or raises.
+
+    The marker is left behind if the worker process dies, so that jobs that
+    were running when a process pool broke can be told apart from the jobs
+    that never started.
+
+    :param run_job: The callable that runs the job, usually :func:`_run_job`.
+    :param job: A job as returned by :func:`expand_spec`.
+    :param output_dir: The output dir of the job.
+    :return: The results of the job.
+    """
+    started = pathlib.Path(output_dir) / _STARTED_FILE
+    started.touch()
+    try:
+        return run_job(job, output_dir)
+    finally:
+        started.unlink(missing_ok=True)
+
+
+class YawningTitanSweep:
+    """
+    Runs the :class:`~yawning_titan.yawning_titan_run.YawningTitanRun` jobs of a sweep spec on a local process pool.
+
+    .. code:: python
+
+        sweep = YawningTitanSweep("learning_rate_sweep.yaml", cpus_per_job=2)
+        results = sweep.run()
+
+    Each job trains in its own worker process, limited to ``cpus_per_job``
+    threads, and saves its run to ``<output_dir>/jobs/<job_id>``. If a sweep
+    is interrupted, running it again with the same output dir skips the jobs
+    that have completed.
+    """
+
+    def __init__(
+        self,
+        spec: Union[str, pathlib.Path, Mapping],
+        output_dir: Optional[Union[str, pathlib.Path]] = None,
+        cpus_per_job: int = 1,
+        max_workers: Optional[int] = None,
+        retry_failed: bool = False,
+    ):
+        """
+        The YawningTitanSweep constructor.
+
+        :param spec: A sweep spec, or the path of a ``.yaml`` or ``.json`` sweep spec file.
+        :param output_dir: The sweep output dir. If none is provided, a path is generated using the
+            ``yawning_titan.AGENTS_DIR`` and the spec ``name``, or the spec file name, so that running the same spec
+            again resumes it.
+        :param cpus_per_job: The number of CPUs each job may use. Default value = 1.
+        :param max_workers: The number of jobs to run at once. If none is provided, as many jobs run at once as the
+            CPU budget allows.
+        :param retry_failed: If True, jobs that failed in a previous run of the sweep are run again.
+        """
+        if isinstance(spec, Mapping):
+            name = spec.get("name")
+        else:
+            name = pathlib.Path(spec).stem
+            spec = load_yaml(spec)
+            name = spec.get("name", name)
+        self.spec: Dict = dict(spec)
+
+        if output_dir is None:
+            if not name:
+                msg = "A sweep spec needs a name when no output_dir is provided."
+                try:
+                    raise YawningTitanSweepError(msg)
+                except YawningTitanSweepError as e:
+                    _LOGGER.critical(e)
+                    raise e
+            output_dir = os.path.join(AGENTS_DIR, "sweeps", name)
+        self.output_dir: pathlib.Path = pathlib.Path(output_dir)
+        self.cpus_per_job = max(1, cpus_per_job)
+        self.max_workers = max_workers or max(
+            1, (os.cpu_count() or 1) // self.cpus_per_job
+        )
+        self.retry_failed = retry_failed
+        self.jobs: List[Dict] = expand_spec(self.spec)
+        self.status: Dict[str, Dict] = {}
+
+    @property
+    def status_path(self) -> pathlib.Path:
+        """The path of the job status checkpoint file."""
+        return self.output_dir / STATUS_FILE
+
+    @property
+    def results_path(self) -> pathlib.Path:
+        """The path of the results file."""
+        return self.output_dir / RESULTS_FILE
+
+    def job_dir(self, job: Mapping) -> pathlib.Path:
+        """
+        The output dir of a job.
+
+        :param job: A job as returned by :func:`expand_spec`.
+        :return: The path of the dir.
+        """
+        return self.output_dir / "jobs" / job["job_id"]
+
+    def _load_status(self):
+        """Load the job status checkpoint file of a previous run of the sweep, if there is one."""
+        self.status = {}
+        if self.status_path.is_file():
+            with open(self.status_path) as file:
+                self.status = json.load(file).get("jobs", {})
+
+    def _save_status(self):
+        """Checkpoint the status of every job."""
+
+        def _write(file):
+            json.dump({"spec": self.spec, "jobs": self.status}, file, indent=4)
+
+        write_atomic(self.status_path, _write)
+
+    def _set_status(self, job: Mapping, status: str, **kwargs):
+        """
+        Set and checkpoint the status of a job.
+
+        :param job: A job as returned by :func:`expand_spec`.
+        :param status: One of ``pending``, ``running``, ``done`` or ``failed``.
+        :param kwargs: Other details to store, such as the ``results`` or ``error``.
+        """
+        self.status[job["job_id"]] = {"status": status, "job": dict(job), **kwargs}
+        self._save_status()
+
+    def pending_jobs(self) -> List[Dict]:
+        """
+        Get the jobs that have not completed in a previous run of the sweep.
+
+        Jobs that were submitted but had not completed when a sweep was
+        interrupted are run again.
+
+        :return: A list of jobs as returned by :func:`expand_spec`.
+        """
+        self._load_status()
+        skip = {"done", "failed"} if not self.retry_failed else {"done"}
+        return [
+            job
+            for job in self.jobs
+            if self.status.get(job["job_id"], {}).get("status") not in skip
+        ]
+
+    def results(self) -> List[Dict]:
+        """
+        Get the results of the completed jobs, one row per job.
+
+        :return: A list of dicts with a value for each column of the results file.
+        """
+        if not self.status:
+            self._load_status()
+        ppo_keys = sorted({k for job in self.jobs for k in job["ppo_kwargs"]})
+        rows = []
+        for job in self.jobs:
+            status = self.status.get(job["job_id"], {})
+            if status.get("status") != "done":
+                continue
+            row = {
+                "job_id": job["job_id"],
+                "game_mode": job["game_mode"],
+                "network": job["network"],
+                "seed": job["seed"],
+            }
+            row.update({f"ppo.{k}": job["ppo_kwargs"].get(k) for k in ppo_keys})
+            row.update({k: status["results"].get(k) for k in RESULT_COLUMNS})
+            rows.append(row)
+        return rows
+
+    def _write_results(self):
+        """Write the results of the completed jobs to the results file."""
+        rows = self.results()
+        if not rows:
+            return
+
+        def _write(file):
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        write_atomic(self.results_path, _write)
+
+    def run(self) -> List[Dict]:
+        """
+        Run the jobs of the sweep that have not completed.
+
+        A job that raises is marked as failed and the other jobs carry on. If a
+        worker process dies, the jobs that had not started are marked as pending
+        so that they run when the sweep is resumed.
+
+        :return: The results of every completed job, as returned by :func:`results`.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        jobs = self.pending_jobs()
+        _LOGGER.info(
+            f"Sweep {self.output_dir}: running {len(jobs)} of {len(self.jobs)} jobs "
+            f"on {self.max_workers} workers with {self.cpus_per_job} CPUs each."
+        )
+        # spawn rather than fork, as forking a process that has imported torch
+        # or holds open db files is unsafe
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(self.cpus_per_job,),
+        ) as executor:
+            running = {}
+            for job in jobs:
+                job_dir = self.job_dir(job)
+                job_dir.mkdir(parents=True, exist_ok=True)
+                (job_dir / _STARTED_FILE).unlink(missing_ok=True)
+                self.status[job["job_id"]] = {"status": "running", "job": dict(job)}
+                future = executor.submit(_run_started_job, _run_job, job, str(job_dir))
+                running[future] = job
+            self._save_status()
+
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = running.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool as e:
+                        if (self.job_dir(job) / _STARTED_FILE).is_file():
+                            _LOGGER.error(f"Sweep {self.output_dir}: {e!r}")
+                            self._set_status(job, "failed", error=repr(e))
+                        else:
+                            self._set_status(job, "pending")
+                    except Exception as e:
+                        _LOGGER.error(
+                            f"Sweep {self.output_dir}: job {job['job_id']} failed: {e!r}"
+                        )
+                        self._set_status(job, "failed", error=repr(e))
+                    else:
+                        _LOGGER.info(
+                            f"Sweep {self.output_dir}: job {job['job_id']} complete."
+                        )
+                        self._set_status(job, "done", results=results)
+                        self._write_results()
+        return self.results()
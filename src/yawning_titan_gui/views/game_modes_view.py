@@ -63,12 +63,13 @@ class GameModesView(View):
         try:
             if search_form.is_valid():
                 if search_form.filters:
-                    game_modes = GameModeManager.filter(search_form.filters)
+                    item_ids = [
+                        g.doc_metadata.uuid
+                        for g in GameModeManager.filter(search_form.filters)
+                    ]
                 else:
-                    game_modes = GameModeManager.db.all()
-                return JsonResponse(
-                    {"item_ids": [g.doc_metadata.uuid for g in game_modes]}
-                )
+                    item_ids = [g.uuid for g in GameModeManager.db.list_summaries()]
+                return JsonResponse({"item_ids": item_ids})
         except Exception as e:
             print("ERR", e, traceback.print_exc())
         return JsonResponse({"message": search_form.errors}, status=500)
@@ -15,7 +15,7 @@ class NetworksView(View):
 
         :param: request: the Django page `request` object containing the html data for `networks.html` and the server GET / POST request bodies.
         """
-        networks = NetworkManager.db.all()
+        networks = NetworkManager.db.list_summaries()
 
         dialogue_boxes = [
             {
@@ -44,7 +44,7 @@ class NetworksView(View):
             {
                 "toolbar": get_toolbar("Manage networks"),
                 "item_type": "network",
-                "networks": [network.doc_metadata for network in networks],
+                "networks": networks,
                 "search_form": NetworkSearchForm(),
                 "dialogue_boxes": dialogue_boxes,
             },
@@ -62,7 +62,7 @@ class NetworksView(View):
             if search_form.filters:
                 networks = NetworkManager.filter(search_form.filters)
             else:
-                networks = [n.doc_metadata.uuid for n in NetworkManager.db.all()]
+                networks = [n.uuid for n in NetworkManager.db.list_summaries()]
             return JsonResponse({"item_ids": networks})
 
         return JsonResponse({"message": search_form.errors})
@@ -6,15 +6,17 @@ import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 from django.urls import reverse
 
 from yawning_titan import _YT_ROOT_DIR, IMAGES_DIR, NOTEBOOKS_DIR, VIDEOS_DIR
+from yawning_titan.db.doc_summary import DocSummary
 from yawning_titan.envs.generic.core.action_loops import ActionLoop
-from yawning_titan.game_modes.game_mode_db import GameModeDB, GameModeSchema
+from yawning_titan.envs.generic.helpers.episode_recorder import render_episodes
+from yawning_titan.game_modes.game_mode_db import GameModeDB
 from yawning_titan.networks.network import Network, NetworkLayout
-from yawning_titan.networks.network_db import NetworkDB, NetworkQuery
+from yawning_titan.networks.network_db import NetworkDB
 from yawning_titan.yawning_titan_run import YawningTitanRun
 from yawning_titan_gui import YT_GUI_RUN_LOG, YT_GUI_STDOUT
 from yawning_titan_server.settings.base import DOCS_ROOT, STATIC_URL
@@ -78,13 +80,15 @@ class RunManager:
                     episode_count=kwargs.get("num_episodes", run.total_timesteps),
                 )
 
-                loop.gif_action_loop(
+                # record the episodes at full speed and render them afterwards across processes
+                episodes = loop.record_action_loop()
+                render_episodes(
+                    episodes,
+                    filename="YT",
                     gif_output_directory=IMAGES_DIR,
                     webm_output_directory=VIDEOS_DIR,
                     save_gif=kwargs["render_gif"],
                     save_webm=kwargs["render_webm"],
-                    render_network=True
-                    # TODO: fix bug where network must be rendered to get gif to be produced
                 )
 
     @classmethod
@@ -163,12 +167,7 @@ class NetworkManager:
         :param min: the minimum value (inclusive)
         :param max: the maximum value (inclusive)
         """
-        return [
-            network.doc_metadata.uuid
-            for network in cls.db.search(
-                NetworkQuery.num_of_entry_nodes_between(min, max)
-            )
-        ]
+        return cls._filter_summaries("entry_node_count", min, max)
 
     @classmethod
     def filter_high_value_nodes(cls, min, max) -> List[str]:
@@ -178,24 +177,32 @@ class NetworkManager:
         :param min: the minimum value (inclusive)
         :param max: the maximum value (inclusive)
         """
-        return [
-            network.doc_metadata.uuid
-            for network in cls.db.search(
-                NetworkQuery.num_of_high_value_nodes_between(min, max)
-            )
-        ]
+        return cls._filter_summaries("high_value_node_count", min, max)
 
     @classmethod
     def filter_network_nodes(cls, min, max) -> List[str]:
         """
         Generate a list of ``uuids`` corresponding to networks that have a number of nodes within ``min`` <= x <= ``max``.
 
+        :param min: the minimum value (inclusive)
+        :param max: the maximum value (inclusive)
+        """
+        return cls._filter_summaries("node_count", min, max)
+
+    @classmethod
+    def _filter_summaries(cls, count: str, min, max) -> List[str]:
+        """
+        Generate a list of ``uuids`` corresponding to networks with a node count within ``min`` <= x <= ``max``.
+
+        :param count: the name of a node count of :class: `~yawning_titan.db.doc_summary.DocSummary`
         :param min: the minimum value (inclusive)
         :param max: the maximum value (inclusive)
         """
         return [
-            network.doc_metadata.uuid
-            for network in cls.db.search(NetworkQuery.num_of_nodes_between(min, max))
+            summary.uuid
+            for summary in cls.db.list_summaries()
+            if getattr(summary, count) is not None
+            and min <= getattr(summary, count) <= max
         ]
 
     @classmethod
@@ -218,7 +225,7 @@ class NetworkManager:
     @classmethod
     def get_network_data(cls) -> List[dict]:
         """Gather the doc metadata of all network objects."""
-        return [network.doc_metadata for network in cls.db.all()]
+        return cls.db.list_summaries()
 
 
 class GameModeManager:
@@ -232,23 +239,18 @@ class GameModeManager:
 
         :param valid_only: return only valid game modes.
         """
-        game_modes = [
-            {**g.doc_metadata.to_dict(), "valid": g.validation.passed}
-            for g in cls.db.all()
-        ]
+        game_modes = [summary.to_dict() for summary in cls.db.list_summaries()]
         if not valid_only:
             return game_modes
         return [g for g in game_modes if g["valid"]]
 
     @classmethod
-    def get_game_modes_compatible_with(cls, network: Network):
-        """Retrieve all game modes compatible with a given network.
+    def get_game_modes_compatible_with(cls, network: Union[Network, DocSummary]):
+        """Retrieve the uuids of all game modes compatible with a given network.
 
-        :param network: an instance of :class: `~yawning_titan.networks.network.Network`
+        :param network: an instance of :class: `~yawning_titan.networks.network.Network` or its :class: `~yawning_titan.db.doc_summary.DocSummary`
         """
-        return cls.db.search(
-            GameModeSchema.NETWORK_COMPATIBILITY.compatible_with(network)
-        )
+        return cls.db.compatible_uuids(network)
 
     # @classmethod
     # def filter(cls, filters: dict):
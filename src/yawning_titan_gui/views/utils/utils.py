@@ -92,7 +92,8 @@ def db_manager(request: HttpRequest) -> JsonResponse:
             )
 
         def create_network_from():
-            network = NetworkManager.db.get(request.POST.get("source_item_id"))
+            source_id = request.POST.get("source_item_id")
+            network = NetworkManager.db.get(source_id)
             network._doc_metadata = DocMetadata()
             NetworkManager.db.insert(network=network, name=item_name)
             return reverse(
@@ -118,11 +119,12 @@ def db_manager(request: HttpRequest) -> JsonResponse:
         except KeyError as e:
             return JsonResponse({"message:": str(e)}, status=400)
     elif request.method == "GET":
-        network = NetworkManager.db.get(request.GET.get("network_id"))
-        game_modes = [
-            g.doc_metadata.uuid
-            for g in GameModeManager.get_game_modes_compatible_with(network)
-        ]
+        network_id = request.GET.get("network_id")
+        network = next(
+            (s for s in NetworkManager.db.list_summaries() if s.uuid == network_id),
+            None,
+        )
+        game_modes = GameModeManager.get_game_modes_compatible_with(network)
         return JsonResponse({"game_mode_ids": game_modes})
     return JsonResponse({"message:": "FAILED"}, status=400)
 
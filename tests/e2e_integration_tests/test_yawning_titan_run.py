@@ -1,5 +1,8 @@
+import copy
 import glob
+import json
 import tempfile
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -70,3 +73,94 @@ def test_rendering_an_action_loop(default_game_mode, default_network):
     assert len(gif_dir) == 1
     assert len(webm_dir) == 1
     tmp_dir.cleanup()
+
+
+@pytest.mark.e2e_integration_test
+def test_concurrent_training_runs(default_game_mode, default_network, tmp_path):
+    """Test seeds train concurrently into their own subdirectories, and are saved and exported with the run."""
+    yt_run = YawningTitanRun(
+        game_mode=default_game_mode,
+        network=default_network,
+        total_timesteps=N_TIME_STEPS,
+        eval_freq=N_TIME_STEPS,
+        training_runs=2,
+        concurrent_training_runs=True,
+        output_dir=str(tmp_path),
+        warn=False,
+        verbose=0,
+    )
+    seeds = yt_run.seeds
+    assert [result["seed"] for result in yt_run.seed_results] == seeds
+
+    summary = yt_run.seed_summary()
+    assert summary["mean_reward"] is not None
+    assert summary["reward_variance"] is not None
+    with open(tmp_path / "seeds.json") as file:
+        assert json.load(file) == summary
+
+    for seed in seeds:
+        seed_dir = tmp_path / f"seed_{seed}"
+        assert (seed_dir / "ppo.zip").is_file()
+        with open(seed_dir / "args.json") as file:
+            args = json.load(file)
+        assert args["game_mode"]["miscellaneous"]["random_seed"] == seed
+
+    with zipfile.ZipFile(yt_run.export()) as export:
+        names = export.namelist()
+    for seed in seeds:
+        assert f"seed_{seed}/args.json" in names
+    assert "INVENTORY" in names
+
+    loaded = YawningTitanRun.load(str(tmp_path))
+    assert loaded.seed_results == yt_run.seed_results
+
+
+@pytest.mark.e2e_integration_test
+def test_resume_from_checkpoint(default_game_mode, default_network, tmp_path):
+    """Test a run resumed from a checkpoint finishes training with the same agent as an uninterrupted run."""
+
+    class Interrupted(Exception):
+        pass
+
+    def _run(output_dir, checkpoint_freq=None):
+        game_mode = copy.deepcopy(default_game_mode)
+        game_mode.miscellaneous.random_seed.value = 1
+        return YawningTitanRun(
+            game_mode=game_mode,
+            network=copy.deepcopy(default_network),
+            total_timesteps=256,
+            eval_freq=128,
+            checkpoint_freq=checkpoint_freq,
+            output_dir=str(output_dir),
+            ppo_kwargs={"n_steps": 64, "batch_size": 32},
+            warn=False,
+            verbose=0,
+            auto=False,
+        )
+
+    uninterrupted = _run(tmp_path / "uninterrupted")
+    uninterrupted.setup()
+    uninterrupted.train()
+
+    interrupted = _run(tmp_path / "interrupted", checkpoint_freq=128)
+    interrupted.setup()
+
+    def _checkpoint_then_interrupt():
+        YawningTitanRun.checkpoint(interrupted).result()
+        raise Interrupted()
+
+    interrupted.checkpoint = _checkpoint_then_interrupt
+    with pytest.raises(Interrupted):
+        interrupted.train()
+    # the checkpoint thread is shut down however training ends
+    assert interrupted._checkpoint_executor is None
+
+    resumed = YawningTitanRun.resume(str(tmp_path / "interrupted"))
+    assert resumed.uuid == interrupted.uuid
+    assert resumed.agent.num_timesteps == 128
+    resumed.train()
+
+    assert resumed.agent.num_timesteps == uninterrupted.agent.num_timesteps
+    resumed_params = resumed.agent.policy.state_dict()
+    for key, value in uninterrupted.agent.policy.state_dict().items():
+        assert (value == resumed_params[key]).all()
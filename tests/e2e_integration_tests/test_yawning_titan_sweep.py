@@ -0,0 +1,39 @@
+import csv
+
+import pytest
+
+from yawning_titan.yawning_titan_sweep import RESULT_COLUMNS, YawningTitanSweep
+
+
+@pytest.mark.e2e_integration_test
+def test_sweep_runs_real_job(tmp_path):
+    """Test a sweep trains and evaluates a tiny job on the 18-node network and collects its results."""
+    spec = {
+        "name": "test_sweep",
+        "game_modes": ["900a704f-6271-4994-ade7-40b74d3199b1"],
+        "networks": ["b3cd9dfd-b178-415d-93f0-c9e279b3c511"],
+        "seeds": [1],
+        "ppo": {"n_steps": 64, "batch_size": 32},
+        "run": {
+            "total_timesteps": 256,
+            "eval_freq": 256,
+            "n_eval_episodes": 1,
+            "warn": False,
+            "verbose": 0,
+        },
+    }
+    sweep = YawningTitanSweep(spec, output_dir=tmp_path, max_workers=1)
+    results = sweep.run()
+    assert len(results) == 1
+
+    with open(sweep.results_path) as file:
+        reader = csv.DictReader(file)
+        rows = list(reader)
+    assert set(RESULT_COLUMNS) | {"job_id", "seed", "ppo.n_steps"} <= set(
+        reader.fieldnames
+    )
+    assert len(rows) == 1
+    assert rows[0]["job_id"] == sweep.jobs[0]["job_id"]
+    assert int(rows[0]["num_timesteps"]) >= 256
+    assert 0.0 <= float(rows[0]["win_rate"]) <= 1.0
+    assert float(rows[0]["steps_per_sec"]) > 0
@@ -0,0 +1,48 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from yawning_titan.db.yawning_titan_db import YawningTitanDB
+from yawning_titan.exceptions import YawningTitanDBCriticalError
+from yawning_titan.game_modes.game_mode import GameMode
+from yawning_titan.game_modes.game_mode_db import GameModeDB
+from yawning_titan.networks.network_creator import get_18_node_network_mesh
+from yawning_titan.networks.network_db import NetworkDB
+from yawning_titan.utils import import_db_files
+
+
+@pytest.mark.integration_test
+def test_import_directory(tmp_path):
+    """Test that a directory of network and game mode files is imported, and can be re-imported with upsert."""
+    network = get_18_node_network_mesh()
+    with open(tmp_path / "network.json", "w") as f:
+        json.dump(network.to_dict(json_serializable=True), f)
+    binary_network = get_18_node_network_mesh()
+    binary_network.save_binary(tmp_path / "binary_network.ytnet")
+    game_mode = GameMode()
+    with open(tmp_path / "game_mode.json", "w") as f:
+        json.dump(game_mode.to_dict(json_serializable=True), f)
+    (tmp_path / "notes.txt").write_text("not imported")
+
+    db_dir = tmp_path / "db"
+    db_dir.mkdir()
+    init = YawningTitanDB.__init__
+
+    def _init_patch(self, name):
+        init(self, name, root=db_dir)
+
+    with patch.object(YawningTitanDB, "__init__", _init_patch):
+        assert import_db_files.run(tmp_path) == (2, 1)
+        with pytest.raises(YawningTitanDBCriticalError):
+            import_db_files.run(tmp_path)
+        assert import_db_files.run(tmp_path, upsert=True) == (2, 1)
+
+        network_db = NetworkDB()
+        game_mode_db = GameModeDB()
+        networks = network_db.get_many(
+            [network.doc_metadata.uuid, binary_network.doc_metadata.uuid]
+        )
+        assert [n.number_of_nodes() for n in networks] == [18, 18]
+        assert game_mode_db.get(game_mode.doc_metadata.uuid) is not None
+        assert network_db.count() == 2
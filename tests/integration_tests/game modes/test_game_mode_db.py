@@ -6,10 +6,12 @@ import pytest
 
 from tests.yawning_titan_db_patch import yawning_titan_db_init_patch
 from yawning_titan.db.doc_metadata import DocMetadataSchema
+from yawning_titan.db.doc_summary import DocSummary
 from yawning_titan.db.yawning_titan_db import YawningTitanDB
 from yawning_titan.exceptions import YawningTitanDBError
 from yawning_titan.game_modes.game_mode import GameMode
 from yawning_titan.game_modes.game_mode_db import GameModeDB, GameModeSchema
+from yawning_titan.networks.network_creator import get_18_node_network_mesh
 from yawning_titan.networks.network_db import default_18_node_network
 
 
@@ -121,3 +123,89 @@ def test_game_mode_compatibility_query_integer():
         assert len(found) == len(db.all())
 
         db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_loaded_game_modes_are_independent_and_up_to_date():
+    """Test that game modes loaded from the cache can be modified without affecting later loads."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = GameModeDB()
+        game_mode = GameMode()
+        db.insert(game_mode, name="cached")
+        uuid = game_mode.doc_metadata.uuid
+        max_steps = game_mode.game_rules.max_steps.value
+
+        loaded = db.get(uuid)
+        loaded.game_rules.max_steps.value = max_steps + 1
+        assert db.get(uuid).game_rules.max_steps.value == max_steps
+
+        db.update(loaded)
+        assert db.get(uuid).game_rules.max_steps.value == max_steps + 1
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_list_summaries():
+    """Test game mode summaries follow the validity of the stored game modes."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = GameModeDB()
+        db.rebuild_db()
+        game_mode = db.all()[0]
+        assert game_mode.validation.passed
+        game_mode.doc_metadata._locked = False
+        game_mode.doc_metadata._uuid = "summary-test"
+        db.insert(game_mode, name="summarised")
+
+        summaries = {s.uuid: s for s in db.list_summaries()}
+        assert len(summaries) == db.count()
+        assert summaries["summary-test"].name == "summarised"
+        assert summaries["summary-test"].valid
+
+        game_mode.game_rules.max_steps.value = -1
+        game_mode.validate()
+        db.update(game_mode)
+        summaries = {s.uuid: s for s in db.list_summaries()}
+        assert summaries["summary-test"].valid is False
+        assert db.search_uuids(DocMetadataSchema.NAME == "summarised") == [
+            "summary-test"
+        ]
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_compatible_uuids_and_compatibility_matrix():
+    """Test compatibility from the stored summaries matches the network compatibility query."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = GameModeDB()
+        network = get_18_node_network_mesh()
+        game_mode = GameMode()
+        compatibility = game_mode.game_rules.network_compatibility
+        compatibility.high_value_node_count.restrict.value = True
+        compatibility.high_value_node_count.min.value = 50
+        compatibility.high_value_node_count.max.value = 60
+        db.insert(game_mode)
+        unrestricted = GameMode()
+        db.insert(unrestricted)
+
+        expected = [
+            g.doc_metadata.uuid
+            for g in db.search(
+                GameModeSchema.NETWORK_COMPATIBILITY.compatible_with(network)
+            )
+        ]
+        assert expected == [unrestricted.doc_metadata.uuid]
+        assert db.compatible_uuids(network) == expected
+
+        small_network = DocSummary(
+            uuid="small", node_count=4, entry_node_count=1, high_value_node_count=50
+        )
+        matrix = db.compatibility_matrix([network, small_network])
+        assert matrix[network.doc_metadata.uuid] == expected
+        assert game_mode.doc_metadata.uuid in matrix["small"]
+        assert db.compatibility_matrix([network, small_network]) == matrix
+
+        compatibility.high_value_node_count.restrict.value = False
+        db.update(game_mode)
+        matrix = db.compatibility_matrix([network])
+        assert game_mode.doc_metadata.uuid in matrix[network.doc_metadata.uuid]
+        db._db.close_and_delete_temp_db()
@@ -0,0 +1,53 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from yawning_titan.agents.sinewave_red import SineWaveRedAgent
+from yawning_titan.envs.generic.core.blue_interface import BlueInterface
+from yawning_titan.envs.generic.core.network_interface import NetworkInterface
+from yawning_titan.envs.generic.generic_env import GenericNetworkEnv
+
+
+def _steps(env, actions):
+    """Step the env through the actions, resetting it when an episode ends."""
+    steps = []
+    for action in actions:
+        obs, reward, done, _ = env.step(action)
+        steps.append((obs.tolist(), reward, done))
+        if done:
+            env.reset()
+    return steps
+
+
+@pytest.mark.integration_test
+def test_env_state_is_restored(default_game_mode, default_network):
+    """Tests that restoring the state of the env, and the random number generators, repeats the same steps."""
+    network_interface = NetworkInterface(default_game_mode, default_network)
+    env = GenericNetworkEnv(
+        SineWaveRedAgent(network_interface),
+        BlueInterface(network_interface),
+        network_interface,
+    )
+    env.reset()
+    _steps(env, [0, 1, 2, 3, 4])
+
+    state = pickle.loads(pickle.dumps(env.get_state()))
+    python_rng, numpy_rng = random.getstate(), np.random.get_state()
+    red_time = env.RED.time
+
+    actions = list(range(10))
+    steps = _steps(env, actions)
+    assert env.RED.time != red_time
+
+    env.set_state(state)
+    random.setstate(python_rng)
+    np.random.set_state(numpy_rng)
+    assert env.RED.time == red_time
+    assert _steps(env, actions) == steps
+
+    # the red agent's location is a node of the restored network, not a copy of one
+    location = env.network_interface.red_current_location
+    if location is not None:
+        assert any(node is location for node in env.network_interface.current_graph)
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import matplotlib
+import pytest
+
+from yawning_titan.envs.generic.helpers.episode_recorder import (
+    EpisodeRecorder,
+    render_episode,
+)
+from yawning_titan.networks import network_creator
+from yawning_titan.networks.node import Node
+
+matplotlib.use("Agg")
+
+
+def _env(network):
+    """A minimal stand-in exposing the attributes of the environment read by the recorder."""
+    network_interface = SimpleNamespace(
+        current_graph=network,
+        true_attacks=[],
+        detected_attacks=[],
+        get_target_node=lambda: None,
+    )
+    return SimpleNamespace(
+        network_interface=network_interface,
+        current_duration=0,
+        current_reward=0.0,
+        made_safe_nodes=[],
+    )
+
+
+@pytest.mark.integration_test
+def test_record_and_render_episode(tmp_path):
+    """Tests that topology changes are recorded as deltas and that every step is rendered."""
+    network = network_creator.create_mesh(size=6, connectivity=0.5)
+    nodes = list(network.nodes)
+    nodes[0].entry_node = True
+    env = _env(network)
+    recorder = EpisodeRecorder()
+    recorder.start_episode(env)
+
+    # step 1: red attacks a node
+    env.current_duration = 1
+    nodes[1].true_compromised_status = 1
+    env.network_interface.true_attacks = [[None, nodes[1]]]
+    recorder.record_step(env)
+
+    # step 2: blue isolates the node and adds a deceptive node
+    env.current_duration = 2
+    env.network_interface.true_attacks = []
+    network.remove_edges_from(list(network.edges(nodes[1])))
+    deceptive_node = Node()
+    network.add_node(deceptive_node)
+    network.add_edge(nodes[2], deceptive_node)
+    recorder.record_step(env)
+
+    episode = recorder.episodes[0]
+    assert len(episode) == 2
+    assert episode.steps[0].node_order is None
+    assert episode.steps[0].edges_added is None
+    assert len(episode.steps[1].node_order) == 7
+    assert len(episode.steps[1].edges_added) == 1
+    assert episode.steps[1].true_attacks.shape == (0, 2)
+
+    output = render_episode(
+        episode,
+        "episode",
+        save_gif=True,
+        save_webm=True,
+        save_png=True,
+        gif_output_directory=tmp_path,
+        webm_output_directory=tmp_path,
+        png_output_directory=tmp_path,
+    )
+    assert output["gif"].exists()
+    assert output["webm"].exists()
+    assert len(output["png"]) == 2
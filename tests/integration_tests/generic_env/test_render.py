@@ -0,0 +1,54 @@
+import matplotlib
+import pytest
+
+from yawning_titan.envs.generic.helpers.graph2plot import CustomEnvGraph
+from yawning_titan.networks import network_creator
+from yawning_titan.networks.node import Node
+
+matplotlib.use("Agg")
+
+
+@pytest.fixture
+def rendered_network():
+    """A small mesh network with an entry node, a high value node and a compromised node."""
+    network = network_creator.create_mesh(size=10, connectivity=0.5)
+    nodes = list(network.nodes)
+    nodes[0].entry_node = True
+    nodes[1].high_value_node = True
+    nodes[2].true_compromised_status = 1
+    return network
+
+
+@pytest.mark.integration_test
+def test_artists_are_retained_between_frames(rendered_network):
+    """Tests that the node and edge artists are reused when the topology does not change."""
+    nodes = list(rendered_network.nodes)
+    graph = CustomEnvGraph()
+    graph.render(1, rendered_network, [[nodes[2], nodes[3]]], 1.0, [])
+    node_collection = graph._node_collection
+    edge_collection = graph._edge_collection
+    assert len(graph._attack_collection.get_segments()) == 1
+
+    nodes[3].true_compromised_status = 1
+    graph.render(2, rendered_network, [], 2.0, [nodes[4]])
+    assert graph._node_collection is node_collection
+    assert graph._edge_collection is edge_collection
+    assert len(graph._attack_collection.get_segments()) == 0
+    assert graph.vis_ax.get_xlabel().startswith("Current Step: 2")
+    graph.close()
+
+
+@pytest.mark.integration_test
+def test_topology_change_redraws_network(rendered_network):
+    """Tests that adding a node rebuilds the retained artists."""
+    graph = CustomEnvGraph()
+    graph.render(1, rendered_network, [], 1.0, [])
+    node_collection = graph._node_collection
+
+    deceptive_node = Node()
+    rendered_network.add_node(deceptive_node)
+    rendered_network.add_edge(deceptive_node, list(rendered_network.nodes)[0])
+    graph.render(2, rendered_network, [], 1.0, [])
+    assert graph._node_collection is not node_collection
+    assert len(graph._node_collection.get_offsets()) == 11
+    graph.close()
@@ -1,15 +1,21 @@
 """Test the main :class: `yawning_titan.networks.network_db.NetworkDB`."""
 import copy
 import os
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from tinydb.operations import delete
 
+from tests import TEST_PACKAGE_DATA_PATH
 from tests.yawning_titan_db_patch import yawning_titan_db_init_patch
-from yawning_titan.db.doc_metadata import DocMetadataSchema
+from yawning_titan.db.doc_metadata import DocMetadata, DocMetadataSchema
 from yawning_titan.db.yawning_titan_db import YawningTitanDB
 from yawning_titan.exceptions import YawningTitanDBError
-from yawning_titan.networks.network_db import NetworkDB, NetworkSchema
+from yawning_titan.networks.network import Network
+from yawning_titan.networks.network_creator import get_18_node_network_mesh
+from yawning_titan.networks.network_db import NetworkDB, NetworkQuery, NetworkSchema
+from yawning_titan.networks.node import Node
 
 
 @pytest.mark.integration_test
@@ -45,7 +51,7 @@ def test_reset_default_networks():
         network_copy = networks_copy[0]
 
         # Update the object locally
-        network_copy.set_random_entry_nodes = False
+        network_copy.set_random_entry_nodes = not network_copy.set_random_entry_nodes
 
         # Hack an update to the locked network in the db
         db._db.db.update(
@@ -71,3 +77,248 @@ def test_network_schema():
         assert len(results) == 2
         assert results[0].doc_metadata.uuid == "b3cd9dfd-b178-415d-93f0-c9e279b3c511"
         db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_network_stored_by_reference():
+    """Test a network stored by reference to a binary network file can be retrieved and removed."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+        network = get_18_node_network_mesh()
+        db.insert(network, name="by reference", by_reference=True)
+
+        doc = db._db.get(network.doc_metadata.uuid)
+        assert "nodes" not in doc and "edges" not in doc
+        path = db._network_file_path(doc)
+        assert path.is_file()
+        assert db.get(network.doc_metadata.uuid) == network
+
+        # an update that fails leaves the stored file and doc as they were
+        network.remove_node(list(network.nodes)[0])
+        with patch.object(
+            NetworkDB, "_refresh_child_summaries", side_effect=RuntimeError
+        ):
+            with pytest.raises(RuntimeError):
+                db.update(network, by_reference=True)
+        assert db._db.get(network.doc_metadata.uuid)["network_file"] == path.name
+        assert len(list(path.parent.iterdir())) == 1
+        assert db.get(network.doc_metadata.uuid).number_of_nodes() == 18
+
+        # an update writes a new file and removes the replaced one
+        db.update(network, by_reference=True)
+        new_path = db._network_file_path(db._db.get(network.doc_metadata.uuid))
+        assert new_path != path and not path.is_file() and new_path.is_file()
+        assert db.get(network.doc_metadata.uuid).number_of_nodes() == 17
+
+        # storing the network inline again removes the file
+        db.update(network, by_reference=False)
+        assert not new_path.is_file()
+        doc = db._db.get(network.doc_metadata.uuid)
+        assert "network_file" not in doc and len(doc["nodes"]) == 17
+
+        db.update(network, by_reference=True)
+        path = db._network_file_path(db._db.get(network.doc_metadata.uuid))
+        assert "nodes" not in db._db.get(network.doc_metadata.uuid)
+        assert db.search(NetworkQuery.num_of_nodes(17)) == []
+        db.remove(network)
+        assert not path.is_file()
+
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_list_summaries():
+    """Test network summaries are listed without building networks, including networks stored without a summary."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+        inline = get_18_node_network_mesh()
+        by_reference = get_18_node_network_mesh()
+        db.insert(inline, name="inline")
+        db.insert(by_reference, name="by reference", by_reference=True)
+
+        # a doc written before summaries were stored
+        db._db.db.update(
+            delete("_summary"), DocMetadataSchema.UUID == inline.doc_metadata.uuid
+        )
+        with patch.object(Network, "create", side_effect=AssertionError):
+            summaries = {s.uuid: s for s in db.list_summaries()}
+        assert "_summary" in db._db.get(inline.doc_metadata.uuid)
+
+        for network in (inline, by_reference):
+            summary = summaries[network.doc_metadata.uuid]
+            assert summary.name == network.doc_metadata.name
+            assert summary.node_count == 18
+            assert summary.entry_node_count == len(network.entry_nodes)
+            assert summary.high_value_node_count == len(network.high_value_nodes)
+
+        assert db.search_uuids(DocMetadataSchema.NAME == "inline") == [
+            inline.doc_metadata.uuid
+        ]
+        # node count queries use the summary, and do not match networks stored by reference
+        entry_node_count = len(inline.entry_nodes)
+        assert db.search_uuids(
+            NetworkQuery.num_of_entry_nodes_between(entry_node_count, entry_node_count)
+        ) == [inline.doc_metadata.uuid]
+        assert db.search_uuids(NetworkQuery.num_of_entry_nodes(entry_node_count)) == [
+            inline.doc_metadata.uuid
+        ]
+
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_network_stored_as_delta():
+    """Test a network stored as a delta of a parent only stores its changes and follows the parent."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+        parent = get_18_node_network_mesh()
+        db.insert(parent, name="parent")
+
+        child = copy.deepcopy(parent)
+        child._doc_metadata = DocMetadata()
+        moved, removed = list(child.nodes)[:2]
+        moved.x_pos = 100.0
+        child.remove_node(removed)
+        db.insert(child, name="child", parent_uuid=parent.doc_metadata.uuid)
+
+        doc = db._db.get(child.doc_metadata.uuid)
+        assert "nodes" not in doc and "edges" not in doc
+        assert set(doc["delta"]["nodes"]) == {moved.uuid, removed.uuid}
+        assert db.get(child.doc_metadata.uuid).to_dict(json_serializable=True)[
+            "nodes"
+        ] == child.to_dict(json_serializable=True)["nodes"]
+        assert (
+            db.list_summaries()[1].node_count == parent.number_of_nodes() - 1 == 17
+        )
+
+        # the child follows changes to nodes of the parent it has not changed
+        other = list(parent.nodes)[2]
+        other.vulnerability = 0.5
+        db.update(parent)
+        loaded = db.get(child.doc_metadata.uuid)
+        assert {n.uuid: n.vulnerability for n in loaded.nodes}[other.uuid] == 0.5
+        assert {n.uuid: n.x_pos for n in loaded.nodes}[moved.uuid] == 100.0
+
+        # and its summary follows the nodes added to the parent
+        grandchild = copy.deepcopy(child)
+        grandchild._doc_metadata = DocMetadata()
+        db.insert(grandchild, parent_uuid=child.doc_metadata.uuid)
+        parent.add_node(Node())
+        parent.add_node(Node())
+        db.update(parent)
+        summaries = {summary.uuid: summary for summary in db.list_summaries()}
+        for network in (child, grandchild):
+            assert db.get(network.doc_metadata.uuid).number_of_nodes() == 19
+            assert summaries[network.doc_metadata.uuid].node_count == 19
+        db.remove(grandchild)
+
+        # updates keep the child a delta of the same parent
+        db.update(child)
+        assert db._db.get(child.doc_metadata.uuid)["parent_uuid"] == (
+            parent.doc_metadata.uuid
+        )
+
+        with pytest.raises(YawningTitanDBError):
+            db.update(parent, parent_uuid=child.doc_metadata.uuid)
+
+        # removing the parent stores the child in full
+        expected = db.get(child.doc_metadata.uuid).to_dict(json_serializable=True)
+        db.remove(parent)
+        doc = db._db.get(child.doc_metadata.uuid)
+        assert "parent_uuid" not in doc and "delta" not in doc
+        assert db.get(child.doc_metadata.uuid).to_dict(json_serializable=True) == (
+            expected
+        )
+        db.remove(child)
+        assert db.count() == 0
+
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_network_history_and_rollback():
+    """Test updates keep previous versions of a network that can be restored."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+        network = get_18_node_network_mesh()
+        uuid = network.doc_metadata.uuid
+        db.insert(network, name="v1")
+        original = network.to_dict(json_serializable=True)
+
+        node = list(network.nodes)[0]
+        network.remove_node(node)
+        db.update(network, name="v2")
+        db.update(network)  # nothing changed, so no revision is kept
+        assert [(r.revision, r.name, r.nodes_changed) for r in db.history(uuid)] == [
+            (1, "v1", 1)
+        ]
+
+        revision = db.get_revision(uuid, 1)
+        assert revision.to_dict(json_serializable=True)["nodes"] == original["nodes"]
+        assert revision.doc_metadata.name == "v1"
+        assert db.get_revision(uuid, 2) is None
+
+        db.rollback(uuid, 1)
+        restored = db.get(uuid)
+        assert restored.number_of_nodes() == 18
+        assert restored.doc_metadata.name == "v1"
+        assert len(db.history(uuid)) == 2
+        assert db.get_revision(uuid, 2).number_of_nodes() == 17
+
+        db.remove(restored)
+        assert db.history(uuid) == []
+
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_failed_update_writes_nothing():
+    """Test an update that fails part way leaves the network and its history as they were."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+        network = get_18_node_network_mesh()
+        uuid = network.doc_metadata.uuid
+        db.insert(network, name="v1")
+
+        network.remove_node(list(network.nodes)[0])
+        with patch.object(
+            NetworkDB, "_refresh_child_summaries", side_effect=RuntimeError
+        ):
+            with pytest.raises(RuntimeError):
+                db.update(network, name="v2")
+
+        assert db.get(uuid).number_of_nodes() == 18
+        assert db.get(uuid).doc_metadata.name == "v1"
+        assert db.history(uuid) == []
+
+        db._db.close_and_delete_temp_db()
+
+
+@pytest.mark.integration_test
+def test_network_history_db_alongside_network_db(network_db: NetworkDB):
+    """Test the network history is kept alongside the network db, and in a temporary db for the test network db."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+    # the history db is opened on first use, with the unpatched YawningTitanDB
+    history_path = Path(db._history._path)
+    db_path = Path(db._db._path)
+    assert history_path == db_path.parent / f"{db_path.stem}_history.json"
+    db._history.db.close()
+    history_path.unlink(missing_ok=True)
+    db._db.close_and_delete_temp_db()
+
+    # the patched test network db keeps its history in a temporary db file
+    assert Path(network_db._history._path).parent != TEST_PACKAGE_DATA_PATH
+    assert network_db.history("b3cd9dfd-b178-415d-93f0-c9e279b3c511") == []
+
+
+@pytest.mark.integration_test
+def test_context_manager_closes_the_same_db():
+    """Test entering a NetworkDB returns the instance itself, and exiting closes its db."""
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        db = NetworkDB()
+    with patch.object(db._db, "close", wraps=db._db.close) as close:
+        with db as entered:
+            assert entered is db
+        close.assert_called_once()
+    db._db.close_and_delete_temp_db()
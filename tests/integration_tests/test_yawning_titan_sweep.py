@@ -0,0 +1,122 @@
+"""Test the expansion, checkpointing and resuming of a YawningTitanSweep."""
+import csv
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from yawning_titan.exceptions import YawningTitanSweepError
+from yawning_titan.yawning_titan_sweep import YawningTitanSweep, expand_spec
+
+SPEC = {
+    "name": "test_sweep",
+    "networks": ["b3cd9dfd-b178-415d-93f0-c9e279b3c511"],
+    "seeds": [1, 2],
+    "ppo": {"learning_rate": [0.001, 0.01], "n_steps": 64},
+    "run": {"total_timesteps": 128},
+}
+
+
+def _fake_run_job(job, output_dir):
+    """Record the call and return results without training, failing seed 2 unless retried."""
+    with open(os.path.join(output_dir, "calls"), "a") as file:
+        file.write("1")
+    if job["seed"] == 2 and not os.path.isfile(os.path.join(output_dir, "retry")):
+        raise RuntimeError("seed 2 failed")
+    return {
+        "eval_reward_mean": job["ppo_kwargs"]["learning_rate"],
+        "eval_reward_std": 0.0,
+        "win_rate": 1.0,
+        "wall_time": 1.0,
+        "steps_per_sec": 128.0,
+        "num_timesteps": 128,
+    }
+
+
+def _crashing_run_job(job, output_dir):
+    """Kill the worker process if the job is marked to crash, otherwise return fake results."""
+    if os.path.isfile(os.path.join(output_dir, "crash")):
+        os._exit(1)
+    return _fake_run_job(job, output_dir)
+
+
+def _calls(sweep, job):
+    with open(sweep.job_dir(job) / "calls") as file:
+        return len(file.read())
+
+
+@pytest.mark.integration_test
+def test_expand_spec():
+    """Test a sweep spec is expanded into one job per combination, with stable job ids."""
+    jobs = expand_spec(SPEC)
+    assert len(jobs) == 4
+    assert {(job["seed"], job["ppo_kwargs"]["learning_rate"]) for job in jobs} == {
+        (1, 0.001),
+        (1, 0.01),
+        (2, 0.001),
+        (2, 0.01),
+    }
+    assert all(job["ppo_kwargs"]["n_steps"] == 64 for job in jobs)
+    assert [job["job_id"] for job in expand_spec(SPEC)] == [
+        job["job_id"] for job in jobs
+    ]
+
+    with pytest.raises(YawningTitanSweepError):
+        expand_spec({**SPEC, "networks": ["not a network"]})
+
+
+@pytest.mark.integration_test
+def test_sweep_resumes(tmp_path):
+    """Test a sweep checkpoints job status and results, and only runs incomplete jobs when run again."""
+    with patch("yawning_titan.yawning_titan_sweep._run_job", _fake_run_job):
+        sweep = YawningTitanSweep(SPEC, output_dir=tmp_path, max_workers=2)
+        results = sweep.run()
+        assert len(results) == 2
+        assert {row["seed"] for row in results} == {1}
+
+        with open(sweep.results_path) as file:
+            rows = list(csv.DictReader(file))
+        assert [row["job_id"] for row in rows] == [row["job_id"] for row in results]
+        assert "ppo.learning_rate" in rows[0] and "steps_per_sec" in rows[0]
+
+        # failed jobs are only run again when asked to
+        assert YawningTitanSweep(SPEC, output_dir=tmp_path).pending_jobs() == []
+        retry = YawningTitanSweep(SPEC, output_dir=tmp_path, retry_failed=True)
+        failed = retry.pending_jobs()
+        assert {job["seed"] for job in failed} == {2}
+
+        # a job that was running when the sweep was interrupted is run again
+        with open(retry.status_path) as file:
+            status = json.load(file)
+        interrupted = results[0]["job_id"]
+        status["jobs"][interrupted]["status"] = "running"
+        with open(retry.status_path, "w") as file:
+            json.dump(status, file)
+
+        for job in failed:
+            (retry.job_dir(job) / "retry").touch()
+        assert len(retry.run()) == 4
+        for job in retry.jobs:
+            expected = 2 if job["seed"] == 2 or job["job_id"] == interrupted else 1
+            assert _calls(retry, job) == expected
+
+
+@pytest.mark.integration_test
+def test_sweep_broken_pool_leaves_unstarted_jobs_pending(tmp_path):
+    """Test the jobs that had not started when a worker died are run when the sweep is resumed."""
+    sweep = YawningTitanSweep(SPEC, output_dir=tmp_path, max_workers=1)
+    crashed = sweep.jobs[0]
+    sweep.job_dir(crashed).mkdir(parents=True)
+    (sweep.job_dir(crashed) / "crash").touch()
+
+    with patch("yawning_titan.yawning_titan_sweep._run_job", _crashing_run_job):
+        assert sweep.run() == []
+
+    with open(sweep.status_path) as file:
+        status = json.load(file)["jobs"]
+    assert status[crashed["job_id"]]["status"] == "failed"
+    assert {status[job["job_id"]]["status"] for job in sweep.jobs[1:]} == {"pending"}
+    assert [job["job_id"] for job in sweep.pending_jobs()] == [
+        job["job_id"] for job in sweep.jobs[1:]
+    ]
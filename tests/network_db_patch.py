@@ -1,6 +1,9 @@
 from unittest.mock import patch
 
-from tests.yawning_titan_db_patch import yawning_titan_db_test_defaults_patch
+from tests.yawning_titan_db_patch import (
+    yawning_titan_db_init_patch,
+    yawning_titan_db_test_defaults_patch,
+)
 from yawning_titan.db.yawning_titan_db import YawningTitanDB
 
 
@@ -8,3 +11,6 @@ def network_db_init_patch(self):
     """Patch NetworkDB to use the tests/_package_data/networks.json db file."""
     with patch.object(YawningTitanDB, "__init__", yawning_titan_db_test_defaults_patch):
         self._db = YawningTitanDB("networks")
+    # the network history is kept in a temporary db file rather than alongside the test networks
+    with patch.object(YawningTitanDB, "__init__", yawning_titan_db_init_patch):
+        self._history_db = YawningTitanDB("network_history")
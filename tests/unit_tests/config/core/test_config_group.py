@@ -1,5 +1,6 @@
 from pathlib import Path
 from typing import Optional
+from unittest.mock import patch
 
 import pytest
 
@@ -230,3 +231,31 @@ def test_yaml_round_trip(test_group: Group, tmp_path: Path):
     d2 = test_group.to_dict()
 
     assert d1 == d2
+
+
+@pytest.mark.unit_test
+def test_batch_update_validates_once_on_exit(multi_tier_test_group: GroupTier2):
+    """Test that values set in a batch update are not validated until the outermost batch exits."""
+    with patch.object(
+        GroupTier2, "validate", autospec=True, side_effect=GroupTier2.validate
+    ) as validate:
+        with multi_tier_test_group.batch_update():
+            multi_tier_test_group.tier_1.bool.value = "test"
+            with multi_tier_test_group.batch_update():
+                multi_tier_test_group.int.value = 2
+            assert multi_tier_test_group.tier_1.bool.validation.passed
+            validate.assert_not_called()
+
+        validate.assert_called_once()
+    assert not multi_tier_test_group.validation.elements_passed
+    assert not multi_tier_test_group.tier_1.bool.validation.passed
+
+
+@pytest.mark.unit_test
+def test_item_validation_is_reused_until_the_value_changes(test_group: Group):
+    """Test that an item is only revalidated after its value is set."""
+    validation = test_group.b.validate()
+    assert test_group.b.validate() is validation
+
+    test_group.b.value = 2
+    assert test_group.b.validate() is not validation
@@ -1,5 +1,8 @@
 """This test module tests the YawningTitanDB class using the DemoDB subclass."""
+import json
+import multiprocessing
 from copy import deepcopy
+from pathlib import Path
 from typing import Dict, Final, List, Mapping, Optional, Union
 from unittest.mock import patch
 
@@ -9,8 +12,10 @@ from tinydb.table import Document
 
 from tests.yawning_titan_db_patch import yawning_titan_db_init_patch
 from yawning_titan.db.doc_metadata import DocMetadata, DocMetadataSchema
+from yawning_titan.db.doc_summary import SUMMARY_VERSION
+from yawning_titan.db.file_lock import FileLock, fcntl
 from yawning_titan.db.query import YawningTitanQuery
-from yawning_titan.db.yawning_titan_db import YawningTitanDB
+from yawning_titan.db.yawning_titan_db import DB_BACKENDS, YawningTitanDB
 from yawning_titan.exceptions import YawningTitanDBCriticalError, YawningTitanDBError
 
 
@@ -400,3 +405,235 @@ def test_remove_locked_fails(demo_db_docs):
             db.remove(item["_doc_metadata"]["uuid"])
 
         db.close_and_delete_temp_db()
+
+
+@pytest.mark.unit_test
+def test_sqlite_backend(demo_db_docs, tmp_path):
+    """Test that the sqlite backend supports the same queries as the tinydb backend."""
+    db = YawningTitanDB("test", root=tmp_path, backend="sqlite")
+    for item in demo_db_docs:
+        db.insert(item)
+    uuid = demo_db_docs[0]["_doc_metadata"]["uuid"]
+
+    assert db.backend == "sqlite"
+    assert db.all() == demo_db_docs
+    assert db.get(uuid) == demo_db_docs[0]
+    assert db.search(DemoSchema.FORENAME == "John") == [
+        demo_db_docs[0],
+        demo_db_docs[2],
+    ]
+    assert db.count(DocMetadataSchema.LOCKED == True) == 1  # noqa
+    assert db.count((DocMetadataSchema.LOCKED == False) & (DemoSchema.AGE > 25)) == 1
+
+    updated_item = deepcopy(demo_db_docs[0])
+    updated_item["age"] = 30
+    db.update(updated_item, uuid)
+    assert db.get(uuid)["age"] == 30
+
+    with pytest.raises(YawningTitanDBError):
+        db.remove(demo_db_docs[2]["_doc_metadata"]["uuid"])
+    assert db.remove(uuid) == uuid
+    assert db.count() == len(demo_db_docs) - 1
+    db.close()
+
+
+@pytest.mark.unit_test
+def test_json_db_is_migrated_to_sqlite(demo_db_docs, tmp_path):
+    """Test that a .json db is migrated once the sqlite backend is used, which is then used by default."""
+    db = YawningTitanDB("test", root=tmp_path)
+    for item in demo_db_docs:
+        db.insert(item)
+    db.close()
+
+    db = YawningTitanDB("test", root=tmp_path, backend="sqlite")
+    assert db.all() == demo_db_docs
+    db.close()
+
+    db = YawningTitanDB("test", root=tmp_path)
+    assert db.backend == "sqlite"
+    assert db.count() == len(demo_db_docs)
+    db.close()
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("backend", ["tinydb", "sqlite"])
+def test_get_many_follows_writes(demo_db_docs, tmp_path, backend):
+    """Test that get and get_many follow writes made by this and other instances of the db."""
+    db = YawningTitanDB("test", root=tmp_path, backend=backend)
+    other = YawningTitanDB("test", root=tmp_path, backend=backend)
+    uuids = [item["_doc_metadata"]["uuid"] for item in demo_db_docs]
+    db.insert(demo_db_docs[0])
+    db.insert(demo_db_docs[1])
+
+    assert db.get_many([uuids[1], uuids[2], uuids[0]]) == [
+        demo_db_docs[1],
+        None,
+        demo_db_docs[0],
+    ]
+
+    other.insert(demo_db_docs[2])
+    other.remove(uuids[0])
+    assert db.get(uuids[0]) is None
+    assert db.get_many(uuids) == [None, demo_db_docs[1], demo_db_docs[2]]
+
+    db.remove(uuids[1])
+    assert other.get(uuids[1]) is None
+    db.close()
+    other.close()
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("backend", ["tinydb", "sqlite"])
+def test_insert_many_and_upsert_many(demo_db_docs, tmp_path, backend):
+    """Test that bulk writes check uuids and locked docs before writing anything."""
+    db = YawningTitanDB("test", root=tmp_path, backend=backend)
+    assert db.insert_many(demo_db_docs[:2]) == demo_db_docs[:2]
+
+    with pytest.raises(YawningTitanDBCriticalError):
+        db.insert_many([demo_db_docs[2], demo_db_docs[0]])
+    with pytest.raises(YawningTitanDBCriticalError):
+        db.upsert_many([demo_db_docs[2], demo_db_docs[2]])
+    assert db.count() == 2
+
+    updated_item = deepcopy(demo_db_docs[0])
+    del updated_item["hobbies"]
+    upserted = db.upsert_many([updated_item, demo_db_docs[2]])
+    assert upserted == [updated_item, demo_db_docs[2]]
+    assert "hobbies" not in db.get(updated_item["_doc_metadata"]["uuid"])
+    assert "updated_at" in upserted[0]["_doc_metadata"]
+
+    locked_item = deepcopy(demo_db_docs[2])
+    locked_item["age"] = 1
+    with pytest.raises(YawningTitanDBError):
+        db.upsert_many([demo_db_docs[1], locked_item])
+    assert db.get(locked_item["_doc_metadata"]["uuid"])["age"] == 264
+
+    db.upsert_many([locked_item], reset=True)
+    assert db.get(locked_item["_doc_metadata"]["uuid"]) == locked_item
+    db.close()
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("backend", ["tinydb", "sqlite"])
+def test_summaries_are_stored_once(demo_db_docs, tmp_path, backend):
+    """Test that docs stored without a summary are summarised once and the summary kept."""
+    db = YawningTitanDB("test", root=tmp_path, backend=backend)
+    summarised = deepcopy(demo_db_docs[0])
+    summarised["_summary"] = {"age": 31, "version": SUMMARY_VERSION}
+    db.insert_many([summarised, demo_db_docs[1]])
+
+    calls = []
+
+    def summarise(doc):
+        calls.append(doc["_doc_metadata"]["uuid"])
+        return {"age": doc["age"], "version": SUMMARY_VERSION}
+
+    summaries = db.summaries(summarise)
+    assert [doc["_summary"]["age"] for doc in summaries] == [31, 26]
+    assert [doc["_doc_metadata"] for doc in summaries] == [
+        demo_db_docs[0]["_doc_metadata"],
+        demo_db_docs[1]["_doc_metadata"],
+    ]
+    assert "forename" not in summaries[0]
+    assert calls == [demo_db_docs[1]["_doc_metadata"]["uuid"]]
+
+    assert db.summaries(summarise) == summaries
+    assert len(calls) == 1
+    db.close()
+
+
+def _insert_docs(root: Path, worker: int, n: int):
+    """Insert docs into a db from a separate process."""
+    db = YawningTitanDB("test", root=root)
+    for i in range(n):
+        db.insert(
+            {"worker": worker, "i": i, "_doc_metadata": DocMetadata().to_dict()}
+        )
+    db.close()
+
+
+@pytest.mark.unit_test
+@pytest.mark.skipif(fcntl is None, reason="fcntl is not available")
+def test_concurrent_inserts_from_processes(tmp_path):
+    """Test that processes writing to the same .json db file do not lose or corrupt each others writes."""
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_insert_docs, args=(tmp_path, worker, 20))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 4
+
+    with open(tmp_path / "test.json") as f:
+        docs = json.load(f)["_default"]
+    assert len(docs) == 80
+
+    db = YawningTitanDB("test", root=tmp_path)
+    assert db.count() == 80
+    assert len({doc["_doc_metadata"]["uuid"] for doc in db.all()}) == 80
+    db.close()
+
+
+@pytest.mark.unit_test
+def test_lock_without_write_access(tmp_path):
+    """Test that a lock file that cannot be created, such as in a read-only dir, leaves the lock a no-op."""
+    lock = FileLock(tmp_path / "test.json.lock")
+    with patch("os.open", side_effect=PermissionError("read-only")):
+        with lock.shared():
+            with lock.exclusive():
+                pass
+    assert lock.version == 0
+    assert not (tmp_path / "test.json.lock").exists()
+
+
+@pytest.mark.unit_test
+def test_write_behind(demo_db_docs, tmp_path):
+    """Test that writes made in a write_behind block are visible in the block and written once it exits."""
+    db = YawningTitanDB("test", root=tmp_path)
+    other = YawningTitanDB("test", root=tmp_path)
+    db.insert(demo_db_docs[0])
+    token = db._file_token()
+
+    with db.write_behind():
+        db.insert(demo_db_docs[1])
+        db.insert(demo_db_docs[2])
+        updated_item = deepcopy(demo_db_docs[0])
+        updated_item["age"] = 30
+        db.update(updated_item, updated_item["_doc_metadata"]["uuid"])
+        assert db.count() == 3
+        assert db.get(updated_item["_doc_metadata"]["uuid"])["age"] == 30
+        assert db._file_token()[:2] == token[:2]
+
+    assert other.count() == 3
+    assert other.get(updated_item["_doc_metadata"]["uuid"])["age"] == 30
+    assert other.all() == db.all()
+    db.close()
+    other.close()
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("backend", DB_BACKENDS)
+def test_write_behind_discarded_on_error(demo_db_docs, tmp_path, backend):
+    """Test that none of the writes made in a write_behind block are made if it raises."""
+    db = YawningTitanDB("test", root=tmp_path, backend=backend)
+    db.insert(demo_db_docs[0])
+
+    with pytest.raises(RuntimeError):
+        with db.write_behind():
+            db.insert(demo_db_docs[1])
+            db.remove(demo_db_docs[0]["_doc_metadata"]["uuid"])
+            raise RuntimeError()
+
+    other = YawningTitanDB("test", root=tmp_path, backend=backend)
+    for reader in (db, other):
+        assert reader.count() == 1
+        assert reader.get(demo_db_docs[0]["_doc_metadata"]["uuid"]) is not None
+        assert reader.get(demo_db_docs[1]["_doc_metadata"]["uuid"]) is None
+
+    db.insert(demo_db_docs[1])
+    assert other.count() == 2
+    db.close()
+    other.close()
@@ -9,3 +9,44 @@ catch the errors raised.
 
 .. todo:: Write full test suite.
 """
+import pickle
+
+import pytest
+
+from yawning_titan.game_modes.game_mode import GameMode
+
+
+@pytest.mark.unit_test
+def test_fingerprint_follows_values():
+    """Test that game modes with the same values share a fingerprint that changes when a value is set."""
+    game_mode = GameMode()
+    other = GameMode()
+    fingerprint = game_mode.fingerprint
+    assert other.fingerprint == fingerprint
+
+    max_steps = game_mode.game_rules.max_steps.value
+    game_mode.game_rules.max_steps.value = max_steps + 1
+    assert game_mode.fingerprint != fingerprint
+
+    game_mode.game_rules.max_steps.value = max_steps
+    assert game_mode.fingerprint == fingerprint
+
+
+@pytest.mark.unit_test
+def test_frozen_game_mode_round_trips():
+    """Test that a frozen game mode is immutable, pickles and thaws back to the same values."""
+    game_mode = GameMode()
+    game_mode.game_rules.max_steps.value = 123
+    frozen = game_mode.freeze()
+
+    with pytest.raises(AttributeError):
+        frozen.schema_version = 0
+
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert unpickled == frozen
+    assert unpickled.fingerprint == game_mode.fingerprint
+
+    thawed = GameMode.thaw(unpickled)
+    assert thawed.to_dict(values_only=True) == game_mode.to_dict(values_only=True)
+    assert thawed.doc_metadata.uuid == game_mode.doc_metadata.uuid
+    assert thawed.validation.passed == game_mode.validation.passed
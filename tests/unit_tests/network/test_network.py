@@ -1,7 +1,17 @@
+import copy
+from unittest.mock import patch
+
+import numpy
 import pytest
 
 from yawning_titan.exceptions import NetworkError
-from yawning_titan.networks.network import Network
+from yawning_titan.networks.network import (
+    EntryNodeSampler,
+    Network,
+    RandomEntryNodePreference,
+    RandomHighValueNodePreference,
+)
+from yawning_titan.networks.network_creator import get_18_node_network_mesh
 from yawning_titan.networks.network_db import default_18_node_network
 from yawning_titan.networks.node import Node
 
@@ -93,3 +103,248 @@ def test_setting_high_value_nodes_before_entry_nodes():
 
     with pytest.raises(NetworkError):
         network.reset_random_high_value_nodes()
+
+
+@pytest.mark.unit_test
+def test_from_arrays():
+    """Test bulk constructing a network from node attribute columns, an edge index and positions."""
+    network = Network.from_arrays(
+        node_attrs={
+            "name": ["a", "b", "c"],
+            "entry_node": [True, False, False],
+            "high_value_node": [False, False, True],
+        },
+        edge_index=[[0, 1], [1, 0], [1, 2]],
+        positions=[[0, 0], [1, 1], [2, 2]],
+        set_random_vulnerabilities=True,
+    )
+    assert [n.name for n in network.nodes] == ["a", "b", "c"]
+    assert network.number_of_edges() == 2
+    assert network.entry_nodes == [network.get_node_from_name("a")]
+    assert network.high_value_nodes == [network.get_node_from_name("c")]
+    assert network.get_node_from_name("c").node_position == [2, 2]
+    assert network.set_random_vulnerabilities
+
+
+@pytest.mark.unit_test
+def test_from_arrays_invalid_edge_index():
+    """Test that an edge index referencing a node that does not exist raises a NetworkError."""
+    with pytest.raises(NetworkError):
+        Network.from_arrays(node_attrs={"name": ["a", "b"]}, edge_index=[[0, 2]])
+
+
+@pytest.mark.unit_test
+def test_create_round_trips_to_dict():
+    """Test that a network created from a dict has the same nodes and edges as the dict."""
+    network = Network.from_arrays(
+        node_attrs={"name": ["a", "b", "c"], "entry_node": [True, False, False]},
+        edge_index=[[0, 1], [1, 2]],
+        positions=[[0, 0], [1, 1], [2, 2]],
+    )
+    network_dict = network.to_dict(json_serializable=True)
+    assert Network.create(network_dict).to_dict(json_serializable=True) == network_dict
+
+
+@pytest.mark.unit_test
+def test_special_node_indexes_follow_node_setters():
+    """Test that the special node lists and index arrays track node flag changes and node removal."""
+    network = Network.from_arrays(
+        node_attrs={
+            "name": ["a", "b", "c", "d"],
+            "entry_node": [False, True, False, True],
+        },
+        edge_index=[[0, 1], [1, 2], [2, 3]],
+    )
+    a, b, c, d = network.nodes
+    assert network.entry_nodes == [b, d]
+    assert network.entry_node_indices.tolist() == [1, 3]
+
+    a.entry_node = True
+    c.high_value_node = True
+    c.deceptive_node = True
+    assert network.entry_nodes == [a, b, d]
+    assert network.high_value_node_indices.tolist() == [2]
+    assert network.deceptive_nodes == [c]
+
+    network.remove_node(a)
+    assert network.entry_nodes == [b, d]
+    assert network.entry_node_indices.tolist() == [0, 2]
+
+    # a removed node no longer updates the network
+    a.high_value_node = True
+    assert network.high_value_nodes == [c]
+
+
+@pytest.mark.unit_test
+def test_special_node_indexes_are_independent_between_copies():
+    """Test that a deep copied network indexes its own nodes."""
+    network = Network.from_arrays(
+        node_attrs={"name": ["a", "b", "c"], "entry_node": [True, False, False]},
+        edge_index=[[0, 1], [1, 2]],
+    )
+    network_copy = copy.deepcopy(network)
+    network_copy.get_node_from_name("c").entry_node = True
+
+    assert [n.name for n in network.entry_nodes] == ["a"]
+    assert [n.name for n in network_copy.entry_nodes] == ["a", "c"]
+    assert network_copy.entry_node_indices.tolist() == [0, 2]
+
+
+@pytest.mark.unit_test
+def test_reset_high_value_nodes_furthest_away_from_entry():
+    """Test that the high value node is placed furthest from the entry node and follows topology changes."""
+    network = Network.from_arrays(
+        node_attrs={
+            "name": ["a", "b", "c", "d", "e"],
+            "entry_node": [True, False, False, False, False],
+        },
+        edge_index=[[0, 1], [1, 2], [2, 3], [3, 4]],
+        random_high_value_node_preference=RandomHighValueNodePreference.FURTHEST_AWAY_FROM_ENTRY,
+        num_of_random_high_value_nodes=1,
+    )
+    network.reset_random_high_value_nodes()
+    assert [n.name for n in network.high_value_nodes] == ["e"]
+
+    # copies share the cached ranking until their topology changes
+    network_copy = copy.deepcopy(network)
+    network_copy.reset_random_high_value_nodes()
+    assert [n.name for n in network_copy.high_value_nodes] == ["e"]
+
+    version = network_copy.topology_version
+    network_copy.remove_edge(
+        network_copy.get_node_from_name("d"), network_copy.get_node_from_name("e")
+    )
+    assert network_copy.topology_version > version
+    network_copy.reset_random_high_value_nodes()
+    assert [n.name for n in network_copy.high_value_nodes] == ["d"]
+    assert [n.name for n in network.high_value_nodes] == ["e"]
+
+
+@pytest.mark.unit_test
+def test_entry_node_sampler_is_serialised_with_the_network():
+    """Test that the entry node centrality is stored in the network dict and reused after loading."""
+    network = default_18_node_network()
+    network.random_entry_node_preference = RandomEntryNodePreference.EDGE
+    network.num_of_random_entry_nodes = 2
+    network.reset_random_entry_nodes(rng=numpy.random.default_rng(1))
+    assert len(network.entry_nodes) == 2
+
+    network_dict = network.to_dict(json_serializable=True)
+    assert len(network_dict["entry_node_sampler"]["centrality"]) == 18
+
+    loaded = Network.create(network_dict)
+    assert loaded.entry_node_sampler == network.entry_node_sampler
+    loaded.reset_random_entry_nodes(rng=numpy.random.default_rng(1))
+    assert [n.uuid for n in loaded.entry_nodes] == [n.uuid for n in network.entry_nodes]
+
+    # a topology change invalidates the stored centrality
+    loaded.remove_node(loaded.entry_nodes[0])
+    weights = loaded.entry_node_sampler.weights(
+        loaded, RandomEntryNodePreference.CENTRAL
+    )
+    assert len(weights) == 17
+    assert weights.sum() == pytest.approx(1)
+
+
+@pytest.mark.unit_test
+def test_entry_node_centrality_is_shared_by_copies():
+    """Test that the entry node centrality is computed once for a network and the copies made of it on each reset."""
+    network = get_18_node_network_mesh()
+    network.random_entry_node_preference = RandomEntryNodePreference.CENTRAL
+    network.num_of_random_entry_nodes = 2
+
+    with patch.object(
+        EntryNodeSampler,
+        "_eigenvector_centrality",
+        wraps=EntryNodeSampler._eigenvector_centrality,
+    ) as centrality:
+        for _ in range(5):
+            episode_network = copy.deepcopy(network)
+            episode_network.reset_random_entry_nodes()
+            assert len(episode_network.entry_nodes) == 2
+        assert centrality.call_count == 1
+
+
+@pytest.mark.unit_test
+def test_binary_file_round_trips_to_dict(tmp_path):
+    """Test that a network loaded from a binary network file matches the saved network."""
+    network = default_18_node_network()
+    path = tmp_path / "network.ytnet"
+    network.save_binary(path)
+
+    for mmap in [True, False]:
+        loaded = Network.load_binary(path, mmap=mmap)
+        assert loaded.to_dict(json_serializable=True) == network.to_dict(
+            json_serializable=True
+        )
+
+
+@pytest.mark.unit_test
+def test_load_binary_rejects_other_files(tmp_path):
+    """Test that loading a file that is not a binary network file raises a NetworkError."""
+    path = tmp_path / "network.ytnet"
+    path.write_bytes(b"not a network file")
+    with pytest.raises(NetworkError):
+        Network.load_binary(path)
+
+
+@pytest.mark.unit_test
+def test_fingerprint_follows_content():
+    """Test that identically built networks share a fingerprint that changes when the network is edited."""
+
+    def build():
+        return Network.from_arrays(
+            node_attrs={"name": ["a", "b", "c"], "entry_node": [True, False, False]},
+            edge_index=[[0, 1], [1, 2]],
+        )
+
+    network, other = build(), build()
+    fingerprint = network.fingerprint
+    topology_fingerprint = network.topology_fingerprint
+    assert other.fingerprint == fingerprint
+    assert other.topology_fingerprint == topology_fingerprint
+    assert hash(other) != hash(network)
+
+    node = network.get_node_from_name("c")
+    node.vulnerability = 0.5
+    assert network.fingerprint != fingerprint
+    assert network.topology_fingerprint == topology_fingerprint
+
+    node.vulnerability = other.get_node_from_name("c").vulnerability
+    assert network.fingerprint == fingerprint
+
+    network.set_random_vulnerabilities = not network.set_random_vulnerabilities
+    assert network.fingerprint != fingerprint
+
+    other.add_edge(other.get_node_from_name("a"), other.get_node_from_name("c"))
+    assert other.topology_fingerprint != topology_fingerprint
+
+
+@pytest.mark.unit_test
+def test_node_filters_follow_node_status():
+    """Test that the filtered nodes and counts follow node status changes, additions and removals."""
+    network = default_18_node_network()
+    nodes = list(network.nodes)
+    assert network.count_nodes(filter_true_safe=True) == 18
+    assert network.get_nodes(filter_true_compromised=True) == []
+
+    nodes[3].true_compromised_status = 1
+    nodes[5].true_compromised_status = 1
+    nodes[5].isolated = True
+    assert network.get_nodes(filter_true_compromised=True) == [nodes[3], nodes[5]]
+    assert network.get_nodes(
+        filter_true_compromised=True, filter_non_isolated=True
+    ) == [nodes[3]]
+    assert list(network.get_node_indices(filter_isolated=True)) == [5]
+    assert network.count_nodes(filter_true_safe=True) == 16
+    assert network.count_nodes(filter_true_safe=True, filter_true_compromised=True) == 0
+
+    network.remove_node(nodes[3])
+    new_node = Node()
+    new_node.true_compromised_status = 1
+    network.add_node(new_node)
+    assert network.get_nodes(filter_true_compromised=True) == [nodes[5], new_node]
+
+    nodes[5].true_compromised_status = 0
+    assert network.count_nodes(filter_true_compromised=True) == 1
+    assert network.count_nodes() == 18
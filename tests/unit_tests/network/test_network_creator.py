@@ -0,0 +1,129 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from yawning_titan.networks import network_creator
+from yawning_titan.networks.network_creator import (
+    check_if_nearby,
+    generate_node_position_array,
+)
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize(
+    "create_network",
+    [
+        lambda seed: network_creator.create_mesh(size=30, connectivity=0.3, seed=seed),
+        lambda seed: network_creator.create_star(seed=seed),
+        lambda seed: network_creator.create_p2p(seed=seed),
+        lambda seed: network_creator.create_ring(seed=seed),
+        lambda seed: network_creator.gnp_random_connected_graph(30, 0.1, seed=seed),
+        lambda seed: network_creator.create_enterprise(seed=seed),
+        lambda seed: network_creator.create_barabasi_albert(200, seed=seed),
+        lambda seed: network_creator.create_wan(seed=seed),
+    ],
+)
+def test_seeded_networks_are_repeatable(create_network):
+    """Test that creating a network with the same seed gives the same topology and positions."""
+    network_a = create_network(1)
+    network_b = create_network(1)
+
+    def summary(network):
+        return (
+            [n.node_position for n in network.nodes],
+            sorted((u.name, v.name) for u, v in network.edges),
+            [n.name for n in network.entry_nodes + network.high_value_nodes],
+        )
+
+    assert summary(network_a) == summary(network_b)
+
+
+@pytest.mark.unit_test
+def test_mesh_edge_count():
+    """Test that a mesh network has roughly the expected number of edges and no self loops."""
+    network = network_creator.create_mesh(size=200, connectivity=0.1, seed=3)
+    expected = 0.1 * 200 * 199 / 2
+    assert len(network.nodes) == 200
+    assert 0.8 * expected < network.number_of_edges() < 1.2 * expected
+    assert nx.number_of_selfloops(network) == 0
+
+
+@pytest.mark.unit_test
+def test_star_groups_only_connect_through_centre():
+    """Test that removing the centre of a star network disconnects the groups."""
+    network = network_creator.create_star(
+        first_layer_size=4, group_size=5, group_connectivity=1, seed=2
+    )
+    centre = network.get_node_from_name("0")
+    assert network.degree[centre] == 4
+    network.remove_node(centre)
+    assert nx.number_connected_components(network) == 4
+
+
+@pytest.mark.unit_test
+def test_gnp_random_connected_graph_has_no_isolated_nodes():
+    """Test that every node of a gnp random connected graph has at least one edge."""
+    network = network_creator.gnp_random_connected_graph(500, 0.001, seed=5)
+    assert len(network.nodes) == 500
+    assert nx.number_of_isolates(network) == 0
+
+
+@pytest.mark.unit_test
+def test_generated_positions_are_separated():
+    """Test that the spatial hash grid placement gives the same separation as check_if_nearby."""
+    positions = generate_node_position_array(100, np.random.default_rng(0))
+    placed = {}
+    for i, pos in enumerate(positions.tolist()):
+        assert not check_if_nearby(pos, placed, 0)
+        placed[str(i)] = pos
+
+
+@pytest.mark.unit_test
+def test_enterprise_hosts_connect_through_their_access_node():
+    """Test the size of an enterprise network and that entry and high value nodes are hosts and servers."""
+    network = network_creator.create_enterprise(
+        n_core=2,
+        n_distribution=3,
+        access_per_distribution=2,
+        hosts_per_access=5,
+        num_of_entry_nodes=2,
+        num_of_high_value_nodes=3,
+        seed=1,
+    )
+    assert network.number_of_nodes() == 2 + 3 * (1 + 2 * (1 + 5))
+    assert nx.is_connected(network)
+    assert all(n.name.startswith("host-") for n in network.entry_nodes)
+    assert all(n.name.startswith("server-") for n in network.high_value_nodes)
+    assert len(network.entry_nodes) == 2 and len(network.high_value_nodes) == 3
+    host = network.entry_nodes[0]
+    assert network.degree[host] == 1
+    assert list(network.neighbors(host))[0].name.startswith("access-")
+
+
+@pytest.mark.unit_test
+def test_barabasi_albert_is_connected_and_scale_free():
+    """Test that a Barabási–Albert network is connected with about m edges per node and high value hubs."""
+    network = network_creator.create_barabasi_albert(
+        2000, m=2, num_of_high_value_nodes=1, seed=4
+    )
+    assert nx.is_connected(network)
+    assert nx.number_of_selfloops(network) == 0
+    assert 1.9 * 2000 < network.number_of_edges() <= 2 * 2000
+    degrees = dict(network.degree)
+    assert degrees[network.high_value_nodes[0]] == max(degrees.values())
+    assert max(degrees.values()) > 10 * 2
+
+
+@pytest.mark.unit_test
+def test_wan_entry_nodes_are_in_branch_sites():
+    """Test that a WAN links every site and places entry nodes away from the headquarters."""
+    network = network_creator.create_wan(
+        n_sites=5, num_of_entry_nodes=4, num_of_high_value_nodes=2, seed=3
+    )
+    assert nx.is_connected(network)
+    assert all(n.name.startswith("site-") for n in network.entry_nodes)
+    assert all(n.name.startswith("hq-server-") for n in network.high_value_nodes)
+    gateways = [n for n in network.nodes if n.name.endswith("gateway")]
+    assert len(gateways) == 5
+    network.remove_nodes_from(gateways)
+    assert nx.number_connected_components(network) == 5
@@ -0,0 +1,27 @@
+"""Test the network deltas used to store networks against a parent network."""
+import pytest
+
+from yawning_titan.networks.network_creator import get_18_node_network_mesh
+from yawning_titan.networks.network_delta import apply_delta, is_empty, network_delta
+
+
+@pytest.mark.unit_test
+def test_delta_round_trip():
+    """Test applying the delta between two networks to the first gives the second."""
+    network = get_18_node_network_mesh()
+    base = network.to_dict(json_serializable=True)
+
+    nodes = list(network.nodes)
+    nodes[0].vulnerability = 0.9
+    network.remove_node(nodes[1])
+    network.add_edge(nodes[2], nodes[3])
+    target = network.to_dict(json_serializable=True)
+
+    delta = network_delta(base, target)
+    assert set(delta["nodes"]) == {nodes[0].uuid, nodes[1].uuid}
+    assert delta["nodes"][nodes[1].uuid] is None
+
+    result = apply_delta(base, delta)
+    assert result["nodes"] == target["nodes"]
+    assert is_empty(network_delta(target, result))
+    assert not is_empty(delta)
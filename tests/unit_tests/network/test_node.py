@@ -0,0 +1,42 @@
+import copy
+import pickle
+
+import pytest
+
+from yawning_titan.networks.node import Node
+
+
+@pytest.mark.unit_test
+def test_create_from_db_preserves_identity():
+    """Test that a Node recreated from its dict is equal to, hashes as and sorts as the original."""
+    node = Node(name="a", entry_node=True, vulnerability=0.5)
+    node.node_position = [1.0, 2.0]
+    loaded = Node.create_from_db(**node.to_dict())
+
+    assert loaded is not node
+    assert loaded == node
+    assert hash(loaded) == hash(node)
+    assert loaded.to_dict() == node.to_dict()
+    assert {node: 1}[loaded] == 1
+
+
+@pytest.mark.unit_test
+def test_nodes_sort_by_uuid():
+    """Test that Nodes sort in uuid string order, including nodes with non canonical uuids."""
+    nodes = [Node() for _ in range(50)]
+    nodes[0]._uuid = "not-a-uuid"
+    assert sorted(nodes) == sorted(nodes, key=lambda n: n.uuid)
+
+
+@pytest.mark.unit_test
+def test_node_copies_keep_state():
+    """Test that copied and unpickled Nodes keep their attributes and stay equal to the original."""
+    node = Node(name="a", high_value_node=True)
+    node.true_compromised_status = 1
+    node.deceptive_node = True
+
+    for node_copy in (copy.deepcopy(node), pickle.loads(pickle.dumps(node))):
+        assert node_copy == node
+        assert node_copy.true_compromised_status == 1
+        assert node_copy.deceptive_node
+        assert node_copy.to_dict() == node.to_dict()
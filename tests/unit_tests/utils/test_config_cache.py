@@ -0,0 +1,79 @@
+import os
+import pickle
+
+import pytest
+
+from yawning_titan.utils.config_cache import ConfigCache, load_yaml
+
+
+@pytest.mark.unit_test
+def test_cached_objects_are_copies():
+    """Test that a cached object is loaded once and that every read is an independent copy."""
+    cache = ConfigCache()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"items": [1, 2, 3]}
+
+    first = cache.get_or_load("key", 1, load)
+    first["items"].append(4)
+    second = cache.get_or_load("key", 1, load)
+    second["items"].append(5)
+
+    assert len(calls) == 1
+    assert cache.get("key", 1) == {"items": [1, 2, 3]}
+    assert cache.get("key", 2) is None
+
+
+@pytest.mark.unit_test
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache holds at most maxsize entries, evicting the least recently used."""
+    cache = ConfigCache(maxsize=2)
+    cache.put("a", 1, "a")
+    cache.put("b", 1, "b")
+    cache.get("a", 1)
+    cache.put("c", 1, "c")
+
+    assert len(cache) == 2
+    assert cache.get("a", 1) == "a"
+    assert cache.get("b", 1) is None
+
+
+@pytest.mark.unit_test
+def test_cache_is_bounded_by_pickled_size():
+    """Test that the cache evicts the least recently used entries to stay within max_bytes."""
+    size = len(pickle.dumps(b"a" * 1000, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ConfigCache(max_bytes=2 * size)
+    cache.put("a", 1, b"a" * 1000)
+    cache.put("b", 1, b"b" * 1000)
+    cache.put("a", 2, b"a" * 1000)
+    assert cache.nbytes == 2 * size
+
+    cache.put("c", 1, b"c" * 1000)
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 2) is not None
+    assert cache.nbytes == 2 * size
+
+    # an object larger than the whole cache is not cached, nor evicts others
+    cache.put("d", 1, b"d" * 10_000)
+    assert cache.get("d", 1) is None
+    assert len(cache) == 2
+
+    cache.invalidate("a")
+    assert cache.nbytes == size
+    cache.invalidate()
+    assert cache.nbytes == 0
+
+
+@pytest.mark.unit_test
+def test_yaml_is_reloaded_when_the_file_changes(tmp_path):
+    """Test that a yaml file is reparsed once it has been modified."""
+    path = tmp_path / "game_mode.yaml"
+    path.write_text("max_steps: 10\n")
+    assert load_yaml(path) == {"max_steps": 10}
+
+    path.write_text("max_steps: 200\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_yaml(path) == {"max_steps": 200}
@@ -0,0 +1,33 @@
+import numpy
+import pytest
+
+from yawning_titan.utils.derived_artifact_cache import DerivedArtifactCache
+
+
+@pytest.mark.unit_test
+def test_artifact_is_computed_once(tmp_path):
+    """Test that a cached artifact is loaded rather than recomputed by a new cache instance."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return numpy.arange(5, dtype=float)
+
+    first = DerivedArtifactCache(tmp_path).get_or_compute("centrality", "abc", compute)
+    second = DerivedArtifactCache(tmp_path).get_or_compute("centrality", "abc", compute)
+
+    assert len(calls) == 1
+    assert numpy.array_equal(first, second)
+
+
+@pytest.mark.unit_test
+def test_unreadable_artifact_is_recomputed(tmp_path):
+    """Test that a corrupt cached artifact is treated as a cache miss."""
+    cache = DerivedArtifactCache(tmp_path)
+    path = cache.path("centrality", "abc")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not an array")
+
+    artifact = cache.get_or_compute("centrality", "abc", lambda: numpy.ones(3))
+    assert numpy.array_equal(artifact, numpy.ones(3))
+    assert numpy.array_equal(cache.load("centrality", "abc"), numpy.ones(3))
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from yawning_titan.utils.process_utils import THREAD_ENV_VARS, init_worker, write_atomic
+
+
+@pytest.mark.unit_test
+def test_write_atomic(tmp_path):
+    """Test a file is replaced only once its new contents are written."""
+    path = tmp_path / "file.txt"
+    path.write_text("old")
+    write_atomic(path, lambda file: file.write("new"))
+    assert path.read_text() == "new"
+
+    def _fail(file):
+        file.write("partial")
+        raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError):
+        write_atomic(path, _fail)
+    assert path.read_text() == "new"
+    assert os.listdir(tmp_path) == ["file.txt"]
+
+    write_atomic(path, lambda file: file.write(b"bytes"), binary=True)
+    assert path.read_bytes() == b"bytes"
+
+
+@pytest.mark.unit_test
+def test_init_worker(monkeypatch):
+    """Test a worker is limited to its CPU budget."""
+    import torch
+
+    threads = torch.get_num_threads()
+    for var in THREAD_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+    try:
+        init_worker(1)
+        assert all(os.environ[var] == "1" for var in THREAD_ENV_VARS)
+        assert torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(threads)